@@ -1,6 +1,9 @@
 """Main CLI for cpueval."""
 
+import json
 import os
+import shlex
+from pathlib import Path
 from typing import List, Optional
 
 import typer
@@ -9,8 +12,9 @@ from rich.table import Table
 
 from cpueval import __version__
 from cpueval.doctor import run_doctor
-from cpueval.paths import get_profiles_dir
+from cpueval.paths import get_profiles_dir, get_repo_root
 from cpueval.results import (
+    load_throughput_records,
     run_results_command,
     run_dashboard_command,
     run_dashboard_stop_command,
@@ -18,8 +22,46 @@ from cpueval.results import (
     find_latest_result,
     find_latest_embedding_result,
 )
+from cpueval.experiment_cache import (
+    DEFAULT_MAX_AGE,
+    ExperimentCache,
+    InputResolver,
+    cell_config,
+    config_key,
+    parse_max_age,
+)
+from cpueval.fleet import FleetAllocator, load_fleet
+from cpueval.matrix_scheduler import (
+    DEFAULT_LOADGEN_CORES,
+    SLOT_VARS,
+    Cell,
+    CorePool,
+    SchedulerError,
+    SerialAllocator,
+    SlotAllocator,
+    list_matrix,
+    plan_waves,
+    read_lscpu,
+    run_cells,
+)
 from cpueval.offline_batch import build_offline_batch_args
+from cpueval.profile_generator import (
+    PROFILE_LSCPU_COMMAND,
+    ProfileGenerator,
+    write_profiles,
+)
+from cpueval.run_manifest import (
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    ManifestError,
+    RunManifest,
+    list_runs,
+)
 from cpueval.runners import (
+    build_script_command,
+    ensure_executable,
     load_profile,
     merge_extra_vars,
     run_ansible,
@@ -89,6 +131,244 @@ def _result_model_hint(
     return None
 
 
+def _make_cell_allocator(options: dict, cells: List[Cell]):
+    """Allocator placing the cells of a scheduled matrix run.
+
+    Raises:
+        SchedulerError: If the topology cannot be read or a cell can never be placed
+    """
+    parallel, fleet = options["parallel"], options["fleet"]
+    dut_lscpu, loadgen_lscpu = options["dut_lscpu"], options["loadgen_lscpu"]
+    requested_tp = options["requested_tp"]
+
+    def make_slot_allocator(dut_data: str, loadgen_data: Optional[str]) -> SlotAllocator:
+        allocator = SlotAllocator(
+            CorePool(dut_data),
+            CorePool(loadgen_data) if loadgen_data else None,
+            loadgen_cores=options["loadgen_cores"],
+            requested_tp=int(requested_tp) if requested_tp else None,
+            max_slots=options["max_slots"],
+        )
+        # Fail before starting anything if a core count can never be placed
+        for cores in sorted({cell.cores for cell in cells}):
+            allocator.shape(cores)
+        return allocator
+
+    if fleet:
+        pairs = load_fleet(fleet)
+        slot_allocators = {}
+        if parallel:
+            if not dut_lscpu:
+                raise SchedulerError(
+                    "--parallel with --fleet needs --dut-lscpu (the fleet's DUTs are identical)"
+                )
+            dut_data = read_lscpu(dut_lscpu, "dut")
+            loadgen_data = read_lscpu(loadgen_lscpu, "load_generator") if loadgen_lscpu else None
+            slot_allocators = {
+                pair.name: make_slot_allocator(dut_data, loadgen_data) for pair in pairs
+            }
+        return FleetAllocator(pairs, slot_allocators)
+    if parallel:
+        return make_slot_allocator(
+            read_lscpu(dut_lscpu, "dut"),
+            read_lscpu(loadgen_lscpu, "load_generator") if loadgen_lscpu else None,
+        )
+    return SerialAllocator()
+
+
+def _run_matrix_cells(
+    suite_obj,
+    cells: List[Cell],
+    options: dict,
+    manifest: Optional[RunManifest] = None,
+    dry_run: bool = False,
+) -> int:
+    """Run (or with dry_run, plan) matrix cells, checkpointing them in a manifest."""
+    cell_vars = options["cell_vars"]
+    try:
+        allocator = _make_cell_allocator(options, cells)
+    except SchedulerError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return 1
+
+    def build_command(cell, slot) -> List[str]:
+        if cell.args:
+            # The script listed the exact arguments of this cell
+            return slot.command(build_script_command(suite_obj.target, [*cell.args]))
+        slot_vars = {
+            **{k: v for k, v in cell_vars.items() if k not in ("model", "workload")},
+            "models": cell.model,
+            "cores": cell.cores,
+            "workloads": cell.workload,
+            **slot.script_vars(),
+        }
+        return slot.command(
+            build_script_command(suite_obj.target, _build_script_args(suite_obj, slot_vars))
+        )
+
+    if dry_run:
+        waves, unplaceable = plan_waves(cells, allocator)
+        for number, wave in enumerate(waves, 1):
+            print(f"# Wave {number}: {len(wave)} cell(s)")
+            for cell, slot in wave:
+                print(f"# {cell.label} → {slot.describe()}")
+                env = " ".join(f"{k}={v}" for k, v in slot.env().items())
+                print(f"{env} {shlex.join(build_command(cell, slot))}".lstrip())
+        for cell in unplaceable:
+            print(f"# Does not fit: {cell.label}")
+        return 1 if unplaceable else 0
+
+    # Cells measured before with the same resolved configuration are reused
+    cache = ExperimentCache(parse_max_age(options.get("cache_max_age", DEFAULT_MAX_AGE)))
+    resolver = InputResolver()
+    keys = {}
+
+    def reuse(cell, slot):
+        config = cell_config(
+            suite_obj.name, cell, build_command(cell, slot)[1:], {**os.environ, **slot.env()}, resolver
+        )
+        keys[cell] = (config_key(config), config)
+        return None if options.get("force") else cache.lookup(keys[cell][0])
+
+    def on_finish(result):
+        manifest.cell_finished(result)
+        if result.returncode == 0 and result.cached is None and result.cell in keys:
+            key, config = keys[result.cell]
+            cache.store(key, config, manifest.entry(result.cell)["result_dirs"], manifest.run_id)
+
+    fleet = options["fleet"]
+    where = f"on fleet {fleet}" if fleet else ("in parallel slots" if options["parallel"] else "one at a time")
+    console.print(
+        f"[cyan]Running {len(cells)} cells {where} (run {manifest.run_id}, logs: {manifest.log_dir})[/cyan]"
+    )
+    try:
+        run_cells(
+            cells,
+            allocator,
+            build_command,
+            log_dir=manifest.log_dir,
+            cwd=get_repo_root(),
+            base_env=dict(os.environ),
+            continue_on_error=options["continue_on_error"],
+            retries=options["retries"],
+            report=console.print,
+            on_start=manifest.cell_started,
+            on_finish=on_finish,
+            reuse=reuse,
+        )
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]Interrupted. Resume with: cpueval resume {manifest.run_id}[/yellow]")
+        return 130
+
+    if isinstance(allocator, FleetAllocator) and allocator.drained:
+        console.print(
+            f"[yellow]Pairs taken out of rotation after repeated failures: "
+            f"{', '.join(allocator.drained)}[/yellow]"
+        )
+    return _report_manifest(manifest)
+
+
+def _report_manifest(manifest: RunManifest) -> int:
+    """Summarize all cells of a run; non-zero unless every cell succeeded."""
+    counts = manifest.counts()
+    reused = sum(1 for entry in manifest.entries if entry.get("reused"))
+    if reused:
+        console.print(f"\n[cyan]{reused} cell(s) reused from earlier runs (--force to measure again)[/cyan]")
+    console.print(
+        f"\nTotal cells: {len(manifest.entries)}, succeeded: {counts[SUCCEEDED]}, "
+        f"failed: {counts[FAILED]}, not run: {counts[PENDING] + counts[RUNNING]} "
+        f"(manifest: {manifest.path})"
+    )
+    for cell, entry in manifest.items():
+        if entry["status"] == SUCCEEDED:
+            continue
+        reason = entry["error"] or (
+            f"exit {entry['returncode']}, log: {entry['log']}" if entry["status"] == FAILED
+            else entry["status"]
+        )
+        console.print(f"  [red]✗ {cell.label}[/red] ({reason})")
+    if manifest.outstanding():
+        console.print(f"[yellow]Rerun failed and missing cells with: cpueval resume {manifest.run_id}[/yellow]")
+        return 1
+    return 0
+
+
+def _print_results_hint(result_dir: Optional[Path]) -> None:
+    """Point at the results of a successful run."""
+    if result_dir:
+        console.print(f"\n[green]✓ Results saved to: {result_dir}[/green]")
+        console.print("\nView results:")
+        console.print("  cpueval results --last")
+        console.print("  cpueval dashboard start\n")
+
+
+def _run_scheduled_matrix(
+    suite_obj,
+    final_vars: dict,
+    script_args: List[str],
+    parallel: bool,
+    fleet: Optional[str],
+    max_slots: Optional[int],
+    loadgen_cores: int,
+    dut_lscpu: Optional[str],
+    loadgen_lscpu: Optional[str],
+    retries: Optional[int],
+    continue_on_error: bool,
+    force: bool,
+    cache_max_age: str,
+    dry_run: bool,
+) -> int:
+    """Run a matrix script suite cell by cell: one at a time, in CPU/NUMA slots
+    and/or across a fleet, with a run manifest for `cpueval resume`."""
+    cell_vars = dict(final_vars)
+    if parallel:
+        # Each slot sets vllm_cpus, which takes precedence over vllm_cpu_start
+        replaced = (*SLOT_VARS, "vllm_cpu_start")
+        overridden = [
+            key for key in replaced
+            if key != "requested_tensor_parallel" and final_vars.get(key) not in (None, "")
+        ]
+        if overridden:
+            console.print(
+                f"[yellow]Warning: --parallel assigns CPUs per cell; ignoring {', '.join(overridden)}[/yellow]"
+            )
+        cell_vars = {key: value for key, value in final_vars.items() if key not in replaced}
+
+    if retries is None:
+        # Fleets retry a failed cell once on another pair by default
+        retries = 1 if fleet else 0
+    options = {
+        "parallel": parallel,
+        "fleet": fleet,
+        "max_slots": max_slots,
+        "loadgen_cores": loadgen_cores,
+        # Absolute, so `cpueval resume` finds them from any directory
+        "dut_lscpu": str(Path(dut_lscpu).expanduser().resolve()) if dut_lscpu else None,
+        "loadgen_lscpu": str(Path(loadgen_lscpu).expanduser().resolve()) if loadgen_lscpu else None,
+        "retries": retries,
+        "continue_on_error": continue_on_error,
+        "requested_tp": final_vars.get("requested_tensor_parallel") or None,
+        "force": force,
+        "cache_max_age": cache_max_age,
+        "cell_vars": cell_vars,
+    }
+
+    ensure_executable(suite_obj.target)
+    try:
+        cells = list_matrix(build_script_command(suite_obj.target, script_args), get_repo_root())
+    except SchedulerError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return 1
+    if not cells:
+        console.print("[red]Error: Empty benchmark matrix (0 tests)[/red]")
+        return 1
+
+    if dry_run:
+        return _run_matrix_cells(suite_obj, cells, options, dry_run=True)
+    manifest = RunManifest.create(suite_obj.name, cells, options)
+    return _run_matrix_cells(suite_obj, cells, options, manifest)
+
+
 def version_callback(value: bool):
     """Print version and exit."""
     if value:
@@ -129,6 +409,16 @@ def _execute_suite(
     ansible_arg: Optional[List[str]],
     dry_run: bool,
     skip_doctor: bool,
+    parallel: bool = False,
+    max_slots: Optional[int] = None,
+    loadgen_cores: int = DEFAULT_LOADGEN_CORES,
+    dut_lscpu: Optional[str] = None,
+    loadgen_lscpu: Optional[str] = None,
+    fleet: Optional[str] = None,
+    retries: Optional[int] = None,
+    checkpoint: bool = False,
+    force: bool = False,
+    cache_max_age: str = DEFAULT_MAX_AGE,
 ) -> None:
     registry = SuiteRegistry()
     suite_obj = registry.get_suite(suite)
@@ -146,6 +436,24 @@ def _execute_suite(
         console.print("Use --model to specify a single model.")
         raise typer.Exit(1)
 
+    if (parallel or fleet) and not suite_obj.parallel:
+        console.print(f"[red]Error: suite '{suite}' does not support --parallel/--fleet[/red]")
+        raise typer.Exit(1)
+    try:
+        parse_max_age(cache_max_age)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    if checkpoint and not suite_obj.checkpoint:
+        console.print(f"[red]Error: suite '{suite}' does not support --checkpoint[/red]")
+        raise typer.Exit(1)
+    if (parallel or fleet) and endpoint_url:
+        console.print(
+            "[red]Error: --parallel/--fleet start vLLM on the DUTs; "
+            "they cannot be used with --endpoint-url[/red]"
+        )
+        raise typer.Exit(1)
+
     # Run doctor unless skipped or dry-run
     if not skip_doctor and not dry_run:
         console.print("[cyan]Running pre-flight checks...[/cyan]")
@@ -330,12 +638,7 @@ def _execute_suite(
                 model=model, audio="audio" in suite
             )
             save_last_run_hint(suite, model, result_dir)
-
-            if result_dir:
-                console.print(f"\n[green]✓ Results saved to: {result_dir}[/green]")
-                console.print("\nView results:")
-                console.print("  cpueval results --last")
-                console.print("  cpueval dashboard start\n")
+            _print_results_hint(result_dir)
 
         raise typer.Exit(exit_code)
 
@@ -356,7 +659,25 @@ def _execute_suite(
             # Flag-based script suites (e.g. rhaiis-sweep)
             script_args = _build_script_args(suite_obj, final_vars)
 
-        exit_code = run_script(suite_obj.target, script_args, dry_run=dry_run)
+        if parallel or fleet or checkpoint:
+            exit_code = _run_scheduled_matrix(
+                suite_obj,
+                final_vars,
+                script_args,
+                parallel=parallel,
+                fleet=fleet,
+                retries=retries,
+                max_slots=max_slots,
+                loadgen_cores=loadgen_cores,
+                dut_lscpu=dut_lscpu,
+                loadgen_lscpu=loadgen_lscpu,
+                continue_on_error=bool(final_vars.get("continue_on_error")),
+                force=force,
+                cache_max_age=cache_max_age,
+                dry_run=dry_run,
+            )
+        else:
+            exit_code = run_script(suite_obj.target, script_args, dry_run=dry_run)
 
         # Save last run hint on success (skip for dry-run)
         if exit_code == 0 and not dry_run:
@@ -376,12 +697,7 @@ def _execute_suite(
                     audio="audio" in suite,
                 )
             save_last_run_hint(suite, model_hint, result_dir)
-
-            if result_dir:
-                console.print(f"\n[green]✓ Results saved to: {result_dir}[/green]")
-                console.print("\nView results:")
-                console.print("  cpueval results --last")
-                console.print("  cpueval dashboard start\n")
+            _print_results_hint(result_dir)
 
         raise typer.Exit(exit_code)
 
@@ -465,6 +781,36 @@ def main(
     ansible_arg: Optional[List[str]] = typer.Option(None, "--ansible-arg", help="Raw ansible-playbook args (repeatable)"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Print command without running"),
     skip_doctor: bool = typer.Option(False, "--skip-doctor", help="Skip pre-run health check"),
+    parallel: bool = typer.Option(
+        False, "--parallel", help="Run matrix cells concurrently in disjoint CPU/NUMA slots"
+    ),
+    max_slots: Optional[int] = typer.Option(
+        None, "--max-slots", min=1, help="Max concurrently running cells with --parallel"
+    ),
+    loadgen_cores: int = typer.Option(
+        DEFAULT_LOADGEN_CORES, "--loadgen-cores", min=1, help="GuideLLM cores per cell with --parallel"
+    ),
+    dut_lscpu: Optional[str] = typer.Option(
+        None, "--dut-lscpu", help="DUT 'lscpu -e=CPU,NODE,CORE -n' output file (default: query the dut host)"
+    ),
+    loadgen_lscpu: Optional[str] = typer.Option(
+        None, "--loadgen-lscpu", help="Load generator lscpu output file, when it is a separate host"
+    ),
+    fleet: Optional[str] = typer.Option(
+        None, "--fleet", help="Run cells across DUT/loadgen pairs: inventory group, pairs YAML, or local:N"
+    ),
+    retries: Optional[int] = typer.Option(
+        None, "--retries", min=0, help="Re-run a failed cell up to N times (default: 1 with --fleet, else 0)"
+    ),
+    checkpoint: bool = typer.Option(
+        False, "--checkpoint", help="Run matrix cells one by one with a run manifest for 'cpueval resume'"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Measure matrix cells again even if the experiment cache has them"
+    ),
+    cache_max_age: str = typer.Option(
+        DEFAULT_MAX_AGE, "--cache-max-age", help="Reuse cached cell results up to this age (e.g. 12h, 7d; 0 = never)"
+    ),
 ):
     """cpueval - Thin CLI wrapper over Ansible CPU automation.
 
@@ -509,6 +855,16 @@ def main(
         ansible_arg=ansible_arg,
         dry_run=dry_run,
         skip_doctor=skip_doctor,
+        parallel=parallel,
+        max_slots=max_slots,
+        loadgen_cores=loadgen_cores,
+        dut_lscpu=dut_lscpu,
+        loadgen_lscpu=loadgen_lscpu,
+        fleet=fleet,
+        retries=retries,
+        checkpoint=checkpoint,
+        force=force,
+        cache_max_age=cache_max_age,
     )
 
 
@@ -586,6 +942,11 @@ def show(suite_name: str = typer.Argument(..., help="Suite name")):
                 console.print("  --cores <list> to select specific core counts")
             if "workloads" in suite.defaults:
                 console.print("  --workloads <list> to select specific workloads")
+            if suite.parallel:
+                console.print("  --parallel to run cells concurrently in disjoint CPU/NUMA slots")
+                console.print("  --fleet <group|file|local:N> to spread cells over DUT/loadgen pairs")
+            if suite.checkpoint:
+                console.print("  --checkpoint to run cells one by one, resumable with 'cpueval resume'")
             if suite.args_builder == "offline_batch":
                 console.print("  --mode <mode> to select test mode (default: use-cases)")
                 console.print("  --runs <n> for use-cases / use-case-sweep iteration count")
@@ -610,9 +971,15 @@ def show(suite_name: str = typer.Argument(..., help="Suite name")):
         console.print()
 
 
-@app.command()
-def profiles():
+profiles_app = typer.Typer(help="List, generate and check CPU pinning profiles")
+app.add_typer(profiles_app, name="profiles")
+
+
+@profiles_app.callback(invoke_without_command=True)
+def profiles(ctx: typer.Context):
     """List available CPU pinning profiles."""
+    if ctx.invoked_subcommand is not None:
+        return
     profiles_dir = get_profiles_dir()
     if not profiles_dir.exists():
         console.print(
@@ -645,6 +1012,188 @@ def profiles():
     console.print()
 
 
+@profiles_app.command("generate")
+def profiles_generate(
+    lscpu: Optional[str] = typer.Option(
+        None, "--lscpu",
+        help=f"DUT '{PROFILE_LSCPU_COMMAND}' output file (default: query the dut host)",
+    ),
+    output_dir: Optional[Path] = typer.Option(
+        None, "--output-dir", "-o", help="Where to write the profiles (default: the profiles directory)"
+    ),
+    prefix: str = typer.Option("", "--prefix", help="Profile name prefix, e.g. the SKU ('epyc9654-')"),
+    loadgen_cores: int = typer.Option(
+        DEFAULT_LOADGEN_CORES, "--loadgen-cores",
+        help="GuideLLM cores when it shares a node with vLLM or the OS",
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Print the profiles instead of writing them"),
+    force: bool = typer.Option(False, "--force", help="Overwrite existing profiles"),
+):
+    """Generate CPU pinning profiles from the DUT's lscpu topology."""
+    try:
+        generator = ProfileGenerator(
+            read_lscpu(lscpu, "dut", PROFILE_LSCPU_COMMAND), loadgen_cores, prefix
+        )
+        generated = generator.generate()
+    except SchedulerError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    source = f"lscpu of {Path(lscpu).name}" if lscpu else "lscpu of the dut host"
+    console.print(f"[dim]Topology:[/dim] {generator.summary()}")
+    if not generated:
+        console.print("[yellow]No profile layout fits this topology.[/yellow]")
+        raise typer.Exit(1)
+
+    if dry_run:
+        for profile in generated:
+            console.print()
+            console.print(profile.to_yaml(source).rstrip("\n"), markup=False, highlight=False)
+        return
+
+    written = write_profiles(generated, output_dir or get_profiles_dir(), source, force)
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Name", style="cyan")
+    table.add_column("Use case")
+    table.add_column("Path", style="dim")
+    for profile in generated:
+        path = written[profile.name]
+        table.add_row(
+            profile.name, profile.use_case,
+            str(path) if path else "[yellow]exists, kept (use --force)[/yellow]",
+        )
+    console.print()
+    console.print(table)
+    console.print()
+    console.print(
+        "[dim]Use with:[/dim] cpueval --suite <suite> --profile <name>"
+    )
+    console.print()
+
+
+@profiles_app.command("check")
+def profiles_check(
+    profile: str = typer.Argument(..., help="Profile name or path"),
+    cores: int = typer.Option(..., "--cores", "-c", help="vLLM core count the profile is run with"),
+    lscpu: Optional[str] = typer.Option(
+        None, "--lscpu",
+        help=f"DUT '{PROFILE_LSCPU_COMMAND}' output file (default: query the dut host)",
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Print the cpuset plan as JSON"),
+):
+    """Check a profile for CPU overlaps, shared SMT cores and remote memory."""
+    try:
+        profile_vars = load_profile(profile, get_profiles_dir())
+    except (FileNotFoundError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    try:
+        generator = ProfileGenerator(read_lscpu(lscpu, "dut", PROFILE_LSCPU_COMMAND))
+        plan = generator.plan(profile_vars, cores)
+    except SchedulerError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    if json_output:
+        print(json.dumps(plan, indent=2))
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Role", style="cyan")
+    table.add_column("CPUs")
+    table.add_column("Mems")
+    table.add_column("Physical cores", justify="right")
+    for placement in plan["placements"]:
+        table.add_row(
+            placement["role"], placement["cpuset_cpus"], placement["cpuset_mems"],
+            str(placement["physical_cores"]),
+        )
+    console.print(f"[dim]Topology:[/dim] {generator.summary()}")
+    console.print()
+    console.print(table)
+    free = ", ".join(f"node {node}: {cpus or '-'}" for node, cpus in plan["free"].items())
+    console.print(f"[dim]Free cores:[/dim] {free}")
+    console.print(f"[green]✓[/green] No shared cores in profile {profile} at {cores} cores")
+
+
+@app.command()
+def allocations(
+    cores: int = typer.Option(..., "--cores", "-c", help="vLLM core count"),
+    lscpu: Optional[str] = typer.Option(
+        None, "--lscpu",
+        help=f"DUT '{PROFILE_LSCPU_COMMAND}' output file (default: query the dut host)",
+    ),
+    top: int = typer.Option(5, "--top", "-k", help="Number of allocations to show"),
+    tensor_parallel: Optional[int] = typer.Option(None, "--tensor-parallel", "--tp", help="Only this TP"),
+    model_memory: Optional[str] = typer.Option(
+        None, "--model-memory",
+        help="Model weight size (e.g. 16GiB); ranks must fit node-local memory where the topology lists it",
+    ),
+    kv_cache: Optional[str] = typer.Option(None, "--kv-cache", help="KV cache space per rank (e.g. 11GiB)"),
+    fit_results: bool = typer.Option(
+        False, "--fit-results", help="Scale costs by a throughput model fitted from past results"
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Print the allocations as JSON"),
+):
+    """Rank every TP / NUMA node allocation of --cores with the cost model."""
+    try:
+        generator = ProfileGenerator(read_lscpu(lscpu, "dut", PROFILE_LSCPU_COMMAND))
+        found = generator.search(
+            cores, top, tensor_parallel, model_memory, kv_cache,
+            load_throughput_records() if fit_results else None,
+        )
+    except SchedulerError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    if json_output:
+        print(json.dumps(found, indent=2))
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Rank", justify="right")
+    table.add_column("TP", justify="right")
+    table.add_column("Nodes", style="cyan")
+    table.add_column("Cores/node", justify="right")
+    table.add_column("CPUs")
+    table.add_column("Cost", justify="right")
+    table.add_column("Memory", justify="right")
+    table.add_column("Cross-node", justify="right")
+    table.add_column("Housekeeping", justify="right")
+    for allocation in found["allocations"]:
+        cost = allocation["cost"]
+        table.add_row(
+            str(allocation["rank"]) + (" *" if allocation["greedy"] else ""),
+            str(allocation["tensor_parallel"]),
+            ",".join(str(node) for node in allocation["allocated_nodes"]),
+            str(allocation["cores_per_node"][0]),
+            allocation["cpuset_cpus"],
+            f"{cost['total']:.3f}",
+            f"{cost['memory']:.3f}",
+            f"{cost['cross_node']:.3f}",
+            f"{cost['housekeeping']:.3f}",
+        )
+    console.print(f"[dim]Topology:[/dim] {generator.summary()}")
+    model = found["throughput_model"]
+    if model:
+        console.print(
+            f"[dim]Throughput model:[/dim] tok/s ~ cores^{model['cores_exponent']} x TP^{model['tp_exponent']}"
+            f" ({model['samples']} runs, {model['groups']} model/workload/platform groups)"
+        )
+    console.print()
+    console.print(table)
+    console.print("[dim]* the allocation the playbooks pick without vllm_allocation_search[/dim]")
+    unchecked = [a for a in found["allocations"] if a["memory"] and not a["memory"]["checked"]]
+    if unchecked:
+        console.print(
+            "[yellow]Warning: memory fit not checked: the topology has no free memory per NUMA node, "
+            f"so {len(unchecked)} of {len(found['allocations'])} allocations are ranked as if "
+            "--model-memory fits[/yellow]"
+        )
+    console.print()
+
+
 @app.command()
 def doctor(
     no_ping: bool = typer.Option(False, "--no-ping", help="Skip host connectivity check"),
@@ -721,6 +1270,36 @@ def run(
     ansible_arg: Optional[List[str]] = typer.Option(None, "--ansible-arg", help="Raw ansible-playbook args (repeatable)"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Print command without running"),
     skip_doctor: bool = typer.Option(False, "--skip-doctor", help="Skip pre-run health check"),
+    parallel: bool = typer.Option(
+        False, "--parallel", help="Run matrix cells concurrently in disjoint CPU/NUMA slots"
+    ),
+    max_slots: Optional[int] = typer.Option(
+        None, "--max-slots", min=1, help="Max concurrently running cells with --parallel"
+    ),
+    loadgen_cores: int = typer.Option(
+        DEFAULT_LOADGEN_CORES, "--loadgen-cores", min=1, help="GuideLLM cores per cell with --parallel"
+    ),
+    dut_lscpu: Optional[str] = typer.Option(
+        None, "--dut-lscpu", help="DUT 'lscpu -e=CPU,NODE,CORE -n' output file (default: query the dut host)"
+    ),
+    loadgen_lscpu: Optional[str] = typer.Option(
+        None, "--loadgen-lscpu", help="Load generator lscpu output file, when it is a separate host"
+    ),
+    fleet: Optional[str] = typer.Option(
+        None, "--fleet", help="Run cells across DUT/loadgen pairs: inventory group, pairs YAML, or local:N"
+    ),
+    retries: Optional[int] = typer.Option(
+        None, "--retries", min=0, help="Re-run a failed cell up to N times (default: 1 with --fleet, else 0)"
+    ),
+    checkpoint: bool = typer.Option(
+        False, "--checkpoint", help="Run matrix cells one by one with a run manifest for 'cpueval resume'"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Measure matrix cells again even if the experiment cache has them"
+    ),
+    cache_max_age: str = typer.Option(
+        DEFAULT_MAX_AGE, "--cache-max-age", help="Reuse cached cell results up to this age (e.g. 12h, 7d; 0 = never)"
+    ),
 ):
     """Run a test suite (alias; prefer: cpueval --suite …)."""
     _execute_suite(
@@ -756,9 +1335,95 @@ def run(
         ansible_arg=ansible_arg,
         dry_run=dry_run,
         skip_doctor=skip_doctor,
+        parallel=parallel,
+        max_slots=max_slots,
+        loadgen_cores=loadgen_cores,
+        dut_lscpu=dut_lscpu,
+        loadgen_lscpu=loadgen_lscpu,
+        fleet=fleet,
+        retries=retries,
+        checkpoint=checkpoint,
+        force=force,
+        cache_max_age=cache_max_age,
     )
 
 
+@app.command()
+def resume(
+    run_id: Optional[str] = typer.Argument(None, help="Run ID (omit to list checkpointed runs)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Print the cells to rerun without running"),
+    skip_doctor: bool = typer.Option(False, "--skip-doctor", help="Skip pre-run health check"),
+):
+    """Rerun the failed or missing cells of a checkpointed matrix run."""
+    if run_id is None:
+        runs = list_runs()
+        if not runs:
+            console.print("[yellow]No checkpointed runs (use --checkpoint, --parallel or --fleet)[/yellow]")
+            return
+        table = Table(title="Checkpointed Runs")
+        table.add_column("Run ID", style="cyan", no_wrap=True)
+        table.add_column("Suite")
+        table.add_column("Cells", justify="right")
+        table.add_column("Succeeded", justify="right", style="green")
+        table.add_column("Failed", justify="right", style="red")
+        table.add_column("Not run", justify="right", style="yellow")
+        for manifest in runs:
+            counts = manifest.counts()
+            table.add_row(
+                manifest.run_id,
+                manifest.suite,
+                str(len(manifest.entries)),
+                str(counts[SUCCEEDED]),
+                str(counts[FAILED]),
+                str(counts[PENDING] + counts[RUNNING]),
+            )
+        console.print(table)
+        return
+
+    try:
+        manifest = RunManifest.load(run_id)
+    except ManifestError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        console.print("\nRun 'cpueval resume' to list checkpointed runs.")
+        raise typer.Exit(1)
+    suite_obj = SuiteRegistry().get_suite(manifest.suite)
+    if not suite_obj:
+        console.print(f"[red]Suite not found: {manifest.suite}[/red]")
+        raise typer.Exit(1)
+
+    cells = manifest.outstanding()
+    if not cells:
+        console.print(f"[green]All cells of run {run_id} succeeded; nothing to resume.[/green]")
+        raise typer.Exit(_report_manifest(manifest))
+    console.print(
+        f"[cyan]Resuming run {run_id}: {len(cells)} of {len(manifest.entries)} cells to run[/cyan]"
+    )
+
+    if not skip_doctor and not dry_run:
+        console.print("[cyan]Running pre-flight checks...[/cyan]")
+        doctor_exit = run_doctor(no_ping=True)
+        if doctor_exit != 0:
+            console.print("\n[yellow]Warning: Some health checks failed. Use --skip-doctor to bypass.[/yellow]")
+            raise typer.Exit(doctor_exit)
+        console.print()
+
+    exit_code = _run_matrix_cells(suite_obj, cells, manifest.options, manifest, dry_run=dry_run)
+
+    # Same last-run hint as an uninterrupted run
+    if exit_code == 0 and not dry_run:
+        cell_vars = manifest.options["cell_vars"]
+        result_dirs = [path for path in manifest.result_dirs() if path.is_dir()]
+        result_dir = max(result_dirs, key=lambda p: p.stat().st_mtime) if result_dirs else None
+        save_last_run_hint(
+            manifest.suite,
+            cell_vars.get("models") or cell_vars.get("mode") or manifest.suite,
+            result_dir,
+        )
+        _print_results_hint(result_dir)
+
+    raise typer.Exit(exit_code)
+
+
 @app.command()
 def results(
     path: Optional[str] = typer.Argument(None, help="Specific result path"),
@@ -0,0 +1,225 @@
+"""Content-addressed cache of measured matrix cells.
+
+Before a cell of a cell-by-cell run (--checkpoint, --parallel, --fleet)
+starts, its fully resolved configuration is hashed:
+
+- the suite and the exact suite script arguments of the cell, i.e. the
+  vars after merge_extra_vars() plus the slot's cpuset, NUMA node and
+  tensor parallelism (sequential cells are allocated by the playbook, which
+  is deterministic for a DUT and core count)
+- the DUT/loadgen hosts and the environment overrides the scripts and
+  inventory read (ENV_INPUTS)
+- the vLLM and GuideLLM container images, pinned to their digests when
+  skopeo can resolve them
+- the model revision: the Hub's current commit of the model, when
+  huggingface_hub is installed
+
+A cell whose key was measured within the max age (DEFAULT_MAX_AGE), and
+whose result directories still exist, is not run again: the run manifest
+links the prior result instead. --force measures anyway and refreshes the
+entry. Entries live in results/.cpueval-cache/<key[:2]>/<key>.json.
+
+Inputs that cannot be resolved (no skopeo, no Hub access) are hashed as
+given, e.g. an image tag; the max age bounds how long such a key is trusted.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from cpueval.matrix_scheduler import Cell
+from cpueval.paths import get_ansible_dir, get_results_dir
+
+CACHE_DIRNAME = ".cpueval-cache"
+
+# Bump when the key inputs change; older entries are then never matched
+CACHE_VERSION = 1
+
+DEFAULT_MAX_AGE = "7d"
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+# Environment read by the suite scripts and inventory that changes what is measured
+ENV_INPUTS = (
+    "DUT_HOSTNAME",
+    "LOADGEN_HOSTNAME",
+    "VLLM_CONTAINER_IMAGE",
+    "VLLM_CONTAINER_ENTRYPOINT",
+    "GUIDELLM_CONTAINER_IMAGE",
+    "VLLM_NUMA_NODE",
+    "VLLM_NUMA_NODES",
+    "VLLM_ENDPOINT_MODE",
+    "VLLM_ENDPOINT_URL",
+)
+
+# Container images of a cell: env var and the group_vars file holding its default
+IMAGES = {
+    "vllm": ("VLLM_CONTAINER_IMAGE", "infrastructure.yml"),
+    "guidellm": ("GUIDELLM_CONTAINER_IMAGE", "benchmark-tools.yml"),
+}
+
+RESOLVE_TIMEOUT = 60
+
+
+def parse_max_age(text: str) -> float:
+    """Seconds of a max age such as 90m, 12h, 7d or 2w (plain numbers are seconds).
+
+    Raises:
+        ValueError: If the value is not a non-negative duration
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", text or "")
+    if not match:
+        raise ValueError(f"Invalid max age '{text}' (expected e.g. 12h, 7d, 2w)")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2) or "s"]
+
+
+def _default_image(env_var: str, group_vars_file: str) -> Optional[str]:
+    """Default image of a `lookup('env', VAR) | default('...')` group_vars line."""
+    path = get_ansible_dir() / "inventory" / "group_vars" / "all" / group_vars_file
+    try:
+        text = path.read_text()
+    except OSError:
+        return None
+    match = re.search(
+        rf"lookup\('env',\s*'{env_var}'\)\s*\|\s*default\('([^']+)'", text
+    )
+    return match.group(1) if match else None
+
+
+class InputResolver:
+    """Pins the mutable inputs of a configuration (image tags, model names)."""
+
+    def __init__(self):
+        self._digests: Dict[str, Optional[str]] = {}
+        self._revisions: Dict[str, Optional[str]] = {}
+
+    def image_digest(self, ref: str) -> Optional[str]:
+        """sha256 digest of an image reference, or None if it cannot be resolved."""
+        if "@sha256:" in ref:
+            return ref.split("@", 1)[1]
+        if ref not in self._digests:
+            digest = None
+            if shutil.which("skopeo"):
+                try:
+                    result = subprocess.run(
+                        ["skopeo", "inspect", "--format", "{{.Digest}}", f"docker://{ref}"],
+                        capture_output=True, text=True, timeout=RESOLVE_TIMEOUT,
+                    )
+                    if result.returncode == 0 and result.stdout.strip().startswith("sha256:"):
+                        digest = result.stdout.strip()
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._digests[ref] = digest
+        return self._digests[ref]
+
+    def revision(self, model: str) -> Optional[str]:
+        """Commit of a model on the Hub, or None if it cannot be resolved."""
+        if model not in self._revisions:
+            revision = None
+            try:
+                from huggingface_hub import model_info
+
+                revision = model_info(model, token=os.environ.get("HF_TOKEN") or None).sha
+            except Exception:
+                pass
+            self._revisions[model] = revision
+        return self._revisions[model]
+
+
+def cell_config(
+    suite: str,
+    cell: Cell,
+    args: Sequence[str],
+    env: Mapping[str, str],
+    resolver: InputResolver,
+) -> Dict[str, Any]:
+    """Fully resolved configuration of a cell, the input of its cache key.
+
+    Args:
+        suite: Suite name
+        cell: The cell
+        args: Suite script arguments that run the cell (without the script path)
+        env: Environment the cell runs with
+        resolver: Pins image tags and model revisions
+    """
+    images = {}
+    for name, (env_var, group_vars_file) in IMAGES.items():
+        ref = env.get(env_var) or _default_image(env_var, group_vars_file)
+        images[name] = {"ref": ref, "digest": resolver.image_digest(ref) if ref else None}
+    return {
+        "version": CACHE_VERSION,
+        "suite": suite,
+        "model": cell.model,
+        "model_revision": resolver.revision(cell.model),
+        "cores": cell.cores,
+        "workload": cell.workload,
+        "repeat": cell.repeat,
+        "args": list(args),
+        "env": {key: env[key] for key in ENV_INPUTS if env.get(key)},
+        "images": images,
+    }
+
+
+def config_key(config: Dict[str, Any]) -> str:
+    """sha256 of a configuration's canonical JSON."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ExperimentCache:
+    """Measured cell configurations, by key."""
+
+    def __init__(self, max_age: float, root: Optional[Path] = None):
+        """
+        Args:
+            max_age: Seconds after which an entry is no longer reused
+            root: Cache directory (default: results/.cpueval-cache)
+        """
+        self.max_age = max_age
+        self.root = root or get_results_dir() / CACHE_DIRNAME
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """The entry of a key if it is recent enough and its results still exist."""
+        try:
+            with open(self.path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("measured", 0) > self.max_age:
+            return None
+        result_dirs = entry.get("result_dirs") or []
+        if not result_dirs or not all(Path(path).is_dir() for path in result_dirs):
+            return None
+        return entry
+
+    def store(
+        self,
+        key: str,
+        config: Dict[str, Any],
+        result_dirs: List[str],
+        run_id: Optional[str] = None,
+    ) -> Optional[Path]:
+        """Record a measured configuration (skipped when it left no results)."""
+        if not result_dirs:
+            return None
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        staging.write_text(json.dumps({
+            "key": key,
+            "measured": time.time(),
+            "run_id": run_id,
+            "result_dirs": result_dirs,
+            "config": config,
+        }, indent=2) + "\n")
+        staging.replace(path)
+        return path
@@ -0,0 +1,207 @@
+"""Fleet mode: distribute matrix cells across DUT/loadgen host pairs.
+
+A fleet is a list of identical DUT/loadgen pairs. Cells are handed out from
+one work queue to whichever pair is idle (with --parallel, to whichever
+pair has a free CPU/NUMA slot). A cell runs the suite script with
+DUT_HOSTNAME/LOADGEN_HOSTNAME pointing at its pair, so the inventory and
+playbooks are unchanged and results are fetched into the usual results/
+layout of the controller.
+
+A fleet is given as:
+
+- an inventory group: each host is a DUT; its `loadgen_host` var names the
+  load generator (default: the DUT itself)
+
+      fleet:
+        hosts:
+          rack1-01: {ansible_host: 10.0.0.11, loadgen_host: 10.0.0.111}
+          rack1-02: {ansible_host: 10.0.0.12, loadgen_host: 10.0.0.112}
+
+- a YAML file with a `pairs` list of {name, dut, loadgen} entries
+- `local:N`: N stand-in pairs that run the suite script locally with
+  --dry-run, to exercise the scheduler without SSH
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import yaml
+
+from cpueval.matrix_scheduler import Cell, SchedulerError, Slot, SlotAllocator
+from cpueval.runners import read_inventory
+
+LOCAL_PREFIX = "local:"
+
+# A pair that fails this many cells in a row is taken out of rotation
+MAX_CONSECUTIVE_FAILURES = 2
+
+
+@dataclass(frozen=True)
+class HostPair:
+    """One DUT and the load generator that drives it."""
+
+    name: str
+    dut: str
+    loadgen: str
+    local: bool = False
+
+
+def _group_hosts(inventory: Dict[str, Any], group: str) -> List[str]:
+    """Hosts of an inventory group, including its child groups."""
+    if group not in inventory:
+        raise SchedulerError(f"Inventory group not found: {group}")
+    hosts = list(inventory[group].get("hosts", []))
+    for child in inventory[group].get("children", []):
+        hosts.extend(h for h in _group_hosts(inventory, child) if h not in hosts)
+    return hosts
+
+
+def pairs_from_inventory(inventory: Dict[str, Any], group: str) -> List[HostPair]:
+    """Host pairs of an inventory group (`ansible-inventory --list` output)."""
+    hostvars = inventory.get("_meta", {}).get("hostvars", {})
+    pairs = []
+    for host in _group_hosts(inventory, group):
+        host_vars = hostvars.get(host, {})
+        dut = str(host_vars.get("ansible_host", host))
+        pairs.append(HostPair(host, dut, str(host_vars.get("loadgen_host", dut))))
+    return pairs
+
+
+def pairs_from_file(path: Path) -> List[HostPair]:
+    """Host pairs of a YAML file with a `pairs` list."""
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise SchedulerError(f"Invalid fleet YAML {path}: {e}")
+    entries = data.get("pairs") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise SchedulerError(f"Fleet file {path} must contain a 'pairs' list")
+
+    pairs = []
+    for number, entry in enumerate(entries):
+        if not isinstance(entry, dict) or "dut" not in entry:
+            raise SchedulerError(f"Fleet file {path}: pair {number} needs a 'dut' host")
+        dut = str(entry["dut"])
+        pairs.append(HostPair(
+            str(entry.get("name", dut)), dut, str(entry.get("loadgen", dut))
+        ))
+    return pairs
+
+
+def load_fleet(spec: str) -> List[HostPair]:
+    """Host pairs of a --fleet value: local:N, a YAML file or an inventory group.
+
+    Raises:
+        SchedulerError: If the fleet is empty or cannot be read
+    """
+    if spec.startswith(LOCAL_PREFIX):
+        try:
+            count = int(spec[len(LOCAL_PREFIX):])
+        except ValueError:
+            count = 0
+        if count <= 0:
+            raise SchedulerError(f"Invalid local fleet '{spec}' (expected local:N, N > 0)")
+        pairs = [
+            HostPair(f"local-{i}", "localhost", "localhost", local=True) for i in range(count)
+        ]
+    elif Path(spec).expanduser().is_file():
+        pairs = pairs_from_file(Path(spec).expanduser())
+    else:
+        try:
+            inventory = read_inventory()
+        except (OSError, RuntimeError, ValueError) as e:
+            raise SchedulerError(f"Cannot read inventory for fleet group '{spec}': {e}")
+        pairs = pairs_from_inventory(inventory, spec)
+
+    if not pairs:
+        raise SchedulerError(f"Fleet '{spec}' has no host pairs")
+    names = [pair.name for pair in pairs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise SchedulerError(f"Duplicate fleet pair names: {', '.join(duplicates)}")
+    return pairs
+
+
+@dataclass
+class FleetSlot:
+    """A cell's place in the fleet: a host pair, and a CPU slot with --parallel."""
+
+    index: int
+    pair: HostPair
+    slot: Optional[Slot] = None
+
+    def script_vars(self) -> Dict[str, object]:
+        return self.slot.script_vars() if self.slot else {}
+
+    def env(self) -> Dict[str, str]:
+        env = {"DUT_HOSTNAME": self.pair.dut, "LOADGEN_HOSTNAME": self.pair.loadgen}
+        if self.slot:
+            env.update(self.slot.env())
+        return env
+
+    def command(self, cmd: List[str]) -> List[str]:
+        # Stand-in pairs only walk through the suite script
+        return cmd + ["--dry-run"] if self.pair.local else cmd
+
+    def describe(self) -> str:
+        text = f"{self.pair.name} (DUT {self.pair.dut}, loadgen {self.pair.loadgen})"
+        return f"{text}, {self.slot.describe()}" if self.slot else text
+
+
+class FleetAllocator:
+    """Work-queue allocator over host pairs, with the SlotAllocator interface."""
+
+    def __init__(
+        self,
+        pairs: Sequence[HostPair],
+        slot_allocators: Optional[Dict[str, SlotAllocator]] = None,
+    ):
+        """
+        Args:
+            pairs: Host pairs of the fleet
+            slot_allocators: Per pair name, packs several cells onto the pair
+                (--parallel); without it a pair runs one cell at a time
+        """
+        self.pairs = list(pairs)
+        self.slot_allocators = slot_allocators or {}
+        self._active: Dict[int, FleetSlot] = {}
+        self._failures: Dict[str, int] = {pair.name: 0 for pair in self.pairs}
+        self.drained: List[str] = []
+
+    def _load(self, pair: HostPair) -> int:
+        return sum(1 for slot in self._active.values() if slot.pair.name == pair.name)
+
+    def acquire(self, cell: Cell, avoid: Sequence[FleetSlot] = ()) -> Optional[FleetSlot]:
+        """Place a cell on the least busy pair it has not failed on, or None."""
+        avoided = {slot.pair.name for slot in avoid}
+        candidates = [
+            pair for pair in self.pairs
+            if pair.name not in avoided and pair.name not in self.drained
+        ]
+        for pair in sorted(candidates, key=self._load):
+            allocator = self.slot_allocators.get(pair.name)
+            if allocator is not None:
+                inner = allocator.acquire(cell)
+                if inner is None:
+                    continue
+            elif self._load(pair):
+                continue
+            else:
+                inner = None
+            index = next(i for i in range(len(self._active) + 1) if i not in self._active)
+            slot = FleetSlot(index, pair, inner)
+            self._active[index] = slot
+            return slot
+        return None
+
+    def release(self, slot: FleetSlot, failed: bool = False) -> None:
+        """Free a slot; drain pairs that keep failing."""
+        self._active.pop(slot.index, None)
+        if slot.slot is not None:
+            self.slot_allocators[slot.pair.name].release(slot.slot, failed=failed)
+        name = slot.pair.name
+        self._failures[name] = self._failures[name] + 1 if failed else 0
+        if self._failures[name] >= MAX_CONSECUTIVE_FAILURES and name not in self.drained:
+            self.drained.append(name)
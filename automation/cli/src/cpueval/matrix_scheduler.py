@@ -0,0 +1,638 @@
+"""Parallel execution of matrix suite cells in disjoint CPU/NUMA slots.
+
+A matrix suite (e.g. concurrent-load) runs one (model, cores, workload)
+cell at a time, so a 16-core cell leaves most of a large DUT idle. The
+scheduler packs independent cells into slots instead: each slot gets its
+own vLLM cpuset on the DUT, its own load generator cores, port and
+container name, and no two running slots share a physical core.
+
+Slot placement reproduces the allocation a sequential run would get:
+allocate_cores_multi_numa() (the Ansible filter behind
+allocate-cores-from-count.yml) is evaluated on the full DUT topology to
+fix the tensor parallelism and cores per node of a cell, and the slot then
+looks for that shape among the free cores:
+
+- TP=1 cells take any free physical cores of a single NUMA node (best fit,
+  so large nodes stay available for large cells)
+- TP>1 cells take the first cores of each node, exactly as the playbook
+  derives its OMP binding from the node list in vllm_numa_nodes
+
+The housekeeping node (node 0 on systems with 3+ NUMA nodes) is never given
+to vLLM. Load generator cores come from a separate pool when the load
+generator topology is known, else from the DUT pool (preferring the
+housekeeping node and nodes the slot's vLLM does not use).
+"""
+
+import shlex
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from cpueval.paths import load_filter_plugin
+from cpueval.runners import run_ansible_adhoc
+
+DEFAULT_LOADGEN_CORES = 4
+
+# Slot i serves vLLM on SLOT_BASE_PORT + i (clear of the default 8000)
+SLOT_BASE_PORT = 8100
+
+LSCPU_COMMAND = "lscpu -e=CPU,NODE,CORE -n"
+
+# CellResult.error of cells left in the queue after a failure
+NOT_STARTED = "not started"
+
+# Vars set per slot; user-provided values for these are ignored in parallel mode
+SLOT_VARS = (
+    "vllm_cpus",
+    "vllm_numa_node",
+    "guidellm_cpus",
+    "guidellm_numa_node",
+    "requested_tensor_parallel",
+)
+
+
+class SchedulerError(Exception):
+    """Raised when the matrix cannot be scheduled."""
+
+
+def _cpu_utils():
+    cpu_utils = load_filter_plugin("cpu_utils")
+    if cpu_utils is None:
+        raise SchedulerError(
+            "Ansible filter plugin cpu_utils not found; --parallel needs the repository checkout"
+        )
+    return cpu_utils
+
+
+@dataclass(frozen=True)
+class Cell:
+    """One (model, cores, workload) combination of a matrix suite.
+
+    repeat numbers identical cells (e.g. offline-batch runs of a use case);
+    args, when set, are the exact suite script arguments that run the cell.
+    """
+
+    model: str
+    cores: int
+    workload: str
+    repeat: int = 1
+    args: Tuple[str, ...] = ()
+
+    @property
+    def label(self) -> str:
+        label = f"{self.model} | {self.workload} | {self.cores} cores"
+        return f"{label} | run {self.repeat}" if self.repeat > 1 else label
+
+    @property
+    def slug(self) -> str:
+        """File-name safe identifier."""
+        slug = f"{self.model.replace('/', '__')}-{self.workload}-{self.cores}c"
+        return f"{slug}-r{self.repeat}" if self.repeat > 1 else slug
+
+
+@dataclass
+class Slot:
+    """CPU, NUMA, port and container assignment of one running cell."""
+
+    index: int
+    vllm_cpus: List[int]
+    vllm_nodes: List[int]
+    tensor_parallel: int
+    loadgen_cpus: List[int]
+    loadgen_node: int
+
+    @property
+    def port(self) -> int:
+        return SLOT_BASE_PORT + self.index
+
+    @property
+    def container_name(self) -> str:
+        return f"vllm-slot{self.index}"
+
+    def script_vars(self) -> Dict[str, object]:
+        """Suite vars (see SLOT_VARS) pinning the cell to this slot.
+
+        vllm_numa_node is the slot's node when it has one; multi-node slots
+        leave it unset and select their nodes with VLLM_NUMA_NODES.
+        """
+        cpu_utils = _cpu_utils()
+        return {
+            "vllm_cpus": cpu_utils.cpu_list_to_range(self.vllm_cpus),
+            "vllm_numa_node": self.vllm_nodes[0] if len(self.vllm_nodes) == 1 else None,
+            "guidellm_cpus": cpu_utils.cpu_list_to_range(self.loadgen_cpus),
+            "guidellm_numa_node": self.loadgen_node,
+            "requested_tensor_parallel": self.tensor_parallel,
+        }
+
+    def env(self) -> Dict[str, str]:
+        """Environment overrides read by the suite script (parallel instances)."""
+        return {
+            "VLLM_PORT": str(self.port),
+            "VLLM_CONTAINER_NAME": self.container_name,
+            "VLLM_NUMA_NODES": ",".join(str(n) for n in self.vllm_nodes),
+        }
+
+    def command(self, cmd: List[str]) -> List[str]:
+        """The cell command to run in this slot."""
+        return cmd
+
+    def describe(self) -> str:
+        cpu_utils = _cpu_utils()
+        return (
+            f"slot {self.index}: vLLM cpus {cpu_utils.cpu_list_to_range(self.vllm_cpus)} "
+            f"(nodes {','.join(str(n) for n in self.vllm_nodes)}, TP={self.tensor_parallel}), "
+            f"loadgen cpus {cpu_utils.cpu_list_to_range(self.loadgen_cpus)} "
+            f"(node {self.loadgen_node}), port {self.port}"
+        )
+
+
+class CorePool:
+    """Free physical cores of one host, per NUMA node."""
+
+    def __init__(self, lscpu_data: str):
+        """Build the pool from `lscpu -e=CPU,NODE,CORE -n` output.
+
+        Raises:
+            SchedulerError: If the output cannot be parsed or is empty
+        """
+        cpu_utils = _cpu_utils()
+        try:
+            parser = cpu_utils.LscpuParser(lscpu_data)
+        except cpu_utils.LscpuParseError as e:
+            raise SchedulerError(f"Invalid lscpu output: {e}")
+        if parser.is_empty():
+            raise SchedulerError("Empty lscpu output")
+
+        # Physical cores only (first thread of each core), as the playbooks pin
+        self.node_cpus: Dict[int, List[int]] = {
+            node: parser.get_primary_cpus(node) for node in parser.get_numa_nodes()
+        }
+        self.free: Dict[int, set] = {node: set(cpus) for node, cpus in self.node_cpus.items()}
+        # Same policy as detect-numa-topology.yml / allocate_cores_multi_numa
+        nodes = sorted(self.node_cpus)
+        self.housekeeping_node: Optional[int] = (
+            (0 if 0 in self.node_cpus else nodes[0]) if len(nodes) >= 3 else None
+        )
+
+    @property
+    def vllm_nodes(self) -> List[int]:
+        """Nodes that may host vLLM (all but the housekeeping node)."""
+        return [n for n in sorted(self.node_cpus) if n != self.housekeeping_node]
+
+    def topology(self) -> Dict[str, object]:
+        """numa_topology as built by detect-numa-topology.yml."""
+        cpu_utils = _cpu_utils()
+        return {
+            "nodes": [
+                {
+                    "id": node,
+                    "physical_cores": len(cpus),
+                    "physical_cpus": cpu_utils.cpu_list_to_range(cpus),
+                    "physical_cpus_list": ",".join(str(c) for c in cpus),
+                }
+                for node, cpus in sorted(self.node_cpus.items())
+            ],
+            "allocation_policy": {
+                "housekeeping": {
+                    "strategy": "reserve_node" if self.housekeeping_node is not None
+                    else "minimal_reservation",
+                    "reserved_node": self.housekeeping_node or 0,
+                }
+            },
+        }
+
+    def take(self, node: int, cpus: Sequence[int]) -> None:
+        self.free[node].difference_update(cpus)
+
+    def release(self, node: int, cpus: Sequence[int]) -> None:
+        self.free[node].update(cpus)
+
+
+class SlotAllocator:
+    """Hands out disjoint slots for cells and takes them back."""
+
+    def __init__(
+        self,
+        dut: CorePool,
+        loadgen: Optional[CorePool] = None,
+        loadgen_cores: int = DEFAULT_LOADGEN_CORES,
+        requested_tp: Optional[int] = None,
+        max_slots: Optional[int] = None,
+    ):
+        """
+        Args:
+            dut: Core pool of the DUT
+            loadgen: Core pool of the load generator host; None when it is
+                the DUT itself (load generator cores then come from the DUT)
+            loadgen_cores: Physical cores per load generator
+            requested_tp: Tensor parallelism override (--tensor-parallel)
+            max_slots: Upper bound on concurrently running slots
+        """
+        if loadgen_cores <= 0:
+            raise SchedulerError(f"loadgen_cores must be positive, got {loadgen_cores}")
+        self.dut = dut
+        self.loadgen = loadgen
+        self.loadgen_cores = loadgen_cores
+        self.requested_tp = requested_tp
+        self.max_slots = max_slots
+        self._active: Dict[int, Slot] = {}
+        self._shapes: Dict[int, Tuple[int, int]] = {}
+
+    @property
+    def active(self) -> List[Slot]:
+        return list(self._active.values())
+
+    def shape(self, cores: int) -> Tuple[int, int]:
+        """(tensor_parallel, cores_per_node) of a sequential run with this many cores.
+
+        Raises:
+            SchedulerError: If the DUT cannot host that many cores at all
+        """
+        if cores not in self._shapes:
+            cpu_utils = _cpu_utils()
+            try:
+                allocation = cpu_utils.allocate_cores_multi_numa(
+                    self.dut.topology(), cores, self.requested_tp
+                )
+            except cpu_utils.AnsibleFilterError as e:
+                raise SchedulerError(f"Cannot allocate {cores} cores on the DUT: {e}")
+            self._shapes[cores] = (
+                allocation["tensor_parallel"],
+                allocation["cores_per_node"][0],
+            )
+        return self._shapes[cores]
+
+    def _place_vllm(self, cores: int) -> Optional[Tuple[List[int], List[List[int]], int]]:
+        tp, per_node = self.shape(cores)
+        free = self.dut.free
+        if tp == 1:
+            fitting = [n for n in self.dut.vllm_nodes if len(free[n]) >= per_node]
+            if not fitting:
+                return None
+            # Best fit: the node with the fewest free cores that still fits.
+            # Its highest cores, so the first cores stay free for TP>1 ranks.
+            node = min(fitting, key=lambda n: (len(free[n]), n))
+            return [node], [sorted(free[node])[-per_node:]], tp
+
+        # TP>1: the playbook binds OMP threads to the first cores of each node
+        fitting = [
+            n for n in self.dut.vllm_nodes
+            if set(self.dut.node_cpus[n][:per_node]) <= free[n]
+        ]
+        if len(fitting) < tp:
+            return None
+        nodes = sorted(sorted(fitting, key=lambda n: (len(free[n]), n))[:tp])
+        return nodes, [self.dut.node_cpus[n][:per_node] for n in nodes], tp
+
+    def _place_loadgen(self, vllm_nodes: List[int]) -> Optional[Tuple[int, List[int]]]:
+        pool = self.loadgen or self.dut
+        candidates = [n for n, cpus in pool.free.items() if len(cpus) >= self.loadgen_cores]
+        if not candidates:
+            return None
+
+        def preference(node: int):
+            if self.loadgen is not None:
+                return (0, -len(pool.free[node]), node)
+            # Shared host: housekeeping node, then nodes without this slot's vLLM
+            rank = 0 if node == pool.housekeeping_node else (1 if node not in vllm_nodes else 2)
+            return (rank, -len(pool.free[node]), node)
+
+        node = min(candidates, key=preference)
+        if self.loadgen is None:
+            # Highest cores, like TP=1 cells: keep the first cores free for TP>1 ranks
+            return node, sorted(pool.free[node])[-self.loadgen_cores:]
+        return node, sorted(pool.free[node])[:self.loadgen_cores]
+
+    def acquire(self, cell: Cell, avoid: Sequence[Slot] = ()) -> Optional[Slot]:
+        """Reserve a slot for a cell, or None if its cores are not free right now.
+
+        avoid lists slots the cell already failed in; all slots share one
+        DUT, so they do not constrain placement here.
+        """
+        if self.max_slots is not None and len(self._active) >= self.max_slots:
+            return None
+        placement = self._place_vllm(cell.cores)
+        if placement is None:
+            return None
+        nodes, node_cpus, tp = placement
+        for node, cpus in zip(nodes, node_cpus):
+            self.dut.take(node, cpus)
+
+        loadgen = self._place_loadgen(nodes)
+        if loadgen is None:
+            for node, cpus in zip(nodes, node_cpus):
+                self.dut.release(node, cpus)
+            return None
+        loadgen_node, loadgen_cpus = loadgen
+        (self.loadgen or self.dut).take(loadgen_node, loadgen_cpus)
+
+        index = next(i for i in range(len(self._active) + 1) if i not in self._active)
+        slot = Slot(
+            index=index,
+            vllm_cpus=[cpu for cpus in node_cpus for cpu in cpus],
+            vllm_nodes=nodes,
+            tensor_parallel=tp,
+            loadgen_cpus=loadgen_cpus,
+            loadgen_node=loadgen_node,
+        )
+        self._active[index] = slot
+        return slot
+
+    def release(self, slot: Slot, failed: bool = False) -> None:
+        """Return a slot's cores to the pools."""
+        self._active.pop(slot.index, None)
+        node_of = {cpu: node for node, cpus in self.dut.node_cpus.items() for cpu in cpus}
+        for cpu in slot.vllm_cpus:
+            self.dut.release(node_of[cpu], [cpu])
+        (self.loadgen or self.dut).release(slot.loadgen_node, slot.loadgen_cpus)
+
+
+@dataclass
+class SerialSlot:
+    """The only slot of a SerialAllocator: the suite's own CPU settings."""
+
+    index: int = 0
+
+    def script_vars(self) -> Dict[str, object]:
+        return {}
+
+    def env(self) -> Dict[str, str]:
+        return {}
+
+    def command(self, cmd: List[str]) -> List[str]:
+        return cmd
+
+    def describe(self) -> str:
+        return "sequential"
+
+
+class SerialAllocator:
+    """Runs one cell at a time, exactly as the suite script would (--checkpoint)."""
+
+    # Cells run in the script's own order
+    preserve_order = True
+
+    def __init__(self):
+        self._busy = False
+
+    def acquire(self, cell: Cell, avoid: Sequence[SerialSlot] = ()) -> Optional[SerialSlot]:
+        if self._busy:
+            return None
+        self._busy = True
+        return SerialSlot()
+
+    def release(self, slot: SerialSlot, failed: bool = False) -> None:
+        self._busy = False
+
+
+def read_lscpu(path: Optional[str], host_pattern: str, command: str = LSCPU_COMMAND) -> str:
+    """lscpu output from a file, or fetched from a single inventory host.
+
+    Raises:
+        SchedulerError: If the file is missing or the host cannot be queried
+    """
+    if path:
+        try:
+            return Path(path).expanduser().read_text()
+        except OSError as e:
+            raise SchedulerError(f"Cannot read lscpu file {path}: {e}")
+    try:
+        outputs = run_ansible_adhoc(host_pattern, command)
+    except (OSError, RuntimeError) as e:
+        raise SchedulerError(f"Cannot read CPU topology of '{host_pattern}': {e}")
+    if len(outputs) != 1:
+        raise SchedulerError(
+            f"Expected one '{host_pattern}' host, got {len(outputs)}; "
+            f"save `{command}` output of the target host to a file instead"
+        )
+    return next(iter(outputs.values()))
+
+
+# Lines of script output quoted when --list-matrix fails
+LIST_MATRIX_ERROR_LINES = 20
+
+
+def list_matrix(script_cmd: List[str], cwd: Path) -> List[Cell]:
+    """Expand a suite script's matrix with its --list-matrix flag.
+
+    The script prints one tab-separated "model cores workload [args...]"
+    line per cell, after applying presets and --skip-models. Trailing
+    columns are the script arguments that run just that cell; without them
+    the cell is run by narrowing the suite's --models/--cores/--workloads.
+    Identical lines are numbered as repeats.
+    """
+    # No stdin: a prompt in the script must not block on a hidden terminal
+    result = subprocess.run(
+        script_cmd + ["--list-matrix"], cwd=cwd, capture_output=True, text=True,
+        stdin=subprocess.DEVNULL,
+    )
+    if result.returncode != 0:
+        output = (result.stderr.strip() or result.stdout.strip()).splitlines()
+        detail = "\n".join(output[-LIST_MATRIX_ERROR_LINES:]) or f"exit code {result.returncode}"
+        raise SchedulerError(f"{shlex.join(script_cmd)} --list-matrix failed: {detail}")
+    cells = []
+    seen: Dict[Tuple[str, ...], int] = {}
+    for line in result.stdout.splitlines():
+        parts = tuple(line.split("\t"))
+        if len(parts) < 3:
+            continue
+        seen[parts] = seen.get(parts, 0) + 1
+        model, cores, workload = parts[:3]
+        try:
+            cells.append(Cell(
+                model=model, cores=int(cores), workload=workload,
+                repeat=seen[parts], args=parts[3:],
+            ))
+        except ValueError:
+            raise SchedulerError(f"Invalid core count in matrix line: {line!r}")
+    return cells
+
+
+def _schedule_order(cells: Sequence[Cell], allocator) -> List[Cell]:
+    if getattr(allocator, "preserve_order", False):
+        return list(cells)
+    # Largest cells first packs better; the sort is stable within a size
+    return sorted(cells, key=lambda c: -c.cores)
+
+
+def plan_waves(
+    cells: Sequence[Cell], allocator
+) -> Tuple[List[List[Tuple[Cell, Slot]]], List[Cell]]:
+    """Group cells into waves of concurrently runnable slots (for --dry-run).
+
+    Assumes cells of a wave finish together; the executor starts queued
+    cells as soon as any slot frees up, so real runs pack tighter.
+
+    Returns:
+        (waves, cells no slot can take)
+    """
+    pending = _schedule_order(cells, allocator)
+    waves: List[List[Tuple[Cell, Slot]]] = []
+    while pending:
+        wave = []
+        for cell in list(pending):
+            slot = allocator.acquire(cell)
+            if slot is not None:
+                wave.append((cell, slot))
+                pending.remove(cell)
+        if not wave:
+            break
+        for _, slot in wave:
+            allocator.release(slot)
+        waves.append(wave)
+    return waves, pending
+
+
+@dataclass
+class CellResult:
+    """Outcome of one cell (its last attempt)."""
+
+    cell: Cell
+    returncode: int
+    log_path: Optional[Path] = None
+    slot: Optional[Slot] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+    attempts: int = 1
+    # Prior measurement reused instead of running the cell (experiment_cache)
+    cached: Optional[Dict[str, object]] = None
+
+
+@dataclass
+class _Running:
+    cell: Cell
+    slot: Slot
+    process: subprocess.Popen
+    log_path: Path
+    started: float = field(default_factory=time.monotonic)
+
+
+def run_cells(
+    cells: Sequence[Cell],
+    allocator,
+    build_command: Callable[[Cell, Slot], List[str]],
+    log_dir: Path,
+    cwd: Path,
+    base_env: Dict[str, str],
+    continue_on_error: bool = False,
+    retries: int = 0,
+    poll_interval: float = 2.0,
+    report: Callable[[str], None] = print,
+    on_start: Optional[Callable[[Cell, Slot, Path], None]] = None,
+    on_finish: Optional[Callable[[CellResult], None]] = None,
+    reuse: Optional[Callable[[Cell, Slot], Optional[Dict[str, object]]]] = None,
+) -> List[CellResult]:
+    """Run cells concurrently as slots of an allocator become free.
+
+    The allocator is a SlotAllocator (one DUT) or a fleet.FleetAllocator
+    (DUT/loadgen pairs): anything with acquire(cell, avoid) and
+    release(slot, failed). A queued cell starts as soon as the allocator
+    has a slot for it. Each attempt's output goes to
+    <log_dir>/<cell>[.<attempt>].log. A failed cell is queued again up to
+    `retries` times, avoiding the slots it failed in. After a final failure
+    no new cells are started unless continue_on_error is set; running cells
+    always finish.
+
+    on_start(cell, slot, log_path) is called when an attempt starts and
+    on_finish(result) when a cell is done (run_manifest.RunManifest
+    checkpoints the run with them). reuse(cell, slot) may return a prior
+    measurement of the cell in that slot; the cell is then not run and its
+    result carries the measurement in `cached`.
+
+    Returns:
+        One CellResult per cell, in completion order
+    """
+    log_dir.mkdir(parents=True, exist_ok=True)
+    pending = _schedule_order(cells, allocator)
+    running: List[_Running] = []
+    results: List[CellResult] = []
+    failed_slots: Dict[Cell, List[Slot]] = {}
+    stop = False
+
+    try:
+        while pending or running:
+            if not stop:
+                for cell in list(pending):
+                    tried = failed_slots.get(cell, [])
+                    slot = allocator.acquire(cell, avoid=tried)
+                    if slot is None:
+                        continue
+                    pending.remove(cell)
+                    cached = reuse(cell, slot) if reuse else None
+                    if cached is not None:
+                        allocator.release(slot)
+                        results.append(CellResult(cell, 0, slot=slot, attempts=0, cached=cached))
+                        report(f"↷ {cell.label}: measured before, reusing {cached.get('run_id') or 'cached result'}")
+                        if on_finish:
+                            on_finish(results[-1])
+                        continue
+                    suffix = f".{len(tried) + 1}" if tried else ""
+                    log_path = log_dir / f"{cell.slug}{suffix}.log"
+                    with open(log_path, "w") as log:
+                        process = subprocess.Popen(
+                            build_command(cell, slot),
+                            cwd=cwd,
+                            env={**base_env, **slot.env()},
+                            stdout=log,
+                            stderr=subprocess.STDOUT,
+                        )
+                    running.append(_Running(cell, slot, process, log_path))
+                    report(f"▶ {cell.label} → {slot.describe()}")
+                    if on_start:
+                        on_start(cell, slot, log_path)
+
+                if pending and not running:
+                    # Nothing is running, so no slot will ever take these cells
+                    for cell in pending:
+                        results.append(CellResult(
+                            cell, 1, error="no slot can run this cell",
+                            attempts=len(failed_slots.get(cell, [])),
+                        ))
+                        report(f"✗ {cell.label}: no slot can run this cell")
+                        if on_finish:
+                            on_finish(results[-1])
+                    pending = []
+                    stop = stop or not continue_on_error
+                    continue
+            elif not running:
+                break
+
+            time.sleep(poll_interval)
+            for entry in list(running):
+                returncode = entry.process.poll()
+                if returncode is None:
+                    continue
+                running.remove(entry)
+                allocator.release(entry.slot, failed=returncode != 0)
+                seconds = time.monotonic() - entry.started
+                if returncode != 0:
+                    tried = failed_slots.setdefault(entry.cell, [])
+                    tried.append(entry.slot)
+                    if len(tried) <= retries and not stop:
+                        report(f"↻ {entry.cell.label} failed (log: {entry.log_path}), retrying")
+                        pending.insert(0, entry.cell)
+                        continue
+                results.append(CellResult(
+                    entry.cell, returncode, entry.log_path, entry.slot, seconds,
+                    attempts=len(failed_slots.get(entry.cell, [])) + (returncode == 0),
+                ))
+                mark = "✓" if returncode == 0 else "✗"
+                report(f"{mark} {entry.cell.label} ({seconds:.0f}s, log: {entry.log_path})")
+                if on_finish:
+                    on_finish(results[-1])
+                if returncode != 0 and not continue_on_error and not stop:
+                    stop = True
+                    report("Not starting new cells after a failure (use --continue-on-error to continue)")
+    except KeyboardInterrupt:
+        for entry in running:
+            entry.process.terminate()
+        for entry in running:
+            entry.process.wait()
+        raise
+
+    for cell in pending:
+        results.append(CellResult(cell, 1, error=NOT_STARTED, attempts=len(failed_slots.get(cell, []))))
+    return results
+
@@ -1,5 +1,7 @@
 """Path management for cpueval."""
 
+import importlib
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -81,6 +83,52 @@ def get_conversion_script() -> Path:
     )
 
 
+def get_shared_dir() -> Path:
+    """Get the shared library directory of test-execution."""
+    return get_repo_root() / "automation" / "test-execution" / "shared"
+
+
+def load_shared_module(name: str):
+    """Import a module of the test-execution shared library.
+
+    Returns:
+        The module, or None if the shared directory is not available
+        (e.g. cpueval installed outside the repository)
+    """
+    shared_dir = str(get_shared_dir())
+    if shared_dir not in sys.path:
+        sys.path.insert(0, shared_dir)
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def get_filter_plugins_dir() -> Path:
+    """Get the Ansible filter plugins directory."""
+    return get_ansible_dir() / "filter_plugins"
+
+
+def load_filter_plugin(name: str):
+    """Import an Ansible filter plugin module (e.g. cpu_utils).
+
+    Returns:
+        The module, or None if the plugin is not available
+    """
+    plugins_dir = str(get_filter_plugins_dir())
+    if plugins_dir not in sys.path:
+        sys.path.insert(0, plugins_dir)
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def load_results_catalog():
+    """Import the shared results_catalog module (None if unavailable)."""
+    return load_shared_module("results_catalog")
+
+
 def get_last_run_hint_path() -> Path:
     """Get the last run hint file path."""
     return get_results_dir() / ".cpueval-last.json"
@@ -118,29 +166,7 @@ def find_latest_result(
     if not base_dir.exists():
         return None
 
-    # Find all benchmark.json files
-    benchmarks = list(base_dir.rglob("benchmarks.json"))
-    if not benchmarks:
-        return None
-
-    # Get directories containing benchmarks.json
-    result_dirs = [b.parent for b in benchmarks]
-
-    # Filter by model if specified
-    if model:
-        # Model name is sanitized with __ instead of / in directory names
-        model_safe = model.replace("/", "__")
-        # Match model directory name exactly, not as substring
-        result_dirs = [
-            d for d in result_dirs
-            if any(part == model_safe for part in d.parts)
-        ]
-
-    # Sort by modification time and return the latest
-    if result_dirs:
-        return max(result_dirs, key=lambda p: p.stat().st_mtime)
-
-    return None
+    return _find_latest_run(base_dir, "benchmarks.json", model)
 
 
 def find_latest_embedding_result(model: Optional[str] = None) -> Optional[Path]:
@@ -160,19 +186,34 @@ def find_latest_embedding_result(model: Optional[str] = None) -> Optional[Path]:
     if not base_dir.exists():
         return None
 
-    metadata_files = list(base_dir.rglob("test-metadata.json"))
-    if not metadata_files:
-        return None
+    return _find_latest_run(base_dir, "test-metadata.json", model)
+
+
+def _find_latest_run(
+    base_dir: Path, marker: str, model: Optional[str] = None
+) -> Optional[Path]:
+    """Latest run directory under base_dir that contains `marker`.
+
+    Uses the results catalog when available and falls back to a
+    filesystem scan otherwise.
+    """
+    # Model name is sanitized with __ instead of / in directory names
+    model_safe = model.replace("/", "__") if model else None
 
-    result_dirs = [m.parent for m in metadata_files]
+    catalog_mod = load_results_catalog()
+    if catalog_mod is not None:
+        with catalog_mod.open_catalog(base_dir) as catalog:
+            return catalog.latest(marker, model_dir=model_safe)
 
-    if model:
-        model_safe = model.replace("/", "__")
+    result_dirs = [f.parent for f in base_dir.rglob(marker)]
+    if model_safe:
+        # Match model directory name exactly, not as substring
         result_dirs = [
             d for d in result_dirs
             if any(part == model_safe for part in d.parts)
         ]
 
+    # Sort by modification time and return the latest
     if result_dirs:
         return max(result_dirs, key=lambda p: p.stat().st_mtime)
 
@@ -0,0 +1,333 @@
+"""Generate CPU pinning profiles from a host's CPU topology.
+
+Hand-written profiles (profiles/dual-socket-split.yaml) hard-code CPU
+ranges for one SKU. The generator derives them from `lscpu` output of the
+DUT instead, with the same building blocks the playbooks use:
+LscpuParser (physical cores only, SMT siblings excluded), the housekeeping
+policy of detect-numa-topology.yml (node 0 is reserved on systems with 3+
+NUMA nodes), allocate_cores_multi_numa() to preview the allocation each
+profile leads to, and the cpuset planner to check that vLLM and the load
+generator never share a core.
+
+Layouts generated:
+
+- split: vLLM pinned to one NUMA node, the load generator on another
+  (one profile per vLLM node)
+- instance: one self-contained vLLM + load generator instance per NUMA
+  node, for parallel multi-instance runs on disjoint cores
+- housekeeping: vLLM auto-allocated across all non-housekeeping nodes, the
+  load generator on the last cores of the housekeeping node
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from cpueval.matrix_scheduler import DEFAULT_LOADGEN_CORES, CorePool, SchedulerError
+from cpueval.paths import load_filter_plugin
+
+# Topology as detect-numa-topology.yml reads it (CACHE for the L3 domains)
+PROFILE_LSCPU_COMMAND = "lscpu -e=CPU,NODE,CORE,CACHE -n"
+
+# Same tensor parallel values as allocate_cores_multi_numa
+TP_VALUES = (8, 4, 2, 1)
+
+
+@dataclass
+class GeneratedProfile:
+    """A generated profile: its extra vars plus the comments that explain them."""
+
+    name: str
+    use_case: str
+    vars: Dict[str, Any]
+    cores: int
+    notes: List[str] = field(default_factory=list)
+
+    def to_yaml(self, source: str = "lscpu") -> str:
+        """Profile file content, commented like the hand-written profiles."""
+        lines = [
+            f"# Generated CPU pinning profile: {self.name}",
+            f"# Use case: {self.use_case}",
+            "#",
+            f"# Generated by 'cpueval profiles generate' from {source}.",
+            "# CPU ranges list physical cores only (first thread of each core).",
+            "#",
+        ]
+        lines += [f"# {note}" if note else "#" for note in self.notes]
+        lines += [
+            "#",
+            "# Usage:",
+            "#   cpueval --suite concurrent-load \\",
+            "#     --model meta-llama/Llama-3.2-1B-Instruct \\",
+            f"#     --cores {self.cores} \\",
+            f"#     --profile {self.name}",
+            "",
+        ]
+        return "\n".join(lines) + yaml.safe_dump(self.vars, sort_keys=False)
+
+
+def _filter_plugin(name: str):
+    plugin = load_filter_plugin(name)
+    if plugin is None:
+        raise SchedulerError(
+            f"Ansible filter plugin {name} not found; profile generation needs the repository checkout"
+        )
+    return plugin
+
+
+class ProfileGenerator:
+    """Derives pinning profiles for the common layouts of one host."""
+
+    def __init__(self, lscpu_data: str, loadgen_cores: int = DEFAULT_LOADGEN_CORES, prefix: str = ""):
+        """
+        Args:
+            lscpu_data: `lscpu -e=CPU,NODE,CORE[,CACHE] -n` output of the DUT
+            loadgen_cores: Physical cores of the load generator when it shares
+                a node with vLLM or housekeeping (instance / housekeeping layouts)
+            prefix: Prefix of the profile names (e.g. the SKU)
+
+        Raises:
+            SchedulerError: If the lscpu output cannot be parsed
+        """
+        if loadgen_cores <= 0:
+            raise SchedulerError(f"loadgen_cores must be positive, got {loadgen_cores}")
+        self.cpu_utils = _filter_plugin("cpu_utils")
+        self.cpuset_planner = _filter_plugin("cpuset_planner")
+        self.lscpu_data = lscpu_data
+        self.pool = CorePool(lscpu_data)
+        self.loadgen_cores = loadgen_cores
+        self.prefix = prefix
+
+        # numa_topology as detect-numa-topology.yml builds it, L3 domains included
+        self.topology = self.pool.topology()
+        for node in self.topology["nodes"]:
+            node["cache_domains"] = self.cpu_utils.extract_cache_domains(lscpu_data, node["id"])
+
+    def _range(self, cpus) -> str:
+        return self.cpu_utils.cpu_list_to_range(sorted(cpus))
+
+    def allocate(
+        self, cores: int, numa_node: Optional[int] = None, cpu_start: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """The allocation allocate-cores-from-count.yml would make.
+
+        Raises:
+            SchedulerError: If the cores cannot be allocated
+        """
+        try:
+            return self.cpu_utils.allocate_cores_multi_numa(self.topology, cores, None, cpu_start, numa_node)
+        except self.cpu_utils.AnsibleFilterError as e:
+            raise SchedulerError(f"Cannot allocate {cores} cores: {e}")
+
+    def search(
+        self,
+        cores: int,
+        top_k: int = 5,
+        tensor_parallel: Optional[int] = None,
+        model_memory: Optional[str] = None,
+        kv_cache_space: Optional[str] = None,
+        throughput_records: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """The best-scoring allocations of vllm_allocation_search=true.
+
+        Args:
+            throughput_records: Past results (cores, tensor_parallel,
+                throughput, group) to fit the throughput model on
+
+        Returns:
+            Dict with the ranked 'allocations' and the fitted
+            'throughput_model' (None without records)
+
+        Raises:
+            SchedulerError: If no placement fits, or the records cannot be fitted
+        """
+        optimizer = _filter_plugin("allocation_optimizer")
+        try:
+            model = optimizer.fit_throughput_model(throughput_records) if throughput_records is not None else None
+            allocations = optimizer.search_allocations(
+                self.topology, cores, top_k, tensor_parallel, model_memory, kv_cache_space,
+                throughput_model=model,
+            )
+        except self.cpu_utils.AnsibleFilterError as e:
+            raise SchedulerError(f"Cannot search allocations of {cores} cores: {e}")
+        return {"allocations": allocations, "throughput_model": model}
+
+    def plan(self, profile_vars: Dict[str, Any], cores: int) -> Dict[str, Any]:
+        """Host cpuset plan of a run with these profile vars and --cores.
+
+        Places vLLM as allocate-cores-from-count.yml does (vllm_cpus, else
+        the allocation for vllm_numa_node / vllm_cpu_start), plus GuideLLM
+        and housekeeping_cpus when the profile pins them.
+
+        Returns:
+            plan_cpusets() result: placements and free cores per node
+
+        Raises:
+            SchedulerError: If placements overlap, share a physical core or
+                bind memory away from their CPUs
+        """
+        allocation = self.allocate(
+            cores, profile_vars.get("vllm_numa_node"), profile_vars.get("vllm_cpu_start")
+        )
+        placements = [{
+            "role": "vllm",
+            "cpus": str(profile_vars.get("vllm_cpus") or allocation["cpuset_cpus"]),
+            "mems": allocation["cpuset_mems"],
+        }]
+        if profile_vars.get("guidellm_cpus") not in (None, ""):
+            placements.append({
+                "role": "guidellm",
+                "cpus": str(profile_vars["guidellm_cpus"]),
+                "mems": str(profile_vars.get("guidellm_cpuset_mems", profile_vars.get("guidellm_numa_node", 0))),
+            })
+        if profile_vars.get("housekeeping_cpus") not in (None, ""):
+            placements.append({"role": "housekeeping", "cpus": str(profile_vars["housekeeping_cpus"])})
+        try:
+            return self.cpuset_planner.plan_cpusets(self.lscpu_data, placements)
+        except self.cpu_utils.AnsibleFilterError as e:
+            raise SchedulerError(f"Cpuset conflict: {e}")
+
+    def summary(self) -> str:
+        """One-line topology summary, e.g. '2 NUMA nodes, 32+32 physical cores'."""
+        sizes = "+".join(str(len(cpus)) for _, cpus in sorted(self.pool.node_cpus.items()))
+        housekeeping = self.pool.housekeeping_node
+        summary = f"{len(self.pool.node_cpus)} NUMA nodes, {sizes} physical cores"
+        if housekeeping is not None:
+            summary += f", housekeeping node {housekeeping}"
+        return summary
+
+    def split_profiles(self) -> List[GeneratedProfile]:
+        """vLLM on node N, load generator on the next vLLM-eligible node."""
+        nodes = self.pool.vllm_nodes
+        if len(nodes) < 2:
+            return []
+        profiles = []
+        for i, node in enumerate(nodes):
+            loadgen_node = nodes[(i + 1) % len(nodes)]
+            cores = len(self.pool.node_cpus[node])
+            allocation = self.allocate(cores, node)
+            notes = [
+                f"vLLM: NUMA node {node} ({self._range(self.pool.node_cpus[node])}), TP=1,",
+                f"  --cores up to {cores} (e.g. --cores {cores} -> CPUs {allocation['cpuset_cpus']}).",
+                f"GuideLLM: all physical cores of NUMA node {loadgen_node}.",
+            ]
+            if self.pool.housekeeping_node is not None:
+                notes.append(f"Housekeeping node {self.pool.housekeeping_node} is left to the OS.")
+            profiles.append(GeneratedProfile(
+                name=f"{self.prefix}vllm-node{node}-loadgen-node{loadgen_node}",
+                use_case=f"Pin vLLM to NUMA node {node}, GuideLLM to NUMA node {loadgen_node}",
+                vars={
+                    "vllm_numa_node": node,
+                    "guidellm_cpus": self._range(self.pool.node_cpus[loadgen_node]),
+                    "guidellm_numa_node": loadgen_node,
+                },
+                cores=cores,
+                notes=notes,
+            ))
+        return profiles
+
+    def instance_profiles(self) -> List[GeneratedProfile]:
+        """One vLLM + load generator instance per node, on disjoint cores."""
+        nodes = self.pool.vllm_nodes
+        profiles = []
+        for index, node in enumerate(nodes):
+            node_cpus = self.pool.node_cpus[node]
+            cores = len(node_cpus) - self.loadgen_cores
+            if cores <= 0:
+                continue
+            allocation = self.allocate(cores, node)
+            vllm_cpus = self.cpu_utils.expand_cpu_range(allocation["cpuset_cpus"])
+            loadgen_cpus = sorted(set(node_cpus) - set(vllm_cpus))
+            notes = [
+                f"vLLM: {cores} cores of NUMA node {node} (fixed vllm_cpus, as allocated",
+                f"  for --cores {cores}); GuideLLM: the other {len(loadgen_cpus)} cores of the node.",
+                "Instances on different nodes share no core; run them side by side with",
+                "their own container name and port:",
+                f"  VLLM_CONTAINER_NAME=vllm-node{node} VLLM_PORT={8000 + index} \\",
+                f"    cpueval ... --cores {cores} --profile {self.prefix}instance-node{node}",
+            ]
+            profiles.append(GeneratedProfile(
+                name=f"{self.prefix}instance-node{node}",
+                use_case=f"One vLLM + GuideLLM instance on NUMA node {node} (multi-instance runs)",
+                vars={
+                    "vllm_cpus": allocation["cpuset_cpus"],
+                    "vllm_numa_node": node,
+                    "guidellm_cpus": self._range(loadgen_cpus),
+                    "guidellm_numa_node": node,
+                },
+                cores=cores,
+                notes=notes,
+            ))
+        return profiles
+
+    def housekeeping_profiles(self) -> List[GeneratedProfile]:
+        """vLLM across all non-housekeeping nodes, load generator on the housekeeping node."""
+        housekeeping = self.pool.housekeeping_node
+        if housekeeping is None:
+            return []
+        housekeeping_cpus = self.pool.node_cpus[housekeeping]
+        if len(housekeeping_cpus) <= self.loadgen_cores:
+            return []
+
+        # Largest allocation: the highest TP the vLLM nodes can host evenly
+        sizes = sorted((len(self.pool.node_cpus[n]) for n in self.pool.vllm_nodes), reverse=True)
+        allocation = None
+        for tp in TP_VALUES:
+            if tp <= len(sizes):
+                try:
+                    allocation = self.allocate(tp * sizes[tp - 1])
+                    break
+                except SchedulerError:
+                    continue
+        if allocation is None:
+            return []
+        cores = sum(allocation["cores_per_node"])
+
+        # Leave the first cores of the node (where the OS and IRQs land) alone
+        loadgen_cpus = housekeeping_cpus[-self.loadgen_cores:]
+        notes = [
+            f"vLLM: auto-allocated on NUMA nodes {', '.join(map(str, self.pool.vllm_nodes))};",
+            f"  --cores up to {cores} (TP={allocation['tensor_parallel']} on nodes "
+            f"{', '.join(map(str, allocation['allocated_nodes']))}, CPUs {allocation['cpuset_cpus']}).",
+            f"GuideLLM: last {self.loadgen_cores} cores of housekeeping node {housekeeping};",
+            f"  its other cores ({self._range(housekeeping_cpus[:-self.loadgen_cores])}) stay with the OS.",
+        ]
+        return [GeneratedProfile(
+            name=f"{self.prefix}housekeeping-node{housekeeping}-reserved",
+            use_case=f"vLLM on all nodes but housekeeping node {housekeeping}, GuideLLM beside the OS",
+            vars={
+                "guidellm_cpus": self._range(loadgen_cpus),
+                "guidellm_numa_node": housekeeping,
+            },
+            cores=cores,
+            notes=notes,
+        )]
+
+    def generate(self) -> List[GeneratedProfile]:
+        """All profiles for this host's layout, each checked with the cpuset planner."""
+        profiles = self.split_profiles() + self.instance_profiles() + self.housekeeping_profiles()
+        for profile in profiles:
+            self.plan(profile.vars, profile.cores)
+        return profiles
+
+
+def write_profiles(
+    profiles: List[GeneratedProfile], output_dir: Path, source: str, force: bool = False
+) -> Dict[str, Optional[Path]]:
+    """Write profiles as <name>.yaml.
+
+    Returns:
+        Profile name -> written path, or None if it exists and force is False
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: Dict[str, Optional[Path]] = {}
+    for profile in profiles:
+        path = output_dir / f"{profile.name}.yaml"
+        if path.exists() and not force:
+            written[profile.name] = None
+            continue
+        path.write_text(profile.to_yaml(source))
+        written[profile.name] = path
+    return written
@@ -19,6 +19,8 @@ from cpueval.paths import (
     get_repo_root,
     find_latest_result,
     find_latest_embedding_result,
+    load_results_catalog,
+    load_shared_module,
 )
 
 
@@ -71,17 +73,23 @@ def load_last_run_hint() -> Optional[Dict[str, Any]]:
 def load_benchmarks(result_dir: Path) -> Optional[Dict[str, Any]]:
     """Load benchmarks.json from a result directory.
 
+    Per-request records are skipped when the shared benchmarks_reader is
+    available, so multi-GB files load in constant memory.
+
     Args:
         result_dir: Result directory path
 
     Returns:
-        Benchmarks data or None
+        Benchmarks data (without per-request records) or None
     """
     benchmarks_path = result_dir / "benchmarks.json"
     if not benchmarks_path.exists():
         return None
 
     try:
+        reader = load_shared_module("benchmarks_reader")
+        if reader is not None:
+            return reader.read_benchmarks(benchmarks_path)
         with open(benchmarks_path) as f:
             return json.load(f)
     except Exception:
@@ -281,29 +289,86 @@ def list_results(limit: int = 10, audio: bool = False) -> None:
         console.print(f"[yellow]No results found in {base_dir}[/yellow]")
         return
 
-    # Find all benchmarks.json files
-    benchmarks = list(base_dir.rglob("benchmarks.json"))
+    catalog_mod = load_results_catalog()
+    if catalog_mod is None:
+        # Find all benchmarks.json files
+        benchmarks = list(base_dir.rglob("benchmarks.json"))
+        # Sort by modification time (newest first)
+        benchmarks.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        runs = [{"path": b.parent} for b in benchmarks[:limit]]
+    else:
+        with catalog_mod.open_catalog(base_dir) as catalog:
+            runs = catalog.runs("benchmarks.json", limit=limit)
 
-    if not benchmarks:
+    if not runs:
         console.print(f"[yellow]No benchmark results found in {base_dir}[/yellow]")
         return
 
-    # Sort by modification time (newest first)
-    benchmarks.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-
-    # Limit results
-    benchmarks = benchmarks[:limit]
+    console.print(f"\n[bold cyan]Recent results ({len(runs)})[/bold cyan]\n")
 
-    console.print(f"\n[bold cyan]Recent results ({len(benchmarks)})[/bold cyan]\n")
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Result")
+    table.add_column("Model")
+    table.add_column("Cores", justify="right")
+    table.add_column("Peak Tok/s", justify="right")
 
-    for bench_path in benchmarks:
-        result_dir = bench_path.parent
-        rel_path = result_dir.relative_to(base_dir)
-        console.print(f"  {rel_path}")
+    for run in runs:
+        rel_path = run["path"].relative_to(base_dir)
+        peak = run.get("peak_output_tok_per_sec")
+        table.add_row(
+            str(rel_path),
+            run.get("model") or "-",
+            str(run["cores"]) if run.get("cores") else "-",
+            f"{peak:.2f}" if peak is not None else "-",
+        )
 
+    console.print(table)
     console.print()
 
 
+def load_throughput_records(base_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Peak throughput of past LLM runs by core count and TP.
+
+    Core count and TP come from each run's test-metadata.json; runs without
+    them (fixed-profile runs) are skipped.
+
+    Args:
+        base_dir: Results root (default: the LLM results directory)
+
+    Returns:
+        Records with cores, tensor_parallel, throughput (peak output tok/s)
+        and group (model, workload and platform)
+    """
+    base_dir = base_dir or get_llm_results_dir()
+    if not base_dir.exists():
+        return []
+
+    catalog_mod = load_results_catalog()
+    if catalog_mod is None:
+        runs = []
+        for path in base_dir.rglob("benchmarks.json"):
+            points = extract_metrics(load_benchmarks(path.parent) or {})
+            peaks = [p["tok_per_sec"] for p in points if p["tok_per_sec"] is not None]
+            runs.append({"path": path.parent, "peak_output_tok_per_sec": max(peaks, default=None)})
+    else:
+        with catalog_mod.open_catalog(base_dir) as catalog:
+            runs = catalog.runs("benchmarks.json")
+
+    records = []
+    for run in runs:
+        metadata = load_metadata(run["path"]) or {}
+        throughput = run.get("peak_output_tok_per_sec")
+        if not metadata.get("core_count") or not metadata.get("tensor_parallel") or not throughput:
+            continue
+        records.append({
+            "cores": metadata["core_count"],
+            "tensor_parallel": metadata["tensor_parallel"],
+            "throughput": throughput,
+            "group": "/".join(str(metadata.get(key, "")) for key in ("model", "workload", "platform")),
+        })
+    return records
+
+
 def run_results_command(
     path: Optional[str] = None,
     last: bool = False,
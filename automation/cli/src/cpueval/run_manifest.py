@@ -0,0 +1,271 @@
+"""Run manifests: checkpoints of cell-by-cell matrix runs.
+
+Matrix runs driven by cpueval (--checkpoint, --parallel, --fleet) record
+themselves in results/.cpueval-runs/<run-id>/manifest.json:
+
+    {
+      "version": 1,
+      "run_id": "20261017-101500-concurrent-load",
+      "suite": "concurrent-load",
+      "created": 1792232100.0,
+      "options": {...},                 # how cells are placed and composed
+      "cells": [
+        {"model": "...", "cores": 16, "workload": "chat", "repeat": 1, "args": [],
+         "status": "succeeded", "attempts": 1, "returncode": 0, "seconds": 812.4,
+         "slot": "sequential", "log": "...", "result_dirs": ["results/llm/..."],
+         "started": 1792232101.2, "finished": 1792232913.6, "error": null,
+         "reused": null},                # or the cache entry of a prior measurement
+        ...
+      ]
+    }
+
+The manifest is rewritten (atomically) whenever a cell starts or finishes,
+so a run that dies - OOM, SSH drop, controller reboot - leaves a record of
+every finished cell. `cpueval resume <run-id>` reruns the cells that did not
+succeed (failed, never started, or interrupted while running) with the
+run's original options, then reports over all cells of the run.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cpueval.matrix_scheduler import NOT_STARTED, Cell, CellResult
+from cpueval.paths import get_llm_results_dir, get_results_dir
+
+RUNS_DIRNAME = ".cpueval-runs"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class ManifestError(Exception):
+    """Raised when a run manifest is missing or unreadable."""
+
+
+def get_runs_dir() -> Path:
+    """Directory holding one subdirectory per checkpointed run."""
+    return get_results_dir() / RUNS_DIRNAME
+
+
+def _cell_entry(cell: Cell) -> Dict[str, Any]:
+    return {
+        "model": cell.model,
+        "cores": cell.cores,
+        "workload": cell.workload,
+        "repeat": cell.repeat,
+        "args": list(cell.args),
+        "status": PENDING,
+        "attempts": 0,
+        "returncode": None,
+        "seconds": None,
+        "slot": None,
+        "log": None,
+        "result_dirs": [],
+        "started": None,
+        "finished": None,
+        "error": None,
+        "reused": None,
+    }
+
+
+def _entry_cell(entry: Dict[str, Any]) -> Cell:
+    return Cell(
+        model=entry["model"],
+        cores=int(entry["cores"]),
+        workload=entry["workload"],
+        repeat=int(entry.get("repeat", 1)),
+        args=tuple(entry.get("args", ())),
+    )
+
+
+def find_cell_results(
+    cell: Cell, since: float, results_dir: Optional[Path] = None
+) -> List[Path]:
+    """Result directories a cell wrote after `since` (unix time).
+
+    Both matrix playbooks write results/llm/<model>/<run>/<cores>cores-<...>/;
+    when cells of one model ran side by side, run directories named after the
+    cell's workload are preferred.
+    """
+    model_dir = (results_dir or get_llm_results_dir()) / cell.model.replace("/", "__")
+    if not model_dir.is_dir():
+        return []
+    found = [
+        path for path in model_dir.glob(f"*/{cell.cores}cores-*")
+        if path.is_dir() and path.stat().st_mtime >= since
+    ]
+    by_workload = [path for path in found if path.parent.name.startswith(f"{cell.workload}-")]
+    return sorted(by_workload or found)
+
+
+class RunManifest:
+    """The manifest of one checkpointed run."""
+
+    def __init__(self, path: Path, data: Dict[str, Any]):
+        self.path = path
+        self.data = data
+        self._index = {_entry_cell(entry): entry for entry in data["cells"]}
+
+    @classmethod
+    def create(
+        cls,
+        suite: str,
+        cells: Sequence[Cell],
+        options: Dict[str, Any],
+        runs_dir: Optional[Path] = None,
+    ) -> "RunManifest":
+        """Start the manifest of a new run, with every cell pending."""
+        runs_dir = runs_dir or get_runs_dir()
+        base_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suite}"
+        run_id, number = base_id, 1
+        while (runs_dir / run_id).exists():
+            number += 1
+            run_id = f"{base_id}-{number}"
+        (runs_dir / run_id).mkdir(parents=True)
+
+        manifest = cls(runs_dir / run_id / MANIFEST_FILENAME, {
+            "version": MANIFEST_VERSION,
+            "run_id": run_id,
+            "suite": suite,
+            "created": time.time(),
+            "options": options,
+            "cells": [_cell_entry(cell) for cell in cells],
+        })
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, run_id: str, runs_dir: Optional[Path] = None) -> "RunManifest":
+        """Read the manifest of a run.
+
+        Raises:
+            ManifestError: If the run does not exist or its manifest is invalid
+        """
+        path = (runs_dir or get_runs_dir()) / run_id / MANIFEST_FILENAME
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            raise ManifestError(f"No run manifest for '{run_id}' ({path})")
+        except (OSError, ValueError) as e:
+            raise ManifestError(f"Cannot read run manifest {path}: {e}")
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            raise ManifestError(f"Unsupported run manifest {path}")
+        try:
+            return cls(path, data)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ManifestError(f"Invalid run manifest {path}: {e}")
+
+    @property
+    def run_id(self) -> str:
+        return self.data["run_id"]
+
+    @property
+    def suite(self) -> str:
+        return self.data["suite"]
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        return self.data["options"]
+
+    @property
+    def log_dir(self) -> Path:
+        return self.path.parent
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        return self.data["cells"]
+
+    def entry(self, cell: Cell) -> Dict[str, Any]:
+        return self._index[cell]
+
+    def cells(self) -> List[Cell]:
+        return list(self._index)
+
+    def items(self) -> List[Tuple[Cell, Dict[str, Any]]]:
+        return list(self._index.items())
+
+    def outstanding(self) -> List[Cell]:
+        """Cells to run again: failed, never started or interrupted."""
+        return [cell for cell, entry in self._index.items() if entry["status"] != SUCCEEDED]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in (SUCCEEDED, FAILED, RUNNING, PENDING)}
+        for entry in self.entries:
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def result_dirs(self) -> List[Path]:
+        """Result directories of all succeeded cells."""
+        return [Path(path) for entry in self.entries for path in entry["result_dirs"]]
+
+    def cell_started(self, cell: Cell, slot, log_path: Path) -> None:
+        """Record an attempt of a cell (run_cells on_start callback)."""
+        entry = self.entry(cell)
+        entry.update(
+            status=RUNNING,
+            slot=slot.describe(),
+            log=str(log_path),
+            started=time.time(),
+            finished=None,
+            error=None,
+        )
+        self.save()
+
+    def cell_finished(self, result: CellResult) -> None:
+        """Record the outcome of a cell (run_cells on_finish callback)."""
+        entry = self.entry(result.cell)
+        if result.error == NOT_STARTED:
+            return
+        if result.cached is not None:
+            entry.update(
+                status=SUCCEEDED,
+                returncode=0,
+                finished=time.time(),
+                error=None,
+                result_dirs=list(result.cached["result_dirs"]),
+                reused={"key": result.cached.get("key"), "run_id": result.cached.get("run_id")},
+            )
+            self.save()
+            return
+        entry.update(
+            status=SUCCEEDED if result.returncode == 0 else FAILED,
+            attempts=entry["attempts"] + result.attempts,
+            returncode=result.returncode,
+            seconds=round(result.seconds, 1),
+            finished=time.time(),
+            error=result.error,
+        )
+        if result.returncode == 0 and entry["started"] is not None:
+            entry["result_dirs"] = [
+                str(path) for path in find_cell_results(result.cell, entry["started"])
+            ]
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest next to its final location and rename it into place."""
+        staging = self.path.with_name(f".{self.path.name}.tmp-{os.getpid()}")
+        staging.write_text(json.dumps(self.data, indent=2) + "\n")
+        staging.replace(self.path)
+
+
+def list_runs(runs_dir: Optional[Path] = None) -> List[RunManifest]:
+    """Readable manifests of all checkpointed runs, newest first."""
+    runs_dir = runs_dir or get_runs_dir()
+    if not runs_dir.is_dir():
+        return []
+    manifests = []
+    for path in runs_dir.glob(f"*/{MANIFEST_FILENAME}"):
+        try:
+            manifests.append(RunManifest.load(path.parent.name, runs_dir))
+        except ManifestError:
+            continue
+    return sorted(manifests, key=lambda m: m.data.get("created", 0), reverse=True)
@@ -78,6 +78,67 @@ def run_ansible(
     ).returncode
 
 
+def run_ansible_adhoc(host_pattern: str, command: str) -> Dict[str, str]:
+    """Run a command on inventory hosts with ad-hoc ansible.
+
+    Args:
+        host_pattern: Inventory host or group (e.g., 'dut')
+        command: Command to run on each host
+
+    Returns:
+        Command stdout per host
+
+    Raises:
+        RuntimeError: If ansible fails on any host
+    """
+    cmd = [
+        "ansible",
+        host_pattern,
+        "-i",
+        str(get_inventory_path()),
+        "-m",
+        "ansible.builtin.command",
+        "-a",
+        command,
+        "--one-line",
+    ]
+    result = subprocess.run(
+        cmd, cwd=get_ansible_dir(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"{shlex.join(cmd)} failed (exit {result.returncode}): "
+            f"{(result.stderr or result.stdout).strip()}"
+        )
+
+    # --one-line output: "<host> | CHANGED | rc=0 | (stdout) line1\nline2"
+    outputs: Dict[str, str] = {}
+    for line in result.stdout.splitlines():
+        host, sep, rest = line.partition(" | ")
+        if not sep or "(stdout)" not in rest:
+            continue
+        stdout = rest.split("(stdout)", 1)[1].strip()
+        outputs[host.strip()] = stdout.replace("\\n", "\n")
+    return outputs
+
+
+def read_inventory() -> Dict[str, Any]:
+    """Parsed `ansible-inventory --list` output of the repository inventory.
+
+    Raises:
+        RuntimeError: If ansible-inventory fails
+    """
+    cmd = ["ansible-inventory", "-i", str(get_inventory_path()), "--list"]
+    result = subprocess.run(
+        cmd, cwd=get_ansible_dir(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"{shlex.join(cmd)} failed (exit {result.returncode}): {result.stderr.strip()}"
+        )
+    return json.loads(result.stdout)
+
+
 def build_script_command(
     script_path: str, args: List[str] = None
 ) -> List[str]:
@@ -102,6 +163,16 @@ def build_script_command(
     return cmd
 
 
+def ensure_executable(script_path: str) -> None:
+    """Make a script (relative to repo root) executable if needed."""
+    script_full_path = get_repo_root() / script_path
+    if script_full_path.exists():
+        current_mode = script_full_path.stat().st_mode
+        script_full_path.chmod(
+            current_mode | stat.S_IXUSR | stat.S_IXGRP
+        )
+
+
 def run_script(
     script_path: str, args: List[str] = None, dry_run: bool = False
 ) -> int:
@@ -121,14 +192,7 @@ def run_script(
         print(shlex.join(cmd))
         return 0
 
-    # Make script executable if needed
-    script_full_path = get_repo_root() / script_path
-    if script_full_path.exists():
-        import stat
-        current_mode = script_full_path.stat().st_mode
-        script_full_path.chmod(
-            current_mode | stat.S_IXUSR | stat.S_IXGRP
-        )
+    ensure_executable(script_path)
 
     return subprocess.run(
         cmd, cwd=get_repo_root(), stdout=sys.stdout, stderr=sys.stderr
@@ -20,6 +20,8 @@ class Suite:
     param_mappings: Dict[str, str]  # CLI param -> ansible/script param
     matrix: bool = False  # True = full matrix by default, --model optional
     args_builder: Optional[str] = None  # e.g. offline_batch for positional scripts
+    parallel: bool = False  # True = script supports --list-matrix, cells can run in slots
+    checkpoint: bool = False  # True = script supports --list-matrix, cells can run one by one
     source_path: Optional[Path] = None  # YAML file this suite was loaded from
 
 
@@ -112,6 +114,9 @@ class SuiteRegistry:
                     param_mappings=param_mappings,
                     matrix=data.get("matrix", False),
                     args_builder=data.get("args_builder"),
+                    parallel=data.get("parallel", False),
+                    # Suites that run cells in slots can always run them one by one
+                    checkpoint=data.get("checkpoint", data.get("parallel", False)),
                     source_path=suite_file,
                 )
                 self._suites[suite.name] = suite
@@ -0,0 +1,106 @@
+"""Tests for the content-addressed experiment cache."""
+
+import json
+import os
+import sys
+
+import pytest
+
+from cpueval.experiment_cache import (
+    ExperimentCache,
+    InputResolver,
+    cell_config,
+    config_key,
+    parse_max_age,
+)
+from cpueval.matrix_scheduler import Cell, SerialAllocator, run_cells
+from cpueval.run_manifest import SUCCEEDED, RunManifest
+
+
+class PinnedResolver(InputResolver):
+    """Resolves without registry or Hub access."""
+
+    def image_digest(self, ref):
+        return "sha256:" + ref.split(":")[-1]
+
+    def revision(self, model):
+        return "abc123"
+
+
+def test_parse_max_age():
+    assert parse_max_age("90") == 90
+    assert parse_max_age("30m") == 1800
+    assert parse_max_age("12h") == 43200
+    assert parse_max_age("7d") == 7 * 86400
+    assert parse_max_age("0") == 0
+    with pytest.raises(ValueError):
+        parse_max_age("soon")
+
+
+def test_config_key_covers_resolved_inputs():
+    resolver = PinnedResolver()
+    cell = Cell("m", 16, "chat")
+    args = ["--models", "m", "--cores", "16", "--vllm-cpus", "32-47"]
+    env = {"DUT_HOSTNAME": "dut-1", "VLLM_PORT": "8100", "PATH": "/usr/bin"}
+
+    config = cell_config("concurrent-load", cell, args, env, resolver)
+    assert config["env"] == {"DUT_HOSTNAME": "dut-1"}  # port and PATH do not matter
+    assert config["images"]["vllm"]["ref"].startswith("docker.io/vllm/")  # group_vars default
+    assert config["model_revision"] == "abc123"
+    key = config_key(config)
+    assert key == config_key(cell_config("concurrent-load", cell, args, {**env, "VLLM_PORT": "8101"}, resolver))
+
+    other_cpuset = args[:-1] + ["48-63"]
+    assert key != config_key(cell_config("concurrent-load", cell, other_cpuset, env, resolver))
+    other_image = {**env, "VLLM_CONTAINER_IMAGE": "quay.io/x/vllm:v2"}
+    assert key != config_key(cell_config("concurrent-load", cell, args, other_image, resolver))
+    assert InputResolver().image_digest("quay.io/x/vllm@sha256:ff") == "sha256:ff"
+
+
+def test_cache_lookup_policy(tmp_path):
+    result_dir = tmp_path / "results" / "16cores-numa1-tp1"
+    result_dir.mkdir(parents=True)
+    cache = ExperimentCache(max_age=3600, root=tmp_path / "cache")
+
+    assert cache.store("ab" * 32, {"cores": 16}, [], run_id="r0") is None  # no results, no entry
+    cache.store("ab" * 32, {"cores": 16}, [str(result_dir)], run_id="r1")
+    assert cache.lookup("ab" * 32)["run_id"] == "r1"
+    assert cache.lookup("cd" * 32) is None
+
+    # Too old
+    path = cache.path("ab" * 32)
+    entry = json.loads(path.read_text())
+    path.write_text(json.dumps({**entry, "measured": entry["measured"] - 7200}))
+    assert cache.lookup("ab" * 32) is None
+
+    # Results deleted since
+    cache.store("ab" * 32, {"cores": 16}, [str(result_dir)], run_id="r2")
+    os.rmdir(result_dir)
+    assert cache.lookup("ab" * 32) is None
+
+
+def test_run_cells_reuses_cached_cells(tmp_path):
+    cells = [Cell("m", 8, "chat"), Cell("m", 16, "chat")]
+    prior = {"key": "k", "run_id": "earlier-run", "result_dirs": [str(tmp_path / "old")]}
+    manifest = RunManifest.create("concurrent-load", cells, {}, runs_dir=tmp_path)
+    started = []
+
+    results = run_cells(
+        cells,
+        SerialAllocator(),
+        lambda cell, slot: started.append(cell) or [sys.executable, "-c", "pass"],
+        log_dir=manifest.log_dir,
+        cwd=tmp_path,
+        base_env={},
+        poll_interval=0.01,
+        report=lambda message: None,
+        on_start=manifest.cell_started,
+        on_finish=manifest.cell_finished,
+        reuse=lambda cell, slot: prior if cell.cores == 8 else None,
+    )
+    assert started == [cells[1]]
+    assert [r.cached for r in results] == [prior, None]
+    entry = manifest.entry(cells[0])
+    assert entry["status"] == SUCCEEDED
+    assert entry["reused"] == {"key": "k", "run_id": "earlier-run"}
+    assert entry["result_dirs"] == prior["result_dirs"]
@@ -0,0 +1,155 @@
+"""Tests for fleet mode (matrix cells across DUT/loadgen pairs)."""
+
+import subprocess
+import sys
+
+import pytest
+
+from cpueval.fleet import (
+    FleetAllocator,
+    HostPair,
+    load_fleet,
+    pairs_from_inventory,
+)
+from cpueval.matrix_scheduler import Cell, CorePool, SchedulerError, SlotAllocator, run_cells
+from .conftest import repo_root
+from .test_matrix_scheduler import make_lscpu
+
+
+def test_load_local_fleet():
+    pairs = load_fleet("local:3")
+    assert [pair.name for pair in pairs] == ["local-0", "local-1", "local-2"]
+    assert all(pair.local for pair in pairs)
+    with pytest.raises(SchedulerError):
+        load_fleet("local:0")
+
+
+def test_load_fleet_file(tmp_path):
+    path = tmp_path / "fleet.yaml"
+    path.write_text(
+        "pairs:\n"
+        "  - {name: a, dut: 10.0.0.1, loadgen: 10.0.0.101}\n"
+        "  - {dut: 10.0.0.2}\n"
+    )
+    assert load_fleet(str(path)) == [
+        HostPair("a", "10.0.0.1", "10.0.0.101"),
+        HostPair("10.0.0.2", "10.0.0.2", "10.0.0.2"),
+    ]
+
+    path.write_text("pairs:\n  - {dut: x}\n  - {dut: x}\n")
+    with pytest.raises(SchedulerError, match="Duplicate"):
+        load_fleet(str(path))
+
+
+def test_pairs_from_inventory():
+    inventory = {
+        "_meta": {"hostvars": {
+            "r1": {"ansible_host": "10.0.0.1", "loadgen_host": "10.0.0.101"},
+            "r2": {"ansible_host": "10.0.0.2"},
+        }},
+        "fleet": {"children": ["rack1"]},
+        "rack1": {"hosts": ["r1", "r2"]},
+    }
+    assert pairs_from_inventory(inventory, "fleet") == [
+        HostPair("r1", "10.0.0.1", "10.0.0.101"),
+        HostPair("r2", "10.0.0.2", "10.0.0.2"),
+    ]
+    with pytest.raises(SchedulerError):
+        pairs_from_inventory(inventory, "missing")
+
+
+def test_fleet_allocator_hands_out_idle_pairs():
+    allocator = FleetAllocator([HostPair("a", "a", "la"), HostPair("b", "b", "lb")])
+    first = allocator.acquire(Cell("m", 8, "chat"))
+    second = allocator.acquire(Cell("m", 8, "code"))
+    assert {first.pair.name, second.pair.name} == {"a", "b"}
+    assert first.env() == {"DUT_HOSTNAME": first.pair.dut, "LOADGEN_HOSTNAME": first.pair.loadgen}
+    assert allocator.acquire(Cell("m", 16, "chat")) is None
+
+    # A failed cell is not placed on the pair it failed on
+    allocator.release(first, failed=True)
+    assert allocator.acquire(Cell("m", 8, "chat"), avoid=[first]) is None
+    assert allocator.acquire(Cell("m", 8, "chat")).pair == first.pair
+
+
+def test_fleet_allocator_drains_failing_pairs():
+    allocator = FleetAllocator([HostPair("a", "a", "a")])
+    for _ in range(2):
+        allocator.release(allocator.acquire(Cell("m", 8, "chat")), failed=True)
+    assert allocator.drained == ["a"]
+    assert allocator.acquire(Cell("m", 8, "chat")) is None
+
+
+def test_fleet_with_slots_per_pair():
+    pairs = [HostPair("a", "a", "a"), HostPair("b", "b", "b")]
+    allocator = FleetAllocator(
+        pairs, {pair.name: SlotAllocator(CorePool(make_lscpu(2, 32))) for pair in pairs}
+    )
+    slots = [allocator.acquire(Cell("m", 16, "chat")) for _ in range(6)]
+    assert all(slot is not None for slot in slots)
+    assert allocator.acquire(Cell("m", 16, "chat")) is None
+    # Cells are spread over pairs before pairs are packed
+    assert [slot.pair.name for slot in slots[:2]] == ["a", "b"]
+    assert slots[0].env()["VLLM_PORT"] == "8100"
+
+
+def test_run_cells_retries_on_another_pair(tmp_path):
+    allocator = FleetAllocator(load_fleet("local:2"))
+    gate = tmp_path / "local-0-drained"
+    release = allocator.release
+
+    def release_and_open_gate(slot, failed=False):
+        release(slot, failed)
+        if allocator.drained:
+            gate.touch()
+
+    allocator.release = release_and_open_gate
+
+    def build_command(cell, slot):
+        # local-0 is broken; local-1 holds its first cell until local-0 is
+        # drained, so the other two cells both fail on local-0 first
+        if slot.pair.name == "local-0":
+            return [sys.executable, "-c", "raise SystemExit(1)"]
+        return [sys.executable, "-c", (
+            "import os, sys, time\n"
+            "deadline = time.monotonic() + 30\n"
+            f"while not os.path.exists({str(gate)!r}):\n"
+            "    if time.monotonic() > deadline:\n"
+            "        sys.exit(2)\n"
+            "    time.sleep(0.01)\n"
+        )]
+
+    cells = [Cell("m", cores, "chat") for cores in (8, 16, 32)]
+    results = run_cells(
+        cells,
+        allocator,
+        build_command,
+        log_dir=tmp_path,
+        cwd=tmp_path,
+        base_env={},
+        retries=1,
+        poll_interval=0.01,
+        report=lambda message: None,
+    )
+    assert sorted(r.cell.cores for r in results) == [8, 16, 32]
+    assert all(r.returncode == 0 and r.slot.pair.name == "local-1" for r in results)
+    assert allocator.drained == ["local-0"]
+    assert sum(r.attempts for r in results) == 5
+
+
+def test_fleet_dry_run():
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "cpueval",
+            "--suite", "concurrent-load", "--fleet", "local:2", "--dry-run",
+            "--models", "tiny", "--workloads", "chat",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+
+    assert result.returncode == 0, f"STDERR: {result.stderr}"
+    assert result.stdout.count("# Wave") == 2
+    assert "DUT_HOSTNAME=localhost LOADGEN_HOSTNAME=localhost" in result.stdout
+    assert "--workloads chat --phase 1 --dry-run" in result.stdout
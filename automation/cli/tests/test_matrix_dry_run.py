@@ -731,3 +731,47 @@ def test_vllm_cpus_suppresses_vllm_cpu_start():
     assert result.returncode == 0, f"STDERR: {result.stderr}"
     assert "--vllm-cpus 64-95" in result.stdout
     assert "--vllm-cpu-start" not in result.stdout
+
+
+def test_concurrent_load_slo_search_flag():
+    """--extra slo=... runs the concurrent-load cells as an adaptive SLO search."""
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "cpueval", "run",
+            "--suite", "concurrent-load",
+            "--models", "tiny",
+            "--cores", "8",
+            "--workloads", "chat",
+            "--extra", "slo=ttft_ms=2000,itl_ms=100",
+            "--dry-run",
+            "--skip-doctor",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+
+    assert result.returncode == 0, f"STDERR: {result.stderr}"
+    assert "--slo ttft_ms=2000,itl_ms=100" in result.stdout
+
+
+def test_concurrent_load_early_stop_flag():
+    """--extra early_stop=... ends concurrent-load points once p95 converges."""
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "cpueval", "run",
+            "--suite", "concurrent-load",
+            "--models", "tiny",
+            "--cores", "8",
+            "--workloads", "chat",
+            "--extra", "early_stop=ttft_ms",
+            "--dry-run",
+            "--skip-doctor",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+
+    assert result.returncode == 0, f"STDERR: {result.stderr}"
+    assert "--early-stop ttft_ms" in result.stdout
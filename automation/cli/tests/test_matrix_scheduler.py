@@ -0,0 +1,219 @@
+"""Tests for the parallel matrix scheduler."""
+
+import subprocess
+import sys
+
+import pytest
+
+from cpueval.matrix_scheduler import (
+    Cell,
+    CorePool,
+    SchedulerError,
+    SlotAllocator,
+    list_matrix,
+    plan_waves,
+    run_cells,
+)
+from cpueval.runners import build_script_command
+from .conftest import repo_root
+
+
+def make_lscpu(nodes: int, cores_per_node: int, smt: bool = True) -> str:
+    """lscpu -e=CPU,NODE,CORE -n output, SMT siblings numbered after all cores."""
+    total = nodes * cores_per_node
+    lines = [f"{core} {core // cores_per_node} {core}" for core in range(total)]
+    if smt:
+        lines += [f"{core + total} {core // cores_per_node} {core}" for core in range(total)]
+    return "\n".join(lines) + "\n"
+
+
+def all_cpus(slots):
+    return [cpu for slot in slots for cpu in slot.vllm_cpus + slot.loadgen_cpus]
+
+
+def test_core_pool_physical_cores_and_housekeeping():
+    pool = CorePool(make_lscpu(4, 8))
+    assert pool.node_cpus[1] == list(range(8, 16))  # SMT siblings left out
+    assert pool.housekeeping_node == 0
+    assert pool.vllm_nodes == [1, 2, 3]
+
+    two_node = CorePool(make_lscpu(2, 8))
+    assert two_node.housekeeping_node is None
+    assert two_node.vllm_nodes == [0, 1]
+
+    with pytest.raises(SchedulerError):
+        CorePool("")
+
+
+def test_slots_are_disjoint():
+    allocator = SlotAllocator(CorePool(make_lscpu(4, 32)), loadgen_cores=4)
+    slots = []
+    for cores in (32, 16, 16, 8, 8, 8, 8):
+        slot = allocator.acquire(Cell("m", cores, "chat"))
+        assert slot is not None
+        slots.append(slot)
+
+    cpus = all_cpus(slots)
+    assert len(cpus) == len(set(cpus))
+    assert not any(0 in slot.vllm_nodes for slot in slots)  # housekeeping node
+    assert all(slot.loadgen_node == 0 for slot in slots)
+    assert len({slot.port for slot in slots}) == len(slots)
+    assert len({slot.container_name for slot in slots}) == len(slots)
+
+    # All three vLLM nodes are full now
+    assert allocator.acquire(Cell("m", 8, "chat")) is None
+    allocator.release(slots[0])
+    reused = allocator.acquire(Cell("m", 8, "chat"))
+    assert reused.index == 0 and reused.vllm_nodes == slots[0].vllm_nodes
+
+
+def test_multi_node_cells_match_sequential_allocation():
+    allocator = SlotAllocator(CorePool(make_lscpu(4, 32)))
+    # 64 cores do not fit one 32-core node: TP=2 on the first cores of two nodes
+    assert allocator.shape(64) == (2, 32)
+    slot = allocator.acquire(Cell("m", 64, "chat"))
+    assert slot.tensor_parallel == 2
+    assert slot.vllm_nodes == [1, 2]
+    assert slot.script_vars()["vllm_cpus"] == "32-95"
+    assert slot.env()["VLLM_NUMA_NODES"] == "1,2"
+
+    # Node 3 alone cannot take another TP=2 cell
+    assert allocator.acquire(Cell("m", 64, "chat")) is None
+
+    with pytest.raises(SchedulerError):
+        allocator.shape(512)
+
+
+def test_single_node_cells_leave_first_cores_to_tp_ranks():
+    allocator = SlotAllocator(CorePool(make_lscpu(4, 32)), loadgen_cores=4)
+    small = allocator.acquire(Cell("m", 15, "chat"))
+    assert small.vllm_cpus == list(range(49, 64))  # highest cores of node 1
+    assert small.script_vars()["vllm_numa_node"] == 1
+    assert small.loadgen_node == 0 and small.loadgen_cpus == [28, 29, 30, 31]
+    allocator.acquire(Cell("m", 15, "chat"))  # fills node 1
+    assert allocator.acquire(Cell("m", 15, "chat")).vllm_nodes == [2]
+
+    # TP=2 ranks take the first 17 cores of nodes 2 and 3, below the TP=1 cell
+    wide = allocator.acquire(Cell("m", 34, "chat"))
+    assert wide is not None and wide.vllm_nodes == [2, 3]
+    assert wide.script_vars()["vllm_numa_node"] is None
+
+
+def test_max_slots_and_separate_loadgen_pool():
+    allocator = SlotAllocator(
+        CorePool(make_lscpu(2, 32)), loadgen=CorePool(make_lscpu(1, 8)), loadgen_cores=4, max_slots=3
+    )
+    slots = [allocator.acquire(Cell("m", 8, "chat")) for _ in range(2)]
+    assert all(slot.loadgen_node == 0 for slot in slots)
+    assert slots[0].loadgen_cpus == [0, 1, 2, 3] and slots[1].loadgen_cpus == [4, 5, 6, 7]
+    # The 8-core load generator host is exhausted before the DUT
+    assert allocator.acquire(Cell("m", 8, "chat")) is None
+
+    allocator = SlotAllocator(CorePool(make_lscpu(2, 32)), max_slots=1)
+    assert allocator.acquire(Cell("m", 8, "chat")) is not None
+    assert allocator.acquire(Cell("m", 8, "chat")) is None
+
+
+def test_plan_waves():
+    cells = [Cell("m", cores, w) for cores in (8, 16, 32) for w in ("chat", "code")]
+    waves, unplaceable = plan_waves(cells, SlotAllocator(CorePool(make_lscpu(4, 32))))
+    assert unplaceable == []
+    assert {cell for wave in waves for cell, _ in wave} == set(cells)
+    assert len(waves) == 2
+    for wave in waves:
+        cpus = all_cpus(slot for _, slot in wave)
+        assert len(cpus) == len(set(cpus))
+
+    waves, unplaceable = plan_waves(
+        [Cell("m", 32, "chat")], SlotAllocator(CorePool(make_lscpu(1, 32)))
+    )
+    assert waves == [] and unplaceable == [Cell("m", 32, "chat")]  # no room for loadgen
+
+
+def test_list_matrix_from_suite_script():
+    cmd = build_script_command(
+        "automation/test-execution/scripts/bash/run-concurrent-load-suite.sh",
+        ["--models", "tiny,qwen", "--skip-models", "qwen", "--cores", "8,16", "--workloads", "chat"],
+    )
+    cells = list_matrix(cmd, repo_root())
+    assert cells == [Cell("tiny", 8, "chat"), Cell("tiny", 16, "chat")]
+
+
+def test_list_matrix_without_stdin(tmp_path):
+    script = tmp_path / "suite.sh"
+    script.write_text(
+        "#!/bin/bash\n"
+        "read -r answer || { echo \"no stdin\" >&2; exit 3; }\n"
+    )
+    script.chmod(0o755)
+    with pytest.raises(SchedulerError, match="--list-matrix failed: no stdin"):
+        list_matrix([str(script)], tmp_path)
+
+
+def test_list_matrix_offline_batch_all_mode():
+    cmd = build_script_command(
+        "automation/test-execution/scripts/bash/run-offline-batch-suite.sh", ["all", "tiny", "8"]
+    )
+    cells = list_matrix(cmd, repo_root())
+    assert cells and {cell.workload for cell in cells} >= {"baseline", "kv_capacity"}
+
+
+def test_run_cells(tmp_path):
+    cells = [Cell("ok", 8, "chat"), Cell("fail", 8, "chat"), Cell("ok", 16, "chat")]
+
+    def build_command(cell, slot):
+        code = 1 if cell.model == "fail" else 0
+        return [sys.executable, "-c", f"import os; print(os.environ['VLLM_PORT']); raise SystemExit({code})"]
+
+    results = run_cells(
+        cells,
+        SlotAllocator(CorePool(make_lscpu(2, 16))),
+        build_command,
+        log_dir=tmp_path,
+        cwd=tmp_path,
+        base_env={},
+        continue_on_error=True,
+        poll_interval=0.01,
+        report=lambda message: None,
+    )
+    assert sorted((r.cell.model, r.cell.cores, r.returncode) for r in results) == [
+        ("fail", 8, 1), ("ok", 8, 0), ("ok", 16, 0)
+    ]
+    for result in results:
+        assert result.log_path.read_text().strip() == str(result.slot.port)
+
+
+def test_parallel_dry_run(tmp_path):
+    lscpu = tmp_path / "lscpu.txt"
+    lscpu.write_text(make_lscpu(4, 32))
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "cpueval",
+            "--suite", "concurrent-load", "--parallel", "--dry-run",
+            "--models", "tiny", "--workloads", "chat,code",
+            "--dut-lscpu", str(lscpu),
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+
+    assert result.returncode == 0, f"STDERR: {result.stderr}"
+    assert "# Wave 1" in result.stdout
+    assert "VLLM_PORT=8100 VLLM_CONTAINER_NAME=vllm-slot0" in result.stdout
+    assert "--models TinyLlama/TinyLlama-1.1B-Chat-v1.0 --cores 32 --workloads chat" in result.stdout
+    assert "--guidellm-numa-node 0" in result.stdout
+
+
+def test_parallel_rejected_for_unsupported_suite():
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "cpueval",
+            "--suite", "embedding", "--parallel", "--dry-run",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+    assert result.returncode == 1
+    assert "does not support --parallel" in result.stdout
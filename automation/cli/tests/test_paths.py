@@ -98,3 +98,23 @@ def test_embedding_suite_does_not_fall_back_to_llm(tmp_path):
         paths_mod.get_llm_results_dir = orig_llm
 
     assert result is None
+
+
+# ---------------------------------------------------------------------------
+# find_latest_result
+# ---------------------------------------------------------------------------
+
+def test_find_latest_result_model_filter(tmp_path):
+    """LLM lookup matches the sanitized model directory exactly."""
+    target = _make_llm_result(tmp_path, "Qwen__Qwen2.5-0.5B", "chat-run-1")
+    _make_llm_result(tmp_path, "Qwen__Qwen2.5-0.5B-Instruct", "chat-run-2")
+
+    from cpueval import paths as paths_mod
+    orig = paths_mod.get_llm_results_dir
+    paths_mod.get_llm_results_dir = lambda: tmp_path / "llm"
+    try:
+        result = find_latest_result(model="Qwen/Qwen2.5-0.5B")
+    finally:
+        paths_mod.get_llm_results_dir = orig
+
+    assert result == target
@@ -0,0 +1,209 @@
+"""Tests for the CPU pinning profile generator."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+import yaml
+
+from cpueval.matrix_scheduler import SchedulerError
+from cpueval.profile_generator import ProfileGenerator, write_profiles
+from cpueval.runners import load_profile
+from .conftest import repo_root
+from .test_matrix_scheduler import make_lscpu
+
+
+def make_cache_lscpu(nodes: int, cores_per_node: int, cores_per_l3: int) -> str:
+    """lscpu -e=CPU,NODE,CORE,CACHE -n output with several L3 domains per node."""
+    total = nodes * cores_per_node
+    lines = []
+    for thread in range(2):
+        for core in range(total):
+            cache = f"{core}:{core}:{core}:{core // cores_per_l3}"
+            lines.append(f"{core + thread * total} {core // cores_per_node} {core} {cache}")
+    return "\n".join(lines) + "\n"
+
+
+def by_name(profiles):
+    return {profile.name: profile for profile in profiles}
+
+
+def test_dual_socket_split():
+    profiles = by_name(ProfileGenerator(make_lscpu(2, 32)).generate())
+    split = profiles["vllm-node1-loadgen-node0"]
+    assert split.vars == {"vllm_numa_node": 1, "guidellm_cpus": "0-31", "guidellm_numa_node": 0}
+    assert split.cores == 32
+    assert "vllm-node0-loadgen-node1" in profiles
+    # No housekeeping node on 2-node systems
+    assert not any(name.startswith("housekeeping") for name in profiles)
+
+
+def test_housekeeping_node_is_reserved():
+    generator = ProfileGenerator(make_lscpu(4, 16), loadgen_cores=4, prefix="sku-")
+    profiles = by_name(generator.generate())
+
+    assert sorted(profiles) == [
+        "sku-housekeeping-node0-reserved",
+        "sku-instance-node1", "sku-instance-node2", "sku-instance-node3",
+        "sku-vllm-node1-loadgen-node2", "sku-vllm-node2-loadgen-node3",
+        "sku-vllm-node3-loadgen-node1",
+    ]
+    housekeeping = profiles["sku-housekeeping-node0-reserved"]
+    assert housekeeping.vars == {"guidellm_cpus": "12-15", "guidellm_numa_node": 0}
+    # TP=2 over two of the three vLLM nodes
+    assert housekeeping.cores == 32
+    assert generator.summary() == "4 NUMA nodes, 16+16+16+16 physical cores, housekeeping node 0"
+
+
+def test_instances_are_disjoint_with_cache_domains():
+    # 2 L3 domains of 8 cores per node; compact placement keeps vLLM in whole domains
+    generator = ProfileGenerator(make_cache_lscpu(2, 16, 8), loadgen_cores=4)
+    instances = [p for p in generator.generate() if p.name.startswith("instance-")]
+    assert [p.name for p in instances] == ["instance-node0", "instance-node1"]
+
+    cpus = []
+    for profile in instances:
+        vllm = generator.cpu_utils.expand_cpu_range(profile.vars["vllm_cpus"])
+        loadgen = generator.cpu_utils.expand_cpu_range(profile.vars["guidellm_cpus"])
+        assert profile.vars["vllm_numa_node"] == profile.vars["guidellm_numa_node"]
+        assert len(vllm) == profile.cores == 12
+        cpus += vllm + loadgen
+    assert len(cpus) == len(set(cpus)) == 32  # physical cores only, no overlap
+    assert instances[0].vars == {
+        "vllm_cpus": "0-11", "vllm_numa_node": 0, "guidellm_cpus": "12-15", "guidellm_numa_node": 0,
+    }
+
+
+def test_invalid_input():
+    with pytest.raises(SchedulerError):
+        ProfileGenerator("")
+    with pytest.raises(SchedulerError):
+        ProfileGenerator(make_lscpu(2, 8), loadgen_cores=0)
+
+
+def test_written_profiles_load(tmp_path):
+    generator = ProfileGenerator(make_lscpu(2, 8))
+    profiles = generator.generate()
+    written = write_profiles(profiles, tmp_path, "test lscpu")
+    for profile in profiles:
+        assert load_profile(str(written[profile.name]), tmp_path) == profile.vars
+
+    # Existing profiles are kept unless forced
+    assert set(write_profiles(profiles, tmp_path, "test lscpu").values()) == {None}
+    assert None not in write_profiles(profiles, tmp_path, "test lscpu", force=True).values()
+
+
+def test_cli_generate(tmp_path):
+    lscpu = tmp_path / "lscpu.txt"
+    lscpu.write_text(make_lscpu(4, 8))
+
+    def cli(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "cpueval", "profiles", "generate", "--lscpu", str(lscpu), *args],
+            capture_output=True, text=True, cwd=repo_root(),
+        )
+
+    result = cli("--dry-run")
+    assert result.returncode == 0, result.stderr
+    assert "housekeeping-node0-reserved" in result.stdout
+    assert not any(tmp_path.glob("*.yaml"))
+
+    out = tmp_path / "profiles"
+    result = cli("--output-dir", str(out))
+    assert result.returncode == 0, result.stderr
+    profile = yaml.safe_load((out / "vllm-node1-loadgen-node2.yaml").read_text())
+    assert profile == {"vllm_numa_node": 1, "guidellm_cpus": "16-23", "guidellm_numa_node": 2}
+
+    # Listing still works as before
+    result = subprocess.run(
+        [sys.executable, "-m", "cpueval", "profiles"], capture_output=True, text=True, cwd=repo_root()
+    )
+    assert result.returncode == 0 and "dual-socket-split" in result.stdout
+
+
+def test_plan_rejects_shared_cores():
+    generator = ProfileGenerator(make_lscpu(2, 8))
+    plan = generator.plan({"vllm_numa_node": 1, "guidellm_cpus": "0-3", "guidellm_numa_node": 0}, 8)
+    assert [(p["role"], p["cpuset_cpus"], p["cpuset_mems"]) for p in plan["placements"]] == [
+        ("vllm", "8-15", "1"), ("guidellm", "0-3", "0"),
+    ]
+
+    with pytest.raises(SchedulerError, match="overlaps vllm"):
+        generator.plan({"vllm_cpus": "0-7", "guidellm_cpus": "4-7"}, 8)
+    # CPU 16 is the SMT sibling of CPU 0
+    with pytest.raises(SchedulerError, match="SMT sibling"):
+        generator.plan({"vllm_cpus": "0-7", "guidellm_cpus": "16"}, 8)
+    with pytest.raises(SchedulerError, match="not in cpuset_mems 0"):
+        generator.plan({"vllm_numa_node": 0, "guidellm_cpus": "8-11"}, 4)
+
+
+def test_cli_check(tmp_path):
+    lscpu = tmp_path / "lscpu.txt"
+    lscpu.write_text(make_lscpu(2, 8))
+    profile = tmp_path / "overlap.yaml"
+    profile.write_text("vllm_cpus: '0-7'\nguidellm_cpus: '4-7'\nguidellm_numa_node: 0\n")
+
+    def cli(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "cpueval", "profiles", "check", *args, "--lscpu", str(lscpu)],
+            capture_output=True, text=True, cwd=repo_root(),
+        )
+
+    result = cli(str(profile), "--cores", "8")
+    assert result.returncode == 1
+    assert "overlaps vllm" in result.stdout
+
+    profile.write_text("vllm_numa_node: 1\nguidellm_cpus: '0-3'\nguidellm_numa_node: 0\n")
+    result = cli(str(profile), "--cores", "8", "--json")
+    assert result.returncode == 0, result.stdout
+    plan = json.loads(result.stdout)
+    assert plan["free"] == {"0": "4-7", "1": ""}
+
+
+def test_search_allocations():
+    generator = ProfileGenerator(make_lscpu(8, 16))
+    found = generator.search(64, top_k=3)
+    assert [(a["tensor_parallel"], a["allocated_nodes"], a["greedy"]) for a in found["allocations"]] == [
+        (4, [1, 2, 3, 4], True), (8, [0, 1, 2, 3, 4, 5, 6, 7], False), (4, [0, 1, 2, 3], False),
+    ]
+    assert found["throughput_model"] is None
+
+    # Past runs where TP costs throughput at equal cores push the search to TP=4
+    records = [
+        {"cores": cores, "tensor_parallel": tp, "throughput": cores / tp ** 0.8, "group": "m"}
+        for cores in (32, 64) for tp in (1, 2, 4)
+    ]
+    generator.topology["allocation_policy"]["housekeeping"]["strategy"] = "minimal_reservation"
+    found = generator.search(64, top_k=1, throughput_records=records)
+    assert found["throughput_model"]["tp_exponent"] == -0.8
+    assert found["allocations"][0]["tensor_parallel"] == 4
+
+    with pytest.raises(SchedulerError, match="No placement of 17 cores"):
+        generator.search(17)
+
+
+def test_cli_allocations(tmp_path):
+    lscpu = tmp_path / "lscpu.txt"
+    lscpu.write_text(make_lscpu(8, 16))
+    result = subprocess.run(
+        [sys.executable, "-m", "cpueval", "allocations", "--cores", "128", "--lscpu", str(lscpu), "--json"],
+        capture_output=True, text=True, cwd=repo_root(),
+    )
+    assert result.returncode == 0, result.stdout
+    allocation, = json.loads(result.stdout)["allocations"]
+    assert allocation["tensor_parallel"] == 8
+    assert allocation["cost"]["housekeeping"] == 0.5
+
+
+def test_cli_allocations_memory_not_checked(tmp_path):
+    lscpu = tmp_path / "lscpu.txt"
+    lscpu.write_text(make_lscpu(4, 16))
+    args = [sys.executable, "-m", "cpueval", "allocations", "--cores", "32", "--lscpu", str(lscpu),
+            "--model-memory", "16GiB"]
+    result = subprocess.run(args, capture_output=True, text=True, cwd=repo_root())
+    assert result.returncode == 0, result.stdout
+    assert "memory fit not checked" in result.stdout
+
+    result = subprocess.run(args + ["--json"], capture_output=True, text=True, cwd=repo_root())
+    assert not any(a["memory"]["checked"] for a in json.loads(result.stdout)["allocations"])
@@ -0,0 +1,142 @@
+"""Tests for checkpointed matrix runs (run manifests and cpueval resume)."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from cpueval.matrix_scheduler import Cell, SerialAllocator, list_matrix, run_cells
+from cpueval.run_manifest import (
+    FAILED,
+    PENDING,
+    SUCCEEDED,
+    ManifestError,
+    RunManifest,
+    find_cell_results,
+    list_runs,
+)
+from cpueval.runners import build_script_command
+from .conftest import repo_root
+
+
+def test_offline_batch_list_matrix_numbers_repeats():
+    cmd = build_script_command(
+        "automation/test-execution/scripts/bash/run-offline-batch-suite.sh",
+        ["use-cases", "2", "org/model"],
+    )
+    cells = list_matrix(cmd, repo_root())
+    # 10 use cases at one core count, ETL at four; two runs each
+    assert len(cells) == 2 * (10 + 4)
+    assert len(set(cells)) == len(cells)
+
+    first, second = cells[:2]
+    assert (first.workload, first.cores, first.repeat) == ("summarization", 16, 1)
+    assert second.repeat == 2 and second.label.endswith("| run 2")
+    assert first.args == (
+        "run-test", "org/model", "sharegpt", "1000", "16", "-e", "use_case=summarization"
+    )
+    assert {cell.cores for cell in cells if cell.workload == "etl"} == {8, 16, 24, 32}
+
+
+def test_manifest_records_cells(tmp_path):
+    cells = [Cell("m", 8, "chat"), Cell("m", 16, "chat")]
+    manifest = RunManifest.create("concurrent-load", cells, {"retries": 0}, runs_dir=tmp_path)
+    assert manifest.run_id.endswith("-concurrent-load")
+    assert manifest.outstanding() == cells
+
+    # A second run in the same second gets its own ID
+    other = RunManifest.create("concurrent-load", cells, {}, runs_dir=tmp_path)
+    assert other.run_id != manifest.run_id
+
+    loaded = RunManifest.load(manifest.run_id, runs_dir=tmp_path)
+    assert loaded.options == {"retries": 0}
+    assert [entry["status"] for entry in loaded.entries] == [PENDING, PENDING]
+    assert [m.run_id for m in list_runs(tmp_path)] == [other.run_id, manifest.run_id]
+
+    with pytest.raises(ManifestError):
+        RunManifest.load("missing", runs_dir=tmp_path)
+
+
+def test_find_cell_results(tmp_path):
+    run_dir = tmp_path / "m" / "chat-20261017-101500" / "16cores-numa1-tp1"
+    run_dir.mkdir(parents=True)
+    (tmp_path / "m" / "code-20261017-101500" / "16cores-numa2-tp1").mkdir(parents=True)
+    (tmp_path / "m" / "chat-20261017-101500" / "8cores-numa1-tp1").mkdir(parents=True)
+
+    assert find_cell_results(Cell("m", 16, "chat"), 0, tmp_path) == [run_dir]
+    assert find_cell_results(Cell("m", 16, "chat"), run_dir.stat().st_mtime + 60, tmp_path) == []
+    assert find_cell_results(Cell("other", 16, "chat"), 0, tmp_path) == []
+
+
+def test_interrupted_run_resumes_outstanding_cells(tmp_path):
+    cells = [Cell("ok", 8, "chat"), Cell("fail", 8, "chat"), Cell("ok", 16, "chat")]
+    manifest = RunManifest.create("concurrent-load", cells, {}, runs_dir=tmp_path)
+
+    def run(to_run, failing):
+        return run_cells(
+            to_run,
+            SerialAllocator(),
+            lambda cell, slot: [sys.executable, "-c", f"raise SystemExit({int(cell.model in failing)})"],
+            log_dir=manifest.log_dir,
+            cwd=tmp_path,
+            base_env={},
+            poll_interval=0.01,
+            report=lambda message: None,
+            on_start=manifest.cell_started,
+            on_finish=manifest.cell_finished,
+        )
+
+    # The failure stops the run: the last cell is never started
+    results = run(cells, failing={"fail"})
+    assert [r.cell for r in results] == cells  # script order, not largest first
+    saved = json.loads(manifest.path.read_text())
+    assert [entry["status"] for entry in saved["cells"]] == [SUCCEEDED, FAILED, PENDING]
+    assert saved["cells"][1]["log"].endswith("fail-chat-8c.log")
+
+    resumed = RunManifest.load(manifest.run_id, runs_dir=tmp_path)
+    assert resumed.outstanding() == cells[1:]
+    manifest = resumed
+    run(resumed.outstanding(), failing=set())
+    assert manifest.outstanding() == []
+    assert manifest.entry(cells[1])["attempts"] == 2
+    assert manifest.entry(cells[0])["attempts"] == 1
+
+
+def test_checkpoint_dry_run_offline_batch():
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "cpueval",
+            "--suite", "offline-batch", "--checkpoint", "--dry-run",
+            "--runs", "1", "--models", "org/model",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+    assert result.returncode == 0, f"STDERR: {result.stderr}"
+    assert result.stdout.count("# Wave") == 14
+    assert "→ sequential" in result.stdout
+    assert "run-offline-batch-suite.sh run-test org/model sonnet 500 24 -e use_case=etl" in result.stdout
+
+
+def test_checkpoint_rejected_for_unsupported_suite():
+    result = subprocess.run(
+        [sys.executable, "-m", "cpueval", "--suite", "embedding", "--checkpoint", "--dry-run"],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+    assert result.returncode == 1
+    assert "does not support --checkpoint" in result.stdout
+
+
+def test_resume_unknown_run():
+    result = subprocess.run(
+        [sys.executable, "-m", "cpueval", "resume", "no-such-run"],
+        capture_output=True,
+        text=True,
+        cwd=str(repo_root()),
+    )
+    assert result.returncode == 1
+    assert "No run manifest" in result.stdout
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Allocation search: score every feasible TP / NUMA node placement.
+
+allocate_cores_multi_numa picks greedily: the lowest TP that fits, on the
+largest nodes, never touching the housekeeping node. search_allocations
+enumerates every (TP, node set) with requested_cores / TP cores per node
+instead, drops the ones whose ranks do not fit in node-local memory (where
+the topology lists free memory per node), and ranks the rest with a cost model of one decode step, relative to a single
+rank reading all weights at full node bandwidth:
+
+    memory        weights are sharded over TP ranks, each reading its shard
+                  at its share of the node's memory bandwidth (the slowest
+                  rank sets the pace): (1 / TP) / min(bandwidth share)
+    cross_node    all-reduce traffic between ranks, (TP - 1) / TP, scaled by
+                  the mean NUMA distance between the nodes (1.0 = SLIT 20)
+    housekeeping  fraction of the housekeeping node's cores taken
+
+A node's bandwidth share is its memory_bandwidth relative to the fastest
+node (equal when unknown), scaled down when a rank has fewer cores than it
+takes to saturate the node's memory controllers.
+
+An optional throughput model fitted from past results (fit_throughput_model)
+scales the cost by the measured effect of TP at a fixed core count.
+"""
+
+import math
+import os
+import sys
+from itertools import combinations
+from typing import Any, Dict, List
+
+try:
+    from cpu_utils import (
+        AnsibleFilterError,
+        VALID_TP_VALUES,
+        allocate_cores_multi_numa,
+        build_allocation,
+        calculate_valid_allocations,
+        memory_requirement,
+        normalize_nodes,
+        rank_memory_bytes,
+    )
+except ImportError:
+    # Ansible loads filter plugins by file path, not from sys.path
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from cpu_utils import (
+        AnsibleFilterError,
+        VALID_TP_VALUES,
+        allocate_cores_multi_numa,
+        build_allocation,
+        calculate_valid_allocations,
+        memory_requirement,
+        normalize_nodes,
+        rank_memory_bytes,
+    )
+
+# Cost model weights (cost terms are relative to one rank reading all weights)
+DEFAULT_WEIGHTS = {
+    'cross_node': 0.1,
+    'housekeeping': 0.5,
+    'throughput_model': 1.0,
+}
+
+# Fraction of a node's cores that saturates its memory bandwidth
+BANDWIDTH_SATURATION = 0.5
+
+# SLIT distance between nodes one hop apart (local is 10)
+REMOTE_DISTANCE = 20
+
+
+def _optional(value):
+    """None for Ansible's omit, '' and 'None', the value otherwise."""
+    if value is None or str(type(value).__name__) == '_OmitType' or value in ('', 'None'):
+        return None
+    return value
+
+
+def _distance(nodes_by_id, a, b):
+    distances = nodes_by_id[a].get('distances') or {}
+    value = distances.get(b, distances.get(int(b)) if str(b).isdigit() else None)
+    return float(value) if value is not None else REMOTE_DISTANCE
+
+
+def _cost(ranks, cores_per_node, tp, nodes_by_id, housekeeping_id, weights, throughput_model, max_bandwidth):
+    """Cost terms of one placement (lower is faster)."""
+    shares = []
+    for node in ranks:
+        bandwidth = nodes_by_id[node['id']].get('memory_bandwidth') or max_bandwidth
+        saturating = BANDWIDTH_SATURATION * node['physical_cores']
+        shares.append(float(bandwidth) / max_bandwidth * min(1.0, cores_per_node / saturating))
+    bandwidth_share = min(shares)
+    memory = (1.0 / tp) / bandwidth_share
+
+    cross_node = 0.0
+    if tp > 1:
+        pairs = list(combinations([node['id'] for node in ranks], 2))
+        hops = sum(_distance(nodes_by_id, a, b) for a, b in pairs) / len(pairs) / REMOTE_DISTANCE
+        cross_node = weights['cross_node'] * (tp - 1) / tp * hops
+
+    housekeeping = 0.0
+    for node in ranks:
+        if node['id'] == housekeeping_id:
+            housekeeping = weights['housekeeping'] * cores_per_node / node['physical_cores']
+
+    total = memory + cross_node + housekeeping
+    throughput_factor = 1.0
+    if throughput_model:
+        # Predicted throughput ~ TP^tp_exponent at a fixed core count
+        throughput_factor = tp ** -float(throughput_model.get('tp_exponent', 0.0))
+        total *= throughput_factor ** weights['throughput_model']
+
+    return {
+        'total': round(total, 4),
+        'memory': round(memory, 4),
+        'bandwidth_share': round(bandwidth_share, 4),
+        'cross_node': round(cross_node, 4),
+        'housekeeping': round(housekeeping, 4),
+        'throughput_factor': round(throughput_factor, 4),
+    }
+
+
+def search_allocations(numa_topology, requested_cores, top_k=5, requested_tp=None, model_memory=None,
+                       kv_cache_space=None, cache_policy=None, weights=None, throughput_model=None):
+    """
+    Rank every feasible TP / NUMA node placement of requested_cores.
+
+    Candidates use one rank per node with requested_cores / TP cores each,
+    TP from VALID_TP_VALUES (or requested_tp). The housekeeping node is a
+    candidate too, at the cost of its housekeeping term. Placements with
+    the same TP and cost are listed once (the lowest node ids).
+
+    Args:
+        numa_topology: Topology dict from detect-numa-topology.yml; nodes may
+            carry memory_bandwidth (any unit) and distances (node id -> SLIT)
+        requested_cores: Total physical cores to allocate
+        top_k: Number of placements to return
+        requested_tp: Optional TP to restrict the search to
+        model_memory: Optional model weight size (e.g., "16GiB")
+        kv_cache_space: Optional KV cache space per rank (e.g., "11GiB")
+        cache_policy: Optional 'compact' or 'spread' placement within nodes
+        weights: Optional overrides of DEFAULT_WEIGHTS
+        throughput_model: Optional fit_throughput_model() result
+
+    Returns:
+        List of allocations as allocate_cores_multi_numa returns them, best
+        first, each with 'rank', 'cost' (total and its terms), 'greedy'
+        (whether allocate_cores_multi_numa picks the same TP and nodes) and,
+        given model_memory, 'memory' ('checked' is False when a rank's node
+        has no memory_free_bytes, so its fit was assumed)
+
+    Raises:
+        AnsibleFilterError: If no placement is feasible
+
+    Example:
+        numa_topology | search_allocations(96, 3)
+    """
+    try:
+        requested_cores = int(requested_cores)
+        top_k = int(top_k)
+    except (TypeError, ValueError) as e:
+        raise AnsibleFilterError(f"requested_cores and top_k must be integers: {e}")
+    if requested_cores <= 0 or top_k <= 0:
+        raise AnsibleFilterError(
+            f"requested_cores and top_k must be positive, got {requested_cores} and {top_k}"
+        )
+    requested_tp = _optional(requested_tp)
+    tp_values = VALID_TP_VALUES
+    if requested_tp is not None:
+        if str(requested_tp) not in [str(tp) for tp in VALID_TP_VALUES]:
+            raise AnsibleFilterError(f"Invalid tensor_parallel: {requested_tp}. Valid values: {VALID_TP_VALUES}")
+        tp_values = [int(requested_tp)]
+    weights = {**DEFAULT_WEIGHTS, **(_optional(weights) or {})}
+    throughput_model = _optional(throughput_model)
+
+    raw_nodes = numa_topology.get('nodes', [])
+    nodes = normalize_nodes(raw_nodes)
+    if not nodes:
+        raise AnsibleFilterError("No NUMA nodes in topology")
+    nodes_by_id = {
+        str(raw['id']): {
+            'memory_bandwidth': _optional(raw.get('memory_bandwidth')),
+            'distances': {str(k): v for k, v in (raw.get('distances') or {}).items()},
+        }
+        for raw in raw_nodes
+    }
+    max_bandwidth = max(
+        (float(n['memory_bandwidth']) for n in nodes_by_id.values() if n['memory_bandwidth']), default=1.0
+    )
+
+    housekeeping_policy = numa_topology.get('allocation_policy', {}).get('housekeeping', {})
+    housekeeping_id = None
+    if housekeeping_policy.get('strategy', 'reserve_node') == 'reserve_node' and len(nodes) >= 3:
+        housekeeping_id = str(housekeeping_policy.get('reserved_node', 0))
+
+    memory_required = memory_requirement(model_memory, kv_cache_space)
+
+    candidates = []
+    for tp in tp_values:
+        if tp > len(nodes) or requested_cores % tp:
+            continue
+        cores_per_node = requested_cores // tp
+        rank_bytes = rank_memory_bytes(memory_required, tp)
+        eligible = [
+            n for n in nodes
+            if n['physical_cores'] >= cores_per_node
+            and (rank_bytes is None or n['memory_free_bytes'] is None or n['memory_free_bytes'] >= rank_bytes)
+        ]
+        for ranks in combinations(eligible, tp):
+            cost = _cost(ranks, cores_per_node, tp, nodes_by_id, housekeeping_id, weights,
+                         throughput_model, max_bandwidth)
+            candidates.append((cost, tp, cores_per_node, ranks))
+
+    if not candidates:
+        raise AnsibleFilterError(
+            f"No placement of {requested_cores} cores fits this topology"
+            f"{' with node-local memory' if memory_required else ''}.\n"
+            f"Valid allocations: {calculate_valid_allocations(nodes)}"
+        )
+
+    try:
+        greedy = allocate_cores_multi_numa(numa_topology, requested_cores, requested_tp, None, None,
+                                           cache_policy, model_memory, kv_cache_space)
+        greedy_key = (greedy['tensor_parallel'], sorted(greedy['allocated_nodes']))
+    except AnsibleFilterError:
+        greedy_key = None
+
+    candidates.sort(key=lambda c: (c[0]['total'], c[1], [int(n['id']) for n in c[3]]))
+    results = []
+    seen = set()
+    for cost, tp, cores_per_node, ranks in candidates:
+        shape = (tp, tuple(sorted(cost.items())))
+        node_ids = sorted(int(n['id']) for n in ranks)
+        if shape in seen and (tp, node_ids) != greedy_key:
+            continue
+        seen.add(shape)
+        allocation = build_allocation(list(ranks), cores_per_node, tp, None, cache_policy or (
+            (numa_topology.get('allocation_policy', {}).get('workload') or {}).get('cache_policy') or 'compact'))
+        allocation['memory'] = None
+        if memory_required:
+            allocation['memory'] = {
+                **memory_required,
+                'rank_bytes': rank_memory_bytes(memory_required, tp),
+                'node_free_bytes': {n['id']: n['memory_free_bytes'] for n in ranks},
+                # Nodes without memory_free_bytes are not checked, as in allocate_cores_multi_numa
+                'checked': all(n['memory_free_bytes'] is not None for n in ranks),
+            }
+        allocation['cost'] = cost
+        allocation['greedy'] = (tp, node_ids) == greedy_key
+        allocation['rank'] = len(results) + 1
+        results.append(allocation)
+        if len(results) == top_k:
+            break
+    return results
+
+
+def fit_throughput_model(records):
+    """
+    Fit how throughput scales with cores and TP from past results.
+
+    Least squares on log(throughput) = a_group + b * log(cores) + c * log(TP),
+    with one intercept per group (e.g. model, workload and platform), so
+    runs of different models share the scaling exponents. An exponent the
+    records cannot separate (no TP variation, or TP always moving with
+    cores) is left at 0.
+
+    Args:
+        records: List of dicts with cores, tensor_parallel, throughput and
+            an optional group
+
+    Returns:
+        Dict with cores_exponent, tp_exponent, samples and groups
+
+    Raises:
+        AnsibleFilterError: If fewer than 3 usable records are given
+    """
+    groups: Dict[Any, List[tuple]] = {}
+    for record in records or []:
+        try:
+            cores = float(record['cores'])
+            tp = float(record.get('tensor_parallel') or 1)
+            throughput = float(record['throughput'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if cores <= 0 or tp <= 0 or throughput <= 0:
+            continue
+        groups.setdefault(record.get('group'), []).append(
+            (math.log(cores), math.log(tp), math.log(throughput))
+        )
+    samples = sum(len(rows) for rows in groups.values())
+    if samples < 3:
+        raise AnsibleFilterError(f"Need at least 3 results with cores, TP and throughput, got {samples}")
+
+    # Remove each group's mean (its intercept), then solve the 2x2 normal equations
+    sxx = sxt = stt = sxy = sty = 0.0
+    for rows in groups.values():
+        mean = [sum(row[i] for row in rows) / len(rows) for i in range(3)]
+        for x, t, y in rows:
+            x, t, y = x - mean[0], t - mean[1], y - mean[2]
+            sxx += x * x
+            sxt += x * t
+            stt += t * t
+            sxy += x * y
+            sty += t * y
+
+    det = sxx * stt - sxt * sxt
+    if det > 1e-9 * max(sxx * stt, 1e-12):
+        cores_exponent = (sxy * stt - sty * sxt) / det
+        tp_exponent = (sty * sxx - sxy * sxt) / det
+    else:
+        cores_exponent = sxy / sxx if sxx > 1e-12 else 0.0
+        tp_exponent = 0.0
+
+    return {
+        'cores_exponent': round(cores_exponent, 4),
+        'tp_exponent': round(tp_exponent, 4),
+        'samples': samples,
+        'groups': len(groups),
+    }
+
+
+class FilterModule:
+    """Ansible filter plugin registration."""
+    def filters(self):
+        return {
+            'search_allocations': search_allocations,
+            'fit_throughput_model': fit_throughput_model,
+        }
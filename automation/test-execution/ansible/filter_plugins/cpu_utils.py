@@ -18,12 +18,48 @@ except ImportError:
 
 _SIZE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*([A-Za-z]+)?$')
 
+# Size units as vLLM reads VLLM_CPU_KVCACHE_SPACE: binary, a bare number is GiB
+_SIZE_UNITS = {
+    'b': 1,
+    'k': 1024, 'kb': 1024, 'kib': 1024,
+    'm': 1024 ** 2, 'mb': 1024 ** 2, 'mib': 1024 ** 2,
+    'g': 1024 ** 3, 'gb': 1024 ** 3, 'gib': 1024 ** 3,
+    't': 1024 ** 4, 'tb': 1024 ** 4, 'tib': 1024 ** 4,
+}
+
+# Bytes per weight of model dtypes (model-matrix.yaml dtype)
+DTYPE_BYTES = {
+    'float32': 4, 'fp32': 4,
+    'bfloat16': 2, 'float16': 2, 'half': 2, 'fp16': 2, 'bf16': 2,
+    'int8': 1, 'fp8': 1,
+    'int4': 0.5, 'mxfp4': 0.5,
+}
+
+_PARAMETERS_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMBT])', re.IGNORECASE)
+_PARAMETER_SCALE = {'k': 1e3, 'm': 1e6, 'b': 1e9, 't': 1e12}
+
+# Per-node memory lines of /sys/devices/system/node/node*/meminfo and numactl -H
+_SYSFS_MEMINFO_PATTERN = re.compile(r'^Node\s+(\d+)\s+([\w()]+):\s+(\d+)\s*kB', re.IGNORECASE)
+_NUMACTL_MEMORY_PATTERN = re.compile(r'^node\s+(\d+)\s+(size|free):\s+(\d+)\s*MB', re.IGNORECASE)
+
+# Cache levels in the order of lscpu's CACHE column (L1d:L1i:L2:L3)
+CACHE_LEVELS = ('l1d', 'l1i', 'l2', 'l3')
+
+# How the allocator picks cores inside a NUMA node with several L3 domains
+# (AMD CCX/CCD, Intel sub-NUMA clusters):
+#   compact: fill the fewest L3 domains (shared cache, fewer cross-domain hops)
+#   spread:  round-robin over every L3 domain (more cache and bandwidth per core)
+CACHE_POLICIES = ('compact', 'spread')
+
 @dataclass(frozen=True)
 class CpuInfo:
     """Represents CPU topology information."""
     cpu: int
     node: int
     core: int
+    l1d: Optional[int] = None
+    l2: Optional[int] = None
+    l3: Optional[int] = None
 
 class LscpuParseError(AnsibleFilterError):
     """Raised when lscpu data cannot be parsed."""
@@ -31,9 +67,12 @@ class LscpuParseError(AnsibleFilterError):
 
 class LscpuParser:
     """
-    Parser for lscpu -e=CPU,NODE,CORE output.
+    Parser for lscpu -e=CPU,NODE,CORE[,CACHE] output.
 
-    Parses once and provides efficient queries for CPU topology.
+    Parses once and provides efficient queries for CPU topology. The
+    optional CACHE column ("L1d:L1i:L2:L3" cache ids, e.g. "8:8:8:1") gives
+    the L2 and L3 domain of every CPU; without it, or where lscpu prints
+    "-", cache queries return no domains.
     """
 
     def __init__(self, lscpu_data: str):
@@ -41,7 +80,7 @@ class LscpuParser:
         Initialize parser with lscpu output data.
 
         Args:
-            lscpu_data: String output from lscpu -e=CPU,NODE,CORE
+            lscpu_data: String output from lscpu -e=CPU,NODE,CORE[,CACHE]
 
         Raises:
             LscpuParseError: If data format is invalid
@@ -55,6 +94,7 @@ class LscpuParser:
         self._numa_nodes: Set[int] = set()
         self._node_to_cpus: Dict[int, List[int]] = defaultdict(list)
         self._node_core_to_min_cpu: Dict[int, Dict[int, int]] = defaultdict(dict)
+        self._cpu_info: Dict[int, CpuInfo] = {}
 
         self._parse(lscpu_data)
 
@@ -84,8 +124,10 @@ class LscpuParser:
                     f"Line {line_num}: Invalid numeric value in '{line}': {e}"
                 )
 
-            entry = CpuInfo(cpu=cpu, node=node, core=core)
+            caches = self._parse_cache_ids(parts[3]) if len(parts) > 3 else {}
+            entry = CpuInfo(cpu=cpu, node=node, core=core, **caches)
             self._cpu_entries.append(entry)
+            self._cpu_info[cpu] = entry
             self._node_to_cpus[node].append(cpu)
             # Index by NUMA node and core for primary CPU tracking
             if node not in self._node_core_to_min_cpu:
@@ -97,6 +139,16 @@ class LscpuParser:
 
             self._numa_nodes.add(node)
 
+    @staticmethod
+    def _parse_cache_ids(column: str) -> Dict[str, Optional[int]]:
+        """Cache ids of one CPU from a CACHE column such as "8:8:8:1"."""
+        ids = {}
+        for level, value in zip(CACHE_LEVELS, column.split(':')):
+            if level == 'l1i':
+                continue
+            ids[level] = int(value) if value.isdigit() else None
+        return ids
+
     def get_primary_cpus(self, numa_node: int) -> List[int]:
         """
         Get primary CPUs (first thread per core) for a NUMA node.
@@ -125,6 +177,44 @@ class LscpuParser:
         cpus = self._node_to_cpus.get(numa_node, [])
         return sorted(cpus)
 
+    def get_cpu_info(self, cpu: int) -> Optional[CpuInfo]:
+        """
+        Get the topology entry (node, core, cache ids) of one CPU.
+
+        Args:
+            cpu: CPU ID
+
+        Returns:
+            CpuInfo, or None if the CPU is not in the lscpu data
+        """
+        return self._cpu_info.get(cpu)
+
+    def get_cache_domains(self, numa_node: int, level: str = 'l3') -> Dict[int, List[int]]:
+        """
+        Get the primary CPUs of a NUMA node grouped by cache domain.
+
+        One CPU per physical core, so SMT siblings never count twice
+        towards a domain's capacity. Under sub-NUMA clustering an L3 spans
+        several nodes; only this node's cores are listed.
+
+        Args:
+            numa_node: NUMA node number
+            level: Cache level ('l1d', 'l2' or 'l3')
+
+        Returns:
+            Dict of cache id -> sorted primary CPU IDs, empty if lscpu
+            reported no cache ids for the node
+        """
+        if level not in CACHE_LEVELS or level == 'l1i':
+            raise LscpuParseError(f"Unknown cache level '{level}' (expected l1d, l2 or l3)")
+        domains: Dict[int, List[int]] = defaultdict(list)
+        for cpu in self.get_primary_cpus(numa_node):
+            cache_id = getattr(self._cpu_info[cpu], level)
+            if cache_id is None:
+                return {}
+            domains[cache_id].append(cpu)
+        return dict(sorted(domains.items()))
+
     def get_numa_nodes(self) -> List[int]:
         """
         Get all unique NUMA node numbers.
@@ -284,6 +374,40 @@ def extract_numa_nodes(lscpu_data):
     except LscpuParseError as e:
         raise AnsibleFilterError(f"Failed to parse lscpu data: {e}")
 
+def extract_cache_domains(lscpu_data, numa_node, level='l3'):
+    """
+    Extract the primary CPUs of a NUMA node grouped by cache domain.
+    Args:
+        lscpu_data: String output from lscpu -e=CPU,NODE,CORE,CACHE
+        numa_node: NUMA node number to filter by
+        level: Cache level (default: l3)
+    Returns:
+        Dict of cache id (string) -> comma-separated primary CPU IDs; empty
+        when the data has no cache ids (e.g. lscpu -e=CPU,NODE,CORE)
+    Example:
+        lscpu_data = "0 0 0 0:0:0:0\n1 0 1 1:1:1:0\n2 0 2 2:2:2:1\n3 0 3 3:3:3:1"
+        extract_cache_domains(lscpu_data, 0) -> {'0': '0,1', '1': '2,3'}
+    """
+    if not lscpu_data or not isinstance(lscpu_data, str):
+        return {}
+
+    try:
+        numa_node_int = int(numa_node)
+    except (ValueError, TypeError) as e:
+        raise AnsibleFilterError(
+            f"Invalid NUMA node '{numa_node}': expected integer, got error: {e}"
+        )
+
+    try:
+        parser = LscpuParser(lscpu_data)
+        domains = parser.get_cache_domains(numa_node_int, str(level))
+        return {
+            str(cache_id): ','.join(str(cpu) for cpu in cpus)
+            for cache_id, cpus in domains.items()
+        }
+    except LscpuParseError as e:
+        raise AnsibleFilterError(f"Failed to parse lscpu data: {e}")
+
 
 def expand_cpu_range(cpu_range_str: str) -> List[int]:
     """
@@ -433,10 +557,252 @@ def extract_size_value(size_str):
             f"Invalid size format: '{size_str}'. Expected: '40GiB', '1024', etc."
         )
 
+def size_to_bytes(size_str):
+    """
+    Convert a size string to bytes.
+
+    Units are binary whatever their spelling, as for VLLM_CPU_KVCACHE_SPACE,
+    and a bare number is GiB.
+
+    Args:
+        size_str: Size string (e.g., "11GiB", "512MiB", "40") or number of GiB
+    Returns:
+        Integer number of bytes
+    Raises:
+        AnsibleFilterError: If the size or its unit is invalid
+    Examples:
+        "11GiB" -> 11811160064
+        "512MiB" -> 536870912
+        2 -> 2147483648
+    """
+    if isinstance(size_str, bool):
+        raise AnsibleFilterError(f"Invalid size: {size_str}")
+    if isinstance(size_str, (int, float)):
+        value, unit = float(size_str), 'gib'
+    else:
+        match = _SIZE_PATTERN.match(str(size_str).strip())
+        if not match:
+            raise AnsibleFilterError(
+                f"Invalid size format: '{size_str}'. Expected: '40GiB', '1024MiB', etc."
+            )
+        value, unit = float(match.group(1)), (match.group(2) or 'gib').lower()
+    if unit not in _SIZE_UNITS:
+        raise AnsibleFilterError(
+            f"Invalid size unit in '{size_str}'. Expected one of: B, KiB, MiB, GiB, TiB"
+        )
+    if value < 0:
+        raise AnsibleFilterError(f"Size must be non-negative, got '{size_str}'")
+    return int(value * _SIZE_UNITS[unit])
+
+def model_weight_bytes(parameters, dtype='bfloat16'):
+    """
+    Estimate the memory taken by a model's weights.
+
+    Args:
+        parameters: Parameter count as in model-matrix.yaml (e.g., "1.2B",
+            "600M", "21B (3.6B active per token)") or a plain number
+        dtype: Weight dtype (e.g., "bfloat16"), see DTYPE_BYTES
+    Returns:
+        Integer number of bytes (parameters x bytes per weight)
+    Raises:
+        AnsibleFilterError: If the parameter count or dtype is not understood
+    Examples:
+        "1.2B", "bfloat16" -> 2400000000
+    """
+    if isinstance(parameters, (int, float)) and not isinstance(parameters, bool):
+        count = float(parameters)
+    else:
+        match = _PARAMETERS_PATTERN.match(str(parameters))
+        if not match:
+            raise AnsibleFilterError(
+                f"Invalid parameter count: '{parameters}'. Expected: '1.2B', '600M', etc."
+            )
+        count = float(match.group(1)) * _PARAMETER_SCALE[match.group(2).lower()]
+
+    dtype_key = str(dtype).strip().lower()
+    if dtype_key not in DTYPE_BYTES:
+        raise AnsibleFilterError(
+            f"Unknown dtype '{dtype}'. Valid values: {sorted(DTYPE_BYTES)}"
+        )
+    return int(count * DTYPE_BYTES[dtype_key])
+
+def extract_node_memory(meminfo_data):
+    """
+    Extract total and free memory per NUMA node.
+
+    Reads the concatenated /sys/devices/system/node/node*/meminfo files or,
+    if those are not available, numactl -H output. From sysfs, free memory
+    is MemFree plus Inactive(file), the page cache the kernel reclaims
+    first; numactl only reports MemFree.
+
+    Args:
+        meminfo_data: String output of `cat /sys/devices/system/node/node*/meminfo`
+            or `numactl -H`
+    Returns:
+        Dict of NUMA node id (string) -> {'total_bytes': int, 'free_bytes': int};
+        empty when the data lists no node memory
+    Examples:
+        "Node 0 MemTotal: 1048576 kB\nNode 0 MemFree: 524288 kB"
+            -> {'0': {'total_bytes': 1073741824, 'free_bytes': 536870912}}
+        "node 1 size: 1024 MB\nnode 1 free: 512 MB"
+            -> {'1': {'total_bytes': 1073741824, 'free_bytes': 536870912}}
+    """
+    if not meminfo_data or not isinstance(meminfo_data, str):
+        return {}
+
+    fields = defaultdict(dict)
+    for line in meminfo_data.splitlines():
+        line = line.strip()
+        match = _SYSFS_MEMINFO_PATTERN.match(line)
+        if match:
+            node, field, kib = match.groups()
+            fields[node][field] = int(kib) * 1024
+            continue
+        match = _NUMACTL_MEMORY_PATTERN.match(line)
+        if match:
+            node, field, mib = match.groups()
+            fields[node]['MemTotal' if field.lower() == 'size' else 'MemFree'] = int(mib) * 1024 ** 2
+
+    memory = {}
+    for node in sorted(fields, key=int):
+        node_fields = fields[node]
+        if 'MemTotal' not in node_fields or 'MemFree' not in node_fields:
+            continue
+        memory[node] = {
+            'total_bytes': node_fields['MemTotal'],
+            'free_bytes': node_fields['MemFree'] + node_fields.get('Inactive(file)', 0),
+        }
+    return memory
+
+def _format_gib(size_bytes):
+    """Format a byte count as GiB for messages (e.g., '11.0 GiB')."""
+    return f"{size_bytes / 1024 ** 3:.1f} GiB"
+
+def rank_memory_bytes(memory_required, tp):
+    """
+    Memory one TP rank needs on its NUMA node.
+
+    Each rank holds its 1/TP shard of the weights and a full KV cache
+    (vLLM's CPU backend allocates VLLM_CPU_KVCACHE_SPACE per rank).
+
+    Args:
+        memory_required: Dict with model_bytes and kv_cache_bytes, or None
+        tp: Tensor parallelism value
+    Returns:
+        Integer number of bytes, or None when no requirement is given
+    """
+    if not memory_required:
+        return None
+    return -(-memory_required['model_bytes'] // tp) + memory_required['kv_cache_bytes']
+
+def _memory_fits(node, rank_bytes):
+    """Whether a node's free memory holds one rank (unknown memory counts as fitting)."""
+    free = node.get('memory_free_bytes')
+    return rank_bytes is None or free is None or free >= rank_bytes
+
+def _describe_rank_memory(memory_required, tp):
+    """Breakdown of one rank's memory for messages."""
+    weights = _format_gib(memory_required['model_bytes'])
+    kv_cache = _format_gib(memory_required['kv_cache_bytes'])
+    if tp == 1:
+        return f"weights {weights} + KV cache {kv_cache}"
+    return f"weights {weights} / TP={tp} + KV cache {kv_cache}"
+
+def _memory_error(nodes, requested_cores, memory_required, attempts):
+    """
+    Explain why no TP keeps every rank's memory on its own node.
+
+    Args:
+        nodes: Candidate NUMA node dicts
+        requested_cores: Total cores requested
+        memory_required: Dict with model_bytes and kv_cache_bytes
+        attempts: List of (tp, cores_per_node) that had enough cores
+
+    Returns:
+        AnsibleFilterError to raise
+    """
+    free = ', '.join(
+        f"node {n['id']}: {_format_gib(n['memory_free_bytes'])}"
+        for n in nodes if n.get('memory_free_bytes') is not None
+    )
+    lines = [
+        f"Cannot keep model memory NUMA-local for {requested_cores} cores: "
+        f"not enough nodes have one rank's memory free, "
+        f"so vLLM would spill into remote memory.",
+        f"Free memory per node: {free}",
+    ]
+    for tp, cores_per_node in attempts:
+        rank_bytes = rank_memory_bytes(memory_required, tp)
+        fitting = [n for n in nodes
+                   if n['physical_cores'] >= cores_per_node and _memory_fits(n, rank_bytes)]
+        lines.append(
+            f"TP={tp}: {_format_gib(rank_bytes)} per rank "
+            f"({_describe_rank_memory(memory_required, tp)}), "
+            f"{len(fitting)} node(s) have it, {tp} needed"
+        )
+    lines.append(
+        "Reduce the KV cache space (VLLM_CPU_KVCACHE_SPACE), free memory on the "
+        "nodes, or request a core count that allows a higher TP."
+    )
+    return AnsibleFilterError('\n'.join(lines))
+
+def memory_requirement(model_memory, kv_cache_space):
+    """
+    Normalize the memory one model needs (sizes as strings, or integer bytes).
+
+    Args:
+        model_memory: Model weight size (e.g., "2.4GiB"), bytes, or None
+        kv_cache_space: KV cache space per rank (e.g., "11GiB"), bytes, or None
+    Returns:
+        Dict with model_bytes and kv_cache_bytes (0 for the one not given),
+        or None when neither is given
+    """
+    memory_sizes = {'model_bytes': model_memory, 'kv_cache_bytes': kv_cache_space}
+    for key, size in memory_sizes.items():
+        if size is not None and (str(type(size).__name__) == '_OmitType' or size in ('', 'None')):
+            size = None
+        memory_sizes[key] = size
+    if all(size is None for size in memory_sizes.values()):
+        return None
+    return {
+        key: (size if isinstance(size, int) and not isinstance(size, bool) else size_to_bytes(size))
+        if size is not None else 0
+        for key, size in memory_sizes.items()
+    }
+
+def normalize_nodes(nodes):
+    """
+    Normalize numa_topology nodes to plain Python types (convert AnsibleUnsafeText).
+
+    Args:
+        nodes: numa_topology['nodes'] from detect-numa-topology.yml
+    Returns:
+        List of node dicts with id (str), physical_cores (int), CPU lists,
+        cache_domains (cache id -> CPU IDs) and memory_free_bytes (int or None)
+    """
+    normalized_nodes = []
+    for n in nodes:
+        normalized_nodes.append({
+            'id': str(n['id']),
+            'physical_cores': int(n['physical_cores']),
+            'physical_cpus': str(n.get('physical_cpus', '')),
+            'physical_cpus_list': str(n.get('physical_cpus_list', '')),
+            'cache_domains': {
+                str(cache_id): expand_cpu_range(str(cpus))
+                for cache_id, cpus in (n.get('cache_domains') or {}).items()
+            },
+            'memory_free_bytes': (
+                int(n['memory_free_bytes'])
+                if n.get('memory_free_bytes') not in (None, '', 'None') else None
+            ),
+        })
+    return normalized_nodes
+
 # Valid tensor parallelism values (powers of 2, capped at 8)
 VALID_TP_VALUES = [1, 2, 4, 8]
 
-def allocate_cores_multi_numa(numa_topology, requested_cores, requested_tp=None, cpu_start=None, numa_node_override=None):
+def allocate_cores_multi_numa(numa_topology, requested_cores, requested_tp=None, cpu_start=None, numa_node_override=None,
+                              cache_policy=None, model_memory=None, kv_cache_space=None):
     """
     Multi-NUMA core allocation with automatic tensor parallelism calculation.
 
@@ -447,12 +813,28 @@ def allocate_cores_multi_numa(numa_topology, requested_cores, requested_tp=None,
     Socket pinning support: Use cpu_start and numa_node_override to pin vLLM
     to a specific socket (e.g., socket 1 with cpu_start=64, numa_node=1).
 
+    Nodes that list their L3 domains (cache_domains, from
+    extract_cache_domains) get their cores picked per cache_policy:
+    'compact' packs each TP rank into the fewest L3 domains, 'spread' deals
+    them round-robin over all of them. Other nodes take their first cores.
+
+    Memory-aware placement: given the model's weight size and the KV cache
+    space of each rank, only nodes whose free memory (memory_free_bytes,
+    from extract_node_memory) holds one rank - weights / TP plus the KV
+    cache - are used, so no rank spills into remote memory. Auto TP moves
+    to a higher TP when that shrinks the weight shard enough to fit; when
+    nothing fits, the error lists what each TP would need per node.
+
     Args:
         numa_topology: Topology dict with nodes inventory and allocation policy
         requested_cores: Total physical cores to allocate
         requested_tp: Optional user override for tensor parallelism (must be valid)
         cpu_start: Optional CPU offset to start allocation from (for socket pinning)
         numa_node_override: Optional NUMA node to allocate from (for socket pinning)
+        cache_policy: Optional 'compact' or 'spread' (default: the topology's
+            allocation_policy.workload.cache_policy, else 'compact')
+        model_memory: Optional model weight size (e.g., "2.4GiB" or bytes as int)
+        kv_cache_space: Optional KV cache space per rank (e.g., "11GiB")
 
     Returns:
         dict: Allocation configuration with:
@@ -463,6 +845,12 @@ def allocate_cores_multi_numa(numa_topology, requested_cores, requested_tp=None,
             - tensor_parallel: TP value (1, 2, 4, or 8)
             - omp_num_threads: Threads per TP instance
             - omp_threads_bind: OMP binding string or None
+            - cache_policy: Policy used to pick cores within a node
+            - cache_domains: Per allocated node id, L3 id -> allocated CPUs
+              (nodes without cache information are left out)
+            - memory: None without model_memory/kv_cache_space, else
+              model_bytes, kv_cache_bytes, rank_bytes and node_free_bytes
+              (allocated node id -> free bytes, None if unknown)
 
     Raises:
         AnsibleFilterError: If allocation impossible or TP invalid
@@ -527,18 +915,25 @@ def allocate_cores_multi_numa(numa_topology, requested_cores, requested_tp=None,
     # Extract nodes and policy
     nodes = numa_topology.get('nodes', [])
     allocation_policy = numa_topology.get('allocation_policy', {})
+
+    # Normalize cache_policy (argument, then topology policy, then compact)
+    if cache_policy is not None and (
+        str(type(cache_policy).__name__) == '_OmitType' or cache_policy in ('', 'None')
+    ):
+        cache_policy = None
+    if cache_policy is None:
+        cache_policy = (allocation_policy.get('workload') or {}).get('cache_policy') or 'compact'
+    cache_policy = str(cache_policy)
+    if cache_policy not in CACHE_POLICIES:
+        raise AnsibleFilterError(
+            f"Invalid cache_policy: {cache_policy}. Valid values: {list(CACHE_POLICIES)}"
+        )
+    memory_required = memory_requirement(model_memory, kv_cache_space)
+
     housekeeping_policy = allocation_policy.get('housekeeping', {})
     housekeeping_node = housekeeping_policy.get('reserved_node', 0)
 
-    # Normalize node data to ensure proper Python types (convert AnsibleUnsafeText)
-    normalized_nodes = []
-    for n in nodes:
-        normalized_nodes.append({
-            'id': str(n['id']),
-            'physical_cores': int(n['physical_cores']),
-            'physical_cpus': str(n.get('physical_cpus', '')),
-            'physical_cpus_list': str(n.get('physical_cpus_list', ''))
-        })
+    normalized_nodes = normalize_nodes(nodes)
 
     # Determine available nodes (exclude housekeeping if strategy is reserve_node)
     housekeeping_strategy = housekeeping_policy.get('strategy', 'reserve_node')
@@ -562,19 +957,32 @@ def allocate_cores_multi_numa(numa_topology, requested_cores, requested_tp=None,
             requested_cores,
             numa_node_override,
             cpu_start,
-            requested_tp
+            requested_tp,
+            cache_policy,
+            memory_required
         )
     else:
         # Normal multi-NUMA allocation
         if requested_tp is not None:
-            result = allocate_with_fixed_tp(available_nodes, requested_cores, requested_tp, cpu_start)
+            result = allocate_with_fixed_tp(available_nodes, requested_cores, requested_tp, cpu_start, cache_policy,
+                                            memory_required)
         else:
-            result = allocate_with_auto_tp(available_nodes, requested_cores, cpu_start)
-
+            result = allocate_with_auto_tp(available_nodes, requested_cores, cpu_start, cache_policy,
+                                           memory_required)
+
+    result['memory'] = None
+    if memory_required:
+        free_by_node = {int(n['id']): n['memory_free_bytes'] for n in normalized_nodes}
+        result['memory'] = {
+            **memory_required,
+            'rank_bytes': rank_memory_bytes(memory_required, result['tensor_parallel']),
+            'node_free_bytes': {str(node): free_by_node[node] for node in result['allocated_nodes']},
+        }
     return result
 
 
-def allocate_with_socket_pinning(all_nodes, requested_cores, numa_node, cpu_start, requested_tp):
+def allocate_with_socket_pinning(all_nodes, requested_cores, numa_node, cpu_start, requested_tp,
+                                 cache_policy='compact', memory_required=None):
     """
     Allocate cores from a specific NUMA node (socket pinning).
 
@@ -584,6 +992,8 @@ def allocate_with_socket_pinning(all_nodes, requested_cores, numa_node, cpu_star
         numa_node: NUMA node to allocate from
         cpu_start: CPU offset to start allocation from (optional)
         requested_tp: Tensor parallelism (must be 1 for single-node allocation)
+        cache_policy: 'compact' or 'spread' placement within the node
+        memory_required: Optional dict with model_bytes and kv_cache_bytes
 
     Returns:
         dict: Allocation configuration
@@ -617,21 +1027,36 @@ def allocate_with_socket_pinning(all_nodes, requested_cores, numa_node, cpu_star
             f"NUMA node {numa_node} has only {node_capacity} cores, cannot allocate {requested_cores}"
         )
 
+    # Check the whole model fits in the node's free memory
+    rank_bytes = rank_memory_bytes(memory_required, 1)
+    if not _memory_fits(target_node, rank_bytes):
+        raise AnsibleFilterError(
+            f"NUMA node {numa_node} has {_format_gib(target_node['memory_free_bytes'])} free, "
+            f"cannot hold {_format_gib(rank_bytes)} locally "
+            f"({_describe_rank_memory(memory_required, 1)}). "
+            f"Pin to a node with more free memory, or drop the socket pinning to allow TP > 1"
+        )
+
     # Build allocation using the specified node
-    return build_allocation([target_node], requested_cores, 1, cpu_start)
+    return build_allocation([target_node], requested_cores, 1, cpu_start, cache_policy)
 
 
-def allocate_with_auto_tp(available_nodes, requested_cores, cpu_start=None):
+def allocate_with_auto_tp(available_nodes, requested_cores, cpu_start=None, cache_policy='compact',
+                          memory_required=None):
     """
     Auto-calculate optimal TP and allocate cores across NUMA nodes.
 
     Tries TP values in ascending order (1, 2, 4, 8) to minimize cross-NUMA
-    traffic. Returns first valid configuration found.
+    traffic. Returns first valid configuration found. With a memory
+    requirement, a TP is only valid if enough nodes also hold one rank's
+    memory each.
 
     Args:
         available_nodes: List of available NUMA node dicts
         requested_cores: Total cores to allocate
         cpu_start: Optional CPU offset to start allocation from
+        cache_policy: 'compact' or 'spread' placement within each node
+        memory_required: Optional dict with model_bytes and kv_cache_bytes
 
     Returns:
         dict: Allocation configuration
@@ -647,6 +1072,9 @@ def allocate_with_auto_tp(available_nodes, requested_cores, cpu_start=None):
     max_cores_per_node = int(sorted_nodes[0]['physical_cores'])
     num_available_nodes = len(sorted_nodes)
 
+    # TP values with enough cores but not enough node-local memory
+    memory_attempts = []
+
     # Try each TP value in ascending order
     for tp in VALID_TP_VALUES:
         # Skip if we don't have enough nodes
@@ -664,7 +1092,18 @@ def allocate_with_auto_tp(available_nodes, requested_cores, cpu_start=None):
             selected_nodes = sorted_nodes[:tp]
             # Verify each selected node has sufficient capacity
             if all(n['physical_cores'] >= cores_per_node for n in selected_nodes):
-                return build_allocation(selected_nodes, cores_per_node, tp, cpu_start)
+                # Keep to nodes that also hold one rank's memory
+                rank_bytes = rank_memory_bytes(memory_required, tp)
+                fitting_nodes = [
+                    n for n in sorted_nodes
+                    if n['physical_cores'] >= cores_per_node and _memory_fits(n, rank_bytes)
+                ]
+                if len(fitting_nodes) >= tp:
+                    return build_allocation(fitting_nodes[:tp], cores_per_node, tp, cpu_start, cache_policy)
+                memory_attempts.append((tp, cores_per_node))
+
+    if memory_attempts:
+        raise _memory_error(sorted_nodes, requested_cores, memory_required, memory_attempts)
 
     # No valid allocation found - generate helpful error
     valid_allocations = calculate_valid_allocations(available_nodes)
@@ -677,7 +1116,8 @@ def allocate_with_auto_tp(available_nodes, requested_cores, cpu_start=None):
     )
 
 
-def allocate_with_fixed_tp(available_nodes, requested_cores, tp, cpu_start=None):
+def allocate_with_fixed_tp(available_nodes, requested_cores, tp, cpu_start=None, cache_policy='compact',
+                           memory_required=None):
     """
     Allocate cores with user-specified TP value.
 
@@ -686,6 +1126,8 @@ def allocate_with_fixed_tp(available_nodes, requested_cores, tp, cpu_start=None)
         requested_cores: Total cores to allocate
         tp: User-specified tensor parallelism
         cpu_start: Optional CPU offset to start allocation from
+        cache_policy: 'compact' or 'spread' placement within each node
+        memory_required: Optional dict with model_bytes and kv_cache_bytes
 
     Returns:
         dict: Allocation configuration
@@ -727,12 +1169,58 @@ def allocate_with_fixed_tp(available_nodes, requested_cores, tp, cpu_start=None)
             f"Only {len(eligible_nodes)} NUMA nodes have sufficient capacity ({cores_per_node} cores), need {tp}"
         )
 
+    # Keep to nodes that also hold one rank's memory
+    rank_bytes = rank_memory_bytes(memory_required, tp)
+    eligible_nodes = [n for n in eligible_nodes if _memory_fits(n, rank_bytes)]
+    if len(eligible_nodes) < tp:
+        raise _memory_error(sorted_nodes, requested_cores, memory_required, [(tp, cores_per_node)])
+
     # Build allocation from eligible nodes
     selected_nodes = eligible_nodes[:tp]
-    return build_allocation(selected_nodes, cores_per_node, tp, cpu_start)
+    return build_allocation(selected_nodes, cores_per_node, tp, cpu_start, cache_policy)
+
 
+def pick_cache_aware_cpus(cache_domains, count, policy='compact'):
+    """
+    Pick `count` primary CPUs from a node's cache domains.
+
+    compact: the fewest domains that can hold `count` cores, i.e. the
+    largest ones, filled completely; the remainder goes to the smallest
+    domain it fits in, so whole domains stay free for other ranks.
+    spread: one core from each domain in turn.
 
-def build_allocation(selected_nodes, cores_per_node, tp, cpu_start=None):
+    Args:
+        cache_domains: Dict of cache id -> primary CPU IDs
+        count: Cores to pick
+        policy: 'compact' or 'spread'
+
+    Returns:
+        List of CPU IDs (fewer than count if the domains hold fewer)
+    """
+    domains = [sorted(cpus) for _, cpus in sorted(cache_domains.items(), key=lambda d: min(d[1]))
+               if cpus]
+    if policy == 'spread':
+        picked = []
+        depth = 0
+        while len(picked) < count and any(depth < len(cpus) for cpus in domains):
+            picked.extend(cpus[depth] for cpus in domains if depth < len(cpus))
+            depth += 1
+        return picked[:count]
+
+    # Largest domains first; ties keep CPU order
+    remaining = sorted(domains, key=len, reverse=True)
+    picked = []
+    while remaining and len(picked) + len(remaining[0]) <= count:
+        picked.extend(remaining.pop(0))
+    needed = count - len(picked)
+    if needed and remaining:
+        fits = [cpus for cpus in remaining if len(cpus) >= needed]
+        target = min(fits, key=len) if fits else remaining[0]
+        picked.extend(target[:needed])
+    return picked
+
+
+def build_allocation(selected_nodes, cores_per_node, tp, cpu_start=None, cache_policy='compact'):
     """
     Build final allocation configuration with CPU pinning and OMP binding.
 
@@ -741,6 +1229,8 @@ def build_allocation(selected_nodes, cores_per_node, tp, cpu_start=None):
         cores_per_node: Cores to allocate from each node
         tp: Tensor parallelism value
         cpu_start: Optional CPU offset to start allocation from (for socket pinning)
+        cache_policy: 'compact' or 'spread' placement over the node's L3
+            domains (nodes without cache_domains take their first cores)
 
     Returns:
         dict: Complete allocation configuration
@@ -748,6 +1238,7 @@ def build_allocation(selected_nodes, cores_per_node, tp, cpu_start=None):
     cpuset_cpus_parts = []
     omp_bind_parts = []
     cpuset_mems_parts = []
+    cache_domain_map = {}
 
     for node in selected_nodes:
         # Get physical CPU list for this node
@@ -768,8 +1259,23 @@ def build_allocation(selected_nodes, cores_per_node, tp, cpu_start=None):
                     f"need {cores_per_node}, found {len(all_physical_cpus)}"
                 )
 
-        # Take first N physical cores
-        allocated_cpus = all_physical_cpus[:cores_per_node]
+        # Restrict cache domains to the CPUs still eligible
+        eligible = set(all_physical_cpus)
+        cache_domains = {
+            cache_id: [cpu for cpu in cpus if cpu in eligible]
+            for cache_id, cpus in (node.get('cache_domains') or {}).items()
+        }
+
+        if cache_domains:
+            allocated_cpus = sorted(pick_cache_aware_cpus(cache_domains, cores_per_node, cache_policy))
+            cache_domain_map[str(node['id'])] = {
+                cache_id: cpu_list_to_range([cpu for cpu in allocated_cpus if cpu in cpus])
+                for cache_id, cpus in cache_domains.items()
+                if any(cpu in cpus for cpu in allocated_cpus)
+            }
+        else:
+            # Take first N physical cores
+            allocated_cpus = all_physical_cpus[:cores_per_node]
 
         # Validate allocation produced requested number of CPUs
         if len(allocated_cpus) != cores_per_node:
@@ -794,7 +1300,9 @@ def build_allocation(selected_nodes, cores_per_node, tp, cpu_start=None):
         'tensor_parallel': tp,
         'omp_num_threads': cores_per_node,
         'omp_threads_bind': '|'.join(omp_bind_parts) if tp > 1 else None,
-        'allocation_strategy': f"multi_numa_tp{tp}" if tp > 1 else "single_numa"
+        'allocation_strategy': f"multi_numa_tp{tp}" if tp > 1 else "single_numa",
+        'cache_policy': cache_policy,
+        'cache_domains': cache_domain_map,
     }
 
 
@@ -841,7 +1349,11 @@ class FilterModule:
             'extract_primary_cpus': extract_primary_cpus,
             'extract_all_cpus': extract_all_cpus,
             'extract_numa_nodes': extract_numa_nodes,
+            'extract_cache_domains': extract_cache_domains,
             'merge_cpu_ranges': merge_cpu_ranges,
             'extract_size_value': extract_size_value,
+            'size_to_bytes': size_to_bytes,
+            'model_weight_bytes': model_weight_bytes,
+            'extract_node_memory': extract_node_memory,
             'allocate_cores_multi_numa': allocate_cores_multi_numa,
         }
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Cpuset planner for processes that share one host.
+
+Keeps a reservation map of the host's CPUs and places vLLM, the load
+generator and auxiliary processes (metrics collector, housekeeping)
+together, so that no two of them share a CPU or the SMT siblings of one
+physical core, and every cpuset comes with the memory nodes it binds to.
+The plan is a JSON-serializable dict that the Ansible roles and cpueval
+apply as-is.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    from cpu_utils import AnsibleFilterError, LscpuParser, cpu_list_to_range, expand_cpu_range
+except ImportError:
+    # Ansible loads filter plugins by file path, not from sys.path
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from cpu_utils import AnsibleFilterError, LscpuParser, cpu_list_to_range, expand_cpu_range
+
+
+class CpusetConflictError(AnsibleFilterError):
+    """Raised when a placement collides with another or does not fit the host."""
+    pass
+
+
+@dataclass
+class Reservation:
+    """CPUs and memory nodes held by one process (role)."""
+    role: str
+    cpus: List[int]
+    mems: List[int]
+    physical_cores: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'role': self.role,
+            'cpuset_cpus': cpu_list_to_range(self.cpus),
+            'cpuset_mems': ','.join(str(node) for node in self.mems),
+            'cpus': len(self.cpus),
+            'physical_cores': self.physical_cores,
+        }
+
+
+def _parse_int_list(value: Union[str, int, Sequence[int], None]) -> List[int]:
+    """CPU or node list from a range string ("0-3,8"), an int or a list."""
+    if value is None or value == '':
+        return []
+    if isinstance(value, int):
+        return [value]
+    if isinstance(value, str):
+        return expand_cpu_range(value.strip())
+    try:
+        return [int(item) for item in value]
+    except (TypeError, ValueError) as e:
+        raise CpusetConflictError(f"Invalid CPU/node list {value!r}: {e}")
+
+
+class CpusetPlanner:
+    """
+    Reservation map of one host's CPUs.
+
+    Works per physical core: a core belongs to at most one role, whichever
+    of its SMT threads that role runs on. Roles are free-form names
+    ('vllm', 'guidellm', 'metrics', 'housekeeping', ...).
+    """
+
+    def __init__(self, lscpu_data: str):
+        """
+        Args:
+            lscpu_data: String output from lscpu -e=CPU,NODE,CORE[,CACHE] -n
+
+        Raises:
+            CpusetConflictError: If the lscpu data holds no CPUs
+        """
+        parser = LscpuParser(lscpu_data)
+        if parser.is_empty():
+            raise CpusetConflictError("Cannot plan cpusets: no CPUs in lscpu data")
+
+        self.nodes = parser.get_numa_nodes()
+        # cpu -> (node, core), core -> its CPUs (primary thread first)
+        self._core_of: Dict[int, Tuple[int, int]] = {}
+        self._threads: Dict[Tuple[int, int], List[int]] = {}
+        for node in self.nodes:
+            for cpu in parser.get_all_cpus(node):
+                core = (node, parser.get_cpu_info(cpu).core)
+                self._core_of[cpu] = core
+                self._threads.setdefault(core, []).append(cpu)
+
+        self._core_owner: Dict[Tuple[int, int], str] = {}
+        self.reservations: Dict[str, Reservation] = {}
+
+    def _node_cores(self, numa_node: int) -> List[Tuple[int, int]]:
+        """Physical cores of a node, ordered by primary CPU."""
+        cores = [core for core in self._threads if core[0] == numa_node]
+        return sorted(cores, key=lambda core: self._threads[core][0])
+
+    def free_cpus(self, numa_node: Optional[int] = None) -> List[int]:
+        """Primary CPUs of the cores no role holds (one node or all)."""
+        nodes = self.nodes if numa_node is None else [numa_node]
+        return [
+            self._threads[core][0]
+            for node in nodes
+            for core in self._node_cores(node)
+            if core not in self._core_owner
+        ]
+
+    def _check_mems(self, role: str, cpus: List[int], mems: List[int]) -> None:
+        unknown = sorted(set(mems) - set(self.nodes))
+        if unknown:
+            raise CpusetConflictError(
+                f"{role}: memory node(s) {unknown} do not exist (host nodes: {self.nodes})"
+            )
+        remote = sorted({self._core_of[cpu][0] for cpu in cpus} - set(mems))
+        if remote:
+            raise CpusetConflictError(
+                f"{role}: CPUs on NUMA node(s) {remote} are not in cpuset_mems "
+                f"{','.join(map(str, mems))}; every allocation of theirs would be remote. "
+                f"Bind memory to the nodes of the CPUs (e.g. cpuset_mems "
+                f"{','.join(map(str, sorted(set(mems) | set(remote))))})"
+            )
+
+    def reserve(self, role: str, cpus: Union[str, Sequence[int]],
+                mems: Union[str, int, Sequence[int], None] = None) -> Reservation:
+        """
+        Reserve explicit CPUs for a role.
+
+        Args:
+            role: Process the CPUs are for
+            cpus: CPU range string ("64-95") or list of CPU IDs
+            mems: Memory nodes (default: the nodes of the CPUs)
+
+        Raises:
+            CpusetConflictError: If a CPU is unknown, already reserved, or an SMT
+                sibling of a CPU reserved by another role, or the memory
+                nodes do not cover the CPUs
+        """
+        if role in self.reservations:
+            raise CpusetConflictError(f"{role}: already placed ({self.reservations[role].to_dict()['cpuset_cpus']})")
+        cpu_list = sorted(_parse_int_list(cpus))
+        if not cpu_list:
+            raise CpusetConflictError(f"{role}: no CPUs given")
+        unknown = [cpu for cpu in cpu_list if cpu not in self._core_of]
+        if unknown:
+            raise CpusetConflictError(
+                f"{role}: CPU(s) {cpu_list_to_range(unknown)} do not exist on this host"
+            )
+
+        for cpu in cpu_list:
+            core = self._core_of[cpu]
+            owner = self._core_owner.get(core)
+            if owner is None:
+                continue
+            if cpu in self.reservations[owner].cpus:
+                raise CpusetConflictError(
+                    f"{role}: CPU {cpu} overlaps {owner} ({self.reservations[owner].to_dict()['cpuset_cpus']})"
+                )
+            siblings = [c for c in self._threads[core] if c in self.reservations[owner].cpus]
+            raise CpusetConflictError(
+                f"{role}: CPU {cpu} is an SMT sibling of CPU(s) {cpu_list_to_range(siblings)} "
+                f"held by {owner}; roles must not share a physical core"
+            )
+
+        mem_list = sorted(set(_parse_int_list(mems))) or sorted({self._core_of[cpu][0] for cpu in cpu_list})
+        self._check_mems(role, cpu_list, mem_list)
+
+        cores = {self._core_of[cpu] for cpu in cpu_list}
+        for core in cores:
+            self._core_owner[core] = role
+        reservation = Reservation(role=role, cpus=cpu_list, mems=mem_list, physical_cores=len(cores))
+        self.reservations[role] = reservation
+        return reservation
+
+    def allocate(self, role: str, cores: int, numa_node: Optional[int] = None,
+                 mems: Union[str, int, Sequence[int], None] = None, smt: bool = False) -> Reservation:
+        """
+        Reserve the lowest free physical cores of one node for a role.
+
+        Args:
+            role: Process the cores are for
+            cores: Number of physical cores
+            numa_node: Node to allocate from (default: the first node with
+                enough free cores)
+            mems: Memory nodes (default: the allocated node)
+            smt: Take every SMT thread of the cores, not just the primary one
+
+        Raises:
+            CpusetConflictError: If no node has enough free cores
+        """
+        cores = int(cores)
+        if cores <= 0:
+            raise CpusetConflictError(f"{role}: cores must be positive, got {cores}")
+        if numa_node is not None and int(numa_node) not in self.nodes:
+            raise CpusetConflictError(f"{role}: NUMA node {numa_node} does not exist (host nodes: {self.nodes})")
+
+        candidates = self.nodes if numa_node is None else [int(numa_node)]
+        for node in candidates:
+            free = [core for core in self._node_cores(node) if core not in self._core_owner]
+            if len(free) < cores:
+                continue
+            picked = free[:cores]
+            cpus = [cpu for core in picked for cpu in (self._threads[core] if smt else self._threads[core][:1])]
+            return self.reserve(role, cpus, mems)
+
+        free_counts = ', '.join(f"node {node}: {len(self.free_cpus(node))}" for node in candidates)
+        raise CpusetConflictError(
+            f"{role}: {cores} free physical cores needed on one NUMA node, free cores: {free_counts}"
+        )
+
+    def plan(self) -> Dict[str, Any]:
+        """The reservation map as a JSON-serializable dict."""
+        return {
+            'placements': [reservation.to_dict() for reservation in self.reservations.values()],
+            'free': {
+                str(node): cpu_list_to_range(self.free_cpus(node)) for node in self.nodes
+            },
+        }
+
+
+def plan_cpusets(lscpu_data, placements):
+    """
+    Place several processes on one host without sharing cores.
+
+    Placements with explicit CPUs are reserved first, in order; placements
+    given as a core count then fill the remaining physical cores.
+
+    Args:
+        lscpu_data: String output from lscpu -e=CPU,NODE,CORE[,CACHE] -n
+        placements: List of dicts, each with 'role' and either 'cpus'
+            (range string or list) or 'cores' (count, with optional
+            'numa_node' and 'smt'); 'mems' optionally sets the memory nodes.
+            Entries without CPUs or cores (e.g. an unpinned process) are
+            skipped. A counted placement with 'optional' true falls back
+            to any node when its numa_node is full, and is left out of the
+            plan when no node has room.
+
+    Returns:
+        Dict with 'placements' (role, cpuset_cpus, cpuset_mems, cpus,
+        physical_cores, in input order) and 'free' (node -> primary CPUs
+        of the unreserved cores)
+
+    Raises:
+        AnsibleFilterError: If two placements collide or one does not fit
+
+    Example:
+        lscpu_data | plan_cpusets([
+            {'role': 'vllm', 'cpus': '32-63', 'mems': 1},
+            {'role': 'guidellm', 'cores': 8, 'numa_node': 0},
+        ])
+    """
+    if not isinstance(placements, (list, tuple)):
+        raise CpusetConflictError(f"placements must be a list, got {type(placements).__name__}")
+    planner = CpusetPlanner(lscpu_data)
+
+    roles = []
+    for placement in placements:
+        if not isinstance(placement, dict) or not placement.get('role'):
+            raise CpusetConflictError(f"Each placement needs a 'role': {placement!r}")
+        has_cpus = placement.get('cpus') not in (None, '', [])
+        has_cores = placement.get('cores') not in (None, '', 0)
+        if has_cpus and has_cores:
+            raise CpusetConflictError(f"{placement['role']}: give 'cpus' or 'cores', not both")
+        if has_cpus or has_cores:
+            roles.append(placement['role'])
+
+    fixed = [p for p in placements if p.get('cpus') not in (None, '', [])]
+    counted = [p for p in placements if p.get('cores') not in (None, '', 0)]
+    for placement in fixed:
+        planner.reserve(placement['role'], placement['cpus'], placement.get('mems'))
+    for placement in counted:
+        numa_node = placement.get('numa_node')
+        numa_nodes = [None if numa_node in (None, '') else int(numa_node)]
+        if placement.get('optional') and numa_nodes[0] is not None:
+            numa_nodes.append(None)
+        for attempt, node in enumerate(numa_nodes, 1):
+            try:
+                planner.allocate(
+                    placement['role'],
+                    placement['cores'],
+                    node,
+                    placement.get('mems'),
+                    bool(placement.get('smt', False)),
+                )
+                break
+            except CpusetConflictError:
+                if not placement.get('optional'):
+                    raise
+                if attempt == len(numa_nodes):
+                    roles.remove(placement['role'])
+
+    plan = planner.plan()
+    plan['placements'].sort(key=lambda p: roles.index(p['role']))
+    return plan
+
+
+class FilterModule:
+    """Ansible filter plugin registration."""
+    def filters(self):
+        return {
+            'plan_cpusets': plan_cpusets,
+        }
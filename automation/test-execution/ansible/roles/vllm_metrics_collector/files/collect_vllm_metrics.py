@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+vLLM Metrics Collector
+Scrapes /metrics endpoint periodically and saves as JSON time-series
+No external dependencies required (uses only stdlib)
+
+Output format is chosen from the output file extension:
+  *.ndjson - streaming mode: one JSON object per line, appended and flushed
+             as each sample is scraped. The first line is a header with
+             collection_info, the last line a footer with the final
+             collection_info. Memory use is bounded and a killed collector
+             leaves every sample written so far on disk.
+  *.json   - legacy mode: all samples are kept in memory and written as a
+             single {"collection_info": ..., "samples": [...]} document on exit.
+
+Scrapes run on a fixed-rate monotonic schedule (sub-second intervals are
+supported). Each sample carries a "collector" block with its scrape latency,
+payload size and the number of ticks skipped before it, so collector-induced
+distortion is visible in the data.
+
+Several endpoints (e.g. one vLLM instance per NUMA node) can be scraped by
+one collector: pass a comma-separated list of URLs, optionally as
+name=url. All endpoints are scraped concurrently on the same tick and every
+series is tagged with an "instance" label, so one sample holds one aligned
+point for the whole deployment.
+
+/metrics payloads are parsed by PrometheusTextParser, one per endpoint, which
+caches each series' name and labels across scrapes, handles escaped label
+values and # TYPE lines, and can drop metrics outside an allowlist (sixth
+argument, comma-separated family names or "prefix*" globs).
+"""
+import asyncio
+import json
+import math
+import time
+import sys
+import re
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+from urllib.request import urlopen, Request
+
+# Label added to every series to identify the endpoint it was scraped from
+INSTANCE_LABEL = "instance"
+
+
+# Sample line: name, optional {labels}, value and optional timestamp (ms)
+_SAMPLE_RE = re.compile(
+    r'([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?[ \t]+(\S+)(?:[ \t]+(-?[0-9]+))?$'
+)
+# One label pair; values may contain commas, braces and \\, \" or \n escapes
+_LABEL_RE = re.compile(r'[ \t]*([a-zA-Z_][a-zA-Z0-9_]*)[ \t]*=[ \t]*"((?:[^"\\]|\\.)*)"[ \t]*(?:,|$)')
+_ESCAPE_RE = re.compile(r'\\(.)')
+_UNESCAPED = {'n': '\n'}
+
+# Sample name suffixes that belong to a metric family declared by # TYPE
+FAMILY_SUFFIXES = ('_bucket', '_sum', '_count', '_total', '_created')
+
+# Cached series beyond this are parsed but not cached (label churn guard)
+MAX_CACHED_SERIES = 100000
+
+_SKIP = object()
+
+
+def _unescape(value):
+    return _ESCAPE_RE.sub(lambda m: _UNESCAPED.get(m.group(1), m.group(1)), value)
+
+
+class PrometheusTextParser:
+    """Prometheus text exposition format parser using only stdlib.
+
+    Meant to be reused across scrapes of one endpoint: a series line repeats
+    with the same name and labels on every scrape, so the text before the
+    value is cached and later scrapes only convert the value. Metric names,
+    label names and label values are interned, and label dicts are shared
+    between series and scrapes; callers must not modify them.
+
+    Args:
+        allowlist: Metric names to keep (default: all). A name matches a
+            whole family, e.g. a histogram name keeps its _bucket, _sum and
+            _count series; a trailing "*" matches a prefix ("vllm:*").
+        extra_labels: Labels added to every series (e.g. the instance)
+    """
+
+    def __init__(self, allowlist=None, extra_labels=None):
+        allowlist = [name for name in (allowlist or []) if name]
+        self.allowlist = allowlist or None
+        self._exact = {name for name in allowlist if not name.endswith('*')}
+        self._prefixes = tuple(name[:-1] for name in allowlist if name.endswith('*'))
+        self.extra_labels = {
+            sys.intern(k): sys.intern(v) for k, v in (extra_labels or {}).items()
+        }
+        # Metric family -> type from # TYPE lines
+        self.types = {}
+        self._series = {}
+        self._label_sets = {}
+
+    def family(self, name):
+        """Metric family a sample name belongs to, per the # TYPE lines seen."""
+        if name in self.types:
+            return name
+        for suffix in FAMILY_SUFFIXES:
+            if name.endswith(suffix) and name[:-len(suffix)] in self.types:
+                return name[:-len(suffix)]
+        return name
+
+    def wanted(self, name):
+        """Whether the allowlist keeps a sample name."""
+        if self.allowlist is None:
+            return True
+        family = self.family(name)
+        return (
+            name in self._exact or family in self._exact
+            or name.startswith(self._prefixes) or family.startswith(self._prefixes)
+        )
+
+    def _labels(self, labels_str):
+        labels = self._label_sets.get(labels_str)
+        if labels is not None:
+            return labels
+        labels = {}
+        pos, end = 0, len(labels_str)
+        while pos < end:
+            match = _LABEL_RE.match(labels_str, pos)
+            if not match:
+                if labels_str[pos:].strip(' \t,'):
+                    return None
+                break
+            value = match.group(2)
+            if '\\' in value:
+                value = _unescape(value)
+            labels[sys.intern(match.group(1))] = sys.intern(value)
+            pos = match.end()
+        labels.update(self.extra_labels)
+        if len(self._label_sets) < MAX_CACHED_SERIES:
+            self._label_sets[labels_str] = labels
+        return labels
+
+    def _parse_series(self, line):
+        """Slow path: parse a full sample line.
+
+        Returns:
+            ((name, labels) or _SKIP, raw value, cacheable), or None if the
+            line is malformed
+        """
+        stripped = line.strip()
+        match = _SAMPLE_RE.match(stripped)
+        if not match:
+            return None
+        name, labels_str, raw_value, timestamp = match.groups()
+        cacheable = timestamp is None and stripped == line
+        if not self.wanted(name):
+            return _SKIP, raw_value, cacheable
+        labels = self._labels(labels_str) if labels_str else self._labels('')
+        if labels is None:
+            return None
+        return (sys.intern(name), labels), raw_value, cacheable
+
+    def _declare_type(self, line):
+        parts = line.split(None, 3)
+        if len(parts) == 4:
+            self.types[sys.intern(parts[2])] = parts[3].strip()
+
+    def parse(self, text):
+        """Parse one /metrics payload.
+
+        Returns:
+            dict: metric name -> list of {"labels": {...}, "value": float}.
+            NaN and infinite values are dropped so output stays valid JSON.
+        """
+        metrics = {}
+        cache = self._series
+        for line in text.split('\n'):
+            if not line:
+                continue
+            if line[0] == '#':
+                if line.startswith('# TYPE '):
+                    self._declare_type(line)
+                continue
+
+            head, _, raw_value = line.rpartition(' ')
+            series = cache.get(head)
+            if series is None:
+                parsed = self._parse_series(line)
+                if parsed is None:
+                    continue
+                series, value_token, cacheable = parsed
+                # Cache only if the fast split finds the same value next time
+                if cacheable and value_token == raw_value and len(cache) < MAX_CACHED_SERIES:
+                    cache[head] = series
+                raw_value = value_token
+            if series is _SKIP:
+                continue
+
+            try:
+                value = float(raw_value)
+            except ValueError:
+                continue
+            if not math.isfinite(value):
+                continue
+
+            name, labels = series
+            items = metrics.get(name)
+            if items is None:
+                metrics[name] = [{"labels": labels, "value": value}]
+            else:
+                items.append({"labels": labels, "value": value})
+
+        return metrics
+
+
+def parse_prometheus_text(text, allowlist=None):
+    """Parse a Prometheus text payload (one-off; see PrometheusTextParser)."""
+    return PrometheusTextParser(allowlist).parse(text)
+
+
+class JsonSampleWriter:
+    """Buffer samples in memory and write one JSON document on close."""
+
+    def __init__(self, path, collection_info):
+        self.path = path
+        self.data = {"collection_info": collection_info, "samples": []}
+
+    def write_sample(self, sample):
+        self.data["samples"].append(sample)
+
+    def close(self, collection_info):
+        self.data["collection_info"] = collection_info
+        with open(self.path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+
+
+class NdjsonSampleWriter:
+    """Append each sample as one NDJSON line, flushed immediately.
+
+    A header line carrying collection_info is written on open so that a
+    collector killed mid-run still leaves a self-describing file; the final
+    collection_info (end_time, total_samples) is appended as a footer line.
+    """
+
+    def __init__(self, path, collection_info):
+        self.path = path
+        self.file = open(path, 'w')
+        self._write_line({"collection_info": collection_info})
+
+    def _write_line(self, record):
+        self.file.write(json.dumps(record, separators=(',', ':')))
+        self.file.write('\n')
+        self.file.flush()
+
+    def write_sample(self, sample):
+        self._write_line(sample)
+
+    def close(self, collection_info):
+        self._write_line({"collection_info": collection_info})
+        self.file.close()
+
+
+def open_writer(path, collection_info):
+    """Pick the sample writer from the output file extension."""
+    if path.endswith('.ndjson'):
+        collection_info["format"] = "ndjson"
+        return NdjsonSampleWriter(path, collection_info)
+    collection_info["format"] = "json"
+    return JsonSampleWriter(path, collection_info)
+
+
+class TickScheduler:
+    """Fixed-rate scheduler anchored to a monotonic start time.
+
+    Tick n is due at start + n * interval, so sleep jitter and scrape time
+    never accumulate into drift. Ticks that fall due while a scrape is still
+    running are skipped and reported as missed rather than fired late.
+    """
+
+    def __init__(self, interval, clock=time.monotonic):
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.interval = interval
+        self.clock = clock
+        self.start = clock()
+        self.tick = 0
+
+    def due_time(self, tick=None):
+        """Monotonic time at which the given (default: current) tick is due."""
+        return self.start + (self.tick if tick is None else tick) * self.interval
+
+    def advance(self):
+        """Move to the next tick that is still in the future.
+
+        Returns:
+            int: Number of ticks skipped because they were already past due
+        """
+        latest_due = math.floor((self.clock() - self.start) / self.interval)
+        missed = max(0, latest_due - self.tick)
+        self.tick += missed + 1
+        return missed
+
+    def wait(self, stop_requested, max_chunk=0.5):
+        """Sleep until the current tick is due, checking stop_requested()."""
+        while not stop_requested():
+            remaining = self.due_time() - self.clock()
+            if remaining <= 0:
+                return
+            time.sleep(min(max_chunk, remaining))
+
+    async def wait_async(self, stop_requested, max_chunk=0.5):
+        """Asyncio variant of wait()."""
+        while not stop_requested():
+            remaining = self.due_time() - self.clock()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(max_chunk, remaining))
+
+
+class ScrapeStats:
+    """Running summary of collector self-metrics (constant memory)."""
+
+    def __init__(self):
+        self.scrapes = 0
+        self.errors = 0
+        self.missed_ticks = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.payload_bytes_max = 0
+
+    def record(self, latency, payload_bytes):
+        self.scrapes += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.payload_bytes_max = max(self.payload_bytes_max, payload_bytes)
+
+    def summary(self):
+        return {
+            "scrape_errors": self.errors,
+            "missed_ticks": self.missed_ticks,
+            "scrape_duration_mean_seconds": round(
+                self.latency_sum / self.scrapes, 6) if self.scrapes else None,
+            "scrape_duration_max_seconds": round(self.latency_max, 6),
+            "payload_bytes_max": self.payload_bytes_max,
+        }
+
+
+def instance_name(url):
+    """Default instance name for an endpoint: host:port, like Prometheus."""
+    netloc = urlsplit(url).netloc.rsplit('@', 1)[-1]
+    return netloc or url
+
+
+def parse_endpoints(spec):
+    """Parse a comma-separated endpoint list into (instance, url) pairs.
+
+    Entries are either a bare URL or name=url.
+
+    Raises:
+        ValueError: If no endpoint is given or an instance name repeats
+    """
+    endpoints = []
+    for entry in spec.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, url = entry.partition('=')
+        if not sep or '/' in name or ':' in name:
+            name, url = instance_name(entry), entry
+        endpoints.append((name.strip(), url.strip().rstrip('/')))
+
+    if not endpoints:
+        raise ValueError("no vLLM endpoint given")
+    names = [name for name, _ in endpoints]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate instance names: {', '.join(duplicates)}")
+    return endpoints
+
+
+def fetch_metrics(url, timeout):
+    """Fetch the raw /metrics payload of one endpoint (blocking)."""
+    response = urlopen(Request(f"{url}/metrics"), timeout=timeout)
+    if response.code != 200:
+        raise RuntimeError(f"HTTP {response.code}")
+    return response.read()
+
+
+def merge_scrapes(scrapes):
+    """Merge per-instance scrape results into one metrics dict.
+
+    Args:
+        scrapes: List of scrape result dicts as returned by scrape_endpoint
+
+    Returns:
+        dict: metric name -> series list, each series labelled with its instance
+    """
+    merged = {}
+    for scrape in scrapes:
+        if scrape.get("metrics") is None:
+            continue
+        for name, series in scrape["metrics"].items():
+            merged.setdefault(name, []).extend(series)
+    return merged
+
+
+async def scrape_endpoint(executor, instance, url, timeout, parser):
+    """Scrape and parse one endpoint without blocking the event loop.
+
+    The endpoint's PrometheusTextParser tags every series with its instance.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+    result = {"instance": instance}
+    try:
+        payload = await loop.run_in_executor(executor, fetch_metrics, url, timeout)
+    except Exception as e:
+        result["error"] = str(e)
+        result["scrape_duration_seconds"] = time.monotonic() - start
+        return result
+
+    result["scrape_duration_seconds"] = time.monotonic() - start
+    result["payload_bytes"] = len(payload)
+    result["metrics"] = parser.parse(payload.decode('utf-8'))
+    return result
+
+
+# Global flag for graceful shutdown
+should_stop = False
+
+
+def signal_handler(signum, frame):
+    """Handle SIGTERM/SIGINT gracefully"""
+    global should_stop
+    should_stop = True
+    print("\n✓ Received stop signal, finishing collection...")
+
+
+def stop_requested():
+    return should_stop
+
+
+def make_parsers(endpoints, allowlist=None):
+    """One PrometheusTextParser per endpoint, tagging series with its instance."""
+    return {
+        instance: PrometheusTextParser(allowlist, {INSTANCE_LABEL: instance})
+        for instance, _ in endpoints
+    }
+
+
+async def collect(endpoints, writer, interval, duration, stats, parsers=None):
+    """Scrape all endpoints on a shared tick until duration or stop.
+
+    One sample is written per tick on which at least one endpoint answered;
+    stats.scrapes counts the samples written.
+    """
+    if parsers is None:
+        parsers = make_parsers(endpoints)
+    scheduler = TickScheduler(interval)
+    # Scrapes must not outlive many ticks; keep the old 5s ceiling for slow intervals
+    scrape_timeout = min(5.0, max(1.0, 2 * interval))
+    # Progress roughly every 10s of collection regardless of interval
+    progress_every = max(10, int(10 / interval))
+    multi_instance = len(endpoints) > 1
+    missed = 0
+
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        while scheduler.due_time() - scheduler.start < duration and not should_stop:
+            scrape_start = time.monotonic()
+            scrape_wall_time = time.time()
+            lag = scrape_start - scheduler.due_time()
+
+            scrapes = await asyncio.gather(*(
+                scrape_endpoint(executor, instance, url, scrape_timeout, parsers[instance])
+                for instance, url in endpoints
+            ))
+            scrape_duration = time.monotonic() - scrape_start
+
+            for scrape in scrapes:
+                if "error" in scrape:
+                    stats.errors += 1
+                    print(f"  Error collecting sample from {scrape['instance']}: {scrape['error']}")
+
+            succeeded = [scrape for scrape in scrapes if "error" not in scrape]
+            if succeeded:
+                payload_bytes = sum(scrape["payload_bytes"] for scrape in succeeded)
+                collector = {
+                    "tick": scheduler.tick,
+                    "scrape_duration_seconds": round(scrape_duration, 6),
+                    "payload_bytes": payload_bytes,
+                    "tick_lag_seconds": round(lag, 6),
+                    "missed_ticks": missed,
+                }
+                if multi_instance:
+                    collector["instances"] = {
+                        scrape["instance"]: (
+                            {"error": scrape["error"]} if "error" in scrape else {
+                                "scrape_duration_seconds": round(scrape["scrape_duration_seconds"], 6),
+                                "payload_bytes": scrape["payload_bytes"],
+                            }
+                        )
+                        for scrape in scrapes
+                    }
+
+                writer.write_sample({
+                    "timestamp": datetime.now().isoformat(),
+                    "unix_time": round(scrape_wall_time, 3),
+                    "elapsed_seconds": round(scrape_start - scheduler.start, 3),
+                    "metrics": merge_scrapes(succeeded),
+                    "collector": collector,
+                })
+                stats.record(scrape_duration, payload_bytes)
+
+                if stats.scrapes % progress_every == 0:
+                    print(f"  Collected {stats.scrapes} samples...")
+
+            # Wait for the next tick on the fixed grid (no cumulative drift)
+            missed = scheduler.advance()
+            if missed:
+                stats.missed_ticks += missed
+                print(f"  Warning: scrape overran interval, skipped {missed} tick(s)")
+            await scheduler.wait_async(stop_requested)
+
+
+def main():
+    # A single URL or a comma-separated list of [name=]url entries
+    vllm_urls = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else "vllm-metrics.ndjson"
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0  # seconds, may be < 1
+    duration = int(sys.argv[4]) if len(sys.argv) > 4 else 300  # seconds
+    test_run_id = sys.argv[5] if len(sys.argv) > 5 else "unknown"
+    # Optional comma-separated metric allowlist (families, "prefix*" globs)
+    allowlist = [name.strip() for name in sys.argv[6].split(',')] if len(sys.argv) > 6 else []
+
+    endpoints = parse_endpoints(vllm_urls)
+    parsers = make_parsers(endpoints, allowlist)
+
+    # Register signal handlers
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
+
+    print("vLLM Metrics Collector")
+    for instance, url in endpoints:
+        print(f"  URL: {url}/metrics ({INSTANCE_LABEL}={instance})")
+    print(f"  Interval: {interval}s")
+    print(f"  Duration: {duration}s")
+    print(f"  Output: {output_file}")
+    print(f"  Test Run ID: {test_run_id}")
+    if any(allowlist):
+        print(f"  Metric allowlist: {', '.join(name for name in allowlist if name)}")
+    print()
+
+    collection_info = {
+        "vllm_url": endpoints[0][1],
+        "instances": {instance: url for instance, url in endpoints},
+        "interval_seconds": interval,
+        "duration_seconds": duration,
+        "start_time": datetime.now().isoformat(),
+        "test_run_id": test_run_id
+    }
+    if any(allowlist):
+        collection_info["metric_allowlist"] = [name for name in allowlist if name]
+    writer = open_writer(output_file, collection_info)
+
+    stats = ScrapeStats()
+    try:
+        asyncio.run(collect(endpoints, writer, interval, duration, stats, parsers))
+    except KeyboardInterrupt:
+        print("\n✓ Collection interrupted by user")
+
+    # Save results
+    sample_count = stats.scrapes
+    collection_info["end_time"] = datetime.now().isoformat()
+    collection_info["total_samples"] = sample_count
+    collection_info["collector_stats"] = stats.summary()
+    # Metric family types from the # TYPE lines (counter, gauge, histogram, ...)
+    metric_types = {}
+    for parser in parsers.values():
+        metric_types.update(parser.types)
+    collection_info["metric_types"] = dict(sorted(metric_types.items()))
+    writer.close(collection_info)
+
+    print(f"\n✓ Saved {sample_count} samples to {output_file}")
+    if stats.missed_ticks:
+        print(f"  Missed ticks: {stats.missed_ticks}")
+
+
+if __name__ == "__main__":
+    main()
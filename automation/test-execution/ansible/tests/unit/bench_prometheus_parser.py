@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: collector Prometheus parser vs. the previous regex parser.
+
+Parses recorded /metrics payloads repeatedly and reports the time per scrape.
+Capture a payload from a running server with:
+
+    curl -s http://localhost:8000/metrics > payload.txt
+
+Run with: python bench_prometheus_parser.py [payload.txt ...] [-n 200]
+Without arguments the payload in fixtures/ is used.
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent.parent / 'roles' / 'vllm_metrics_collector' / 'files')
+)
+
+from collect_vllm_metrics import PrometheusTextParser  # noqa: E402
+
+DEFAULT_PAYLOAD = Path(__file__).parent / 'fixtures' / 'vllm_metrics_payload.txt'
+ALLOWLIST = ['vllm:*', 'process_cpu_seconds_total', 'process_resident_memory_bytes']
+
+
+def legacy_parse_prometheus_text(text):
+    """The collector's parser before PrometheusTextParser, kept for comparison."""
+    metrics = {}
+
+    for line in text.split('\n'):
+        line = line.strip()
+
+        if not line or line.startswith('#'):
+            continue
+
+        match = re.match(r'([a-zA-Z_:][a-zA-Z0-9_:]*)\{([^}]*)\}\s+([0-9.eE+-]+)', line)
+        if not match:
+            match = re.match(r'([a-zA-Z_:][a-zA-Z0-9_:]*)\s+([0-9.eE+-]+)', line)
+            if match:
+                metric_name = match.group(1)
+                value = float(match.group(2))
+                labels = {}
+            else:
+                continue
+        else:
+            metric_name = match.group(1)
+            labels_str = match.group(2)
+            value = float(match.group(3))
+
+            labels = {}
+            for label_pair in labels_str.split(','):
+                if '=' in label_pair:
+                    key, val = label_pair.split('=', 1)
+                    labels[key.strip()] = val.strip(' "')
+
+        if metric_name not in metrics:
+            metrics[metric_name] = []
+
+        metrics[metric_name].append({
+            "labels": labels,
+            "value": value
+        })
+
+    return metrics
+
+
+def per_scrape_ms(func, text, number):
+    best = min(timeit.repeat(lambda: func(text), number=number, repeat=5))
+    return best / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('payloads', nargs='*', type=Path, default=[DEFAULT_PAYLOAD])
+    parser.add_argument('-n', '--number', type=int, default=200,
+                        help='parses per timing run (default: 200)')
+    args = parser.parse_args()
+
+    for path in args.payloads:
+        text = path.read_text()
+        series = sum(1 for line in text.splitlines() if line and not line.startswith('#'))
+        print(f"{path.name}: {len(text) / 1024:.0f} KiB, {series} series")
+
+        warm = PrometheusTextParser()
+        warm.parse(text)
+        warm_allowlist = PrometheusTextParser(ALLOWLIST)
+        warm_allowlist.parse(text)
+
+        legacy_ms = per_scrape_ms(legacy_parse_prometheus_text, text, args.number)
+        results = [
+            ("legacy regex parser", legacy_ms),
+            ("new parser, first scrape", per_scrape_ms(
+                lambda t: PrometheusTextParser().parse(t), text, args.number)),
+            ("new parser, reused", per_scrape_ms(warm.parse, text, args.number)),
+            ("new parser, reused + allowlist", per_scrape_ms(
+                warm_allowlist.parse, text, args.number)),
+        ]
+        for name, ms in results:
+            print(f"  {name:<32} {ms:8.3f} ms/scrape  {legacy_ms / ms:5.1f}x")
+        kept = sum(len(items) for items in warm_allowlist.parse(text).values())
+        print(f"  allowlist {ALLOWLIST} keeps {kept}/{series} series")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the allocation_optimizer filter plugin.
+Run with: python -m pytest test_allocation_optimizer.py -v
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add filter_plugins to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'filter_plugins'))
+
+from allocation_optimizer import (  # noqa: E402
+    fit_throughput_model,
+    search_allocations,
+)
+from cpu_utils import AnsibleFilterError  # noqa: E402
+from test_cpu_utils import GiB, create_numa_topology, with_free_memory  # noqa: E402
+
+
+def shapes(results):
+    """(TP, nodes) of each ranked allocation."""
+    return [(r['tensor_parallel'], r['allocated_nodes']) for r in results]
+
+
+@pytest.mark.unit
+class TestSearchAllocations:
+    """Test enumeration and ranking of placements."""
+
+    def test_128_cores_on_8_nodes(self):
+        """Only TP=8 spreads 128 cores over 16-core nodes; it uses the housekeeping node."""
+        results = search_allocations(create_numa_topology(8, 16), 128)
+        assert shapes(results) == [(8, [0, 1, 2, 3, 4, 5, 6, 7])]
+        assert results[0]['cpuset_cpus'] == '0-15,16-31,32-47,48-63,64-79,80-95,96-111,112-127'
+        assert results[0]['cost']['housekeeping'] == 0.5
+        # The greedy allocator never takes the housekeeping node
+        assert results[0]['greedy'] is False
+        json.dumps(results)
+
+    def test_64_cores_ranked(self):
+        """TP=4 off the housekeeping node beats TP=8 and TP=4 on it."""
+        results = search_allocations(create_numa_topology(8, 16), 64, top_k=3)
+        assert shapes(results) == [
+            (4, [1, 2, 3, 4]),
+            (8, [0, 1, 2, 3, 4, 5, 6, 7]),
+            (4, [0, 1, 2, 3]),
+        ]
+        assert [r['rank'] for r in results] == [1, 2, 3]
+        assert results[0]['greedy'] is True
+        assert results[0]['cpuset_cpus'] == '16-31,32-47,48-63,64-79'
+        totals = [r['cost']['total'] for r in results]
+        assert totals == sorted(totals)
+
+    def test_equivalent_placements_listed_once(self):
+        """Any 4 of the 5 non-housekeeping nodes cost the same: one entry."""
+        results = search_allocations(create_numa_topology(6, 16), 64, top_k=10)
+        assert shapes(results) == [(4, [1, 2, 3, 4]), (4, [0, 1, 2, 3])]
+
+    def test_requested_tp(self):
+        results = search_allocations(create_numa_topology(8, 16), 64, requested_tp=8)
+        assert shapes(results) == [(8, [0, 1, 2, 3, 4, 5, 6, 7])]
+        # Ansible passes omit / '' for unset variables
+        assert search_allocations(create_numa_topology(8, 16), 64, requested_tp='')[0]['tensor_parallel'] == 4
+
+    def test_bandwidth_and_distance(self):
+        """Slower memory and farther nodes raise the cost of a placement."""
+        topology = create_numa_topology(4, 16)
+        topology['allocation_policy']['housekeeping']['strategy'] = 'minimal_reservation'
+        for node in topology['nodes']:
+            node['memory_bandwidth'] = 100 if node['id'] != 1 else 50
+            node['distances'] = {str(other): 10 if other == node['id'] else (12 if other // 2 == node['id'] // 2 else 32)
+                                 for other in range(4)}
+        results = search_allocations(topology, 32, requested_tp=2, top_k=10)
+        # Same-socket pair 2-3 first, cross-socket pairs next, node 1 (half bandwidth) last
+        assert results[0]['allocated_nodes'] == [2, 3]
+        assert results[1]['allocated_nodes'] == [0, 2]
+        assert results[-1]['cost']['bandwidth_share'] == 0.5
+        assert 1 in results[-1]['allocated_nodes']
+
+    def test_memory_must_fit(self):
+        """A 40 GiB model only fits where each rank's shard has room."""
+        topology = with_free_memory(create_numa_topology(4, 16), [64, 64, 12, 64])
+        topology['allocation_policy']['housekeeping']['strategy'] = 'minimal_reservation'
+        results = search_allocations(topology, 32, model_memory='40GiB', kv_cache_space='4GiB', top_k=10)
+        assert all(2 not in r['allocated_nodes'] for r in results)
+        assert results[0]['memory']['rank_bytes'] == 24 * GiB
+        assert all(r['memory']['checked'] for r in results)
+        with pytest.raises(AnsibleFilterError, match='node-local memory'):
+            search_allocations(topology, 32, model_memory='200GiB')
+
+    def test_memory_unknown_is_not_checked(self):
+        """Without free memory per node, placements are kept and marked unchecked."""
+        topology = create_numa_topology(4, 16)
+        results = search_allocations(topology, 32, model_memory='200GiB', top_k=10)
+        assert results and not any(r['memory']['checked'] for r in results)
+        assert search_allocations(topology, 32)[0]['memory'] is None
+
+    def test_throughput_model(self):
+        """A fitted TP penalty moves TP=8 below TP=4 on equal footing."""
+        topology = create_numa_topology(8, 16)
+        topology['allocation_policy']['housekeeping']['strategy'] = 'minimal_reservation'
+        assert search_allocations(topology, 64)[0]['tensor_parallel'] == 8
+        model = {'cores_exponent': 0.8, 'tp_exponent': -0.8}
+        best = search_allocations(topology, 64, throughput_model=model)[0]
+        assert best['tensor_parallel'] == 4
+        assert best['cost']['throughput_factor'] == round(4 ** 0.8, 4)
+
+    def test_infeasible(self):
+        with pytest.raises(AnsibleFilterError, match='No placement of 17 cores'):
+            search_allocations(create_numa_topology(8, 16), 17)
+        with pytest.raises(AnsibleFilterError, match='Invalid tensor_parallel'):
+            search_allocations(create_numa_topology(8, 16), 64, requested_tp=3)
+        with pytest.raises(AnsibleFilterError, match='must be positive'):
+            search_allocations(create_numa_topology(8, 16), 64, top_k=0)
+
+
+@pytest.mark.unit
+class TestFitThroughputModel:
+    """Test the log-linear throughput fit."""
+
+    def test_recovers_exponents(self):
+        records = []
+        for group, scale in (('llama', 100.0), ('granite', 250.0)):
+            for cores in (16, 32, 64):
+                for tp in (1, 2, 4):
+                    records.append({
+                        'cores': cores, 'tensor_parallel': tp, 'group': group,
+                        'throughput': scale * cores ** 0.7 * tp ** 0.2,
+                    })
+        model = fit_throughput_model(records)
+        assert model == {'cores_exponent': 0.7, 'tp_exponent': 0.2, 'samples': 18, 'groups': 2}
+
+    def test_tp_not_separable(self):
+        """Without TP variation the TP exponent stays 0."""
+        records = [{'cores': c, 'tensor_parallel': 1, 'throughput': 10 * c} for c in (8, 16, 32)]
+        model = fit_throughput_model(records)
+        assert math.isclose(model['cores_exponent'], 1.0)
+        assert model['tp_exponent'] == 0.0
+
+    def test_too_few_records(self):
+        records = [{'cores': 16, 'throughput': 10}, {'cores': 32}, {'cores': 0, 'throughput': 5}]
+        with pytest.raises(AnsibleFilterError, match='got 1'):
+            fit_throughput_model(records)
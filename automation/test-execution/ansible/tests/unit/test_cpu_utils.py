@@ -51,8 +51,14 @@ from cpu_utils import (  # noqa: E402
     extract_primary_cpus,
     extract_all_cpus,
     extract_numa_nodes,
+    extract_cache_domains,
     merge_cpu_ranges,
     allocate_cores_multi_numa,
+    pick_cache_aware_cpus,
+    size_to_bytes,
+    model_weight_bytes,
+    extract_node_memory,
+    LscpuParser,
     VALID_TP_VALUES,
 )
 
@@ -809,6 +815,270 @@ class TestVllmNumaNodesFiltering:
         assert vllm_numa_node_value == 2
 
 
+def create_epyc_lscpu(num_nodes=2, ccds_per_node=4, cores_per_ccd=8):
+    """Helper to build lscpu -e=CPU,NODE,CORE,CACHE output of an EPYC-like host.
+
+    Every CCD has its own L3; SMT siblings are numbered after all primary
+    CPUs (CPU n + total cores), as on Linux.
+    """
+    total_cores = num_nodes * ccds_per_node * cores_per_ccd
+    lines = []
+    for thread in range(2):
+        for core in range(total_cores):
+            node = core // (ccds_per_node * cores_per_ccd)
+            l3 = core // cores_per_ccd
+            cpu = core + thread * total_cores
+            lines.append(f"{cpu} {node} {core} {core}:{core}:{core}:{l3}")
+    return '\n'.join(lines)
+
+
+def create_cache_topology(lscpu_data, num_nodes):
+    """Helper to build numa_topology (with cache_domains) like detect-numa-topology.yml."""
+    nodes = []
+    for node in range(num_nodes):
+        cpus = extract_primary_cpus(lscpu_data, node)
+        nodes.append({
+            'id': node,
+            'physical_cores': len(cpus.split(',')),
+            'physical_cpus': cpu_list_to_range(cpus),
+            'physical_cpus_list': cpus,
+            'cache_domains': extract_cache_domains(lscpu_data, node),
+        })
+    return {
+        'node_count': num_nodes,
+        'nodes': nodes,
+        'allocation_policy': {
+            'housekeeping': {'strategy': 'minimal_reservation', 'reserved_node': 0},
+            'workload': {},
+        },
+    }
+
+
+@pytest.mark.unit
+class TestCacheDomains:
+    """Test L3 cache domain parsing."""
+
+    def test_cache_domains_use_primary_cpus(self):
+        """Each L3 domain lists one CPU per core, SMT siblings excluded."""
+        lscpu_data = create_epyc_lscpu(num_nodes=1, ccds_per_node=2, cores_per_ccd=4)
+        assert extract_cache_domains(lscpu_data, 0) == {'0': '0,1,2,3', '1': '4,5,6,7'}
+        parser = LscpuParser(lscpu_data)
+        assert parser.get_cache_domains(0, 'l2') == {i: [i] for i in range(8)}
+
+    def test_without_cache_column(self):
+        """lscpu -e=CPU,NODE,CORE output has no cache domains."""
+        assert extract_cache_domains("0 0 0\n1 0 1", 0) == {}
+        assert extract_primary_cpus("0 0 0 0:0:0:0\n1 0 0 0:0:0:0", 0) == "0"
+
+    def test_missing_l3(self):
+        """CPUs without an L3 id ('-' or fewer levels) give no domains."""
+        assert extract_cache_domains("0 0 0 0:0:0\n1 0 1 1:1:1", 0) == {}
+        assert extract_cache_domains("0 0 0 -\n1 0 1 -", 0) == {}
+
+    def test_sub_numa_clustering(self):
+        """Under SNC an L3 spans nodes; each node only lists its own cores."""
+        lscpu_data = "0 0 0 0:0:0:0\n1 0 1 1:1:1:0\n2 1 2 2:2:2:0\n3 1 3 3:3:3:0"
+        assert extract_cache_domains(lscpu_data, 1) == {'0': '2,3'}
+
+
+@pytest.mark.unit
+class TestCacheAwareAllocation:
+    """Test L3-aware core placement within NUMA nodes."""
+
+    def test_pick_compact_fills_fewest_domains(self):
+        """Largest domains first; remainder in the smallest domain it fits."""
+        domains = {'0': [0, 1, 2, 3, 4, 5], '1': [6, 7, 8, 9], '2': [10, 11]}
+        assert pick_cache_aware_cpus(domains, 8, 'compact') == [0, 1, 2, 3, 4, 5, 10, 11]
+        assert pick_cache_aware_cpus(domains, 3, 'compact') == [6, 7, 8]
+
+    def test_pick_spread_round_robin(self):
+        """Spread takes one core per domain in turn."""
+        domains = {'0': [0, 1, 2], '1': [3, 4, 5], '2': [6]}
+        assert pick_cache_aware_cpus(domains, 5, 'spread') == [0, 3, 6, 1, 4]
+
+    def test_compact_packs_ccds(self):
+        """12 cores on a node of 8-core CCDs use 2 L3 domains."""
+        topology = create_cache_topology(create_epyc_lscpu(), num_nodes=2)
+        result = allocate_cores_multi_numa(topology, requested_cores=12)
+
+        assert result['cache_policy'] == 'compact'
+        assert result['cpuset_cpus'] == "0-11"
+        assert result['cache_domains'] == {'0': {'0': '0-7', '1': '8-11'}}
+
+    def test_compact_prefers_whole_free_domain(self):
+        """With socket pinning past the first cores, the partial CCD is avoided."""
+        topology = create_cache_topology(create_epyc_lscpu(), num_nodes=2)
+        result = allocate_cores_multi_numa(
+            topology, requested_cores=8, cpu_start=4, numa_node_override=0
+        )
+        assert result['cpuset_cpus'] == "8-15"
+        assert result['cache_domains'] == {'0': {'1': '8-15'}}
+
+    def test_spread_policy(self):
+        """spread deals a TP rank's cores over every L3 domain of its node."""
+        topology = create_cache_topology(create_epyc_lscpu(), num_nodes=2)
+        result = allocate_cores_multi_numa(topology, requested_cores=16, requested_tp=2,
+                                           cache_policy='spread')
+
+        assert result['tensor_parallel'] == 2
+        assert result['cpuset_cpus'] == "0-1,8-9,16-17,24-25,32-33,40-41,48-49,56-57"
+        assert result['omp_threads_bind'] == "0-1,8-9,16-17,24-25|32-33,40-41,48-49,56-57"
+        assert result['cache_domains']['1'] == {'4': '32-33', '5': '40-41', '6': '48-49', '7': '56-57'}
+
+    def test_policy_from_topology(self):
+        """The topology's workload.cache_policy applies when no argument is given."""
+        topology = create_cache_topology(create_epyc_lscpu(), num_nodes=2)
+        topology['allocation_policy']['workload']['cache_policy'] = 'spread'
+        result = allocate_cores_multi_numa(topology, requested_cores=4)
+        assert result['cache_policy'] == 'spread'
+        assert result['cpuset_cpus'] == "0,8,16,24"
+
+    def test_invalid_policy(self):
+        """Unknown cache_policy raises AnsibleFilterError."""
+        topology = create_cache_topology(create_epyc_lscpu(), num_nodes=2)
+        with pytest.raises(AnsibleFilterError):
+            allocate_cores_multi_numa(topology, requested_cores=8, cache_policy='scatter')
+
+    def test_nodes_without_cache_info_unchanged(self):
+        """Topologies without cache_domains keep taking the first cores."""
+        topology = create_numa_topology(num_nodes=3, cores_per_node=32)
+        result = allocate_cores_multi_numa(topology, requested_cores=16, cache_policy='spread')
+        assert result['cpuset_cpus'] == "32-47"
+        assert result['cache_domains'] == {}
+
+
+GiB = 1024 ** 3
+
+
+def with_free_memory(topology, free_gib):
+    """Helper to give each node of a topology free memory (GiB, None = unknown)."""
+    for node, free in zip(topology['nodes'], free_gib):
+        node['memory_free_bytes'] = None if free is None else free * GiB
+    return topology
+
+
+@pytest.mark.unit
+class TestMemorySizes:
+    """Test size and node memory parsing."""
+
+    def test_size_to_bytes(self):
+        """Units are binary; a bare number is GiB like VLLM_CPU_KVCACHE_SPACE."""
+        assert size_to_bytes("11GiB") == 11 * GiB
+        assert size_to_bytes("512MiB") == 512 * 1024 ** 2
+        assert size_to_bytes("16GB") == 16 * GiB
+        assert size_to_bytes("2400000000B") == 2400000000
+        assert size_to_bytes(2) == size_to_bytes("2") == 2 * GiB
+        with pytest.raises(AnsibleFilterError):
+            size_to_bytes("11 parsecs")
+
+    def test_model_weight_bytes(self):
+        """Parameter count (model-matrix.yaml style) times bytes per weight."""
+        assert model_weight_bytes("1.2B", "bfloat16") == 2_400_000_000
+        assert model_weight_bytes("0.6B", "float32") == 2_400_000_000
+        assert model_weight_bytes("21B (3.6B active per token)", "mxfp4") == 10_500_000_000
+        assert model_weight_bytes("600M") == 1_200_000_000
+        with pytest.raises(AnsibleFilterError):
+            model_weight_bytes("1.2B", "float12")
+
+    def test_extract_node_memory_sysfs(self):
+        """sysfs meminfo: free memory includes the inactive page cache."""
+        meminfo = (
+            "Node 0 MemTotal:       65536000 kB\n"
+            "Node 0 MemFree:        30000000 kB\n"
+            "Node 0 Inactive(file):  2000000 kB\n"
+            "Node 1 MemTotal:       65536000 kB\n"
+            "Node 1 MemFree:         1000000 kB\n"
+        )
+        assert extract_node_memory(meminfo) == {
+            '0': {'total_bytes': 65536000 * 1024, 'free_bytes': 32000000 * 1024},
+            '1': {'total_bytes': 65536000 * 1024, 'free_bytes': 1000000 * 1024},
+        }
+
+    def test_extract_node_memory_numactl(self):
+        """numactl -H size/free lines."""
+        numactl = (
+            "available: 2 nodes (0-1)\n"
+            "node 0 cpus: 0 1 2 3\n"
+            "node 0 size: 64000 MB\n"
+            "node 0 free: 50000 MB\n"
+            "node 1 cpus: 4 5 6 7\n"
+            "node 1 size: 64000 MB\n"
+            "node 1 free: 20000 MB\n"
+            "node distances:\n"
+        )
+        memory = extract_node_memory(numactl)
+        assert memory['1'] == {'total_bytes': 64000 * 1024 ** 2, 'free_bytes': 20000 * 1024 ** 2}
+        assert extract_node_memory("") == {}
+
+
+@pytest.mark.unit
+class TestMemoryAwareAllocation:
+    """Test placement that keeps each rank's weights and KV cache node-local."""
+
+    def test_skips_node_without_enough_memory(self):
+        """A node with the cores but not the memory is passed over."""
+        topology = with_free_memory(create_numa_topology(num_nodes=3), [100, 20, 60])
+        result = allocate_cores_multi_numa(topology, requested_cores=16,
+                                           model_memory="30GiB", kv_cache_space="10GiB")
+
+        assert result['allocated_nodes'] == [2]
+        assert result['tensor_parallel'] == 1
+        assert result['memory'] == {
+            'model_bytes': 30 * GiB,
+            'kv_cache_bytes': 10 * GiB,
+            'rank_bytes': 40 * GiB,
+            'node_free_bytes': {'2': 60 * GiB},
+        }
+
+    def test_auto_tp_splits_weights_to_fit(self):
+        """TP=2 halves the weight shard when no single node holds the model."""
+        topology = with_free_memory(create_numa_topology(num_nodes=3), [100, 40, 40])
+        result = allocate_cores_multi_numa(topology, requested_cores=32,
+                                           model_memory="60GiB", kv_cache_space="5GiB")
+
+        assert result['tensor_parallel'] == 2
+        assert result['allocated_nodes'] == [1, 2]
+        assert result['memory']['rank_bytes'] == 35 * GiB
+
+    def test_no_fit_explains(self):
+        """When no TP fits, the error lists free memory and each TP's needs."""
+        topology = with_free_memory(create_numa_topology(num_nodes=3), [100, 20, 30])
+        with pytest.raises(AnsibleFilterError) as exc_info:
+            allocate_cores_multi_numa(topology, requested_cores=32,
+                                      model_memory="40GiB", kv_cache_space="10GiB")
+
+        message = str(exc_info.value)
+        assert "node 1: 20.0 GiB, node 2: 30.0 GiB" in message
+        assert "TP=1: 50.0 GiB per rank" in message
+        assert "TP=2: 30.0 GiB per rank (weights 40.0 GiB / TP=2 + KV cache 10.0 GiB), 1 node(s) have it, 2 needed" in message
+
+    def test_fixed_tp_checks_memory(self):
+        """A user-set TP fails early rather than spilling to remote memory."""
+        topology = with_free_memory(create_numa_topology(num_nodes=3), [100, 20, 30])
+        with pytest.raises(AnsibleFilterError, match="NUMA-local"):
+            allocate_cores_multi_numa(topology, requested_cores=32, requested_tp=2,
+                                      model_memory="40GiB", kv_cache_space="10GiB")
+
+    def test_socket_pinning_checks_memory(self):
+        """Pinning to a node too small for the whole model is refused."""
+        topology = with_free_memory(create_numa_topology(num_nodes=2), [64, 16])
+        with pytest.raises(AnsibleFilterError, match="NUMA node 1 has 16.0 GiB free"):
+            allocate_cores_multi_numa(topology, requested_cores=8, numa_node_override=1,
+                                      model_memory="10GiB", kv_cache_space="10GiB")
+
+    def test_unknown_memory_is_not_checked(self):
+        """Nodes without memory information and calls without a footprint place by cores."""
+        topology = with_free_memory(create_numa_topology(num_nodes=3), [None, None, None])
+        result = allocate_cores_multi_numa(topology, requested_cores=16,
+                                           model_memory="500GiB", kv_cache_space="40GiB")
+        assert result['allocated_nodes'] == [1]
+        assert result['memory']['node_free_bytes'] == {'1': None}
+
+        result = allocate_cores_multi_numa(create_numa_topology(num_nodes=3), requested_cores=16,
+                                           model_memory='', kv_cache_space='None')
+        assert result['memory'] is None
+
+
 if __name__ == "__main__":
     # Run tests if pytest not available
     import sys
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the cpuset_planner filter plugin.
+Run with: python -m pytest test_cpuset_planner.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add filter_plugins to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'filter_plugins'))
+
+from cpuset_planner import (  # noqa: E402
+    CpusetConflictError,
+    CpusetPlanner,
+    plan_cpusets,
+)
+from cpu_utils import AnsibleFilterError  # noqa: E402
+
+
+def create_smt_lscpu(num_nodes=2, cores_per_node=8):
+    """lscpu -e=CPU,NODE,CORE -n of an SMT host: CPU n and n + total share a core."""
+    total = num_nodes * cores_per_node
+    lines = []
+    for thread in range(2):
+        for core in range(total):
+            lines.append(f"{core + thread * total} {core // cores_per_node} {core}")
+    return '\n'.join(lines)
+
+
+@pytest.mark.unit
+class TestReservations:
+    """Test the reservation map."""
+
+    def test_disjoint_placements(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        planner.reserve('vllm', '8-15', mems='1')
+        planner.reserve('guidellm', [0, 1, 2, 3])
+
+        plan = planner.plan()
+        assert plan['placements'] == [
+            {'role': 'vllm', 'cpuset_cpus': '8-15', 'cpuset_mems': '1', 'cpus': 8, 'physical_cores': 8},
+            {'role': 'guidellm', 'cpuset_cpus': '0-3', 'cpuset_mems': '0', 'cpus': 4, 'physical_cores': 4},
+        ]
+        assert plan['free'] == {'0': '4-7', '1': ''}
+        json.dumps(plan)
+
+    def test_overlap_rejected(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        planner.reserve('vllm', '0-7')
+        with pytest.raises(CpusetConflictError, match='CPU 4 overlaps vllm'):
+            planner.reserve('guidellm', '4-5')
+
+    def test_smt_sibling_sharing_rejected(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        planner.reserve('vllm', '0-3')
+        # CPU 16 is the second thread of CPU 0's core
+        with pytest.raises(CpusetConflictError, match='SMT sibling of CPU.* 0 held by vllm'):
+            planner.reserve('metrics', '16')
+
+    def test_one_role_may_use_both_threads(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        reservation = planner.reserve('vllm', '0-3,16-19')
+        assert reservation.physical_cores == 4
+        assert reservation.to_dict()['cpus'] == 8
+
+    def test_remote_memory_rejected(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        with pytest.raises(CpusetConflictError, match='not in cpuset_mems 0'):
+            planner.reserve('guidellm', '8-11', mems='0')
+
+    def test_unknown_cpus_and_nodes(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        with pytest.raises(CpusetConflictError, match='32-33 do not exist'):
+            planner.reserve('vllm', '30-33')
+        with pytest.raises(CpusetConflictError, match=r'memory node\(s\) \[2\]'):
+            planner.reserve('vllm', '0-3', mems='0,2')
+
+    def test_errors_are_filter_errors(self):
+        assert issubclass(CpusetConflictError, AnsibleFilterError)
+        with pytest.raises(AnsibleFilterError):
+            CpusetPlanner('')
+
+
+@pytest.mark.unit
+class TestAllocation:
+    """Test count-based allocation around existing reservations."""
+
+    def test_fills_free_cores_of_node(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        planner.reserve('vllm', '0-5')
+        reservation = planner.allocate('guidellm', 2, numa_node=0)
+        assert reservation.cpus == [6, 7]
+        assert reservation.mems == [0]
+
+    def test_smt_takes_sibling_threads(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        reservation = planner.allocate('guidellm', 2, numa_node=1, smt=True)
+        assert reservation.cpus == [8, 9, 24, 25]
+
+    def test_first_node_with_room(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        planner.reserve('vllm', '0-5')
+        assert planner.allocate('guidellm', 4).cpus == [8, 9, 10, 11]
+
+    def test_no_room(self):
+        planner = CpusetPlanner(create_smt_lscpu())
+        planner.reserve('vllm', '0-5')
+        with pytest.raises(CpusetConflictError, match='node 0: 2'):
+            planner.allocate('guidellm', 4, numa_node=0)
+
+
+@pytest.mark.unit
+class TestPlanCpusetsFilter:
+    """Test the plan_cpusets filter."""
+
+    def test_fixed_placements_first(self):
+        plan = plan_cpusets(create_smt_lscpu(), [
+            {'role': 'metrics', 'cores': 1},
+            {'role': 'vllm', 'cpus': '0-3', 'mems': 0},
+            {'role': 'guidellm', 'cores': 4, 'numa_node': '1'},
+            {'role': 'housekeeping', 'cpus': ''},
+        ])
+        assert [(p['role'], p['cpuset_cpus']) for p in plan['placements']] == [
+            ('metrics', '4'), ('vllm', '0-3'), ('guidellm', '8-11'),
+        ]
+        assert plan['free'] == {'0': '5-7', '1': '12-15'}
+
+    def test_colocated_defaults_conflict(self):
+        # vLLM on 16 cores of a 2 x 16 host, GuideLLM on its default 16-31
+        with pytest.raises(AnsibleFilterError, match='guidellm: CPU 16 overlaps vllm'):
+            plan_cpusets(create_smt_lscpu(2, 16), [
+                {'role': 'vllm', 'cpus': '0-31', 'mems': '0,1'},
+                {'role': 'guidellm', 'cpus': '16-31', 'mems': '0'},
+            ])
+
+    def test_invalid_placements(self):
+        with pytest.raises(AnsibleFilterError, match='must be a list'):
+            plan_cpusets(create_smt_lscpu(), {'role': 'vllm'})
+        with pytest.raises(AnsibleFilterError, match="needs a 'role'"):
+            plan_cpusets(create_smt_lscpu(), [{'cpus': '0-3'}])
+        with pytest.raises(AnsibleFilterError, match='not both'):
+            plan_cpusets(create_smt_lscpu(), [{'role': 'vllm', 'cpus': '0-3', 'cores': 4}])
+        with pytest.raises(AnsibleFilterError, match='already placed'):
+            plan_cpusets(create_smt_lscpu(), [{'role': 'vllm', 'cpus': '0'}, {'role': 'vllm', 'cpus': '1'}])
+
+    def test_optional_placement(self):
+        """An optional metrics core moves off a full node, or is left out."""
+        plan = plan_cpusets(create_smt_lscpu(), [
+            {'role': 'vllm', 'cpus': '8-15'},
+            {'role': 'guidellm', 'cpus': '0-6'},
+            {'role': 'metrics', 'cores': 1, 'numa_node': 1, 'optional': True},
+        ])
+        assert plan['placements'][-1]['cpuset_cpus'] == '7'
+
+        plan = plan_cpusets(create_smt_lscpu(), [
+            {'role': 'vllm', 'cpus': '8-15'},
+            {'role': 'guidellm', 'cpus': '0-7'},
+            {'role': 'metrics', 'cores': 1, 'optional': True},
+        ])
+        assert [p['role'] for p in plan['placements']] == ['vllm', 'guidellm']
+        with pytest.raises(AnsibleFilterError, match='metrics'):
+            plan_cpusets(create_smt_lscpu(), [{'role': 'vllm', 'cpus': '0-15'}, {'role': 'metrics', 'cores': 1}])
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the vllm_metrics_collector role's collector script.
+Run with: python -m pytest test_metrics_collector.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the role's files directory to path
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent.parent / 'roles' / 'vllm_metrics_collector' / 'files')
+)
+
+from collect_vllm_metrics import (  # noqa: E402
+    JsonSampleWriter,
+    NdjsonSampleWriter,
+    PrometheusTextParser,
+    ScrapeStats,
+    TickScheduler,
+    make_parsers,
+    merge_scrapes,
+    open_writer,
+    parse_endpoints,
+    parse_prometheus_text,
+)
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_sample(n):
+    return {
+        "timestamp": f"2026-01-01T10:00:{n:02d}",
+        "elapsed_seconds": float(n),
+        "metrics": {"vllm:num_requests_running": [{"labels": {}, "value": n}]},
+    }
+
+
+@pytest.mark.unit
+class TestSampleWriters:
+    """Test the NDJSON and JSON output writers."""
+
+    def test_writer_selected_by_extension(self, tmp_path):
+        ndjson = open_writer(str(tmp_path / "m.ndjson"), {})
+        ndjson.close({})
+        assert isinstance(ndjson, NdjsonSampleWriter)
+        assert isinstance(open_writer(str(tmp_path / "m.json"), {}), JsonSampleWriter)
+
+    def test_ndjson_is_readable_before_close(self, tmp_path):
+        """Every sample is on disk as soon as it is written."""
+        path = tmp_path / "vllm-metrics.ndjson"
+        writer = open_writer(str(path), {"test_run_id": "abc"})
+        writer.write_sample(make_sample(1))
+        writer.write_sample(make_sample(2))
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert lines[0] == {"collection_info": {"test_run_id": "abc", "format": "ndjson"}}
+        assert lines[1:] == [make_sample(1), make_sample(2)]
+        writer.close({"test_run_id": "abc", "total_samples": 2})
+
+    def test_ndjson_footer(self, tmp_path):
+        path = tmp_path / "vllm-metrics.ndjson"
+        writer = open_writer(str(path), {"test_run_id": "abc"})
+        writer.write_sample(make_sample(1))
+        writer.close({"test_run_id": "abc", "total_samples": 1})
+
+        last = json.loads(path.read_text().splitlines()[-1])
+        assert last == {"collection_info": {"test_run_id": "abc", "total_samples": 1}}
+
+    def test_json_written_on_close(self, tmp_path):
+        path = tmp_path / "vllm-metrics.json"
+        writer = open_writer(str(path), {"test_run_id": "abc"})
+        writer.write_sample(make_sample(1))
+        assert not path.exists()
+
+        writer.close({"test_run_id": "abc", "total_samples": 1})
+        data = json.loads(path.read_text())
+        assert data["collection_info"]["total_samples"] == 1
+        assert data["samples"] == [make_sample(1)]
+
+
+@pytest.mark.unit
+class TestTickScheduler:
+    """Test the fixed-rate monotonic scheduler."""
+
+    def test_rejects_non_positive_interval(self):
+        with pytest.raises(ValueError):
+            TickScheduler(0)
+
+    def test_ticks_stay_on_grid(self):
+        """Scrape time inside the interval does not shift later ticks."""
+        clock = FakeClock()
+        scheduler = TickScheduler(0.25, clock=clock)
+        for expected_tick in range(1, 20):
+            clock.now += 0.07  # scrape takes 70 ms
+            assert scheduler.advance() == 0
+            assert scheduler.tick == expected_tick
+            clock.now = scheduler.due_time()
+        assert scheduler.due_time() == pytest.approx(100.0 + 19 * 0.25)
+
+    def test_overrun_skips_and_counts_missed_ticks(self):
+        clock = FakeClock()
+        scheduler = TickScheduler(0.1, clock=clock)
+        clock.now += 0.35  # scrape overran ticks 1, 2 and 3
+        assert scheduler.advance() == 3
+        assert scheduler.tick == 4
+        assert scheduler.due_time() == pytest.approx(100.4)
+
+    def test_wait_returns_when_stop_requested(self):
+        scheduler = TickScheduler(3600)
+        scheduler.advance()
+        scheduler.wait(lambda: True)  # would otherwise sleep for an hour
+
+
+@pytest.mark.unit
+class TestScrapeStats:
+    """Test the collector self-metrics summary."""
+
+    def test_summary(self):
+        stats = ScrapeStats()
+        stats.record(0.010, 1000)
+        stats.record(0.030, 3000)
+        stats.missed_ticks = 2
+        summary = stats.summary()
+        assert summary["scrape_duration_mean_seconds"] == pytest.approx(0.02)
+        assert summary["scrape_duration_max_seconds"] == pytest.approx(0.03)
+        assert summary["payload_bytes_max"] == 3000
+        assert summary["missed_ticks"] == 2
+
+    def test_empty_summary(self):
+        assert ScrapeStats().summary()["scrape_duration_mean_seconds"] is None
+
+
+@pytest.mark.unit
+class TestMultiEndpoint:
+    """Test endpoint parsing and instance tagging for multi-instance scrapes."""
+
+    def test_single_url_named_by_host_port(self):
+        assert parse_endpoints("http://localhost:8000") == [
+            ("localhost:8000", "http://localhost:8000")
+        ]
+
+    def test_named_endpoints(self):
+        endpoints = parse_endpoints("numa0=http://h:8000, numa1=http://h:8001/")
+        assert endpoints == [("numa0", "http://h:8000"), ("numa1", "http://h:8001")]
+
+    def test_duplicate_names_rejected(self):
+        with pytest.raises(ValueError, match="duplicate"):
+            parse_endpoints("http://h:8000,http://h:8000")
+
+    def test_empty_rejected(self):
+        with pytest.raises(ValueError):
+            parse_endpoints(" , ")
+
+    def test_merge_tags_every_series(self):
+        parsers = make_parsers(parse_endpoints(
+            "numa0=http://h:8000,numa1=http://h:8001,numa2=http://h:8002"))
+
+        def scrape(instance, value):
+            text = f'vllm:num_requests_running{{engine="0"}} {value}\n'
+            return {"instance": instance, "metrics": parsers[instance].parse(text)}
+
+        merged = merge_scrapes([
+            scrape("numa0", 2.0),
+            {"instance": "numa1", "error": "timed out"},
+            scrape("numa2", 3.0),
+        ])
+        series = merged["vllm:num_requests_running"]
+        assert [item["labels"]["instance"] for item in series] == ["numa0", "numa2"]
+        assert all(item["labels"]["engine"] == "0" for item in series)
+        assert sum(item["value"] for item in series) == 5.0
+
+
+@pytest.mark.unit
+class TestPrometheusTextParser:
+    """Test the Prometheus text exposition format parser."""
+
+    def test_label_values_with_commas_and_escapes(self):
+        text = (
+            'vllm:cache_config_info{name="a,b}",path="C:\\\\tmp",'
+            'quote="say \\"hi\\"",multi="x\\ny"} 1.0\n'
+        )
+        labels = parse_prometheus_text(text)["vllm:cache_config_info"][0]["labels"]
+        assert labels == {
+            "name": "a,b}", "path": "C:\\tmp", "quote": 'say "hi"', "multi": "x\ny",
+        }
+
+    def test_timestamps_special_values_and_malformed_lines(self):
+        text = "\n".join([
+            "up 1 1700000000000",
+            "gauge_nan NaN",
+            "gauge_inf +Inf",
+            "not a metric line",
+            '  padded{a="1"}   2.5  ',
+        ])
+        metrics = parse_prometheus_text(text)
+        assert metrics == {
+            "up": [{"labels": {}, "value": 1.0}],
+            "padded": [{"labels": {"a": "1"}, "value": 2.5}],
+        }
+
+    def test_types_recorded(self):
+        parser = PrometheusTextParser()
+        parser.parse((FIXTURES / 'vllm_metrics_payload.txt').read_text())
+        assert parser.types["vllm:time_to_first_token_seconds"] == "histogram"
+        assert parser.types["process_cpu_seconds_total"] == "counter"
+        assert parser.family("vllm:time_to_first_token_seconds_bucket") == (
+            "vllm:time_to_first_token_seconds")
+
+    def test_allowlist_keeps_whole_families(self):
+        parser = PrometheusTextParser(
+            ["vllm:time_to_first_token_seconds", "process_*"])
+        metrics = parser.parse((FIXTURES / 'vllm_metrics_payload.txt').read_text())
+        assert "vllm:time_to_first_token_seconds_bucket" in metrics
+        assert "vllm:time_to_first_token_seconds_count" in metrics
+        assert "process_cpu_seconds_total" in metrics
+        assert "vllm:num_requests_running" not in metrics
+        assert "python_info" not in metrics
+
+    def test_reused_parser_reads_new_values(self):
+        parser = PrometheusTextParser(extra_labels={"instance": "numa0"})
+        line = 'vllm:num_requests_running{engine="0"} '
+        assert parser.parse(line + "1")["vllm:num_requests_running"][0]["value"] == 1.0
+        second = parser.parse(line + "7")["vllm:num_requests_running"][0]
+        assert second == {"labels": {"engine": "0", "instance": "numa0"}, "value": 7.0}
+
+    def test_matches_previous_parser_on_payload(self):
+        """Same series and values as the old regex parser on plain labels."""
+        from bench_prometheus_parser import legacy_parse_prometheus_text
+
+        text = (FIXTURES / 'vllm_metrics_payload.txt').read_text()
+        assert parse_prometheus_text(text) == legacy_parse_prometheus_text(text)
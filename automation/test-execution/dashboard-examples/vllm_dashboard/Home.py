@@ -4,10 +4,15 @@ Main landing page for the multipage dashboard app.
 Navigate to different views using the sidebar.
 """
 
+import sys
 import streamlit as st
 from pathlib import Path
 from config_manager import DashboardConfig
 
+# Add shared library to path for the results catalog
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared"))
+from results_catalog import find_files  # noqa: E402
+
 # Page config
 st.set_page_config(
     page_title="vLLM CPU Performance Dashboards",
@@ -352,10 +357,7 @@ if results_base.exists():
         m for m in results_base.glob("*")
         if m.is_dir() and not m.name.startswith('.')
     ]
-    test_count = sum(
-        len(list(m.rglob("test-metadata.json")))
-        for m in model_dirs
-    )
+    test_count = len(find_files(results_base, "test-metadata.json"))
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Models Tested", len(model_dirs))
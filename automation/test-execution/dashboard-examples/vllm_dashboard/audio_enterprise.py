@@ -10,10 +10,15 @@ Used by:
 
 import json
 import logging
+import sys
 from pathlib import Path
 
 import numpy as np
 
+# Add shared library to path for the results catalog
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared"))
+from results_catalog import find_files  # noqa: E402
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +39,7 @@ def discover_run_results(results_dir: str) -> list[dict]:
         logger.warning("Results directory not found: %s", results_path)
         return all_results
 
-    for json_file in results_path.rglob("benchmarks.json"):
+    for json_file in find_files(results_path, "benchmarks.json"):
         try:
             with open(json_file) as fh:
                 data = json.load(fh)
@@ -367,7 +372,7 @@ def load_quality_results(results_dir: str) -> list[dict]:
     if not results_path.exists():
         return out
 
-    for qf in results_path.rglob("quality-results.json"):
+    for qf in find_files(results_path, "quality-results.json"):
         try:
             with open(qf) as fh:
                 qdata = json.load(fh)
@@ -0,0 +1,61 @@
+"""Sidebar selection of the results a dashboard page loads.
+
+The results store is partitioned by model, workload, cores and month
+(results_store.PARTITION_COLUMNS). Selecting a subset here turns into
+load_table() filters, so only the matching partitions are read.
+"""
+
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+from results_tables import load_partitions
+
+SCOPE_LABELS = {
+    'model': "Model",
+    'workload': "Workload",
+    'cores': "Cores",
+    'month': "Month",
+}
+
+
+@st.cache_data(ttl=300)
+def load_scope_options(results_dir: str, table: str) -> pd.DataFrame:
+    """Distinct partition keys of a table (cached)."""
+    return load_partitions(results_dir, table)
+
+
+def render_data_scope(
+    results_dir: str,
+    table: str,
+    key: str,
+    labels: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Render the data scope selection in the sidebar.
+
+    Args:
+        results_dir: Results directory of the page
+        table: Table the page loads (results_tables.TABLE_LOADERS key)
+        key: Widget key prefix, unique per page
+        labels: Labels overriding SCOPE_LABELS (e.g. 'workload': "Scenario")
+
+    Returns:
+        load_table() filters; partitions left fully selected are not filtered
+    """
+    options = load_scope_options(results_dir, table)
+    if options.empty:
+        return {}
+
+    filters: Dict[str, Any] = {}
+    labels = {**SCOPE_LABELS, **(labels or {})}
+    with st.sidebar.expander("🗂️ Data Scope", expanded=False):
+        st.caption("Load only these results")
+        for column, label in labels.items():
+            values = sorted(options[column].dropna().unique().tolist())
+            if len(values) < 2:
+                continue
+            selected = st.multiselect(label, values, default=values, key=f"{key}_scope_{column}")
+            if len(selected) < len(values):
+                filters[column] = selected
+    return filters
@@ -5,7 +5,6 @@ Provides interactive visualizations and analysis of CPU inference performance
 across different platforms, models, and configurations.
 """
 
-import json
 import logging
 import sys
 from pathlib import Path
@@ -21,7 +20,9 @@ from plotly.subplots import make_subplots
 
 # Add parent directory to path for config_manager import
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config_manager import DashboardConfig, normalize_vllm_version
+from config_manager import DashboardConfig
+from data_scope import render_data_scope
+from results_tables import load_table, pool_repetitions
 
 # Set global Plotly template
 if "plotly_white_light" not in pio.templates:
@@ -60,110 +61,24 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data(ttl=300)
-def load_guidellm_data(results_dir: str) -> pd.DataFrame:
-    """Load GuideLLM benchmark results from directory structure."""
-    results_path = Path(results_dir)
-    all_results = []
-
-    if not results_path.exists():
-        logger.warning(f"Results directory not found: {results_path}")
-        return pd.DataFrame()
-
-    # Scan for all benchmarks.json files
-    for json_file in results_path.rglob("benchmarks.json"):
-        try:
-            with open(json_file) as f:
-                data = json.load(f)
-
-            # Load metadata
-            metadata_file = json_file.parent / "test-metadata.json"
-            if not metadata_file.exists():
-                continue
-
-            with open(metadata_file) as f:
-                metadata = json.load(f)
-
-            # Extract each benchmark (load point)
-            for bench in data.get('benchmarks', []):
-                metrics = bench['metrics']
-                config = bench['config']
-
-                # Extract concurrency/rate
-                concurrency = config.get('strategy', {}).get('max_concurrency', 0)
-                req_rate = metrics.get('requests_per_second', {}).get('successful', {}).get('mean', concurrency)
-
-                row = {
-                    # Metadata
-                    'test_run_id': metadata.get('test_run_id', 'unknown'),
-                    'test_name': metadata.get('test_name', ''),
-                    'platform': metadata.get('platform', 'unknown'),
-                    'model': metadata.get('model', 'unknown'),
-                    'model_short': metadata.get('model', 'unknown').split('/')[-1],
-                    'workload': metadata.get('workload', 'unknown'),
-                    'cores': metadata.get('core_count', 0),
-                    'backend': metadata.get('backend', 'unknown'),
-                    'vllm_version': normalize_vllm_version(metadata.get('vllm_version', 'unknown')),
-                    'guidellm_version': metadata.get('guidellm_version', 'unknown'),
-                    'core_config': metadata.get('core_config_name', 'unknown'),
-                    'tensor_parallel': metadata.get('tensor_parallel', 1),
-                    'vllm_mode': metadata.get('vllm_mode', 'managed'),
-                    'vllm_endpoint_url': metadata.get('vllm_endpoint_url', 'n/a'),
-                    'model_source': metadata.get('model_source', 'specified'),
-
-                    # Load characteristics
-                    'concurrency': concurrency,
-                    'request_rate': req_rate,
-
-                    # Throughput metrics
-                    'throughput_mean': metrics['tokens_per_second']['successful']['mean'],
-                    'throughput_p50': metrics['tokens_per_second']['successful']['percentiles']['p50'],
-                    'throughput_p95': metrics['tokens_per_second']['successful']['percentiles']['p95'],
-                    'throughput_p99': metrics['tokens_per_second']['successful']['percentiles']['p99'],
-
-                    # TTFT metrics (ms)
-                    'ttft_mean': metrics['time_to_first_token_ms']['successful']['mean'],
-                    'ttft_p50': metrics['time_to_first_token_ms']['successful']['percentiles']['p50'],
-                    'ttft_p95': metrics['time_to_first_token_ms']['successful']['percentiles']['p95'],
-                    'ttft_p99': metrics['time_to_first_token_ms']['successful']['percentiles']['p99'],
-
-                    # ITL metrics (ms)
-                    'itl_mean': metrics['inter_token_latency_ms']['successful']['mean'],
-                    'itl_p50': metrics['inter_token_latency_ms']['successful']['percentiles']['p50'],
-                    'itl_p95': metrics['inter_token_latency_ms']['successful']['percentiles']['p95'],
-                    'itl_p99': metrics['inter_token_latency_ms']['successful']['percentiles']['p99'],
-
-                    # E2E latency metrics (s)
-                    'e2e_mean': metrics['request_latency']['successful']['mean'],
-                    'e2e_p50': metrics['request_latency']['successful']['percentiles']['p50'],
-                    'e2e_p95': metrics['request_latency']['successful']['percentiles']['p95'],
-                    'e2e_p99': metrics['request_latency']['successful']['percentiles']['p99'],
-
-                    # Request stats
-                    'total_requests': metrics['request_totals']['total'],
-                    'successful_requests': metrics['request_totals']['successful'],
-                    'success_rate': (metrics['request_totals']['successful'] /
-                                   metrics['request_totals']['total'] * 100)
-                                   if metrics['request_totals']['total'] > 0 else 0,
-                }
-
-                all_results.append(row)
-
-        except Exception as e:
-            logger.warning(f"Failed to load {json_file}: {e}")
-            continue
-
-    if not all_results:
-        return pd.DataFrame()
+# Client table columns read by this page (the rest, e.g. the throughput
+# percentiles, stay on disk)
+CLIENT_COLUMNS = [
+    'test_run_id', 'test_name', 'platform', 'model', 'model_short', 'workload',
+    'cores', 'backend', 'vllm_version', 'guidellm_version', 'core_config',
+    'tensor_parallel', 'vllm_mode', 'vllm_endpoint_url', 'model_source',
+    'concurrency', 'request_rate', 'throughput_mean',
+    'ttft_mean', 'ttft_p50', 'ttft_p95', 'ttft_p99', 'ttft_p999', 'ttft_hist',
+    'itl_mean', 'itl_p50', 'itl_p95', 'itl_p99', 'itl_p999', 'itl_hist',
+    'e2e_mean', 'e2e_p50', 'e2e_p95', 'e2e_p99', 'e2e_p999', 'e2e_hist',
+    'total_requests', 'successful_requests', 'success_rate', 'efficiency',
+]
 
-    df = pd.DataFrame(all_results)
 
-    # Calculate efficiency (throughput per core)
-    # Guard against missing/zero cores to avoid inf/NaN
-    cores = pd.to_numeric(df['cores'], errors='coerce')
-    df['efficiency'] = np.where(cores > 0, df['throughput_mean'] / cores, np.nan)
-
-    return df
+@st.cache_data(ttl=300)
+def load_guidellm_data(results_dir: str, filters: dict) -> pd.DataFrame:
+    """Load GuideLLM benchmark results from directory structure."""
+    return load_table(results_dir, 'client', columns=CLIENT_COLUMNS, filters=filters)
 
 
 def render_filters(df: pd.DataFrame, test_mode: str) -> pd.DataFrame:
@@ -605,8 +520,19 @@ def render_performance_plots(df: pd.DataFrame):
     x_col = x_axis_options[selected_x_axis]
     metric_config = metric_families[selected_metric_family]
 
+    # Repetitions pool into one line per configuration, with exact pooled
+    # latency percentiles from the merged per-request histograms
+    if st.checkbox("Pool repetitions", value=False, key="pool_repetitions",
+                   help="Merge runs of the same configuration; latency percentiles are "
+                        "computed over all their requests"):
+        df = pool_repetitions(df)
+
+    # P99.9 where the table has it (latency families)
+    if metric_config["percentiles"] and f"{metric_config['prefix']}_p999" in df.columns:
+        metric_config = {**metric_config, "percentiles": [*metric_config["percentiles"], "p999"]}
+
     # Percentile labels for display
-    percentile_labels = {"mean": "Mean", "p50": "P50", "p95": "P95", "p99": "P99"}
+    percentile_labels = {"mean": "Mean", "p50": "P50", "p95": "P95", "p99": "P99", "p999": "P99.9"}
 
     # Percentile selector (only show for metrics with percentiles)
     selected_percentiles = []
@@ -651,7 +577,8 @@ def render_performance_plots(df: pd.DataFrame):
         "mean": "solid",
         "p50": "dash",
         "p95": "dot",
-        "p99": "dashdot"
+        "p99": "dashdot",
+        "p999": "longdash"
     }
 
     color_idx = 0
@@ -1242,6 +1169,8 @@ def render_dashboard():
         st.cache_data.clear()
         st.rerun()
 
+    scope_filters = render_data_scope(results_dir, 'client', key="client")
+
     # CSV Import section
     st.sidebar.markdown("---")
     st.sidebar.subheader("📥 Import CSV")
@@ -1318,7 +1247,7 @@ def render_dashboard():
         st.caption("ISL = Input Sequence Length | OSL = Output Sequence Length")
 
     with st.spinner("Loading benchmark data..."):
-        df = load_guidellm_data(results_dir)
+        df = load_guidellm_data(results_dir, scope_filters)
 
     # Check for imported CSV data in session state
     if 'imported_llm_performance' in st.session_state:
@@ -14,6 +14,7 @@ Run: streamlit run streamlit_vllm_server_metrics.py
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -21,11 +22,17 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import List
 
 # Add parent directory to path for config_manager import
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config_manager import DashboardConfig, normalize_vllm_version
+from config_manager import DashboardConfig
+from data_scope import render_data_scope
+from results_tables import load_table
+
+# Add shared library to path for the metrics file readers
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "shared"))
+from vllm_metrics import MetricsFrame  # noqa: E402
 
 # Page config is set in Home.py for multipage apps
 
@@ -76,6 +83,8 @@ if st.sidebar.button("🔄 Reload Data", key="reload_btn_server"):
     st.cache_data.clear()
     st.rerun()
 
+scope_filters = render_data_scope(results_dir, 'server', key="server")
+
 # Workload reference table
 with st.sidebar.expander("📋 Workload Reference", expanded=False):
     st.markdown("**Token Configuration by Workload**")
@@ -101,55 +110,53 @@ with st.sidebar.expander("📋 Workload Reference", expanded=False):
     )
     st.caption("ISL = Input Sequence Length | OSL = Output Sequence Length")
 
+# Server table columns read by this page
+SERVER_COLUMNS = [
+    'collection_info', 'platform', 'model', 'workload', 'test_run_id', 'test_name',
+    'cores', 'backend', 'vllm_version', 'guidellm_version', 'vllm_mode',
+    'vllm_endpoint_url', '_metrics_file',
+]
+
+
 # Load vLLM metrics
 @st.cache_data
-def load_vllm_metrics(base_dir: str):
-    """Load all vLLM server metrics files with metadata"""
+def load_vllm_metrics(base_dir: str, filters: dict):
+    """Load collection info and metadata for all vLLM server metrics files.
+
+    Samples are not loaded here; use load_metrics_frame() for the runs
+    actually being displayed.
+    """
     results_path = Path(base_dir)
-    metrics_data = []
 
     if not results_path.exists():
         st.error(f"Directory not found: {results_path.absolute()}")
-        return metrics_data
+        return []
 
     with st.spinner(f"Scanning {results_path}..."):
-        for metrics_file in results_path.rglob("vllm-metrics.json"):
-            try:
-                # Load vLLM metrics
-                with open(metrics_file) as f:
-                    data = json.load(f)
-
-                # Load test metadata
-                metadata_file = metrics_file.parent / "test-metadata.json"
-                if metadata_file.exists():
-                    with open(metadata_file) as f:
-                        metadata = json.load(f)
-
-                        # Load metadata for both managed and external endpoints
-                        data['platform'] = metadata.get('platform', 'unknown')
-                        data['model'] = metadata.get('model', 'unknown')
-                        data['workload'] = metadata.get('workload', 'unknown')
-                        data['test_run_id'] = metadata.get('test_run_id', 'unknown')
-                        data['test_name'] = metadata.get('test_name', '')
-                        data['cores'] = metadata.get('core_count', 'N/A')
-                        data['backend'] = metadata.get('backend', 'unknown')
-                        data['vllm_version'] = normalize_vllm_version(metadata.get('vllm_version', 'unknown'))
-                        data['guidellm_version'] = metadata.get('guidellm_version', 'unknown')
-                        data['core_config'] = metadata.get('core_config_name', 'unknown')
-                        data['vllm_mode'] = metadata.get('vllm_mode', 'managed')
-                        data['vllm_endpoint_url'] = metadata.get('vllm_endpoint_url', 'n/a')
-
-                # Add file path
-                data['_file_path'] = str(metrics_file.parent)
-                data['_file_name'] = metrics_file.name
-
-                metrics_data.append(data)
-            except Exception as e:
-                st.sidebar.warning(f"Failed to load {metrics_file.name}: {e}")
+        df = load_table(base_dir, 'server', columns=SERVER_COLUMNS, filters=filters)
 
+    metrics_data = df.to_dict('records')
+    for data in metrics_data:
+        data['collection_info'] = json.loads(data['collection_info'])
     return metrics_data
 
-results = load_vllm_metrics(results_dir)
+
+@st.cache_data
+def load_metrics_frame(metrics_file: str) -> MetricsFrame:
+    """Load a single metrics file into a MetricsFrame (streamed for .ndjson)"""
+    try:
+        return MetricsFrame.from_file(metrics_file)
+    except Exception as e:
+        st.warning(f"Failed to load samples from {Path(metrics_file).name}: {e}")
+        return MetricsFrame.from_samples([])
+
+
+def series_list(values: np.ndarray) -> List[float]:
+    """Frame series as a plain list, with missing observations as 0"""
+    return np.nan_to_num(values, nan=0.0).tolist()
+
+
+results = load_vllm_metrics(results_dir, scope_filters)
 
 if not results:
     st.error("No vLLM metrics found!")
@@ -544,131 +551,81 @@ if current_section == "📈 Performance Plots":
     collection_info = test_data.get('collection_info', {})
     st.caption(f"Collected {collection_info.get('total_samples', 'N/A')} samples over {collection_info.get('duration_seconds', 'N/A')}s")
 
-    # Helper functions to extract metrics
-    def get_metric_values(sample: Dict, metric_name: str) -> List[float]:
-        """Extract all values for a metric from a sample"""
-        metrics = sample.get('metrics', {})
-        if metric_name in metrics:
-            return [m['value'] for m in metrics[metric_name]]
-        return []
-
-    def sum_metric(sample: Dict, metric_name: str) -> float:
-        """Sum all values of a metric in a sample"""
-        values = get_metric_values(sample, metric_name)
-        return sum(values) if values else 0
+    # Multi-instance collections: totals below are summed across instances
+    instances = collection_info.get('instances') or {}
+    if len(instances) > 1:
+        st.caption(
+            f"Scraped {len(instances)} vLLM instances on a shared tick "
+            f"({', '.join(sorted(instances))}); totals are summed across instances."
+        )
 
-    def mean_metric(sample: Dict, metric_name: str) -> float:
-        """Average all values of a metric in a sample"""
-        values = get_metric_values(sample, metric_name)
-        return sum(values) / len(values) if values else 0
+    # Collector self-metrics (recorded by collectors with the monotonic scheduler)
+    collector_stats = collection_info.get('collector_stats')
+    if collector_stats:
+        mean_scrape = collector_stats.get('scrape_duration_mean_seconds') or 0
+        max_scrape = collector_stats.get('scrape_duration_max_seconds') or 0
+        st.caption(
+            f"Collector: interval {collection_info.get('interval_seconds', 'N/A')}s | "
+            f"scrape mean {mean_scrape * 1000:.1f} ms, max {max_scrape * 1000:.1f} ms | "
+            f"payload max {collector_stats.get('payload_bytes_max', 0) / 1024:.0f} KiB | "
+            f"missed ticks {collector_stats.get('missed_ticks', 0)}"
+        )
+        if collector_stats.get('missed_ticks', 0) > 0:
+            st.warning(
+                f"⚠️ The metrics collector skipped {collector_stats['missed_ticks']} tick(s) because "
+                "scrapes overran the interval; consider a longer metrics_collection_interval."
+            )
 
     # Extract time series data
-    samples = test_data.get('samples', [])
+    frame = load_metrics_frame(test_data['_metrics_file'])
 
-    if not samples:
+    if not len(frame):
         st.error("No samples found in metrics file")
         st.stop()
 
     # Build time series
-    timestamps = [s['elapsed_seconds'] for s in samples]
+    timestamps = frame.elapsed.tolist()
 
     # Queue metrics
-    requests_running = [sum_metric(s, 'vllm:num_requests_running') for s in samples]
-    requests_waiting = [sum_metric(s, 'vllm:num_requests_waiting') for s in samples]
+    requests_running = series_list(frame.total('vllm:num_requests_running'))
+    requests_waiting = series_list(frame.total('vllm:num_requests_waiting'))
 
     # Cache metrics (KV cache usage)
-    cpu_cache_usage = [mean_metric(s, 'vllm:kv_cache_usage_perc') for s in samples]
-
-    # Token metrics
-    prompt_tokens = [sum_metric(s, 'vllm:prompt_tokens_total') for s in samples]
-    generation_tokens = [sum_metric(s, 'vllm:generation_tokens_total') for s in samples]
-
-    # Latency metrics (calculate averages from sum/count if available)
-    ttft_latency = []
-    itl_latency = []
-    e2e_latency = []
-
-    for i, s in enumerate(samples):
-        # TTFT (Time to First Token)
-        ttft_sum = sum_metric(s, 'vllm:time_to_first_token_seconds_sum')
-        ttft_count = sum_metric(s, 'vllm:time_to_first_token_seconds_count')
-        if i > 0 and ttft_count > 0:
-            prev_sum = sum_metric(samples[i-1], 'vllm:time_to_first_token_seconds_sum')
-            prev_count = sum_metric(samples[i-1], 'vllm:time_to_first_token_seconds_count')
-            delta_sum = ttft_sum - prev_sum
-            delta_count = ttft_count - prev_count
-            ttft_latency.append((delta_sum / delta_count * 1000) if delta_count > 0 else 0)  # Convert to ms
-        else:
-            ttft_latency.append(0)
-
-        # ITL (Inter Token Latency)
-        itl_sum = sum_metric(s, 'vllm:request_time_per_output_token_seconds_sum')
-        itl_count = sum_metric(s, 'vllm:request_time_per_output_token_seconds_count')
-        if i > 0 and itl_count > 0:
-            prev_sum = sum_metric(samples[i-1], 'vllm:time_per_output_token_seconds_sum')
-            prev_count = sum_metric(samples[i-1], 'vllm:time_per_output_token_seconds_count')
-            delta_sum = itl_sum - prev_sum
-            delta_count = itl_count - prev_count
-            itl_latency.append((delta_sum / delta_count * 1000) if delta_count > 0 else 0)  # Convert to ms
-        else:
-            itl_latency.append(0)
-
-        # E2E (End-to-End Latency)
-        e2e_sum = sum_metric(s, 'vllm:e2e_request_latency_seconds_sum')
-        e2e_count = sum_metric(s, 'vllm:e2e_request_latency_seconds_count')
-        if i > 0 and e2e_count > 0:
-            prev_sum = sum_metric(samples[i-1], 'vllm:e2e_request_latency_seconds_sum')
-            prev_count = sum_metric(samples[i-1], 'vllm:e2e_request_latency_seconds_count')
-            delta_sum = e2e_sum - prev_sum
-            delta_count = e2e_count - prev_count
-            e2e_latency.append((delta_sum / delta_count * 1000) if delta_count > 0 else 0)  # Convert to ms
-        else:
-            e2e_latency.append(0)
-
-    # Request characteristics (calculate average from sum/count)
-    prompt_length = []
-    generation_length = []
-
-    for i, s in enumerate(samples):
-        # Prompt length
-        prompt_sum = sum_metric(s, 'vllm:request_prompt_tokens_sum')
-        prompt_count = sum_metric(s, 'vllm:request_prompt_tokens_count')
-        if i > 0 and prompt_count > 0:
-            prev_sum = sum_metric(samples[i-1], 'vllm:request_prompt_tokens_sum')
-            prev_count = sum_metric(samples[i-1], 'vllm:request_prompt_tokens_count')
-            delta_sum = prompt_sum - prev_sum
-            delta_count = prompt_count - prev_count
-            prompt_length.append((delta_sum / delta_count) if delta_count > 0 else 0)
-        else:
-            prompt_length.append(0)
-
-        # Generation length
-        gen_sum = sum_metric(s, 'vllm:request_generation_tokens_sum')
-        gen_count = sum_metric(s, 'vllm:request_generation_tokens_count')
-        if i > 0 and gen_count > 0:
-            prev_sum = sum_metric(samples[i-1], 'vllm:request_generation_tokens_sum')
-            prev_count = sum_metric(samples[i-1], 'vllm:request_generation_tokens_count')
-            delta_sum = gen_sum - prev_sum
-            delta_count = gen_count - prev_count
-            generation_length.append((delta_sum / delta_count) if delta_count > 0 else 0)
-        else:
-            generation_length.append(0)
+    cpu_cache_usage = series_list(frame.mean('vllm:kv_cache_usage_perc'))
+
+    # Token metrics (cumulative increase, keeps rising across server restarts)
+    prompt_tokens = series_list(frame.cumulative_increase('vllm:prompt_tokens_total'))
+    generation_tokens = series_list(frame.cumulative_increase('vllm:generation_tokens_total'))
+
+    # Latency metrics (per-interval averages from histogram sum/count deltas, ms)
+    ttft_latency = series_list(frame.interval_histogram_mean('vllm:time_to_first_token_seconds') * 1000)
+    itl_latency = series_list(frame.interval_histogram_mean('vllm:request_time_per_output_token_seconds') * 1000)
+    e2e_latency = series_list(frame.interval_histogram_mean('vllm:e2e_request_latency_seconds') * 1000)
+
+    # Request characteristics (per-interval averages from sum/count deltas)
+    prompt_length = series_list(frame.interval_histogram_mean('vllm:request_prompt_tokens'))
+    generation_length = series_list(frame.interval_histogram_mean('vllm:request_generation_tokens'))
 
     # Calculate token rates (tokens/sec)
-    prompt_token_rate = []
-    generation_token_rate = []
-    for i in range(len(prompt_tokens)):
-        if i == 0:
-            prompt_token_rate.append(0)
-            generation_token_rate.append(0)
-        else:
-            time_delta = timestamps[i] - timestamps[i-1]
-            if time_delta > 0:
-                prompt_token_rate.append((prompt_tokens[i] - prompt_tokens[i-1]) / time_delta)
-                generation_token_rate.append((generation_tokens[i] - generation_tokens[i-1]) / time_delta)
-            else:
-                prompt_token_rate.append(0)
-                generation_token_rate.append(0)
+    prompt_token_rate = [0.0] + series_list(frame.rate('vllm:prompt_tokens_total'))
+    generation_token_rate = [0.0] + series_list(frame.rate('vllm:generation_tokens_total'))
+
+    # CPU utilization (busy cores) and completed requests per second
+    cpu_busy_cores = [0.0] + series_list(frame.rate('process_cpu_seconds_total'))
+    request_rate_metric = (
+        'vllm:request_success_total' if 'vllm:request_success_total' in frame.metric_names
+        else 'vllm:e2e_request_latency_seconds_count'
+    )
+    request_rate = [0.0] + series_list(frame.rate(request_rate_metric))
+
+    # Counter resets mean the server restarted during collection; rates and
+    # totals above already account for them
+    restarts = frame.counter_resets('process_cpu_seconds_total')
+    if restarts:
+        st.info(
+            f"ℹ️ Detected {restarts} server restart(s) during collection (counter resets). "
+            "Rates and totals are computed across restarts."
+        )
 
     # Check if we have latency data
     has_latency_data = any(ttft_latency) or any(itl_latency) or any(e2e_latency)
@@ -682,18 +639,20 @@ if current_section == "📈 Performance Plots":
     with tab1:
         st.subheader("Core Server Metrics Over Time")
 
-        # Create 3x2 subplot
+        # Create 4x2 subplot
         fig = make_subplots(
-            rows=3, cols=2,
+            rows=4, cols=2,
             subplot_titles=(
                 'Request Queue Depth',
                 'KV Cache Usage',
                 'Token Generation Rate',
                 'Cumulative Tokens Processed',
                 'Avg Request Prompt Length',
-                'Avg Request Generation Length'
+                'Avg Request Generation Length',
+                'CPU Utilization',
+                'Request Completion Rate'
             ),
-            vertical_spacing=0.10,
+            vertical_spacing=0.08,
             horizontal_spacing=0.1
         )
 
@@ -773,17 +732,37 @@ if current_section == "📈 Performance Plots":
             showlegend=False
         ), row=3, col=2)
 
+        # CPU utilization
+        fig.add_trace(go.Scatter(
+            x=timestamps, y=cpu_busy_cores,
+            name='Busy Cores',
+            mode='lines',
+            line=dict(color='#34495e', width=2),
+            showlegend=False
+        ), row=4, col=1)
+
+        # Request completion rate
+        fig.add_trace(go.Scatter(
+            x=timestamps, y=request_rate,
+            name='Requests/sec',
+            mode='lines',
+            line=dict(color='#16a085', width=2),
+            showlegend=False
+        ), row=4, col=2)
+
         # Update axes
-        fig.update_xaxes(title_text="Time (seconds)", row=3, col=1)
-        fig.update_xaxes(title_text="Time (seconds)", row=3, col=2)
+        fig.update_xaxes(title_text="Time (seconds)", row=4, col=1)
+        fig.update_xaxes(title_text="Time (seconds)", row=4, col=2)
         fig.update_yaxes(title_text="Requests", row=1, col=1)
         fig.update_yaxes(title_text="Percentage", row=1, col=2)
         fig.update_yaxes(title_text="Tokens/sec", row=2, col=1)
         fig.update_yaxes(title_text="Total Tokens", row=2, col=2)
         fig.update_yaxes(title_text="Tokens", row=3, col=1)
         fig.update_yaxes(title_text="Tokens", row=3, col=2)
+        fig.update_yaxes(title_text="Cores (CPU s/s)", row=4, col=1)
+        fig.update_yaxes(title_text="Requests/sec", row=4, col=2)
 
-        fig.update_layout(height=1000, hovermode='x unified')
+        fig.update_layout(height=1300, hovermode='x unified')
 
         st.plotly_chart(fig, use_container_width=True)
 
@@ -936,9 +915,8 @@ if current_section == "📈 Performance Plots":
         st.subheader("Raw Metrics Data")
 
         # Show available metrics
-        if samples:
-            first_sample = samples[0]
-            available_metrics = sorted(first_sample.get('metrics', {}).keys())
+        if len(frame):
+            available_metrics = frame.metric_names
 
             st.markdown(f"### Available Metrics ({len(available_metrics)})")
 
@@ -950,29 +928,34 @@ if current_section == "📈 Performance Plots":
             # Create expandable sections
             for metric_name in vllm_metrics:
                 with st.expander(f"📊 {metric_name}"):
-                    # Get time series for this metric
-                    metric_values = []
-                    for sample in samples:
-                        values = get_metric_values(sample, metric_name)
-                        if values:
-                            metric_values.append({
-                                'time': sample['elapsed_seconds'],
-                                'value': sum(values) / len(values) if len(values) > 1 else values[0],
-                                'count': len(values)
-                            })
-
-                    if metric_values:
-                        df = pd.DataFrame(metric_values)
+                    # Get time series for this metric (mean across series per sample)
+                    series_count = (~np.isnan(frame.series(metric_name))).sum(axis=0)
+                    df = pd.DataFrame({
+                        'time': frame.elapsed,
+                        'value': frame.mean(metric_name),
+                        'count': series_count,
+                    })[series_count > 0]
+
+                    if not df.empty:
                         st.dataframe(df, use_container_width=True)
 
-                        # Simple line chart
+                        # Simple line chart (one trace per instance when several were scraped)
                         fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=df['time'],
-                            y=df['value'],
-                            mode='lines',
-                            name=metric_name
-                        ))
+                        if len(instances) > 1:
+                            for instance, values in sorted(frame.by_label(metric_name).items()):
+                                fig.add_trace(go.Scatter(
+                                    x=frame.elapsed,
+                                    y=values,
+                                    mode='lines',
+                                    name=instance
+                                ))
+                        else:
+                            fig.add_trace(go.Scatter(
+                                x=df['time'],
+                                y=df['value'],
+                                mode='lines',
+                                name=metric_name
+                            ))
                         fig.update_layout(
                             xaxis_title="Time (seconds)",
                             yaxis_title="Value",
@@ -1147,51 +1130,23 @@ elif current_section == "⚖️ Compare Configurations":
     st.markdown("---")
     st.subheader("Comparison Results")
 
-    # Helper functions
-    def sum_metric(sample: Dict, metric_name: str) -> float:
-        metrics = sample.get('metrics', {})
-        if metric_name in metrics:
-            return sum(m['value'] for m in metrics[metric_name])
-        return 0
-
-    def mean_metric(sample: Dict, metric_name: str) -> float:
-        metrics = sample.get('metrics', {})
-        if metric_name in metrics:
-            values = [m['value'] for m in metrics[metric_name]]
-            return sum(values) / len(values) if values else 0
-        return 0
-
     # Calculate key metrics for comparison
-    baseline_samples = baseline_result.get('samples', [])
-    compare_samples = compare_result.get('samples', [])
+    baseline_frame = load_metrics_frame(baseline_result['_metrics_file'])
+    compare_frame = load_metrics_frame(compare_result['_metrics_file'])
 
-    if baseline_samples and compare_samples:
+    if len(baseline_frame) and len(compare_frame):
         # Calculate metrics
-        baseline_cache_avg = sum(mean_metric(s, 'vllm:kv_cache_usage_perc') for s in baseline_samples) / len(baseline_samples)
-        compare_cache_avg = sum(mean_metric(s, 'vllm:kv_cache_usage_perc') for s in compare_samples) / len(compare_samples)
+        baseline_cache_avg = float(np.mean(series_list(baseline_frame.mean('vllm:kv_cache_usage_perc'))))
+        compare_cache_avg = float(np.mean(series_list(compare_frame.mean('vllm:kv_cache_usage_perc'))))
         cache_diff = ((compare_cache_avg - baseline_cache_avg) / baseline_cache_avg * 100) if baseline_cache_avg > 0 else 0
 
-        baseline_queue_avg = sum(sum_metric(s, 'vllm:num_requests_running') for s in baseline_samples) / len(baseline_samples)
-        compare_queue_avg = sum(sum_metric(s, 'vllm:num_requests_running') for s in compare_samples) / len(compare_samples)
+        baseline_queue_avg = float(np.mean(series_list(baseline_frame.total('vllm:num_requests_running'))))
+        compare_queue_avg = float(np.mean(series_list(compare_frame.total('vllm:num_requests_running'))))
         queue_diff = ((compare_queue_avg - baseline_queue_avg) / baseline_queue_avg * 100) if baseline_queue_avg > 0 else 0
 
         # Calculate token generation rates
-        baseline_gen_tokens = [sum_metric(s, 'vllm:generation_tokens_total') for s in baseline_samples]
-        compare_gen_tokens = [sum_metric(s, 'vllm:generation_tokens_total') for s in compare_samples]
-        baseline_timestamps = [s['elapsed_seconds'] for s in baseline_samples]
-        compare_timestamps = [s['elapsed_seconds'] for s in compare_samples]
-
-        baseline_gen_rates = []
-        for i in range(1, len(baseline_gen_tokens)):
-            time_delta = baseline_timestamps[i] - baseline_timestamps[i-1]
-            if time_delta > 0:
-                baseline_gen_rates.append((baseline_gen_tokens[i] - baseline_gen_tokens[i-1]) / time_delta)
-
-        compare_gen_rates = []
-        for i in range(1, len(compare_gen_tokens)):
-            time_delta = compare_timestamps[i] - compare_timestamps[i-1]
-            if time_delta > 0:
-                compare_gen_rates.append((compare_gen_tokens[i] - compare_gen_tokens[i-1]) / time_delta)
+        baseline_gen_rates = series_list(baseline_frame.rate('vllm:generation_tokens_total'))
+        compare_gen_rates = series_list(compare_frame.rate('vllm:generation_tokens_total'))
 
         baseline_peak_gen = max(baseline_gen_rates) if baseline_gen_rates else 0
         compare_peak_gen = max(compare_gen_rates) if compare_gen_rates else 0
@@ -1264,31 +1219,21 @@ elif current_section == "⚖️ Compare Configurations":
     labels = [baseline_label, compare_label]
 
     for idx, result in enumerate(comparison_results):
-        samples = result.get('samples', [])
-        if not samples:
+        frame = load_metrics_frame(result['_metrics_file'])
+        if not len(frame):
             continue
 
-        timestamps = [s['elapsed_seconds'] for s in samples]
+        timestamps = frame.elapsed.tolist()
 
         # Cache usage
-        cache_usage = [mean_metric(s, 'vllm:kv_cache_usage_perc') for s in samples]
+        cache_usage = series_list(frame.mean('vllm:kv_cache_usage_perc'))
 
         # Queue metrics
-        running = [sum_metric(s, 'vllm:num_requests_running') for s in samples]
-        waiting = [sum_metric(s, 'vllm:num_requests_waiting') for s in samples]
+        running = series_list(frame.total('vllm:num_requests_running'))
+        waiting = series_list(frame.total('vllm:num_requests_waiting'))
 
         # Token generation rate
-        gen_tokens = [sum_metric(s, 'vllm:generation_tokens_total') for s in samples]
-        gen_rate = []
-        for i in range(len(gen_tokens)):
-            if i == 0:
-                gen_rate.append(0)
-            else:
-                time_delta = timestamps[i] - timestamps[i-1]
-                if time_delta > 0:
-                    gen_rate.append((gen_tokens[i] - gen_tokens[i-1]) / time_delta)
-                else:
-                    gen_rate.append(0)
+        gen_rate = [0.0] + series_list(frame.rate('vllm:generation_tokens_total'))
 
         label = labels[idx]
         color = colors[idx % len(colors)]
@@ -1348,14 +1293,14 @@ elif current_section == "⚖️ Compare Configurations":
 
     comparison_table = []
     for result in comparison_results:
-        samples = result.get('samples', [])
-        if not samples:
+        frame = load_metrics_frame(result['_metrics_file'])
+        if not len(frame):
             continue
 
         # Calculate averages
-        cache_avg = sum(mean_metric(s, 'vllm:kv_cache_usage_perc') for s in samples) / len(samples)
-        running_avg = sum(sum_metric(s, 'vllm:num_requests_running') for s in samples) / len(samples)
-        waiting_avg = sum(sum_metric(s, 'vllm:num_requests_waiting') for s in samples) / len(samples)
+        cache_avg = float(np.mean(series_list(frame.mean('vllm:kv_cache_usage_perc'))))
+        running_avg = float(np.mean(series_list(frame.total('vllm:num_requests_running'))))
+        waiting_avg = float(np.mean(series_list(frame.total('vllm:num_requests_waiting'))))
 
         row = {
             'Backend': result.get('backend', 'unknown'),
@@ -18,7 +18,13 @@ from plotly.subplots import make_subplots
 
 # Add parent directory to path for config_manager import
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config_manager import DashboardConfig, normalize_vllm_version
+from config_manager import DashboardConfig
+from data_scope import render_data_scope
+from results_tables import load_table
+
+# Add shared library to path for the results catalog
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "shared"))
+from results_catalog import find_files  # noqa: E402
 
 # Configure logging
 logging.basicConfig(
@@ -38,148 +44,21 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data(ttl=3600)  # Increased from 5min to 1 hour - results rarely change
-def load_embedding_data(results_dir: str) -> pd.DataFrame:
-    """Load embedding benchmark results from directory structure."""
-    results_path = Path(results_dir)
-    all_results = []
-
-    # Track skipped/failed files for user feedback
-    stats = {
-        'total_metadata_files': 0,
-        'skipped_missing_fields': 0,
-        'skipped_missing_metrics': 0,
-        'skipped_json_errors': 0,
-        'failed_unexpected': 0
-    }
-
-    if not results_path.exists():
-        logger.warning(f"Results directory not found: {results_path}")
-        return pd.DataFrame()
-
-    # Scan for all test-metadata.json files in embedding results
-    for metadata_file in results_path.rglob("test-metadata.json"):
-        stats['total_metadata_files'] += 1
-        try:
-            with open(metadata_file) as f:
-                metadata = json.load(f)
-
-            # Validate required metadata fields
-            required_fields = ['test_run_id', 'model', 'platform']
-            missing = [f for f in required_fields if f not in metadata or not metadata[f]]
-            if missing:
-                logger.warning(f"Skipping {metadata_file}: missing required fields {missing}")
-                stats['skipped_missing_fields'] += 1
-                continue
-
-            test_run_dir = metadata_file.parent
-
-            # Process JSON files in baseline/ and latency/ subdirectories
-            result_subdirs = ['baseline', 'latency']
-            for subdir_name in result_subdirs:
-                subdir = test_run_dir / subdir_name
-                if not subdir.exists():
-                    continue
-
-                # Process all JSON result files in this subdirectory
-                for json_file in sorted(subdir.glob("*.json")):
-                    try:
-                        with open(json_file) as f:
-                            result = json.load(f)
-
-                        # Validate result has key metrics
-                        required_metrics = ['request_throughput', 'mean_e2el_ms']
-                        missing_metrics = [m for m in required_metrics if m not in result]
-                        if missing_metrics:
-                            logger.warning(f"Skipping {json_file}: missing metrics {missing_metrics}")
-                            stats['skipped_missing_metrics'] += 1
-                            continue
-
-                        # Parse test type from filename
-                        stem = json_file.stem
-                        if stem.startswith('sweep-'):
-                            test_type = 'baseline'
-                            parameter = stem.replace('sweep-', '')
-                        elif stem.startswith('concurrent-'):
-                            test_type = 'concurrent'
-                            parameter = stem.replace('concurrent-', '')
-                        else:
-                            test_type = 'unknown'
-                            parameter = stem
-
-                        # Extract test_name from test_run_id (format: test_name-YYYYMMDD-HHMMSS or just YYYYMMDD-HHMMSS)
-                        test_run_id = metadata.get('test_run_id', 'unknown')
-                        test_name = ''
-                        if test_run_id != 'unknown' and '-' in test_run_id:
-                            parts = test_run_id.split('-')
-                            # If more than 2 parts (date-time), first part(s) are test_name
-                            if len(parts) > 2:
-                                test_name = '-'.join(parts[:-2])
-
-                        # Calculate derived metrics
-                        rps = result.get('request_throughput', 0)
-                        cores = metadata.get('requested_cores')
-                        rps_per_core = (rps / cores) if cores and cores > 0 else None
-
-                        row = {
-                            # Metadata
-                            'test_run_id': test_run_id,
-                            'test_name': test_name,
-                            'scenario': metadata.get('scenario', ''),
-                            'model': metadata.get('model', ''),
-                            'platform': metadata.get('platform', 'unknown'),
-                            'vllm_version': normalize_vllm_version(metadata.get('vllm_version', 'unknown')),
-                            'vllm_mode': metadata.get('vllm_mode', 'managed'),
-                            'requested_cores': metadata.get('requested_cores'),
-                            'input_length': metadata.get('embedding_random_input_len'),
-                            'timestamp': metadata.get('timestamp', ''),
-
-                            # Test configuration
-                            'test_type': test_type,
-                            'parameter': parameter,
-                            'request_rate': result.get('request_rate'),
-                            'max_concurrency': result.get('max_concurrency'),
-                            'num_prompts': result.get('num_prompts'),
-
-                            # Performance metrics
-                            'request_throughput_rps': rps,
-                            'token_throughput_tps': result.get('total_token_throughput'),
-                            'rps_per_core': rps_per_core,
-                            'mean_latency_ms': result.get('mean_e2el_ms'),
-                            'median_latency_ms': result.get('median_e2el_ms'),
-                            'std_latency_ms': result.get('std_e2el_ms'),
-                            'p99_latency_ms': result.get('p99_e2el_ms'),
-                            'duration_sec': result.get('duration'),
-                            'completed_requests': result.get('completed'),
-                            'total_input_tokens': result.get('total_input_tokens'),
-                        }
-                        all_results.append(row)
-
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse JSON in {json_file}: {e}")
-                        stats['skipped_json_errors'] += 1
-                        continue
-
-        except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
-            logger.warning(f"Failed to load {metadata_file}: {e}")
-            stats['skipped_json_errors'] += 1
-            continue
-        except Exception as e:
-            logger.error(f"Unexpected error loading {metadata_file}: {e}")
-            stats['failed_unexpected'] += 1
-            # Re-raise unexpected errors - don't hide bugs
-            raise
+# Embedding table columns read by this page
+EMBEDDING_COLUMNS = [
+    'test_run_id', 'test_name', 'scenario', 'model', 'platform', 'vllm_version',
+    'vllm_mode', 'requested_cores', 'input_length', 'timestamp',
+    'test_type', 'parameter', 'request_rate', 'max_concurrency', 'num_prompts',
+    'request_throughput_rps', 'token_throughput_tps', 'rps_per_core',
+    'mean_latency_ms', 'median_latency_ms', 'std_latency_ms', 'p99_latency_ms',
+    'duration_sec', 'completed_requests', 'total_input_tokens',
+]
 
-    # Log statistics about data loading
-    logger.info(f"Data loading complete: {len(all_results)} result files loaded from {stats['total_metadata_files']} test runs")
-    if stats['skipped_missing_fields'] > 0 or stats['skipped_missing_metrics'] > 0 or stats['skipped_json_errors'] > 0:
-        logger.warning(
-            f"Skipped files: {stats['skipped_missing_fields']} missing fields, "
-            f"{stats['skipped_missing_metrics']} missing metrics, "
-            f"{stats['skipped_json_errors']} JSON errors"
-        )
 
-    return pd.DataFrame(all_results)
+@st.cache_data(ttl=3600)  # Increased from 5min to 1 hour - results rarely change
+def load_embedding_data(results_dir: str, filters: dict) -> pd.DataFrame:
+    """Load embedding benchmark results from directory structure."""
+    return load_table(results_dir, 'embedding', columns=EMBEDDING_COLUMNS, filters=filters)
 
 
 @st.cache_data(ttl=3600)
@@ -204,7 +83,7 @@ def load_mteb_data(results_dir: str) -> pd.DataFrame:
         return pd.DataFrame()
 
     # Scan for all run_summary.json files
-    for summary_file in results_path.rglob("run_summary.json"):
+    for summary_file in find_files(results_path, "run_summary.json"):
         try:
             with open(summary_file) as f:
                 summary = json.load(f)
@@ -1354,6 +1233,10 @@ def main():
         if st.button("🔄 Reload Data"):
             st.cache_data.clear()
 
+        scope_filters = render_data_scope(
+            results_dir_input, 'embedding', key="embedding", labels={'workload': "Scenario"}
+        )
+
         st.markdown("---")
         st.subheader("📥 Import CSV")
 
@@ -1418,7 +1301,7 @@ def main():
         """)
 
     # Load performance data
-    df = load_embedding_data(results_dir_input)
+    df = load_embedding_data(results_dir_input, scope_filters)
 
     # Check for imported CSV data in session state
     if 'imported_embedding_performance' in st.session_state:
@@ -7,7 +7,6 @@ Focuses on Real-Time Factor (RTF), audio throughput, and audio processing charac
 import logging
 import sys
 from pathlib import Path
-import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -21,11 +20,12 @@ from audio_enterprise import (
     compute_batch_eta,
     compute_capacity_metrics,
     compute_warmup_metrics,
-    discover_run_results,
     format_duration,
     format_enterprise_report,
     load_quality_results,
 )
+from data_scope import render_data_scope
+from results_tables import load_table
 
 # Set global Plotly template
 if "plotly_white_light" not in pio.templates:
@@ -61,17 +61,22 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# Audio table columns read by this page
+AUDIO_COLUMNS = [
+    'test_run_id', 'model', 'model_short', 'scenario', 'stage', 'cores',
+    'audio_format', 'audio_sample_rate', 'dataset_name',
+    'concurrency', 'duration', 'requests_per_second', 'e2e_mean', 'e2e_p95',
+    'successful_requests', 'success_rate',
+    'total_audio_seconds', 'mean_audio_seconds', 'audio_throughput',
+    'rtf_mean', 'rtf_p50', 'rtf_p95', 'rtf_p99',
+    'warmup_duration', 'first_rtf', 'efficiency',
+]
+
+
 @st.cache_data(ttl=300)
-def load_audio_data(results_dir: str) -> pd.DataFrame:
+def load_audio_data(results_dir: str, filters: dict) -> pd.DataFrame:
     """Load audio benchmark results with audio-specific metrics."""
-    rows = discover_run_results(results_dir)
-    if not rows:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(rows)
-    cores = pd.to_numeric(df['cores'], errors='coerce')
-    df['efficiency'] = np.where(cores > 0, df['audio_throughput'] / cores, np.nan)
-    return df
+    return load_table(results_dir, 'audio', columns=AUDIO_COLUMNS, filters=filters)
 
 
 @st.cache_data(ttl=300)
@@ -1006,6 +1011,8 @@ def main():
     if results_dir != default_results_dir:
         config.set_audio_results_directory(results_dir)
 
+    scope_filters = render_data_scope(results_dir, 'audio', key="audio", labels={'workload': "Scenario"})
+
     # Sidebar: enterprise settings
     p95_target = st.sidebar.number_input(
         "P95 Latency Target (s)", min_value=0.1, value=2.0, step=0.5,
@@ -1014,7 +1021,7 @@ def main():
 
     # Load data
     with st.spinner("Loading audio benchmark data..."):
-        df = load_audio_data(results_dir)
+        df = load_audio_data(results_dir, scope_filters)
         quality_df = load_quality_data(results_dir)
 
     if df.empty and quality_df.empty:
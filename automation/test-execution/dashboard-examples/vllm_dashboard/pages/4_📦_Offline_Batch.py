@@ -7,10 +7,9 @@ Displays results from vLLM offline batch benchmarking
 time estimates, core scaling, prefill/decode.
 """
 
-import json
 import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 
 import pandas as pd
 import plotly.graph_objects as go
@@ -18,7 +17,9 @@ import streamlit as st
 
 # Add parent directory to path for config_manager import
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config_manager import DashboardConfig, normalize_vllm_version  # noqa: E402
+from config_manager import DashboardConfig, normalize_vllm_version  # noqa: E402,F401
+from data_scope import render_data_scope  # noqa: E402
+from results_tables import USE_CASE_MAP, infer_use_case, load_table  # noqa: E402,F401
 
 
 # ---------------------------------------------------------------------------
@@ -36,28 +37,6 @@ TECHNICAL_USE_CASES = frozenset({
     "core_scaling",
 })
 
-USE_CASE_MAP = {
-    'summarization': '📝 Summarization',
-    'classification': '🏷️ Classification/Tagging',
-    'translation': '🌐 Translation',
-    'entity_extraction': '🧬 Entity Extraction',
-    'dataset_generation': '🎲 Dataset Generation',
-    'code_generation': '💻 Code Generation',
-    'etl': '🔄 ETL Pipelines',
-    'long_summarization': '📜 Long-Document Summarization',
-    'rag_batch': '🔍 Batch RAG / Grounded Q&A',
-    'shared_prefix': '📋 Shared-Prefix / Template Batch',
-    'short_labeling': '⚡ Ultra-Short Labeling',
-    'kv_capacity': '📊 KV-Cache Capacity',
-    'context_scaling': '📏 Context Scaling',
-    'baseline': '📐 Baseline Throughput',
-    'batch_scaling': '📈 Batch Size Scaling',
-    'input_scaling': '📥 Input Length Scaling',
-    'output_scaling': '📤 Output Length Scaling',
-    'core_scaling': '🔧 Core Scaling',
-    'quantization_comparison': '⚖️ Quantization Comparison',
-}
-
 USE_CASE_REFERENCE = [
     {
         "Use Case": "📝 Summarization",
@@ -237,102 +216,6 @@ def get_use_case_units(use_case: str) -> Dict[str, str]:
         return {'singular': 'request', 'plural': 'requests'}
 
 
-def infer_use_case(test_metadata: dict) -> str:
-    """
-    Infer the use case from test metadata parameters.
-
-    Maps to the 11 use cases from run-offline-batch-suite.sh:
-    1. Summarization (sharegpt, 1000 prompts, no output_len set)
-    2. Classification/Tagging (sharegpt, 1000 prompts, output=64)
-    3. Translation (sharegpt, 500 prompts, output=1024)
-    4. Entity Extraction (sharegpt, 1000 prompts, output=128)
-    5. Dataset Generation (random, 256->256 tokens, 5000 prompts)
-    6. Code Generation (random, 512->512 tokens, 500 prompts)
-    7. ETL Pipelines (sonnet, 500 prompts, variable cores)
-    8. Long-Document Summarization (random, 4096->256 tokens, 500 prompts)
-    9. Batch RAG / Grounded Q&A (random, 2048->128 tokens, 500 prompts)
-    10. Shared-Prefix / Template Batch (random, 1024->64 tokens, 1000 prompts)
-    11. Ultra-Short Labeling (sharegpt, 2000 prompts, output=16)
-    """
-    config = test_metadata.get('configuration', {})
-    dataset_config = config.get('dataset_config', {})
-
-    # Check for explicit use_case field first
-    use_case = dataset_config.get('use_case', '')
-    if use_case:
-        if use_case in USE_CASE_MAP:
-            return USE_CASE_MAP[use_case]
-
-    dataset = config.get('dataset', '')
-    num_prompts = config.get('num_prompts', 0)
-    cores = config.get('cores', 0)
-    output_len = dataset_config.get('output_len', 0)
-
-    # ShareGPT dataset cases
-    if dataset == 'sharegpt':
-        if output_len > 0 and output_len <= 20:
-            return "⚡ Ultra-Short Labeling"
-        elif num_prompts == 1000 and output_len > 0 and output_len <= 100:
-            return "🏷️ Classification/Tagging"
-        elif num_prompts == 1000 and output_len > 100 and output_len <= 150:
-            return "🧬 Entity Extraction"
-        elif num_prompts == 500 and output_len >= 900:
-            return "🌐 Translation"
-        elif num_prompts == 1000 and output_len == 0:
-            return "📝 Summarization"
-        elif output_len > 0 and output_len <= 100:
-            return "🏷️ Classification/Tagging"
-        elif output_len > 900:
-            return "🌐 Translation"
-        elif output_len > 100 and output_len <= 200:
-            return "🧬 Entity Extraction"
-        else:
-            return "📝 Summarization"
-
-    # Sonnet dataset cases
-    if dataset == 'sonnet':
-        if num_prompts == 500 and cores in [8, 16, 24, 32]:
-            return "🔄 ETL Pipelines"
-        else:
-            return "🔄 ETL Pipelines"
-
-    # Random dataset - infer from token lengths
-    if dataset == 'random':
-        input_len = dataset_config.get('input_len', 0)
-        output_len = dataset_config.get('output_len', 0)
-
-        if input_len == 256 and output_len == 256 and num_prompts == 5000:
-            return "🎲 Dataset Generation"
-        elif input_len == 512 and output_len == 512 and num_prompts == 500:
-            return "💻 Code Generation"
-        elif (
-            input_len >= 512
-            and output_len <= 64
-            and output_len > 0
-            and num_prompts >= 1000
-        ):
-            return "📋 Shared-Prefix / Template Batch"
-        elif (
-            input_len >= 1024
-            and output_len <= 128
-            and output_len > 0
-            and num_prompts <= 500
-        ):
-            return "🔍 Batch RAG / Grounded Q&A"
-        elif input_len >= 2048 and output_len <= 256 and output_len > 128:
-            return "📜 Long-Document Summarization"
-        elif (
-            400 <= input_len <= 600
-            and 400 <= output_len <= 600
-            and num_prompts <= 1000
-        ):
-            return "💻 Code Generation"
-        elif num_prompts >= 5000:
-            return "🎲 Dataset Generation"
-
-    return "⚙️ General"
-
-
 def _get_use_case_slug(display_name: str) -> str:
     """Reverse-map display name to slug, or empty string."""
     _reverse = {v: k for k, v in USE_CASE_MAP.items()}
@@ -343,94 +226,39 @@ def _get_use_case_slug(display_name: str) -> str:
 # Data loading
 # ---------------------------------------------------------------------------
 
+# Offline batch table columns read by this page; the optional ones are
+# only in results that report them
+OFFLINE_BATCH_COLUMNS = [
+    'model', 'timestamp', 'cores', 'dataset', 'num_prompts', 'container_image',
+    'vllm_version', 'use_case_slug', 'use_case',
+    'metric_throughput_requests_per_sec', 'metric_throughput_total_tokens_per_sec',
+    'metric_total_time_sec', 'metric_avg_input_tokens', 'metric_avg_output_tokens',
+]
+OFFLINE_BATCH_OPTIONAL_COLUMNS = [
+    'config_input_len', 'config_output_len',
+    'metric_prefill_throughput_tokens_per_sec',
+    'metric_decode_throughput_tokens_per_sec',
+    'metric_max_kv_cache_usage_percent',
+]
+
+
 @st.cache_data
-def load_benchmark_results(results_base_dir: str) -> pd.DataFrame:
+def load_benchmark_results(results_base_dir: str, filters: dict) -> pd.DataFrame:
     """Load all offline batch benchmark results from the results directory."""
-    results: List[dict] = []
-    results_path = Path(results_base_dir)
-
-    if not results_path.exists():
+    if not Path(results_base_dir).exists():
         st.error(f"Results directory not found: {results_base_dir}")
         return pd.DataFrame()
 
-    for model_dir in results_path.iterdir():
-        if not model_dir.is_dir():
-            continue
-
-        for timestamp_dir in model_dir.iterdir():
-            if (
-                not timestamp_dir.is_dir()
-                or not timestamp_dir.name.startswith('offline-batch-')
-            ):
-                continue
-
-            for config_dir in timestamp_dir.iterdir():
-                if not config_dir.is_dir():
-                    continue
-
-                results_file = config_dir / 'results.json'
-                metadata_file = config_dir / 'test-metadata.json'
-
-                if results_file.exists() and metadata_file.exists():
-                    try:
-                        with open(results_file, 'r') as f:
-                            result_data = json.load(f)
-                        with open(metadata_file, 'r') as f:
-                            metadata = json.load(f)
-
-                        combined = {
-                            'model': metadata['model'],
-                            'timestamp': metadata['timestamp'],
-                            'test_run_id': metadata['test_run_id'],
-                            'cores': metadata['configuration']['cores'],
-                            'dataset': metadata['configuration']['dataset'],
-                            'num_prompts': metadata['configuration'][
-                                'num_prompts'
-                            ],
-                            'container_image': metadata['environment'].get(
-                                'container_image', 'unknown'
-                            ),
-                            'vllm_version': normalize_vllm_version(
-                                metadata['environment'].get(
-                                    'vllm_version', 'unknown'
-                                )
-                            ),
-                        }
-
-                        dataset_config = metadata['configuration'].get(
-                            'dataset_config', {}
-                        )
-                        if 'input_len' in dataset_config:
-                            combined['config_input_len'] = dataset_config[
-                                'input_len'
-                            ]
-                        if 'output_len' in dataset_config:
-                            combined['config_output_len'] = dataset_config[
-                                'output_len'
-                            ]
-
-                        # Store raw use_case slug for technical detection
-                        combined['use_case_slug'] = dataset_config.get(
-                            'use_case', ''
-                        )
-
-                        metrics = result_data.get('metrics', {})
-                        for metric_name, metric_value in metrics.items():
-                            combined[f'metric_{metric_name}'] = metric_value
-
-                        combined['use_case'] = infer_use_case(metadata)
-
-                        results.append(combined)
-
-                    except Exception as e:
-                        st.warning(f"Error loading {config_dir}: {e}")
-                        continue
-
-    if not results:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(results)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df = load_table(
+        results_base_dir, 'offline_batch',
+        columns=OFFLINE_BATCH_COLUMNS + OFFLINE_BATCH_OPTIONAL_COLUMNS,
+        filters=filters,
+    )
+    if not df.empty:
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        # The charts check for optional columns before using them
+        missing = [col for col in OFFLINE_BATCH_OPTIONAL_COLUMNS if df[col].isna().all()]
+        df = df.drop(columns=missing)
     return df
 
 
@@ -482,6 +310,10 @@ def main():
             st.cache_data.clear()
             st.rerun()
 
+        scope_filters = render_data_scope(
+            results_dir_input, 'offline_batch', key="offline", labels={'workload': "Use Case"}
+        )
+
         st.markdown("---")
         st.markdown("**Use Case Reference:**")
 
@@ -519,7 +351,7 @@ def main():
             )
 
     # Load data
-    df = load_benchmark_results(results_dir_input)
+    df = load_benchmark_results(results_dir_input, scope_filters)
 
     if df.empty:
         st.warning("No benchmark results found. Run some benchmarks first!")
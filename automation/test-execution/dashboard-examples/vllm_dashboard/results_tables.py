@@ -0,0 +1,746 @@
+"""Normalised result tables — shared by the dashboard pages and the results store.
+
+One loader per table turns a results directory into the DataFrame a
+dashboard page works with; load_table() serves it from the Parquet results
+store when that is current and falls back to the loader otherwise.
+No Streamlit dependency.
+
+Used by:
+  - pages/*.py  (dashboard)
+  - scripts/conversion/build_results_store.py  (conversion stage)
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from audio_enterprise import discover_run_results
+from config_manager import normalize_vllm_version
+
+# Add shared library to path for the catalog, store and metrics readers
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared"))
+import request_sidecar  # noqa: E402
+import results_store  # noqa: E402
+from benchmarks_reader import read_benchmarks  # noqa: E402
+from latency_histogram import REPORT_QUANTILES, LatencyHistogram, quantile_label  # noqa: E402
+from results_catalog import find_files, open_catalog  # noqa: E402
+from vllm_metrics import METRICS_FILENAMES, read_collection_info  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Server table values for metrics files without a test-metadata.json
+SERVER_METADATA_DEFAULTS = {
+    'platform': 'unknown',
+    'model': 'unknown',
+    'workload': 'unknown',
+    'test_run_id': 'unknown',
+    'test_name': '',
+    'cores': 'N/A',
+    'backend': 'unknown',
+    'vllm_version': 'unknown',
+    'guidellm_version': 'unknown',
+    'core_config': 'unknown',
+    'vllm_mode': 'managed',
+    'vllm_endpoint_url': 'n/a',
+}
+
+
+# Client table histogram columns (latency_histogram.py JSON, ms) per metric
+# prefix, from request_sidecar.request_histograms()
+CLIENT_HISTOGRAMS = {
+    'ttft': 'ttft_ms',
+    'itl': 'itl_ms',
+    'e2e': 'request_latency_ms',
+}
+
+# Client table columns identifying one configuration and load point;
+# rows that differ only in test_run_id are repetitions
+POOL_KEYS = [
+    'platform', 'model', 'model_short', 'workload', 'vllm_version', 'cores',
+    'tensor_parallel', 'test_name', 'backend', 'core_config', 'vllm_mode',
+    'vllm_endpoint_url', 'concurrency',
+]
+
+
+# ---------------------------------------------------------------------------
+# Offline batch use cases
+# ---------------------------------------------------------------------------
+
+USE_CASE_MAP = {
+    'summarization': '📝 Summarization',
+    'classification': '🏷️ Classification/Tagging',
+    'translation': '🌐 Translation',
+    'entity_extraction': '🧬 Entity Extraction',
+    'dataset_generation': '🎲 Dataset Generation',
+    'code_generation': '💻 Code Generation',
+    'etl': '🔄 ETL Pipelines',
+    'long_summarization': '📜 Long-Document Summarization',
+    'rag_batch': '🔍 Batch RAG / Grounded Q&A',
+    'shared_prefix': '📋 Shared-Prefix / Template Batch',
+    'short_labeling': '⚡ Ultra-Short Labeling',
+    'kv_capacity': '📊 KV-Cache Capacity',
+    'context_scaling': '📏 Context Scaling',
+    'baseline': '📐 Baseline Throughput',
+    'batch_scaling': '📈 Batch Size Scaling',
+    'input_scaling': '📥 Input Length Scaling',
+    'output_scaling': '📤 Output Length Scaling',
+    'core_scaling': '🔧 Core Scaling',
+    'quantization_comparison': '⚖️ Quantization Comparison',
+}
+
+
+def infer_use_case(test_metadata: dict) -> str:
+    """
+    Infer the use case from test metadata parameters.
+
+    Maps to the 11 use cases from run-offline-batch-suite.sh:
+    1. Summarization (sharegpt, 1000 prompts, no output_len set)
+    2. Classification/Tagging (sharegpt, 1000 prompts, output=64)
+    3. Translation (sharegpt, 500 prompts, output=1024)
+    4. Entity Extraction (sharegpt, 1000 prompts, output=128)
+    5. Dataset Generation (random, 256->256 tokens, 5000 prompts)
+    6. Code Generation (random, 512->512 tokens, 500 prompts)
+    7. ETL Pipelines (sonnet, 500 prompts, variable cores)
+    8. Long-Document Summarization (random, 4096->256 tokens, 500 prompts)
+    9. Batch RAG / Grounded Q&A (random, 2048->128 tokens, 500 prompts)
+    10. Shared-Prefix / Template Batch (random, 1024->64 tokens, 1000 prompts)
+    11. Ultra-Short Labeling (sharegpt, 2000 prompts, output=16)
+    """
+    config = test_metadata.get('configuration', {})
+    dataset_config = config.get('dataset_config', {})
+
+    # Check for explicit use_case field first
+    use_case = dataset_config.get('use_case', '')
+    if use_case:
+        if use_case in USE_CASE_MAP:
+            return USE_CASE_MAP[use_case]
+
+    dataset = config.get('dataset', '')
+    num_prompts = config.get('num_prompts', 0)
+    cores = config.get('cores', 0)
+    output_len = dataset_config.get('output_len', 0)
+
+    # ShareGPT dataset cases
+    if dataset == 'sharegpt':
+        if output_len > 0 and output_len <= 20:
+            return "⚡ Ultra-Short Labeling"
+        elif num_prompts == 1000 and output_len > 0 and output_len <= 100:
+            return "🏷️ Classification/Tagging"
+        elif num_prompts == 1000 and output_len > 100 and output_len <= 150:
+            return "🧬 Entity Extraction"
+        elif num_prompts == 500 and output_len >= 900:
+            return "🌐 Translation"
+        elif num_prompts == 1000 and output_len == 0:
+            return "📝 Summarization"
+        elif output_len > 0 and output_len <= 100:
+            return "🏷️ Classification/Tagging"
+        elif output_len > 900:
+            return "🌐 Translation"
+        elif output_len > 100 and output_len <= 200:
+            return "🧬 Entity Extraction"
+        else:
+            return "📝 Summarization"
+
+    # Sonnet dataset cases
+    if dataset == 'sonnet':
+        if num_prompts == 500 and cores in [8, 16, 24, 32]:
+            return "🔄 ETL Pipelines"
+        else:
+            return "🔄 ETL Pipelines"
+
+    # Random dataset - infer from token lengths
+    if dataset == 'random':
+        input_len = dataset_config.get('input_len', 0)
+        output_len = dataset_config.get('output_len', 0)
+
+        if input_len == 256 and output_len == 256 and num_prompts == 5000:
+            return "🎲 Dataset Generation"
+        elif input_len == 512 and output_len == 512 and num_prompts == 500:
+            return "💻 Code Generation"
+        elif (
+            input_len >= 512
+            and output_len <= 64
+            and output_len > 0
+            and num_prompts >= 1000
+        ):
+            return "📋 Shared-Prefix / Template Batch"
+        elif (
+            input_len >= 1024
+            and output_len <= 128
+            and output_len > 0
+            and num_prompts <= 500
+        ):
+            return "🔍 Batch RAG / Grounded Q&A"
+        elif input_len >= 2048 and output_len <= 256 and output_len > 128:
+            return "📜 Long-Document Summarization"
+        elif (
+            400 <= input_len <= 600
+            and 400 <= output_len <= 600
+            and num_prompts <= 1000
+        ):
+            return "💻 Code Generation"
+        elif num_prompts >= 5000:
+            return "🎲 Dataset Generation"
+
+    return "⚙️ General"
+
+
+# ---------------------------------------------------------------------------
+# Table loaders
+# ---------------------------------------------------------------------------
+
+def client_table(results_dir: str) -> pd.DataFrame:
+    """GuideLLM client metrics, one row per benchmark (load point)."""
+    results_path = Path(results_dir)
+    all_results = []
+
+    if not results_path.exists():
+        logger.warning(f"Results directory not found: {results_path}")
+        return pd.DataFrame()
+
+    # Scan for all benchmarks.json files
+    for json_file in find_files(results_path, "benchmarks.json"):
+        try:
+            # Load metadata
+            metadata_file = json_file.parent / "test-metadata.json"
+            if not metadata_file.exists():
+                continue
+
+            # Per-request columns for the histograms: from the sidecar when
+            # conversion wrote one, else streamed from the records
+            if request_sidecar.available() and request_sidecar.is_current(json_file):
+                data = read_benchmarks(json_file)
+                requests = request_sidecar.read_request_arrays(request_sidecar.sidecar_path(json_file))
+            else:
+                data = read_benchmarks(json_file, request_fields=request_sidecar.REQUEST_FIELDS)
+                requests = request_sidecar.request_columns(data)
+
+            with open(metadata_file) as f:
+                metadata = json.load(f)
+
+            # Extract each benchmark (load point)
+            for index, bench in enumerate(data.get('benchmarks', [])):
+                metrics = bench['metrics']
+                config = bench['config']
+                histograms = request_sidecar.request_histograms(requests, index)
+
+                # Extract concurrency/rate
+                concurrency = config.get('strategy', {}).get('max_concurrency', 0)
+                req_rate = metrics.get('requests_per_second', {}).get('successful', {}).get('mean', concurrency)
+
+                row = {
+                    # Metadata
+                    'test_run_id': metadata.get('test_run_id', 'unknown'),
+                    'test_name': metadata.get('test_name', ''),
+                    'platform': metadata.get('platform', 'unknown'),
+                    'model': metadata.get('model', 'unknown'),
+                    'model_short': metadata.get('model', 'unknown').split('/')[-1],
+                    'workload': metadata.get('workload', 'unknown'),
+                    'cores': metadata.get('core_count', 0),
+                    'backend': metadata.get('backend', 'unknown'),
+                    'vllm_version': normalize_vllm_version(metadata.get('vllm_version', 'unknown')),
+                    'guidellm_version': metadata.get('guidellm_version', 'unknown'),
+                    'core_config': metadata.get('core_config_name', 'unknown'),
+                    'tensor_parallel': metadata.get('tensor_parallel', 1),
+                    'vllm_mode': metadata.get('vllm_mode', 'managed'),
+                    'vllm_endpoint_url': metadata.get('vllm_endpoint_url', 'n/a'),
+                    'model_source': metadata.get('model_source', 'specified'),
+
+                    # Load characteristics
+                    'concurrency': concurrency,
+                    'request_rate': req_rate,
+
+                    # Throughput metrics
+                    'throughput_mean': metrics['tokens_per_second']['successful']['mean'],
+                    'throughput_p50': metrics['tokens_per_second']['successful']['percentiles']['p50'],
+                    'throughput_p95': metrics['tokens_per_second']['successful']['percentiles']['p95'],
+                    'throughput_p99': metrics['tokens_per_second']['successful']['percentiles']['p99'],
+
+                    # TTFT metrics (ms)
+                    'ttft_mean': metrics['time_to_first_token_ms']['successful']['mean'],
+                    'ttft_p50': metrics['time_to_first_token_ms']['successful']['percentiles']['p50'],
+                    'ttft_p95': metrics['time_to_first_token_ms']['successful']['percentiles']['p95'],
+                    'ttft_p99': metrics['time_to_first_token_ms']['successful']['percentiles']['p99'],
+                    'ttft_p999': metrics['time_to_first_token_ms']['successful']['percentiles'].get('p999'),
+
+                    # ITL metrics (ms)
+                    'itl_mean': metrics['inter_token_latency_ms']['successful']['mean'],
+                    'itl_p50': metrics['inter_token_latency_ms']['successful']['percentiles']['p50'],
+                    'itl_p95': metrics['inter_token_latency_ms']['successful']['percentiles']['p95'],
+                    'itl_p99': metrics['inter_token_latency_ms']['successful']['percentiles']['p99'],
+                    'itl_p999': metrics['inter_token_latency_ms']['successful']['percentiles'].get('p999'),
+
+                    # E2E latency metrics (s)
+                    'e2e_mean': metrics['request_latency']['successful']['mean'],
+                    'e2e_p50': metrics['request_latency']['successful']['percentiles']['p50'],
+                    'e2e_p95': metrics['request_latency']['successful']['percentiles']['p95'],
+                    'e2e_p99': metrics['request_latency']['successful']['percentiles']['p99'],
+                    'e2e_p999': metrics['request_latency']['successful']['percentiles'].get('p999'),
+
+                    # Request stats
+                    'total_requests': metrics['request_totals']['total'],
+                    'successful_requests': metrics['request_totals']['successful'],
+                    'success_rate': (metrics['request_totals']['successful'] /
+                                   metrics['request_totals']['total'] * 100)
+                                   if metrics['request_totals']['total'] > 0 else 0,
+                }
+                for prefix, name in CLIENT_HISTOGRAMS.items():
+                    histogram = histograms.get(name)
+                    row[f'{prefix}_hist'] = histogram.to_json() if histogram is not None else None
+                    # Older GuideLLM releases report no p999
+                    if row[f'{prefix}_p999'] is None and histogram is not None:
+                        row[f'{prefix}_p999'] = histogram.quantile(0.999) / (1000 if prefix == 'e2e' else 1)
+
+                all_results.append(row)
+
+        except Exception as e:
+            logger.warning(f"Failed to load {json_file}: {e}")
+            continue
+
+    if not all_results:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(all_results)
+
+    # Calculate efficiency (throughput per core)
+    # Guard against missing/zero cores to avoid inf/NaN
+    cores = pd.to_numeric(df['cores'], errors='coerce')
+    df['efficiency'] = np.where(cores > 0, df['throughput_mean'] / cores, np.nan)
+
+    return df
+
+
+def pool_repetitions(df: pd.DataFrame) -> pd.DataFrame:
+    """Pool client table rows that are repetitions of one configuration and load point.
+
+    Latency means and percentiles are recomputed from the merged per-request
+    histograms, so a pooled p99 is the p99 of all repetitions' requests, not
+    an average of their p99s. Rows pooled from repetitions of which any lacks
+    a histogram get NaN latencies for that metric. Throughput and request
+    rate are averaged, request counts add up.
+
+    Args:
+        df: Client table (client_table())
+
+    Returns:
+        One row per configuration and load point, with a 'repetitions'
+        column and test_run_id "pooled xN" for pooled rows
+    """
+    if df.empty:
+        return df.assign(repetitions=pd.Series(dtype=int))
+
+    keys = [key for key in POOL_KEYS if key in df.columns]
+    rows = []
+    for _, group in df.groupby(keys, dropna=False, sort=False):
+        row = group.iloc[0].to_dict()
+        row['repetitions'] = len(group)
+        if len(group) == 1:
+            rows.append(row)
+            continue
+
+        row['test_run_id'] = f"pooled x{len(group)}"
+        for column in ('request_rate', 'throughput_mean', 'throughput_p50',
+                       'throughput_p95', 'throughput_p99'):
+            if column in group:
+                row[column] = pd.to_numeric(group[column], errors='coerce').mean()
+        for column in ('total_requests', 'successful_requests'):
+            if column in group:
+                row[column] = group[column].sum()
+        if row.get('total_requests'):
+            row['success_rate'] = row['successful_requests'] / row['total_requests'] * 100
+
+        for prefix in CLIENT_HISTOGRAMS:
+            column = f'{prefix}_hist'
+            parsed = [LatencyHistogram.from_json(text) for text in group.get(column, [])]
+            histogram = None
+            if parsed and all(h is not None for h in parsed):
+                histogram = LatencyHistogram.merged(parsed)
+            # E2E latency columns are in seconds, histograms in ms
+            scale = 1000 if prefix == 'e2e' else 1
+            stats = {'mean': histogram.mean if histogram else np.nan}
+            for q in REPORT_QUANTILES:
+                stats[quantile_label(q)] = histogram.quantile(q) if histogram else np.nan
+            for stat, value in stats.items():
+                row[f'{prefix}_{stat}'] = value / scale
+            row[column] = histogram.to_json() if histogram else None
+        rows.append(row)
+
+    pooled = pd.DataFrame(rows)
+    if 'efficiency' in pooled:
+        cores = pd.to_numeric(pooled['cores'], errors='coerce')
+        pooled['efficiency'] = np.where(cores > 0, pooled['throughput_mean'] / cores, np.nan)
+    return pooled
+
+
+def server_table(results_dir: str) -> pd.DataFrame:
+    """vLLM server metrics files, one row per run with its collection info and metadata.
+
+    Samples are not loaded here; the Server Metrics page reads the file in
+    `_metrics_file` for the runs actually being displayed.
+    """
+    results_path = Path(results_dir)
+    metrics_data = []
+
+    if not results_path.exists():
+        logger.warning(f"Results directory not found: {results_path}")
+        return pd.DataFrame()
+
+    # One metrics file per result directory; .ndjson preferred over .json
+    metrics_files = {}
+    with open_catalog(results_path) as catalog:
+        for filename in reversed(METRICS_FILENAMES):
+            for metrics_file in catalog.find(filename):
+                metrics_files[metrics_file.parent] = metrics_file
+
+    for metrics_file in metrics_files.values():
+        try:
+            # Load vLLM metrics header only; kept as JSON so the table stays flat
+            data = {'collection_info': json.dumps(read_collection_info(metrics_file))}
+
+            # Defaults for runs without test-metadata.json
+            data.update(SERVER_METADATA_DEFAULTS)
+
+            # Load test metadata
+            metadata_file = metrics_file.parent / "test-metadata.json"
+            if metadata_file.exists():
+                with open(metadata_file) as f:
+                    metadata = json.load(f)
+
+                    # Load metadata for both managed and external endpoints
+                    data['platform'] = metadata.get('platform', 'unknown')
+                    data['model'] = metadata.get('model', 'unknown')
+                    data['workload'] = metadata.get('workload', 'unknown')
+                    data['test_run_id'] = metadata.get('test_run_id', 'unknown')
+                    data['test_name'] = metadata.get('test_name', '')
+                    data['cores'] = metadata.get('core_count', 'N/A')
+                    data['backend'] = metadata.get('backend', 'unknown')
+                    data['vllm_version'] = normalize_vllm_version(metadata.get('vllm_version', 'unknown'))
+                    data['guidellm_version'] = metadata.get('guidellm_version', 'unknown')
+                    data['core_config'] = metadata.get('core_config_name', 'unknown')
+                    data['vllm_mode'] = metadata.get('vllm_mode', 'managed')
+                    data['vllm_endpoint_url'] = metadata.get('vllm_endpoint_url', 'n/a')
+
+            # Add file path
+            data['_file_path'] = str(metrics_file.parent)
+            data['_file_name'] = metrics_file.name
+            data['_metrics_file'] = str(metrics_file)
+
+            metrics_data.append(data)
+        except Exception as e:
+            logger.warning(f"Failed to load {metrics_file.name}: {e}")
+
+    return pd.DataFrame(metrics_data)
+
+
+def embedding_table(results_dir: str) -> pd.DataFrame:
+    """Embedding benchmark results, one row per result file."""
+    results_path = Path(results_dir)
+    all_results = []
+
+    # Track skipped/failed files for user feedback
+    stats = {
+        'total_metadata_files': 0,
+        'skipped_missing_fields': 0,
+        'skipped_missing_metrics': 0,
+        'skipped_json_errors': 0,
+        'failed_unexpected': 0
+    }
+
+    if not results_path.exists():
+        logger.warning(f"Results directory not found: {results_path}")
+        return pd.DataFrame()
+
+    # Scan for all test-metadata.json files in embedding results
+    for metadata_file in find_files(results_path, "test-metadata.json"):
+        stats['total_metadata_files'] += 1
+        try:
+            with open(metadata_file) as f:
+                metadata = json.load(f)
+
+            # Validate required metadata fields
+            required_fields = ['test_run_id', 'model', 'platform']
+            missing = [f for f in required_fields if f not in metadata or not metadata[f]]
+            if missing:
+                logger.warning(f"Skipping {metadata_file}: missing required fields {missing}")
+                stats['skipped_missing_fields'] += 1
+                continue
+
+            test_run_dir = metadata_file.parent
+
+            # Process JSON files in baseline/ and latency/ subdirectories
+            result_subdirs = ['baseline', 'latency']
+            for subdir_name in result_subdirs:
+                subdir = test_run_dir / subdir_name
+                if not subdir.exists():
+                    continue
+
+                # Process all JSON result files in this subdirectory
+                for json_file in sorted(subdir.glob("*.json")):
+                    try:
+                        with open(json_file) as f:
+                            result = json.load(f)
+
+                        # Validate result has key metrics
+                        required_metrics = ['request_throughput', 'mean_e2el_ms']
+                        missing_metrics = [m for m in required_metrics if m not in result]
+                        if missing_metrics:
+                            logger.warning(f"Skipping {json_file}: missing metrics {missing_metrics}")
+                            stats['skipped_missing_metrics'] += 1
+                            continue
+
+                        # Parse test type from filename
+                        stem = json_file.stem
+                        if stem.startswith('sweep-'):
+                            test_type = 'baseline'
+                            parameter = stem.replace('sweep-', '')
+                        elif stem.startswith('concurrent-'):
+                            test_type = 'concurrent'
+                            parameter = stem.replace('concurrent-', '')
+                        else:
+                            test_type = 'unknown'
+                            parameter = stem
+
+                        # Extract test_name from test_run_id (format: test_name-YYYYMMDD-HHMMSS or just YYYYMMDD-HHMMSS)
+                        test_run_id = metadata.get('test_run_id', 'unknown')
+                        test_name = ''
+                        if test_run_id != 'unknown' and '-' in test_run_id:
+                            parts = test_run_id.split('-')
+                            # If more than 2 parts (date-time), first part(s) are test_name
+                            if len(parts) > 2:
+                                test_name = '-'.join(parts[:-2])
+
+                        # Calculate derived metrics
+                        rps = result.get('request_throughput', 0)
+                        cores = metadata.get('requested_cores')
+                        rps_per_core = (rps / cores) if cores and cores > 0 else None
+
+                        row = {
+                            # Metadata
+                            'test_run_id': test_run_id,
+                            'test_name': test_name,
+                            'scenario': metadata.get('scenario', ''),
+                            'model': metadata.get('model', ''),
+                            'platform': metadata.get('platform', 'unknown'),
+                            'vllm_version': normalize_vllm_version(metadata.get('vllm_version', 'unknown')),
+                            'vllm_mode': metadata.get('vllm_mode', 'managed'),
+                            'requested_cores': metadata.get('requested_cores'),
+                            'input_length': metadata.get('embedding_random_input_len'),
+                            'timestamp': metadata.get('timestamp', ''),
+
+                            # Test configuration
+                            'test_type': test_type,
+                            'parameter': parameter,
+                            'request_rate': result.get('request_rate'),
+                            'max_concurrency': result.get('max_concurrency'),
+                            'num_prompts': result.get('num_prompts'),
+
+                            # Performance metrics
+                            'request_throughput_rps': rps,
+                            'token_throughput_tps': result.get('total_token_throughput'),
+                            'rps_per_core': rps_per_core,
+                            'mean_latency_ms': result.get('mean_e2el_ms'),
+                            'median_latency_ms': result.get('median_e2el_ms'),
+                            'std_latency_ms': result.get('std_e2el_ms'),
+                            'p99_latency_ms': result.get('p99_e2el_ms'),
+                            'duration_sec': result.get('duration'),
+                            'completed_requests': result.get('completed'),
+                            'total_input_tokens': result.get('total_input_tokens'),
+                        }
+                        all_results.append(row)
+
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Failed to parse JSON in {json_file}: {e}")
+                        stats['skipped_json_errors'] += 1
+                        continue
+
+        except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
+            logger.warning(f"Failed to load {metadata_file}: {e}")
+            stats['skipped_json_errors'] += 1
+            continue
+        except Exception as e:
+            logger.error(f"Unexpected error loading {metadata_file}: {e}")
+            stats['failed_unexpected'] += 1
+            # Re-raise unexpected errors - don't hide bugs
+            raise
+
+    # Log statistics about data loading
+    logger.info(f"Data loading complete: {len(all_results)} result files loaded from {stats['total_metadata_files']} test runs")
+    if stats['skipped_missing_fields'] > 0 or stats['skipped_missing_metrics'] > 0 or stats['skipped_json_errors'] > 0:
+        logger.warning(
+            f"Skipped files: {stats['skipped_missing_fields']} missing fields, "
+            f"{stats['skipped_missing_metrics']} missing metrics, "
+            f"{stats['skipped_json_errors']} JSON errors"
+        )
+
+    return pd.DataFrame(all_results)
+
+
+def audio_table(results_dir: str) -> pd.DataFrame:
+    """Audio benchmark results with audio-specific metrics."""
+    rows = discover_run_results(results_dir)
+    if not rows:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(rows)
+    cores = pd.to_numeric(df['cores'], errors='coerce')
+    df['efficiency'] = np.where(cores > 0, df['audio_throughput'] / cores, np.nan)
+    return df
+
+
+def offline_batch_table(results_dir: str) -> pd.DataFrame:
+    """Offline batch benchmark results, one row per configuration."""
+    results: List[dict] = []
+    results_path = Path(results_dir)
+
+    if not results_path.exists():
+        logger.warning(f"Results directory not found: {results_dir}")
+        return pd.DataFrame()
+
+    for model_dir in results_path.iterdir():
+        if not model_dir.is_dir():
+            continue
+
+        for timestamp_dir in model_dir.iterdir():
+            if (
+                not timestamp_dir.is_dir()
+                or not timestamp_dir.name.startswith('offline-batch-')
+            ):
+                continue
+
+            for config_dir in timestamp_dir.iterdir():
+                if not config_dir.is_dir():
+                    continue
+
+                results_file = config_dir / 'results.json'
+                metadata_file = config_dir / 'test-metadata.json'
+
+                if results_file.exists() and metadata_file.exists():
+                    try:
+                        with open(results_file, 'r') as f:
+                            result_data = json.load(f)
+                        with open(metadata_file, 'r') as f:
+                            metadata = json.load(f)
+
+                        combined = {
+                            'model': metadata['model'],
+                            'timestamp': metadata['timestamp'],
+                            'test_run_id': metadata['test_run_id'],
+                            'cores': metadata['configuration']['cores'],
+                            'dataset': metadata['configuration']['dataset'],
+                            'num_prompts': metadata['configuration'][
+                                'num_prompts'
+                            ],
+                            'container_image': metadata['environment'].get(
+                                'container_image', 'unknown'
+                            ),
+                            'vllm_version': normalize_vllm_version(
+                                metadata['environment'].get(
+                                    'vllm_version', 'unknown'
+                                )
+                            ),
+                        }
+
+                        dataset_config = metadata['configuration'].get(
+                            'dataset_config', {}
+                        )
+                        if 'input_len' in dataset_config:
+                            combined['config_input_len'] = dataset_config[
+                                'input_len'
+                            ]
+                        if 'output_len' in dataset_config:
+                            combined['config_output_len'] = dataset_config[
+                                'output_len'
+                            ]
+
+                        # Store raw use_case slug for technical detection
+                        combined['use_case_slug'] = dataset_config.get(
+                            'use_case', ''
+                        )
+
+                        metrics = result_data.get('metrics', {})
+                        for metric_name, metric_value in metrics.items():
+                            combined[f'metric_{metric_name}'] = metric_value
+
+                        combined['use_case'] = infer_use_case(metadata)
+
+                        results.append(combined)
+
+                    except Exception as e:
+                        logger.warning(f"Error loading {config_dir}: {e}")
+                        continue
+
+    if not results:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(results)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
+
+
+TABLE_LOADERS = {
+    'client': client_table,
+    'server': server_table,
+    'embedding': embedding_table,
+    'audio': audio_table,
+    'offline_batch': offline_batch_table,
+}
+
+
+def load_table(
+    results_dir: str,
+    table: str,
+    columns: Optional[Iterable[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """Load a table from the results store, rebuilding it from JSON when stale.
+
+    The store is current while the results catalog fingerprint of
+    results_dir matches the one it was built from. A rebuilt table is
+    written back to the store when pyarrow is installed.
+
+    Args:
+        results_dir: Results directory (e.g. results/llm)
+        table: Table name (key of TABLE_LOADERS)
+        columns: Columns to return (default: all)
+        filters: {column: value or list of values}; filters on the
+            partition columns (model, workload, cores, month, see
+            results_store.PARTITION_COLUMNS) only read the matching files
+
+    Returns:
+        The table as a DataFrame (empty if there are no results)
+    """
+    results_path = Path(results_dir)
+    if not results_path.is_dir():
+        return TABLE_LOADERS[table](results_dir)
+
+    with open_catalog(results_path) as catalog:
+        fingerprint = catalog.fingerprint()
+    if results_store.is_current(results_path, table, fingerprint):
+        return results_store.read_table(results_path, table, columns=columns, filters=filters)
+
+    df = TABLE_LOADERS[table](results_dir)
+    if results_store.available():
+        try:
+            results_store.write_table(results_path, table, df, fingerprint)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not update results store for {table}: {e}")
+
+    if columns is None and not filters:
+        return df
+    return results_store.filter_frame(df, table, columns=columns, filters=filters)
+
+
+def load_partitions(results_dir: str, table: str) -> pd.DataFrame:
+    """Distinct partition keys (model, workload, cores, month) of a table.
+
+    Read from the partition columns alone, for choosing the filters of a
+    load_table() call before loading the table itself.
+    """
+    columns = list(results_store.PARTITION_COLUMNS)
+    partitions = load_table(results_dir, table, columns=columns)
+    return partitions.reindex(columns=columns).drop_duplicates().reset_index(drop=True)
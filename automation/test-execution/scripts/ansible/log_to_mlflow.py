@@ -8,6 +8,7 @@ LLM inference performance benchmarks.
 
 import argparse
 import json
+import math
 import os
 import sys
 from pathlib import Path
@@ -18,7 +19,13 @@ _script_dir = Path(__file__).parent
 _shared_dir = _script_dir.parent.parent / "shared"
 sys.path.insert(0, str(_shared_dir))
 
+from benchmarks_reader import read_benchmarks  # noqa: E402
 from io_utils import load_json_file  # noqa: E402
+from vllm_metrics import (  # noqa: E402
+    MetricsFrame,
+    find_metrics_file,
+    server_latency_percentiles,
+)
 
 try:
     import mlflow
@@ -263,45 +270,35 @@ def extract_aggregate_metrics(
 def extract_server_metrics(vllm_metrics_file: Path) -> Dict[str, float]:
     """Extract key server-side metrics from vLLM metrics JSON.
 
+    Counters and histograms are increases over the collection window;
+    gauges use the value at the end of the test.
+
     Args:
-        vllm_metrics_file: Path to vllm-metrics.json
+        vllm_metrics_file: Path to vllm-metrics.ndjson or vllm-metrics.json
 
     Returns:
         Dictionary of server metrics with 'server_' prefix
     """
     try:
-        vllm_data = load_json_file(vllm_metrics_file)
-        samples = vllm_data.get('samples', [])
+        frame = MetricsFrame.from_file(vllm_metrics_file)
 
-        if not samples:
+        if not len(frame):
             return {}
 
-        # Use the last sample (end of test) for cumulative metrics
-        last_sample = samples[-1]
-        metrics_data = last_sample.get('metrics', {})
-
         server_metrics = {}
 
-        # Helper to extract single value from metric
-        def get_value(metric_list):
-            if metric_list and len(metric_list) > 0:
-                return metric_list[0].get('value', 0)
-            return 0
+        def delta(metric_name):
+            return frame.counter_delta(metric_name) or 0
 
         # KV Cache utilization (%)
-        kv_cache = metrics_data.get('vllm:kv_cache_usage_perc', [])
-        if kv_cache:
-            server_metrics['server_kv_cache_usage_pct'] = (
-                get_value(kv_cache)
-            )
+        kv_cache = frame.gauge_stats('vllm:kv_cache_usage_perc', per_series=True)
+        # 'last' is NaN when no series has a value in the final sample
+        if kv_cache and math.isfinite(kv_cache['last']):
+            server_metrics['server_kv_cache_usage_pct'] = kv_cache['last']
 
         # Total tokens processed
-        prompt_tokens = get_value(
-            metrics_data.get('vllm:prompt_tokens_total', [])
-        )
-        generation_tokens = get_value(
-            metrics_data.get('vllm:generation_tokens_total', [])
-        )
+        prompt_tokens = delta('vllm:prompt_tokens_total')
+        generation_tokens = delta('vllm:generation_tokens_total')
         if prompt_tokens > 0:
             server_metrics['server_prompt_tokens_total'] = prompt_tokens
         if generation_tokens > 0:
@@ -312,25 +309,16 @@ def extract_server_metrics(vllm_metrics_file: Path) -> Dict[str, float]:
             )
 
         # Cache hit rates
-        prefix_hits = get_value(
-            metrics_data.get('vllm:prefix_cache_hits_total', [])
-        )
-        prefix_queries = get_value(
-            metrics_data.get('vllm:prefix_cache_queries_total', [])
-        )
+        prefix_hits = delta('vllm:prefix_cache_hits_total')
+        prefix_queries = delta('vllm:prefix_cache_queries_total')
         if prefix_queries > 0:
             server_metrics['server_prefix_cache_hit_rate'] = (
                 (prefix_hits / prefix_queries) * 100
             )
 
-        # Request success rate
-        success_total = get_value(
-            metrics_data.get('vllm:request_success_total', [])
-        )
-        # Get total requests from histogram count
-        e2e_count = get_value(
-            metrics_data.get('vllm:e2e_request_latency_seconds_count', [])
-        )
+        # Request success rate; total requests from the e2e histogram count
+        success_total = delta('vllm:request_success_total')
+        e2e_count = delta('vllm:e2e_request_latency_seconds_count')
         if e2e_count > 0:
             server_metrics['server_requests_total'] = e2e_count
             server_metrics['server_request_success_rate'] = (
@@ -338,90 +326,47 @@ def extract_server_metrics(vllm_metrics_file: Path) -> Dict[str, float]:
             )
 
         # Average latencies from histogram sums and counts
-        # TTFT
-        ttft_sum = get_value(
-            metrics_data.get('vllm:time_to_first_token_seconds_sum', [])
-        )
-        ttft_count = get_value(
-            metrics_data.get('vllm:time_to_first_token_seconds_count', [])
-        )
-        if ttft_count > 0:
-            server_metrics['server_ttft_avg_ms'] = (ttft_sum / ttft_count) * 1000
-
-        # E2E latency
-        e2e_sum = get_value(
-            metrics_data.get('vllm:e2e_request_latency_seconds_sum', [])
-        )
-        if e2e_count > 0:
-            server_metrics['server_e2e_latency_avg_s'] = e2e_sum / e2e_count
-
-        # Prefill time
-        prefill_sum = get_value(
-            metrics_data.get('vllm:request_prefill_time_seconds_sum', [])
-        )
-        prefill_count = get_value(
-            metrics_data.get('vllm:request_prefill_time_seconds_count', [])
-        )
-        if prefill_count > 0:
-            server_metrics['server_prefill_time_avg_ms'] = (prefill_sum / prefill_count) * 1000
-
-        # Decode time
-        decode_sum = get_value(
-            metrics_data.get('vllm:request_decode_time_seconds_sum', [])
-        )
-        decode_count = get_value(
-            metrics_data.get('vllm:request_decode_time_seconds_count', [])
-        )
-        if decode_count > 0:
-            server_metrics['server_decode_time_avg_ms'] = (decode_sum / decode_count) * 1000
-
-        # Queue time
-        queue_sum = get_value(
-            metrics_data.get('vllm:request_queue_time_seconds_sum', [])
-        )
-        queue_count = get_value(
-            metrics_data.get('vllm:request_queue_time_seconds_count', [])
-        )
-        if queue_count > 0:
-            server_metrics['server_queue_time_avg_ms'] = (queue_sum / queue_count) * 1000
+        latency_means_ms = {
+            'server_ttft_avg_ms': 'vllm:time_to_first_token_seconds',
+            'server_prefill_time_avg_ms': 'vllm:request_prefill_time_seconds',
+            'server_decode_time_avg_ms': 'vllm:request_decode_time_seconds',
+            'server_queue_time_avg_ms': 'vllm:request_queue_time_seconds',
+        }
+        for key, histogram in latency_means_ms.items():
+            mean = frame.histogram_mean(histogram)
+            if mean is not None:
+                server_metrics[key] = mean * 1000
+
+        e2e_mean = frame.histogram_mean('vllm:e2e_request_latency_seconds')
+        if e2e_mean is not None:
+            server_metrics['server_e2e_latency_avg_s'] = e2e_mean
 
         # CPU time
-        cpu_seconds = get_value(metrics_data.get('process_cpu_seconds_total', []))
+        cpu_seconds = delta('process_cpu_seconds_total')
         if cpu_seconds > 0:
             server_metrics['server_cpu_seconds_total'] = cpu_seconds
 
         # Memory usage (convert to MB)
-        resident_mem = get_value(metrics_data.get('process_resident_memory_bytes', []))
-        if resident_mem > 0:
-            server_metrics['server_memory_mb'] = resident_mem / (1024 * 1024)
+        memory = frame.gauge_stats('process_resident_memory_bytes')
+        if memory and memory['last'] > 0:
+            server_metrics['server_memory_mb'] = memory['last'] / (1024 * 1024)
 
         # Preemptions
-        preemptions = get_value(metrics_data.get('vllm:num_preemptions_total', []))
+        preemptions = delta('vllm:num_preemptions_total')
         if preemptions > 0:
             server_metrics['server_num_preemptions'] = preemptions
 
         # Average tokens per request
-        gen_tokens_sum = get_value(
-            metrics_data.get('vllm:request_generation_tokens_sum', [])
-        )
-        gen_tokens_count = get_value(
-            metrics_data.get('vllm:request_generation_tokens_count', [])
-        )
-        if gen_tokens_count > 0:
-            server_metrics['server_avg_output_tokens_per_req'] = (
-                gen_tokens_sum / gen_tokens_count
-            )
+        output_per_req = frame.histogram_mean('vllm:request_generation_tokens')
+        if output_per_req is not None:
+            server_metrics['server_avg_output_tokens_per_req'] = output_per_req
 
-        prompt_tokens_sum = get_value(
-            metrics_data.get('vllm:request_prompt_tokens_sum', [])
-        )
-        prompt_tokens_count = get_value(
-            metrics_data.get('vllm:request_prompt_tokens_count', [])
-        )
-        if prompt_tokens_count > 0:
-            server_metrics['server_avg_prompt_tokens_per_req'] = (
-                prompt_tokens_sum / prompt_tokens_count
-            )
+        prompt_per_req = frame.histogram_mean('vllm:request_prompt_tokens')
+        if prompt_per_req is not None:
+            server_metrics['server_avg_prompt_tokens_per_req'] = prompt_per_req
+
+        # Server-side p50/p95/p99 for TTFT, queue, prefill and decode (ms)
+        server_metrics.update(server_latency_percentiles(frame))
 
         return server_metrics
 
@@ -476,7 +421,7 @@ def log_to_mlflow(
     """
     try:
         # Load data
-        benchmarks = load_json_file(benchmarks_file)
+        benchmarks = read_benchmarks(benchmarks_file)
         metadata = load_json_file(metadata_file)
 
         # Set tracking URI
@@ -588,8 +533,8 @@ def log_to_mlflow(
                     mlflow.log_artifact(str(metrics_collector_log), "logs")
 
                 # Log vLLM server metrics if they exist
-                vllm_metrics = result_dir / "vllm-metrics.json"
-                if vllm_metrics.exists():
+                vllm_metrics = find_metrics_file(result_dir)
+                if vllm_metrics:
                     mlflow.log_artifact(str(vllm_metrics), "server_metrics")
 
                 # Log any vLLM server logs
@@ -642,7 +587,7 @@ def log_to_mlflow(
                 mlflow.log_metrics(aggregate_metrics)
 
                 # Log server-side metrics (from vLLM) if available
-                if vllm_metrics.exists():
+                if vllm_metrics:
                     server_metrics = extract_server_metrics(vllm_metrics)
                     if server_metrics:
                         mlflow.log_metrics(server_metrics)
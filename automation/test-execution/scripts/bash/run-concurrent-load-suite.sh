@@ -29,8 +29,17 @@
 #   --guidellm-cpus RANGE   CPU range for GuideLLM (e.g., 0-31)
 #   --guidellm-numa-node NUM NUMA node for GuideLLM
 #   --tensor-parallel NUM   Tensor parallel size (1, 2, 4, or 8)
+#   --slo SPEC              Search for the highest concurrency meeting a p95 SLO
+#                           instead of the fixed rate list (GuideLLM adaptive
+#                           profile), e.g. ttft_ms=2000,itl_ms=100,e2e_ms=30000
+#   --search-max NUM        Highest concurrency the SLO search tries (default: 128)
+#   --early-stop METRIC     End each concurrency point once the p95 of METRIC
+#                           (ttft_ms|itl_ms|tpot_ms|e2e_ms) has converged, or
+#                           violates the --slo threshold beyond doubt
 #   --continue-on-error     Continue testing if a model/workload fails
 #   --dry-run               Show what would run without executing
+#   --list-matrix           Print the test matrix (model<TAB>cores<TAB>workload per
+#                           line) and exit; used by cpueval --parallel
 #   -h, --help              Show this help
 #
 # Model Presets:
@@ -48,6 +57,9 @@
 #   # Quick test with TinyLlama
 #   ./run-concurrent-load-suite.sh --models tiny --cores 8 --workloads chat
 #
+#   # Find the highest concurrency with p95 TTFT <= 2s and ITL <= 100ms
+#   ./run-concurrent-load-suite.sh --models tiny --cores 16 --slo ttft_ms=2000,itl_ms=100
+#
 #   # Test specific model
 #   ./run-concurrent-load-suite.sh --models "meta-llama/Llama-3.2-1B-Instruct"
 #
@@ -104,6 +116,7 @@ WORKLOADS_INPUT=""  # Empty = default to chat
 PHASE="1"
 CONTINUE_ON_ERROR=false
 DRY_RUN=false
+LIST_MATRIX=false
 SKIP_MODELS_INPUT=""
 VLLM_CPUS=""
 VLLM_CPU_START=""
@@ -111,6 +124,9 @@ VLLM_NUMA_NODE=""
 GUIDELLM_CPUS=""
 GUIDELLM_NUMA_NODE=""
 TENSOR_PARALLEL=""
+SLO=""
+SEARCH_MAX=""
+EARLY_STOP=""
 
 show_help() {
     sed -n '/^# ===/,/^set -/p' "$0" | sed '$d' | sed '1,3d;$d' | sed 's/^# //; s/^#//'
@@ -162,6 +178,18 @@ while [[ $# -gt 0 ]]; do
             TENSOR_PARALLEL="$2"
             shift 2
             ;;
+        --slo)
+            SLO="$2"
+            shift 2
+            ;;
+        --search-max)
+            SEARCH_MAX="$2"
+            shift 2
+            ;;
+        --early-stop)
+            EARLY_STOP="$2"
+            shift 2
+            ;;
         --continue-on-error)
             CONTINUE_ON_ERROR=true
             shift
@@ -170,6 +198,10 @@ while [[ $# -gt 0 ]]; do
             DRY_RUN=true
             shift
             ;;
+        --list-matrix)
+            LIST_MATRIX=true
+            shift
+            ;;
         -h|--help)
             show_help
             exit 0
@@ -269,6 +301,17 @@ case "$PHASE" in
         ;;
 esac
 
+if [[ "$LIST_MATRIX" == true ]]; then
+    for model in "${FINAL_MODELS[@]}"; do
+        for cores in "${CORES[@]}"; do
+            for workload in "${WORKLOADS[@]}"; do
+                printf '%s\t%s\t%s\n' "$model" "$cores" "$workload"
+            done
+        done
+    done
+    exit 0
+fi
+
 echo "========================================="
 echo "Upstream LLM Concurrent Load Test Suite"
 echo "========================================="
@@ -277,6 +320,12 @@ echo "Cores: ${CORES[*]}"
 echo "Workloads: ${WORKLOADS[*]}"
 echo "Phase: $PHASE"
 echo "Continue on error: $CONTINUE_ON_ERROR"
+if [[ -n "$SLO" ]]; then
+    echo "SLO search (p95): $SLO"
+fi
+if [[ -n "$EARLY_STOP" ]]; then
+    echo "Early stop on: $EARLY_STOP"
+fi
 echo "Dry run: $DRY_RUN"
 echo "========================================="
 echo
@@ -288,7 +337,7 @@ FAILED_TESTS=0
 for model in "${FINAL_MODELS[@]}"; do
     for cores in "${CORES[@]}"; do
         for workload in "${WORKLOADS[@]}"; do
-            ((CURRENT_TEST++))
+            CURRENT_TEST=$((CURRENT_TEST + 1))
 
             echo "[$CURRENT_TEST/$TOTAL_TESTS] Testing: $model | $workload | ${cores} cores"
 
@@ -321,6 +370,15 @@ for model in "${FINAL_MODELS[@]}"; do
             if [[ -n "${TENSOR_PARALLEL}" ]]; then
                 CMD+=(-e "requested_tensor_parallel=${TENSOR_PARALLEL}")
             fi
+            if [[ -n "${SLO}" ]]; then
+                CMD+=(-e "guidellm_profile=adaptive" -e "guidellm_slo=${SLO}")
+                if [[ -n "${SEARCH_MAX}" ]]; then
+                    CMD+=(-e "guidellm_search_max=${SEARCH_MAX}")
+                fi
+            fi
+            if [[ -n "${EARLY_STOP}" ]]; then
+                CMD+=(-e "guidellm_early_stop=true" -e "guidellm_early_stop_metric=${EARLY_STOP}")
+            fi
 
             # Parallel instance overrides — set env vars to run multiple instances
             # simultaneously on the same host (each with its own container, port, NUMA nodes):
@@ -343,7 +401,7 @@ for model in "${FINAL_MODELS[@]}"; do
                     echo "  ✓ Success"
                 else
                     echo "  ✗ Failed"
-                    ((FAILED_TESTS++))
+                    FAILED_TESTS=$((FAILED_TESTS + 1))
                     if [[ "$CONTINUE_ON_ERROR" == false ]]; then
                         echo "Stopping due to failure (use --continue-on-error to continue)"
                         exit 1
@@ -24,6 +24,10 @@
 #   ./run-offline-batch-suite.sh baseline 32 100
 #   ./run-offline-batch-suite.sh batch-scaling TinyLlama/TinyLlama-1.1B-Chat-v1.0 16
 #   ./run-offline-batch-suite.sh all meta-llama/Llama-3.2-1B-Instruct 32
+#
+# --list-matrix (any position) prints the playbook runs a mode would make, one
+# tab-separated "model cores workload run-test <args...>" line each, and exits.
+# cpueval uses it to run and checkpoint the runs one by one.
 
 set -euo pipefail
 
@@ -73,6 +77,9 @@ DEFAULT_TIMEOUT_PER_PROMPT=2  # 2 seconds per prompt
 BASE_TIMEOUT="${OFFLINE_BATCH_BASE_TIMEOUT:-$DEFAULT_BASE_TIMEOUT}"
 TIMEOUT_PER_PROMPT="${OFFLINE_BATCH_TIMEOUT_PER_PROMPT:-$DEFAULT_TIMEOUT_PER_PROMPT}"
 
+# Set by --list-matrix: print each playbook run instead of running it
+LIST_MATRIX=false
+
 # Retry configuration
 MAX_RETRIES="${OFFLINE_BATCH_MAX_RETRIES:-1}"  # Retry once on timeout/failure
 RETRY_DELAY=30  # Seconds to wait between retries
@@ -200,6 +207,21 @@ run_ansible_with_timeout() {
     local cores=$5
     shift 5
 
+    if [ "$LIST_MATRIX" = true ]; then
+        # Workload column: the use case when set, else the dataset
+        local workload="$dataset"
+        local arg
+        for arg in "$@"; do
+            if [[ "$arg" == use_case=* ]]; then
+                workload="${arg#use_case=}"
+            fi
+        done
+        printf '%s\t%s\t%s\trun-test' "$model" "$cores" "$workload" >&3
+        printf '\t%s' "$model" "$dataset" "$num_prompts" "$cores" "$@" >&3
+        printf '\n' >&3
+        return 0
+    fi
+
     local attempt=1
     local max_attempts=$((MAX_RETRIES + 1))
 
@@ -1008,13 +1030,16 @@ test_all() {
     echo "  7. KV-cache capacity sweep (6 sizes)"
     echo "  8. Context length scaling (4 lengths)"
     echo
-    read -p "Continue? [y/N] " -n 1 -r
-    echo
-    if [[ ! $REPLY =~ ^[Yy]$ ]]; then
-        echo "Cancelled."
-        return 1
+    # --list-matrix only prints the cells: nobody sees or answers the prompt
+    if [ "$LIST_MATRIX" != true ]; then
+        read -p "Continue? [y/N] " -n 1 -r
+        echo
+        if [[ ! $REPLY =~ ^[Yy]$ ]]; then
+            echo "Cancelled."
+            return 1
+        fi
+        echo
     fi
-    echo
 
     local failed_tests=()
 
@@ -1056,10 +1081,26 @@ test_all() {
 # ==============================================================================
 
 main() {
+    local args=()
+    local arg
+    for arg in "$@"; do
+        if [ "$arg" = "--list-matrix" ]; then
+            LIST_MATRIX=true
+        else
+            args+=("$arg")
+        fi
+    done
+    set -- "${args[@]+"${args[@]}"}"
+
     if [ $# -lt 1 ]; then
         usage
     fi
 
+    if [ "$LIST_MATRIX" = true ]; then
+        # Matrix lines go to the original stdout, progress output is dropped
+        exec 3>&1 1>/dev/null
+    fi
+
     local mode=$1
     shift
 
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Build the Parquet results store read by the dashboards.
+
+Converts the raw JSON results into the normalised client, server, embedding,
+audio and offline-batch tables (the same tables the dashboard pages build)
+and writes each one as a partitioned Parquet dataset under
+<results-dir>/<suite dir>/.store/. Dashboards read a table from the store
+while it is current and rebuild it from JSON otherwise.
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    python3 build_results_store.py
+    python3 build_results_store.py --results-dir /path/to/results --table client --table server
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add dashboard (table loaders) and shared (catalog, store) libraries to path
+_script_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(_script_dir.parent.parent / "dashboard-examples" / "vllm_dashboard"))
+sys.path.insert(0, str(_script_dir.parent.parent / "shared"))
+
+import results_store  # noqa: E402
+from results_catalog import open_catalog  # noqa: E402
+from results_tables import TABLE_LOADERS  # noqa: E402
+
+# Results subdirectory each table is built from
+TABLE_DIRS = {
+    "client": "llm",
+    "server": "llm",
+    "offline_batch": "llm",
+    "embedding": "embedding",
+    "audio": "audio-models",
+}
+
+
+def build_table(results_root: Path, table: str) -> None:
+    """Rebuild one table of the store from the JSON results."""
+    source_dir = results_root / TABLE_DIRS[table]
+    if not source_dir.is_dir():
+        print(f"  {table}: skipped, {source_dir} not found")
+        return
+
+    start = time.perf_counter()
+    with open_catalog(source_dir) as catalog:
+        fingerprint = catalog.fingerprint()
+    df = TABLE_LOADERS[table](str(source_dir))
+    path = results_store.write_table(source_dir, table, df, fingerprint)
+    print(f"  {table}: {len(df)} rows -> {path} ({time.perf_counter() - start:.1f}s)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the Parquet results store")
+    parser.add_argument(
+        "--results-dir",
+        type=Path,
+        default=_script_dir.parents[3] / "results",
+        help="Results root holding llm/, embedding/, audio-models/ (default: <repo>/results)",
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=list(TABLE_DIRS),
+        help="Table to build (repeatable, default: all)",
+    )
+    args = parser.parse_args()
+
+    if not results_store.available():
+        print("Error: pyarrow is not installed. Install with: pip install pyarrow",
+              file=sys.stderr)
+        return 1
+
+    print(f"Building results store from {args.results_dir}")
+    for table in args.table or list(TABLE_DIRS):
+        build_table(args.results_dir, table)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,53 @@
 """Batch convert CPU benchmark results to dashboard CSV format.
 
 This script recursively finds all benchmark results in the results/llm directory
-and converts them using the CPU-specific import script.
+and converts them in-process with convert_single.py, spreading the runs over a
+pool of worker processes.
+
+Conversion is incremental: the rows of each run are cached under
+results/.convert-cache/, keyed by the path, size and mtime of the run's
+benchmarks.json, test-metadata.json and vllm-metrics file plus
+convert_single.CONVERTER_VERSION. Unchanged runs are read back from the cache
+and only new or modified runs are converted.
+
+Each converted run also gets a per-request sidecar, requests.arrow next to
+its benchmarks.json (see shared/request_sidecar.py), when pyarrow is
+installed; --no-sidecar turns this off.
 
 Results are separated into two CSV files based on vllm_mode:
 - managed_cpu_benchmarks.csv: Single-instance tests (vllm_mode=managed)
 - external_cpu_benchmarks.csv: External Endpoint/Multi-instance tests (vllm_mode=external)
+
+Usage:
+    python3 convert_batch.py [--jobs N] [--no-cache] [--no-sidecar]
 """
 
-import subprocess
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pandas as pd
 
+# Add shared library and the single-run converter to path
+_script_dir = Path(__file__).parent
+_shared_dir = _script_dir.parent.parent / "shared"
+sys.path.insert(0, str(_shared_dir))
+sys.path.insert(0, str(_script_dir))
+
+import request_sidecar  # noqa: E402
+from convert_single import CONVERTER_VERSION, CSV_COLUMNS, convert_run  # noqa: E402
+from results_catalog import find_files  # noqa: E402
+from vllm_metrics import find_metrics_file  # noqa: E402
+
+CACHE_DIRNAME = ".convert-cache"
+
 
 def find_benchmark_results(results_dir):
     """Find all benchmark result directories with benchmarks.json and test-metadata.json.
@@ -23,20 +57,19 @@ def find_benchmark_results(results_dir):
         results_dir: Root directory to search for results.
 
     Returns:
-        list: List of tuples (benchmarks_json_path, metadata_json_path, vllm_metrics_json_path)
+        list: List of tuples (benchmarks_json_path, metadata_json_path, vllm_metrics_path)
     """
     results = []
-    results_path = Path(results_dir)
 
     # Find all directories containing both required files
-    for benchmarks_json in results_path.rglob("benchmarks.json"):
+    for benchmarks_json in find_files(results_dir, "benchmarks.json"):
         parent_dir = benchmarks_json.parent
         metadata_json = parent_dir / "test-metadata.json"
-        vllm_metrics_json = parent_dir / "vllm-metrics.json"
 
         if metadata_json.exists():
-            # vllm-metrics.json is optional - include path if it exists, else None
-            vllm_path = str(vllm_metrics_json) if vllm_metrics_json.exists() else None
+            # vLLM metrics (.ndjson or legacy .json) are optional - None if absent
+            vllm_metrics_file = find_metrics_file(parent_dir)
+            vllm_path = str(vllm_metrics_file) if vllm_metrics_file else None
             results.append((str(benchmarks_json), str(metadata_json), vllm_path))
         else:
             print(f"Warning: Found {benchmarks_json} but no corresponding test-metadata.json")
@@ -44,81 +77,149 @@ def find_benchmark_results(results_dir):
     return results
 
 
-def convert_result(benchmarks_json, metadata_json, vllm_metrics_json, output_csv, script_path):
-    """Convert a single benchmark result to CSV format.
+def cache_key(benchmarks_json, metadata_json, vllm_metrics_json):
+    """Cache key of one run: its input files' path, size and mtime plus the converter version.
 
     Args:
         benchmarks_json: Path to benchmarks.json
         metadata_json: Path to test-metadata.json
-        vllm_metrics_json: Path to vllm-metrics.json (optional, can be None)
-        output_csv: Path to output CSV file
-        script_path: Path to the convert_single.py script
+        vllm_metrics_json: Path to vllm-metrics.ndjson/.json (optional, can be None)
 
     Returns:
-        bool: True if successful, False otherwise
+        str: Hex digest identifying the run's cached rows
     """
-    cmd = [
-        sys.executable,  # Use the same Python interpreter
-        script_path,
-        benchmarks_json,
-        "--metadata-file", metadata_json,
-        "--csv-file", output_csv,
-    ]
+    files = []
+    for path in (benchmarks_json, metadata_json, vllm_metrics_json):
+        if path:
+            stat = os.stat(path)
+            files.append([str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns])
+    payload = json.dumps([CONVERTER_VERSION, files])
+    return hashlib.sha1(payload.encode()).hexdigest()
 
-    # Add vllm-metrics file if available
-    if vllm_metrics_json:
-        cmd.extend(["--vllm-metrics-file", vllm_metrics_json])
 
-    print(f"\nProcessing: {benchmarks_json}")
-    print(f"  Metadata: {metadata_json}")
-    if vllm_metrics_json:
-        print(f"  Server Metrics: {vllm_metrics_json}")
+def convert_result(benchmarks_json, metadata_json, vllm_metrics_json, sidecar=False):
+    """Convert a single benchmark result (runs in a worker process).
 
+    Args:
+        benchmarks_json: Path to benchmarks.json
+        metadata_json: Path to test-metadata.json
+        vllm_metrics_json: Path to vllm-metrics.ndjson/.json (optional, can be None)
+        sidecar: Also write the run's per-request sidecar (requests.arrow)
+
+    Returns:
+        tuple: (rows DataFrame or None, captured converter output, error message or None)
+    """
+    log = io.StringIO()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=300,  # 5 minutes timeout to avoid indefinite blocking
-        )
-        print(result.stdout)
-        return True
-    except subprocess.TimeoutExpired:
-        print(f"Error: Conversion timed out after 300s for {benchmarks_json}")
-        return False
-    except subprocess.CalledProcessError as e:
-        print(f"Error processing {benchmarks_json}:")
-        print(e.stdout)
-        print(e.stderr)
-        return False
+        with contextlib.redirect_stdout(log):
+            df = convert_run(
+                benchmarks_json,
+                metadata_file=metadata_json,
+                vllm_metrics_file=vllm_metrics_json,
+                sidecar=sidecar,
+            )
+    except Exception as e:  # noqa: BLE001 - one bad run must not stop the batch
+        return None, log.getvalue(), f"{type(e).__name__}: {e}"
+    if df is None or df.empty:
+        return None, log.getvalue(), "no valid benchmark data extracted"
+    return df, log.getvalue(), None
+
+
+def convert_all(benchmark_results, cache_dir, jobs, use_cache=True, sidecar=False):
+    """Convert every run, reusing cached rows for unchanged runs.
+
+    Args:
+        benchmark_results: Tuples from find_benchmark_results()
+        cache_dir: Directory holding the per-run cached rows
+        jobs: Number of worker processes
+        use_cache: Re-convert every run when False (the cache is still refreshed)
+        sidecar: Write per-request sidecars; runs without a current one are re-converted
+
+    Returns:
+        tuple: (list of per-run CSV paths in result order, converted count, cached count, failed count)
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    keys = [cache_key(*result) for result in benchmark_results]
+    pending = [
+        (result, key)
+        for result, key in zip(benchmark_results, keys)
+        if not (use_cache and (cache_dir / f"{key}.csv").exists()
+                and (not sidecar or request_sidecar.is_current(result[0])))
+    ]
+    cached = len(benchmark_results) - len(pending)
+    converted = 0
+    failed = 0
+
+    if pending:
+        print(f"Converting {len(pending)} run(s) with {min(jobs, len(pending))} worker(s)...")
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+            futures = [pool.submit(convert_result, *result, sidecar) for result, _ in pending]
+            for (result, key), future in zip(pending, futures):
+                benchmarks_json, metadata_json, vllm_metrics_json = result
+                print(f"\nProcessing: {benchmarks_json}")
+                print(f"  Metadata: {metadata_json}")
+                if vllm_metrics_json:
+                    print(f"  Server Metrics: {vllm_metrics_json}")
+                df, log, error = future.result()
+                print(log, end="")
+                if error:
+                    print(f"Error processing {benchmarks_json}: {error}")
+                    failed += 1
+                    continue
+                # Write then rename, so an interrupted batch never leaves a partial entry
+                entry = cache_dir / f"{key}.csv"
+                staging = entry.with_suffix(f".tmp-{os.getpid()}")
+                df.reindex(columns=CSV_COLUMNS).to_csv(staging, index=False)
+                staging.replace(entry)
+                converted += 1
+
+    # Drop entries of runs that were removed or changed since the last batch
+    live = {f"{key}.csv" for key in keys}
+    for entry in cache_dir.glob("*.csv"):
+        if entry.name not in live:
+            entry.unlink()
+
+    csv_files = [cache_dir / f"{key}.csv" for key in keys if (cache_dir / f"{key}.csv").exists()]
+    return csv_files, converted, cached, failed
 
 
 def main():
     """Main batch conversion function."""
+    parser = argparse.ArgumentParser(description="Batch convert CPU benchmark results to dashboard CSV")
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--no-sidecar",
+        action="store_true",
+        help="Do not write the per-request sidecar (requests.arrow) of each run",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-convert every run instead of reusing cached rows of unchanged runs",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     # Determine paths - script can be run from repo root or from results/scripts/
     script_dir = Path(__file__).parent.absolute()
     repo_root = script_dir.parent.parent if script_dir.name == "scripts" else Path.cwd()
 
     # Configuration
     results_dir = repo_root / "results" / "llm"
-    temp_csv = repo_root / "results" / "temp_all_cpu_benchmarks.csv"
+    cache_dir = repo_root / "results" / CACHE_DIRNAME
     managed_csv = repo_root / "results" / "managed_cpu_benchmarks.csv"
     external_csv = repo_root / "results" / "external_cpu_benchmarks.csv"
-    import_script = script_dir / "convert_single.py"
 
     if not results_dir.exists():
         print(f"Error: Results directory '{results_dir}' not found")
         sys.exit(1)
 
-    if not import_script.exists():
-        print(f"Error: Single converter script '{import_script}' not found")
-        sys.exit(1)
-
-    # Remove temp CSV if it exists
-    if temp_csv.exists():
-        temp_csv.unlink()
-
     # Find all benchmark results
     print(f"Searching for benchmark results in {results_dir}...")
     benchmark_results = find_benchmark_results(str(results_dir))
@@ -129,23 +230,19 @@ def main():
 
     print(f"\nFound {len(benchmark_results)} benchmark result(s)")
 
-    # Process each result into temp CSV
-    successful = 0
-    failed = 0
-
-    for benchmarks_json, metadata_json, vllm_metrics_json in benchmark_results:
-        if convert_result(benchmarks_json, metadata_json, vllm_metrics_json, str(temp_csv), str(import_script)):
-            successful += 1
-        else:
-            failed += 1
+    start = time.perf_counter()
+    csv_files, converted, cached, failed = convert_all(
+        benchmark_results, cache_dir, args.jobs, use_cache=not args.no_cache,
+        sidecar=not args.no_sidecar and request_sidecar.available(),
+    )
 
     if failed > 0:
         print(f"\nWarning: {failed} results failed to convert")
 
     # Split results by vllm_mode
-    if temp_csv.exists():
+    if csv_files:
         print("\nSplitting results by vllm_mode...")
-        df = pd.read_csv(temp_csv)
+        df = pd.concat([pd.read_csv(path) for path in csv_files], ignore_index=True)
 
         # Split into managed and external
         managed_df = df[df['vllm_mode'] == 'managed']
@@ -164,21 +261,19 @@ def main():
         else:
             print("  No external results found")
 
-        # Clean up temp file
-        temp_csv.unlink()
-        print(f"  Removed temporary file {temp_csv}")
-
     # Summary
     print("\n" + "=" * 60)
     print("Batch Conversion Summary")
     print("=" * 60)
     print(f"Total results found: {len(benchmark_results)}")
-    print(f"Successfully converted: {successful}")
+    print(f"Converted: {converted}")
+    print(f"Unchanged (from cache): {cached}")
     print(f"Failed: {failed}")
-    print(f"\nOutput files:")
+    print(f"Elapsed: {time.perf_counter() - start:.1f}s")
+    print("\nOutput files:")
     print(f"  Managed (single-instance): {managed_csv}")
     print(f"  External (variable instances): {external_csv}")
-    print(f"Script location: {import_script}")
+    print(f"Cache: {cache_dir}")
 
     if failed > 0:
         sys.exit(1)
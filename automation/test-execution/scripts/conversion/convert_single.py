@@ -14,6 +14,129 @@ from pathlib import Path
 
 import pandas as pd
 
+# Add shared library to path
+_script_dir = Path(__file__).parent
+_shared_dir = _script_dir.parent.parent / "shared"
+sys.path.insert(0, str(_shared_dir))
+
+import request_sidecar  # noqa: E402
+from benchmarks_reader import read_benchmarks  # noqa: E402
+from vllm_metrics import (  # noqa: E402
+    SERVER_PERCENTILE_COLUMNS,
+    MetricsFrame,
+    server_latency_percentiles,
+)
+
+# Bump when the produced rows change, so convert_batch.py re-converts cached runs
+CONVERTER_VERSION = "2"
+
+# Sweep-point histograms (request_sidecar.HISTOGRAMS) and their CSV columns
+HISTOGRAM_COLUMNS = {
+    "ttft_ms": "ttft_histogram",
+    "itl_ms": "itl_histogram",
+    "tpot_ms": "tpot_histogram",
+    "request_latency_ms": "request_latency_histogram",
+}
+
+# Output CSV columns (extended with CPU-specific fields)
+CSV_COLUMNS = [
+    "run",
+    "accelerator",  # CPU type in our case
+    "model",
+    "version",
+    "prompt toks",
+    "output toks",
+    "TP",
+    "measured concurrency",
+    "intended concurrency",
+    "measured rps",
+    "output_tok/sec",
+    "total_tok/sec",
+    "prompt_token_count_mean",
+    "prompt_token_count_p99",
+    "output_token_count_mean",
+    "output_token_count_p99",
+    "ttft_median",
+    "ttft_p95",
+    "ttft_p1",
+    "ttft_p999",
+    "tpot_median",
+    "tpot_p95",
+    "tpot_p99",
+    "tpot_p999",
+    "tpot_p1",
+    "itl_median",
+    "itl_p95",
+    "itl_p999",
+    "itl_p1",
+    "request_latency_median",
+    "request_latency_min",
+    "request_latency_max",
+    "successful_requests",
+    "errored_requests",
+    "uuid",
+    "ttft_mean",
+    "ttft_p99",
+    "itl_mean",
+    "itl_p99",
+    "runtime_args",
+    "guidellm_start_time_ms",
+    "guidellm_end_time_ms",
+    "image_tag",
+    "guidellm_version",
+    "DP",
+    # CPU-specific additions
+    "core_count",
+    "cpuset_cpus",
+    "cpuset_mems",
+    "omp_num_threads",
+    "tpot_mean",
+    # Test configuration
+    "vllm_mode",
+    "core_config_name",
+    "config_type",
+    "test_name",
+    "workload",
+    "platform",
+    # vLLM configuration
+    "vllm_caching_mode",
+    "vllm_dtype",
+    "vllm_kv_cache_size",
+    "vllm_max_model_len",
+    "backend",
+    "timestamp",
+    # Server-side metrics (from vllm-metrics.ndjson/.json)
+    "server_cpu_usage_rate",
+    "server_memory_mean_bytes",
+    "server_memory_max_bytes",
+    "server_kv_cache_usage_mean",
+    "server_kv_cache_usage_max",
+    "server_requests_running_mean",
+    "server_requests_running_max",
+    "server_requests_waiting_mean",
+    "server_requests_waiting_max",
+    "server_prefix_cache_hits",
+    "server_prefix_cache_queries",
+    "server_prefix_cache_hit_rate",
+    "server_num_preemptions",
+    "server_prompt_tokens_total",
+    "server_generation_tokens_total",
+    "server_ttft_mean_ms",
+    "server_tpot_mean_ms",
+    "server_e2e_latency_mean_ms",
+    "server_queue_time_mean_ms",
+    "server_prefill_time_mean_ms",
+    "server_decode_time_mean_ms",
+    *SERVER_PERCENTILE_COLUMNS,
+    # Per-request latency histograms (latency_histogram.py JSON, ms), for
+    # pooling percentiles across repetitions
+    *HISTOGRAM_COLUMNS.values(),
+]
+
+
+class MissingFieldError(ValueError):
+    """A required field is neither given nor present in the metadata."""
+
 
 def load_test_metadata(metadata_path):
     """Load test metadata from test-metadata.json.
@@ -35,204 +158,160 @@ def load_test_metadata(metadata_path):
         return {}
 
 
-def parse_vllm_metrics(vllm_metrics_path):
-    """Parse vLLM server-side metrics from vllm-metrics.json.
+def load_vllm_metrics_frame(vllm_metrics_path):
+    """Load vllm-metrics.ndjson or vllm-metrics.json into a MetricsFrame.
 
     Args:
-        vllm_metrics_path: Path to the vllm-metrics.json file.
+        vllm_metrics_path: Path to the vLLM metrics file (either format).
 
     Returns:
-        dict: Aggregated server-side metrics.
+        MetricsFrame: Loaded samples, or None if the file is missing,
+        unreadable or empty.
     """
     if not vllm_metrics_path or not Path(vllm_metrics_path).exists():
         print(f"Warning: vLLM metrics file not found at {vllm_metrics_path}")
-        return {}
+        return None
 
     try:
-        with open(vllm_metrics_path) as f:
-            data = json.load(f)
+        frame = MetricsFrame.from_file(vllm_metrics_path)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Warning: Could not parse vLLM metrics from {vllm_metrics_path}: {e}")
-        return {}
+        return None
 
-    samples = data.get("samples", [])
-    if not samples:
+    if not len(frame):
         print("Warning: No samples found in vLLM metrics")
-        return {}
+        return None
+    return frame
 
-    # Helper function to extract metric values across all samples
-    def get_metric_values(metric_name, label_filter=None):
-        """Extract all values for a given metric across samples."""
-        values = []
-        for sample in samples:
-            metrics = sample.get("metrics", {})
-            metric_data = metrics.get(metric_name, [])
-
-            if isinstance(metric_data, list):
-                for item in metric_data:
-                    if label_filter is None or (
-                        isinstance(item, dict) and
-                        item.get("labels", {}) == label_filter
-                    ):
-                        values.append(item.get("value", 0))
-            elif isinstance(metric_data, (int, float)):
-                values.append(metric_data)
-
-        return values
-
-    # Helper to compute percentiles
-    def compute_percentiles(values):
-        """Compute statistics from a list of values."""
-        if not values:
-            return {}
-
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
-
-        return {
-            "mean": sum(values) / n,
-            "min": sorted_vals[0],
-            "max": sorted_vals[-1],
-            "p50": sorted_vals[int(n * 0.50)],
-            "p95": sorted_vals[int(n * 0.95)] if n > 1 else sorted_vals[0],
-            "p99": sorted_vals[int(n * 0.99)] if n > 1 else sorted_vals[0],
-        }
-
-    # Extract and aggregate metrics
-    result = {}
 
-    # Resource usage metrics
-    cpu_values = get_metric_values("process_cpu_seconds_total")
-    if cpu_values:
-        # CPU is cumulative, so compute rate (difference / time)
-        if len(cpu_values) > 1:
-            cpu_rate = (cpu_values[-1] - cpu_values[0]) / len(samples)
-            result["server_cpu_usage_rate"] = cpu_rate
-        else:
-            result["server_cpu_usage_rate"] = 0
-
-    mem_values = get_metric_values("process_resident_memory_bytes")
-    if mem_values:
-        mem_stats = compute_percentiles(mem_values)
-        result["server_memory_mean_bytes"] = mem_stats.get("mean")
-        result["server_memory_max_bytes"] = mem_stats.get("max")
-
-    kv_cache_values = get_metric_values("vllm:kv_cache_usage_perc")
-    if kv_cache_values:
-        kv_stats = compute_percentiles(kv_cache_values)
-        result["server_kv_cache_usage_mean"] = kv_stats.get("mean")
-        result["server_kv_cache_usage_max"] = kv_stats.get("max")
-
-    # Queue/Concurrency metrics
-    running_values = get_metric_values("vllm:num_requests_running")
-    if running_values:
-        running_stats = compute_percentiles(running_values)
-        result["server_requests_running_mean"] = running_stats.get("mean")
-        result["server_requests_running_max"] = running_stats.get("max")
-
-    waiting_values = get_metric_values("vllm:num_requests_waiting")
-    if waiting_values:
-        waiting_stats = compute_percentiles(waiting_values)
-        result["server_requests_waiting_mean"] = waiting_stats.get("mean")
-        result["server_requests_waiting_max"] = waiting_stats.get("max")
-
-    # Cache performance - extract from last sample (cumulative counters)
-    if samples:
-        last_metrics = samples[-1].get("metrics", {})
-
-        # Prefix cache hits/queries
-        prefix_hits = last_metrics.get("vllm:prefix_cache_hits_total", [])
-        prefix_queries = last_metrics.get("vllm:prefix_cache_queries_total", [])
-
-        if prefix_hits and prefix_queries and isinstance(prefix_hits, list) and isinstance(prefix_queries, list):
-            total_hits = sum(item.get("value", 0) for item in prefix_hits)
-            total_queries = sum(item.get("value", 0) for item in prefix_queries)
-
-            result["server_prefix_cache_hits"] = total_hits
-            result["server_prefix_cache_queries"] = total_queries
-            result["server_prefix_cache_hit_rate"] = (
-                total_hits / total_queries if total_queries > 0 else 0
-            )
+def parse_vllm_metrics(vllm_metrics_path):
+    """Parse vLLM server-side metrics from vllm-metrics.ndjson or vllm-metrics.json.
 
-        # Preemptions
-        preemptions = last_metrics.get("vllm:num_preemptions_total", [])
-        if preemptions and isinstance(preemptions, list):
-            result["server_num_preemptions"] = sum(
-                item.get("value", 0) for item in preemptions
-            )
+    Metrics are aggregated over the whole collection; see
+    summarize_vllm_metrics() for the per-benchmark equivalent.
 
-        # Token counts
-        prompt_tokens = last_metrics.get("vllm:prompt_tokens_total", [])
-        if prompt_tokens and isinstance(prompt_tokens, list):
-            result["server_prompt_tokens_total"] = sum(
-                item.get("value", 0) for item in prompt_tokens
-            )
+    Args:
+        vllm_metrics_path: Path to the vLLM metrics file (either format).
 
-        generation_tokens = last_metrics.get("vllm:generation_tokens_total", [])
-        if generation_tokens and isinstance(generation_tokens, list):
-            result["server_generation_tokens_total"] = sum(
-                item.get("value", 0) for item in generation_tokens
-            )
+    Returns:
+        dict: Aggregated server-side metrics.
+    """
+    frame = load_vllm_metrics_frame(vllm_metrics_path)
+    return summarize_vllm_metrics(frame) if frame is not None else {}
 
-    # Extract histogram metrics (converted from bucket/sum/count format)
-    def extract_histogram_stats(base_name):
-        """Extract summary stats from Prometheus histogram."""
-        sum_metric = f"{base_name}_sum"
-        count_metric = f"{base_name}_count"
-
-        # Get final cumulative values from last sample
-        if not samples:
-            return {}
-
-        last_metrics = samples[-1].get("metrics", {})
-        sum_data = last_metrics.get(sum_metric, [])
-        count_data = last_metrics.get(count_metric, [])
-
-        total_sum = 0
-        total_count = 0
-
-        if isinstance(sum_data, list):
-            total_sum = sum(item.get("value", 0) for item in sum_data)
-        elif isinstance(sum_data, (int, float)):
-            total_sum = sum_data
-
-        if isinstance(count_data, list):
-            total_count = sum(item.get("value", 0) for item in count_data)
-        elif isinstance(count_data, (int, float)):
-            total_count = count_data
-
-        if total_count > 0:
-            return {
-                "mean": total_sum / total_count,
-                "total": total_sum,
-                "count": total_count,
-            }
-        return {}
 
-    # Server-side latency metrics (in seconds, convert to ms)
-    ttft_stats = extract_histogram_stats("vllm:time_to_first_token_seconds")
-    if ttft_stats:
-        result["server_ttft_mean_ms"] = ttft_stats["mean"] * 1000
+def benchmark_window(benchmark):
+    """Measurement window of a GuideLLM benchmark in Unix seconds.
 
-    tpot_stats = extract_histogram_stats("vllm:request_time_per_output_token_seconds")
-    if tpot_stats:
-        result["server_tpot_mean_ms"] = tpot_stats["mean"] * 1000
+    GuideLLM 0.5.x reports the measured period (warmup and cooldown
+    excluded) as scheduler_metrics.measure_start_time/measure_end_time.
+    Older results only have start_time/end_time plus warmup_duration and
+    cooldown_duration, which are trimmed off instead.
 
-    e2e_stats = extract_histogram_stats("vllm:e2e_request_latency_seconds")
-    if e2e_stats:
-        result["server_e2e_latency_mean_ms"] = e2e_stats["mean"] * 1000
+    Args:
+        benchmark: Benchmark data from JSON.
 
-    queue_stats = extract_histogram_stats("vllm:request_queue_time_seconds")
-    if queue_stats:
-        result["server_queue_time_mean_ms"] = queue_stats["mean"] * 1000
+    Returns:
+        tuple: (start, end), or None if the benchmark has no timing data.
+    """
+    scheduler_metrics = benchmark.get("scheduler_metrics", {})
+    start = scheduler_metrics.get("measure_start_time")
+    end = scheduler_metrics.get("measure_end_time")
+    if start and end:
+        return start, end
+
+    start = scheduler_metrics.get("start_time", benchmark.get("start_time"))
+    end = scheduler_metrics.get("end_time", benchmark.get("end_time"))
+    if not start or not end:
+        return None
+    start += benchmark.get("warmup_duration") or 0
+    end -= benchmark.get("cooldown_duration") or 0
+    return (start, end) if end > start else None
+
+
+def summarize_vllm_metrics(frame):
+    """Aggregate server-side metrics over a MetricsFrame.
 
-    prefill_stats = extract_histogram_stats("vllm:request_prefill_time_seconds")
-    if prefill_stats:
-        result["server_prefill_time_mean_ms"] = prefill_stats["mean"] * 1000
+    Counters and histograms are reported as increases over the frame
+    (first to last sample); gauges are summarized over all samples.
+
+    Args:
+        frame: MetricsFrame covering the period to summarize.
+
+    Returns:
+        dict: Aggregated server-side metrics.
+    """
+    result = {}
+
+    # Resource usage metrics
+    cpu_seconds = frame.counter_delta("process_cpu_seconds_total")
+    if cpu_seconds is not None:
+        # CPU seconds per second of collection, i.e. busy cores
+        result["server_cpu_usage_rate"] = (
+            cpu_seconds / frame.duration if frame.duration > 0 else 0
+        )
+
+    mem_stats = frame.gauge_stats("process_resident_memory_bytes")
+    if mem_stats:
+        result["server_memory_mean_bytes"] = mem_stats["mean"]
+        result["server_memory_max_bytes"] = mem_stats["max"]
+
+    # Utilization is pooled per series: the mean and max over instances
+    kv_stats = frame.gauge_stats("vllm:kv_cache_usage_perc", per_series=True)
+    if kv_stats:
+        result["server_kv_cache_usage_mean"] = kv_stats["mean"]
+        result["server_kv_cache_usage_max"] = kv_stats["max"]
+
+    # Queue/Concurrency metrics (summed across engines/instances per sample)
+    running_stats = frame.gauge_stats("vllm:num_requests_running")
+    if running_stats:
+        result["server_requests_running_mean"] = running_stats["mean"]
+        result["server_requests_running_max"] = running_stats["max"]
+
+    waiting_stats = frame.gauge_stats("vllm:num_requests_waiting")
+    if waiting_stats:
+        result["server_requests_waiting_mean"] = waiting_stats["mean"]
+        result["server_requests_waiting_max"] = waiting_stats["max"]
+
+    # Cache performance (counter increases over the collection window)
+    prefix_hits = frame.counter_delta("vllm:prefix_cache_hits_total")
+    prefix_queries = frame.counter_delta("vllm:prefix_cache_queries_total")
+    if prefix_hits is not None and prefix_queries is not None:
+        result["server_prefix_cache_hits"] = prefix_hits
+        result["server_prefix_cache_queries"] = prefix_queries
+        result["server_prefix_cache_hit_rate"] = (
+            prefix_hits / prefix_queries if prefix_queries > 0 else 0
+        )
 
-    decode_stats = extract_histogram_stats("vllm:request_decode_time_seconds")
-    if decode_stats:
-        result["server_decode_time_mean_ms"] = decode_stats["mean"] * 1000
+    preemptions = frame.counter_delta("vllm:num_preemptions_total")
+    if preemptions is not None:
+        result["server_num_preemptions"] = preemptions
+
+    # Token counts
+    prompt_tokens = frame.counter_delta("vllm:prompt_tokens_total")
+    if prompt_tokens is not None:
+        result["server_prompt_tokens_total"] = prompt_tokens
+
+    generation_tokens = frame.counter_delta("vllm:generation_tokens_total")
+    if generation_tokens is not None:
+        result["server_generation_tokens_total"] = generation_tokens
+
+    # Server-side latency means (in seconds, convert to ms)
+    latency_means = {
+        "server_ttft_mean_ms": "vllm:time_to_first_token_seconds",
+        "server_tpot_mean_ms": "vllm:request_time_per_output_token_seconds",
+        "server_e2e_latency_mean_ms": "vllm:e2e_request_latency_seconds",
+        "server_queue_time_mean_ms": "vllm:request_queue_time_seconds",
+        "server_prefill_time_mean_ms": "vllm:request_prefill_time_seconds",
+        "server_decode_time_mean_ms": "vllm:request_decode_time_seconds",
+    }
+    for column, histogram in latency_means.items():
+        mean = frame.histogram_mean(histogram)
+        if mean is not None:
+            result[column] = mean * 1000
+
+    # Server-side latency percentiles from histogram bucket deltas
+    result.update(server_latency_percentiles(frame))
 
     return result
 
@@ -266,6 +345,7 @@ def process_benchmark_section(
     vllm_max_model_len=None,
     backend=None,
     timestamp=None,
+    histograms=None,
 ):
     """Process a single benchmark section and extract performance metrics.
 
@@ -289,6 +369,8 @@ def process_benchmark_section(
         vllm_mode: vLLM mode - external or managed (optional).
         core_config_name: Core configuration name (optional).
         config_type: Configuration type - auto or manual (optional).
+        histograms: Latency histograms of the section's requests, from
+            request_sidecar.request_histograms() (optional).
 
     Returns:
         dict: Processed benchmark metrics.
@@ -466,6 +548,12 @@ def process_benchmark_section(
             "server_prefill_time_mean_ms": vllm_metrics.get("server_prefill_time_mean_ms"),
             "server_decode_time_mean_ms": vllm_metrics.get("server_decode_time_mean_ms"),
         })
+        # Server-side latency percentiles (ms), e.g. server_ttft_p95_ms
+        row.update({col: vllm_metrics.get(col) for col in SERVER_PERCENTILE_COLUMNS})
+
+    for name, column in HISTOGRAM_COLUMNS.items():
+        histogram = (histograms or {}).get(name)
+        row[column] = histogram.to_json() if histogram is not None else None
 
     return row
 
@@ -485,6 +573,7 @@ def parse_guidellm_json(
     omp_num_threads=None,
     tensor_parallel=None,
     vllm_metrics_path=None,
+    sidecar_path=None,
 ):
     """Parse guidellm 0.5.x+ JSON benchmark results for CPU runs.
 
@@ -502,7 +591,9 @@ def parse_guidellm_json(
         cpuset_mems: Memory node affinity.
         omp_num_threads: OpenMP thread count.
         tensor_parallel: Tensor parallelism size.
-        vllm_metrics_path: Optional path to vllm-metrics.json for server-side metrics.
+        vllm_metrics_path: Optional path to the vLLM metrics file for server-side metrics.
+        sidecar_path: Optional path to write the per-request sidecar to
+            (see request_sidecar.py), from the same pass over the JSON.
 
     Returns:
         DataFrame: Processed benchmark results.
@@ -588,9 +679,13 @@ def parse_guidellm_json(
             }
             workload = workload_mapping.get(workload_name, workload_name)
 
+    if sidecar_path and not request_sidecar.available():
+        print("Warning: pyarrow is not installed, skipping the per-request sidecar")
+        sidecar_path = None
+
     try:
-        with open(json_path) as f:
-            data = json.load(f)
+        # Per-request records feed the latency histograms and the sidecar
+        data = read_benchmarks(json_path, request_fields=request_sidecar.REQUEST_FIELDS)
     except FileNotFoundError:
         print(f"Error: JSON file not found at {json_path}")
         return None
@@ -611,6 +706,15 @@ def parse_guidellm_json(
 
     benchmarks = data["benchmarks"]
 
+    request_columns = request_sidecar.request_columns(data)
+
+    if sidecar_path:
+        try:
+            request_sidecar.write_sidecar(data, sidecar_path, columns=request_columns)
+            print(f"Wrote per-request sidecar to {sidecar_path}")
+        except OSError as e:
+            print(f"Warning: Could not write per-request sidecar {sidecar_path}: {e}")
+
     # Get global data config (prompt_tokens, output_tokens)
     global_args = data.get("args", {})
     global_data_config = global_args.get("data", [])
@@ -630,16 +734,33 @@ def parse_guidellm_json(
     guidellm_end_time_ms = int(max(end_times) * 1000) if end_times else ""
 
     # Parse server-side metrics if available
-    vllm_metrics = None
+    vllm_frame = None
+    run_vllm_metrics = None
     if vllm_metrics_path:
         print(f"Loading server-side metrics from {vllm_metrics_path}...")
-        vllm_metrics = parse_vllm_metrics(vllm_metrics_path)
-        if vllm_metrics:
-            print(f"  Loaded {len(vllm_metrics)} server-side metric(s)")
+        vllm_frame = load_vllm_metrics_frame(vllm_metrics_path)
+        if vllm_frame is not None:
+            run_vllm_metrics = summarize_vllm_metrics(vllm_frame)
+            print(f"  Loaded {len(run_vllm_metrics)} server-side metric(s)")
 
     print(f"Processing {len(benchmarks)} benchmark sections...")
 
     for i, benchmark in enumerate(benchmarks):
+        # Slice server metrics to this benchmark's measurement window so each
+        # sweep point carries its own queue depth, KV-cache pressure, etc.
+        vllm_metrics = run_vllm_metrics
+        window = benchmark_window(benchmark) if vllm_frame is not None else None
+        if window:
+            window_frame = vllm_frame.between(*window)
+            if len(window_frame) >= 2:
+                vllm_metrics = summarize_vllm_metrics(window_frame)
+            else:
+                vllm_metrics = None
+                print(
+                    f"  Warning: {len(window_frame)} vLLM metrics sample(s) in "
+                    f"benchmark {i + 1}'s window, server metrics omitted"
+                )
+
         row_data = process_benchmark_section(
             benchmark,
             cpu_type,
@@ -669,6 +790,7 @@ def parse_guidellm_json(
             vllm_max_model_len=vllm_max_model_len,
             backend=backend,
             timestamp=timestamp,
+            histograms=request_sidecar.request_histograms(request_columns, i),
         )
         if row_data:
             all_run_data.append(row_data)
@@ -686,6 +808,114 @@ def parse_guidellm_json(
         return None
 
 
+def convert_run(
+    json_file,
+    metadata_file=None,
+    vllm_metrics_file=None,
+    model=None,
+    version=None,
+    cpu_type=None,
+    core_count=None,
+    tensor_parallel=None,
+    cpuset_cpus=None,
+    cpuset_mems=None,
+    omp_num_threads=None,
+    runtime_args=None,
+    image_tag=None,
+    guidellm_version=None,
+    sidecar=False,
+):
+    """Convert one benchmark result into dashboard rows.
+
+    Explicit arguments take priority over test-metadata.json, which takes
+    priority over defaults.
+
+    Args:
+        json_file: Path to the guidellm benchmarks JSON file.
+        metadata_file: Optional path to test-metadata.json.
+        vllm_metrics_file: Optional path to vllm-metrics.ndjson/.json.
+        model, version, cpu_type, core_count, tensor_parallel, cpuset_cpus,
+        cpuset_mems, omp_num_threads, runtime_args, image_tag,
+        guidellm_version: Overrides for the metadata values.
+        sidecar: Also write the per-request sidecar (requests.arrow) next
+            to json_file.
+
+    Returns:
+        pandas.DataFrame: One row per benchmark, or None if nothing was extracted.
+
+    Raises:
+        MissingFieldError: If the model or version cannot be determined.
+    """
+    # Load metadata if provided
+    metadata = {}
+    if metadata_file:
+        metadata = load_test_metadata(metadata_file)
+
+    # Determine values (priority: arguments > metadata file > defaults)
+    # For CPU type, prefer test_name over platform if platform is "unknown"
+    if not cpu_type:
+        platform = metadata.get("platform", "")
+        if platform and platform != "unknown":
+            cpu_type = platform
+        else:
+            cpu_type = metadata.get("test_name", "unknown")
+
+    model_name = model or metadata.get("model")
+    core_count = core_count if core_count is not None else metadata.get("core_count", 0)
+    cpuset_cpus = cpuset_cpus or metadata.get("cpuset_cpus")
+    cpuset_mems = cpuset_mems or metadata.get("cpuset_mems")
+    omp_num_threads = omp_num_threads or metadata.get("omp_num_threads")
+    tensor_parallel = tensor_parallel or metadata.get("tensor_parallel")
+
+    # Build runtime args from metadata if not provided
+    if not runtime_args and metadata:
+        runtime_parts = []
+        if metadata.get("vllm_dtype"):
+            runtime_parts.append(f"dtype={metadata['vllm_dtype']}")
+        if metadata.get("vllm_kv_cache_size"):
+            runtime_parts.append(f"kv_cache={metadata['vllm_kv_cache_size']}")
+        if metadata.get("vllm_max_model_len"):
+            runtime_parts.append(f"max_len={metadata['vllm_max_model_len']}")
+        if tensor_parallel:
+            runtime_parts.append(f"tp={tensor_parallel}")
+        runtime_args = ";".join(runtime_parts) if runtime_parts else "default"
+
+    version = version or (f"vLLM-{metadata.get('vllm_version')}" if metadata.get("vllm_version") else None)
+    image_tag = image_tag or (f"vllm:{metadata.get('vllm_version')}" if metadata.get("vllm_version") else None)
+    guidellm_version = guidellm_version or metadata.get("guidellm_version", "unknown")
+
+    # Validate required fields
+    if not model_name:
+        raise MissingFieldError("--model is required (or provide --metadata-file with model field)")
+    if not version:
+        raise MissingFieldError("--version is required (or provide --metadata-file with vllm_version field)")
+
+    print(f"Processing {json_file}...")
+    print(f"  CPU Type: {cpu_type}")
+    print(f"  Model: {model_name}")
+    print(f"  Core Count: {core_count}")
+    if tensor_parallel:
+        print(f"  Tensor Parallel: {tensor_parallel}")
+
+    return parse_guidellm_json(
+        json_file,
+        cpu_type,
+        model_name,
+        version,
+        core_count,
+        runtime_args,
+        image_tag,
+        guidellm_version,
+        metadata_path=metadata_file,
+        cpuset_cpus=cpuset_cpus,
+        cpuset_mems=cpuset_mems,
+        omp_num_threads=omp_num_threads,
+        tensor_parallel=tensor_parallel,
+        vllm_metrics_path=vllm_metrics_file,
+        sidecar_path=request_sidecar.sidecar_path(json_file) if sidecar else None,
+    )
+
+
 def main():
     """Main function to process benchmark JSON files for CPU runs.
 
@@ -705,7 +935,7 @@ def main():
     )
     parser.add_argument(
         "--vllm-metrics-file",
-        help="Path to vllm-metrics.json (adds server-side performance metrics)",
+        help="Path to vllm-metrics.ndjson or vllm-metrics.json (adds server-side performance metrics)",
     )
     parser.add_argument(
         "--model",
@@ -760,6 +990,12 @@ def main():
         help="Version of guidellm used to run the benchmark. "
              "Can be auto-detected from JSON or metadata file.",
     )
+    parser.add_argument(
+        "--requests-sidecar",
+        action="store_true",
+        help="Also write the per-request columns to requests.arrow next to the JSON "
+             "(Arrow IPC, memory-mappable; needs pyarrow)",
+    )
     parser.add_argument(
         "--csv-file",
         default="cpu_benchmarks.csv",
@@ -767,75 +1003,26 @@ def main():
     )
     args = parser.parse_args()
 
-    # Load metadata if provided
-    metadata = {}
-    if args.metadata_file:
-        metadata = load_test_metadata(args.metadata_file)
-
-    # Determine values (priority: CLI args > metadata file > defaults)
-    # For CPU type, prefer test_name over platform if platform is "unknown"
-    cpu_type = args.cpu_type
-    if not cpu_type:
-        platform = metadata.get("platform", "")
-        if platform and platform != "unknown":
-            cpu_type = platform
-        else:
-            cpu_type = metadata.get("test_name", "unknown")
-
-    model_name = args.model or metadata.get("model")
-    core_count = args.core_count if args.core_count is not None else metadata.get("core_count", 0)
-    cpuset_cpus = args.cpuset_cpus or metadata.get("cpuset_cpus")
-    cpuset_mems = args.cpuset_mems or metadata.get("cpuset_mems")
-    omp_num_threads = args.omp_num_threads or metadata.get("omp_num_threads")
-    tensor_parallel = args.tensor_parallel or metadata.get("tensor_parallel")
-
-    # Build runtime args from metadata if not provided
-    runtime_args = args.runtime_args
-    if not runtime_args and metadata:
-        runtime_parts = []
-        if metadata.get("vllm_dtype"):
-            runtime_parts.append(f"dtype={metadata['vllm_dtype']}")
-        if metadata.get("vllm_kv_cache_size"):
-            runtime_parts.append(f"kv_cache={metadata['vllm_kv_cache_size']}")
-        if metadata.get("vllm_max_model_len"):
-            runtime_parts.append(f"max_len={metadata['vllm_max_model_len']}")
-        if tensor_parallel:
-            runtime_parts.append(f"tp={tensor_parallel}")
-        runtime_args = ";".join(runtime_parts) if runtime_parts else "default"
-
-    version = args.version or (f"vLLM-{metadata.get('vllm_version')}" if metadata.get("vllm_version") else None)
-    image_tag = args.image_tag or (f"vllm:{metadata.get('vllm_version')}" if metadata.get("vllm_version") else None)
-    guidellm_version = args.guidellm_version or metadata.get("guidellm_version", "unknown")
-
-    # Validate required fields
-    if not model_name:
-        parser.error("--model is required (or provide --metadata-file with model field)")
-    if not version:
-        parser.error("--version is required (or provide --metadata-file with vllm_version field)")
-
-    print(f"Processing {args.json_file}...")
-    print(f"  CPU Type: {cpu_type}")
-    print(f"  Model: {model_name}")
-    print(f"  Core Count: {core_count}")
-    if tensor_parallel:
-        print(f"  Tensor Parallel: {tensor_parallel}")
-
-    new_data_df = parse_guidellm_json(
-        args.json_file,
-        cpu_type,
-        model_name,
-        version,
-        core_count,
-        runtime_args,
-        image_tag,
-        guidellm_version,
-        metadata_path=args.metadata_file,
-        cpuset_cpus=cpuset_cpus,
-        cpuset_mems=cpuset_mems,
-        omp_num_threads=omp_num_threads,
-        tensor_parallel=tensor_parallel,
-        vllm_metrics_path=args.vllm_metrics_file,
-    )
+    try:
+        new_data_df = convert_run(
+            args.json_file,
+            metadata_file=args.metadata_file,
+            vllm_metrics_file=args.vllm_metrics_file,
+            model=args.model,
+            version=args.version,
+            cpu_type=args.cpu_type,
+            core_count=args.core_count,
+            tensor_parallel=args.tensor_parallel,
+            cpuset_cpus=args.cpuset_cpus,
+            cpuset_mems=args.cpuset_mems,
+            omp_num_threads=args.omp_num_threads,
+            runtime_args=args.runtime_args,
+            image_tag=args.image_tag,
+            guidellm_version=args.guidellm_version,
+            sidecar=args.requests_sidecar,
+        )
+    except MissingFieldError as e:
+        parser.error(str(e))
 
     if new_data_df is not None and not new_data_df.empty:
         if os.path.exists(args.csv_file):
@@ -848,102 +1035,7 @@ def main():
             )
             combined_df = new_data_df
 
-        # Define fieldnames (extended with CPU-specific fields)
-        fieldnames = [
-            "run",
-            "accelerator",  # CPU type in our case
-            "model",
-            "version",
-            "prompt toks",
-            "output toks",
-            "TP",
-            "measured concurrency",
-            "intended concurrency",
-            "measured rps",
-            "output_tok/sec",
-            "total_tok/sec",
-            "prompt_token_count_mean",
-            "prompt_token_count_p99",
-            "output_token_count_mean",
-            "output_token_count_p99",
-            "ttft_median",
-            "ttft_p95",
-            "ttft_p1",
-            "ttft_p999",
-            "tpot_median",
-            "tpot_p95",
-            "tpot_p99",
-            "tpot_p999",
-            "tpot_p1",
-            "itl_median",
-            "itl_p95",
-            "itl_p999",
-            "itl_p1",
-            "request_latency_median",
-            "request_latency_min",
-            "request_latency_max",
-            "successful_requests",
-            "errored_requests",
-            "uuid",
-            "ttft_mean",
-            "ttft_p99",
-            "itl_mean",
-            "itl_p99",
-            "runtime_args",
-            "guidellm_start_time_ms",
-            "guidellm_end_time_ms",
-            "image_tag",
-            "guidellm_version",
-            "DP",
-            # CPU-specific additions
-            "core_count",
-            "cpuset_cpus",
-            "cpuset_mems",
-            "omp_num_threads",
-            "tpot_mean",
-            # Test configuration
-            "vllm_mode",
-            "core_config_name",
-            "config_type",
-            "test_name",
-            "workload",
-            "platform",
-            # vLLM configuration
-            "vllm_caching_mode",
-            "vllm_dtype",
-            "vllm_kv_cache_size",
-            "vllm_max_model_len",
-            "backend",
-            "timestamp",
-            # Server-side metrics (from vllm-metrics.json)
-            "server_cpu_usage_rate",
-            "server_memory_mean_bytes",
-            "server_memory_max_bytes",
-            "server_kv_cache_usage_mean",
-            "server_kv_cache_usage_max",
-            "server_requests_running_mean",
-            "server_requests_running_max",
-            "server_requests_waiting_mean",
-            "server_requests_waiting_max",
-            "server_prefix_cache_hits",
-            "server_prefix_cache_queries",
-            "server_prefix_cache_hit_rate",
-            "server_num_preemptions",
-            "server_prompt_tokens_total",
-            "server_generation_tokens_total",
-            "server_ttft_mean_ms",
-            "server_tpot_mean_ms",
-            "server_e2e_latency_mean_ms",
-            "server_queue_time_mean_ms",
-            "server_prefill_time_mean_ms",
-            "server_decode_time_mean_ms",
-        ]
-
-        for col in fieldnames:
-            if col not in combined_df.columns:
-                combined_df[col] = None
-
-        combined_df = combined_df[fieldnames]
+        combined_df = combined_df.reindex(columns=CSV_COLUMNS)
         combined_df.to_csv(args.csv_file, index=False)
         print(f"Successfully saved to {args.csv_file}")
     else:
@@ -5,7 +5,8 @@ Supports both LLM (GuideLLM benchmarks.json) and embedding
 (vllm bench serve sweep-*.json / concurrent-*.json) result
 formats. Auto-detects the format based on directory contents.
 
-No external dependencies -- stdlib only.
+No external dependencies -- stdlib only (plus the stdlib-only
+shared benchmarks_reader, which skips GuideLLM's per-request records).
 
 Usage:
     # LLM results (GuideLLM)
@@ -23,6 +24,13 @@ import json
 import sys
 from pathlib import Path
 
+# Add shared library to path
+_script_dir = Path(__file__).parent
+_shared_dir = _script_dir.parent.parent / "shared"
+sys.path.insert(0, str(_shared_dir))
+
+from benchmarks_reader import read_benchmarks  # noqa: E402
+
 TABLE_WIDTH = 95
 
 
@@ -30,9 +38,11 @@ TABLE_WIDTH = 95
 # Shared helpers
 # -----------------------------------------------------------
 
-def load_json(path):
+def load_json(path, reader=None):
     """Load a JSON file, returning None on failure."""
     try:
+        if reader is not None:
+            return reader(path)
         with open(path) as f:
             return json.load(f)
     except (FileNotFoundError, json.JSONDecodeError, OSError) as e:
@@ -340,7 +350,7 @@ def build_llm_table(rows):
 
 def view_llm(benchmarks_path, result_dir, show_header):
     """Display LLM benchmark results."""
-    data = load_json(benchmarks_path)
+    data = load_json(benchmarks_path, reader=read_benchmarks)
     if data is None:
         print(
             "Error: could not parse benchmarks.json",
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Quick summary of client metrics CSV data."""
+"""Quick summary of client metrics CSV data.
+
+Also reads the client table of the Parquet results store (--store), loading
+only the columns used here and the model/workload partitions asked for.
+"""
 
 import argparse
 import sys
@@ -7,6 +11,25 @@ from pathlib import Path
 
 import pandas as pd
 
+# Add shared library to path for the results store
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared"))
+import results_store  # noqa: E402
+
+REQUIRED_COLUMNS = {
+    "model",
+    "workload",
+    "model_short",
+    "concurrency",
+    "success_rate",
+    "throughput_mean",
+    "e2e_mean",
+    "e2e_p95",
+    "ttft_mean",
+    "ttft_p95",
+    "itl_mean",
+    "itl_p95",
+}
+
 
 def repo_root() -> Path:
     """Return the repository root (mt-perf-eval)."""
@@ -35,21 +58,41 @@ def summarize_csv(csv_file: Path) -> None:
         print(f"ERROR: Failed to read CSV file {csv_file}: {exc}", file=sys.stderr)
         sys.exit(1)
 
-    required_columns = {
-        "model",
-        "workload",
-        "model_short",
-        "concurrency",
-        "success_rate",
-        "throughput_mean",
-        "e2e_mean",
-        "e2e_p95",
-        "ttft_mean",
-        "ttft_p95",
-        "itl_mean",
-        "itl_p95",
-    }
-    missing = required_columns - set(df.columns)
+    summarize_dataframe(df)
+
+
+def summarize_store(results_dir: Path, models=None, workloads=None) -> None:
+    """Generate the summary from the client table of the results store."""
+    llm_dir = results_dir / "llm"
+    if not results_store.available():
+        print("ERROR: pyarrow is required to read the results store: pip install pyarrow",
+              file=sys.stderr)
+        sys.exit(1)
+    if results_store.read_manifest(llm_dir, "client") is None:
+        print(
+            f"ERROR: No results store found in {llm_dir}. "
+            "Build it with scripts/conversion/build_results_store.py",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    filters = {}
+    if models:
+        filters["model"] = models
+    if workloads:
+        filters["workload"] = workloads
+    df = results_store.read_table(
+        llm_dir, "client", columns=sorted(REQUIRED_COLUMNS), filters=filters
+    )
+    if df.empty:
+        print("ERROR: No client results match the given filters", file=sys.stderr)
+        sys.exit(1)
+    summarize_dataframe(df)
+
+
+def summarize_dataframe(df: pd.DataFrame) -> None:
+    """Print the summary of a client metrics table."""
+    missing = REQUIRED_COLUMNS - set(df.columns)
     if missing:
         print(
             "ERROR: CSV is missing expected client-metrics columns: "
@@ -162,6 +205,21 @@ def parse_args() -> argparse.Namespace:
         default=default_results_dir,
         help="Directory containing benchmark CSV files (default: <repo>/results)",
     )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Read the client table of the Parquet results store in <results-dir>/llm instead of a CSV",
+    )
+    parser.add_argument(
+        "--model",
+        action="append",
+        help="With --store: only this model (repeatable)",
+    )
+    parser.add_argument(
+        "--workload",
+        action="append",
+        help="With --store: only this workload (repeatable)",
+    )
     parser.add_argument(
         "--csv-file",
         type=Path,
@@ -175,6 +233,9 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
+    if args.store:
+        summarize_store(args.results_dir, args.model, args.workload)
+        return 0
     csv_file = args.csv_file or default_client_metrics_csv(args.results_dir)
     summarize_csv(csv_file)
     return 0
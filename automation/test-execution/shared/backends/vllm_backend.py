@@ -3,6 +3,12 @@
 from typing import List, Dict, Optional
 from .base import InferenceBackend, BackendConfig, BackendMetrics
 
+try:
+    from ..vllm_metrics import MetricsFrame
+except ImportError:
+    # Imported as the top-level 'backends' package with shared/ on sys.path
+    from vllm_metrics import MetricsFrame
+
 
 class vLLMBackend(InferenceBackend):
     """vLLM inference backend.
@@ -101,81 +107,44 @@ class vLLMBackend(InferenceBackend):
             if not samples:
                 raise ValueError("No samples found in metrics_data")
 
-            # Get first and last samples for computing counter deltas
-            first_sample = samples[0]
-            last_sample = samples[-1]
-            first_metrics = first_sample.get('metrics', {})
-            last_metrics = last_sample.get('metrics', {})
-
-            # Helper to extract single value from metric list
-            def get_value(metric_list):
-                if metric_list and len(metric_list) > 0:
-                    return metric_list[0].get('value', 0)
-                return 0
+            # Counters are increases between the first and last sample; a
+            # single sample has no baseline and is used as-is
+            frame = MetricsFrame.from_samples(samples)
 
-            # Helper to compute delta between first and last samples
-            # For single-sample case, use the value directly (no prior state)
             def get_counter_delta(metric_name):
-                if len(samples) == 1:
-                    return get_value(last_metrics.get(metric_name, []))
-                first_val = get_value(first_metrics.get(metric_name, []))
-                last_val = get_value(last_metrics.get(metric_name, []))
-                return last_val - first_val
-
-            # Extract latencies from histograms (sum / count)
-            # Use deltas for cumulative histogram counters
-            ttft_sum = get_counter_delta(
-                'vllm:time_to_first_token_seconds_sum'
-            )
-            ttft_count = get_counter_delta(
-                'vllm:time_to_first_token_seconds_count'
-            )
-            ttft_mean_ms = (
-                (ttft_sum / ttft_count * 1000) if ttft_count > 0 else 0.0
-            )
+                return frame.counter_delta(metric_name) or 0
 
-            e2e_sum = get_counter_delta(
-                'vllm:e2e_request_latency_seconds_sum'
+            # Latencies from histograms (sum / count deltas)
+            ttft_mean = frame.histogram_mean(
+                'vllm:time_to_first_token_seconds'
             )
-            e2e_count = get_counter_delta(
-                'vllm:e2e_request_latency_seconds_count'
-            )
-            e2e_mean_ms = (
-                (e2e_sum / e2e_count * 1000) if e2e_count > 0 else 0.0
+            ttft_mean_ms = ttft_mean * 1000 if ttft_mean is not None else 0.0
+
+            e2e_mean = frame.histogram_mean(
+                'vllm:e2e_request_latency_seconds'
             )
+            e2e_mean_ms = e2e_mean * 1000 if e2e_mean is not None else 0.0
 
-            # Calculate TPOT from decode time
+            # TPOT = total_decode_time / total_output_tokens (ms per token)
             decode_sum = get_counter_delta(
                 'vllm:request_decode_time_seconds_sum'
             )
             gen_tokens_sum = get_counter_delta(
                 'vllm:request_generation_tokens_sum'
             )
-
-            # TPOT = total_decode_time / total_output_tokens (ms per token)
             tpot_mean_ms = 0.0
             if gen_tokens_sum > 0:
                 tpot_mean_ms = (decode_sum / gen_tokens_sum * 1000)
 
-            # Throughput: requests per second and tokens per second
-            # Get test duration from first to last sample timestamp
-            if len(samples) > 1:
-                import datetime
-                first_ts = datetime.datetime.fromisoformat(
-                    samples[0]['timestamp']
-                )
-                last_ts = datetime.datetime.fromisoformat(
-                    last_sample['timestamp']
-                )
-                duration_sec = (last_ts - first_ts).total_seconds()
-            else:
-                duration_sec = 0
-
+            # Throughput over the first-to-last sample duration
+            duration_sec = frame.duration
+            e2e_count = get_counter_delta(
+                'vllm:e2e_request_latency_seconds_count'
+            )
             requests_per_second = (
                 e2e_count / duration_sec if duration_sec > 0 else 0.0
             )
 
-            # Use deltas for cumulative token counters
             prompt_tokens = get_counter_delta('vllm:prompt_tokens_total')
             generation_tokens = get_counter_delta(
                 'vllm:generation_tokens_total'
@@ -186,31 +155,27 @@ class vLLMBackend(InferenceBackend):
             )
 
             # Memory (gauge, not counter - use last value)
-            memory_bytes = get_value(
-                last_metrics.get('process_resident_memory_bytes', [])
-            )
+            memory = frame.gauge_stats('process_resident_memory_bytes')
+            memory_bytes = memory.get('last', 0)
             memory_mb = (
                 memory_bytes / (1024 * 1024) if memory_bytes > 0 else 0.0
             )
 
             # CPU is cumulative counter - compute delta
-            cpu_seconds_delta = get_counter_delta(
-                'process_cpu_seconds_total'
-            )
+            cpu_seconds_delta = get_counter_delta('process_cpu_seconds_total')
             cpu_percent = (
                 (cpu_seconds_delta / duration_sec * 100)
                 if duration_sec > 0 else 0.0
             )
 
             # Optional vLLM-specific metrics (gauges - use last value)
-            kv_cache_usage = get_value(
-                last_metrics.get('vllm:kv_cache_usage_perc', [])
+            kv_cache = frame.gauge_stats(
+                'vllm:kv_cache_usage_perc', per_series=True
             )
+            kv_cache_usage = kv_cache.get('last', 0)
 
             # Prefix cache metrics are counters - use deltas
-            prefix_hits = get_counter_delta(
-                'vllm:prefix_cache_hits_total'
-            )
+            prefix_hits = get_counter_delta('vllm:prefix_cache_hits_total')
             prefix_queries = get_counter_delta(
                 'vllm:prefix_cache_queries_total'
             )
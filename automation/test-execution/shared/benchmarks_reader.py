@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""Incremental reader for GuideLLM benchmarks.json files.
+
+GuideLLM stores every request of every sweep point under
+benchmarks[i]["requests"] ({"successful": [...], "errored": [...], ...}),
+which makes long sweeps 1-3 GB. json.load() builds all of those records
+before a converter can look at the few KB of config and metrics it needs.
+
+read_benchmarks() walks the document incrementally instead: it reads the
+file in chunks, decodes the top-level fields and each benchmark's fields
+with the C JSON decoder, and steps over the "requests" member record by
+record, so memory stays at one record plus the summaries:
+
+    data = read_benchmarks(path)
+    for benchmark in data["benchmarks"]:
+        benchmark["config"], benchmark["metrics"]  # "requests" is left out
+
+For percentile work, request_fields streams chosen numeric fields of the
+records into float64 NumPy arrays (NaN where a record lacks the field)
+under benchmark[REQUEST_ARRAYS_KEY][status][field]. Fields may be dotted
+paths into nested records, e.g. "info.timings.request_start":
+
+    data = read_benchmarks(path, request_fields=["request_latency"])
+    latencies = data["benchmarks"][0][REQUEST_ARRAYS_KEY]["successful"]["request_latency"]
+    numpy.percentile(latencies, 99)
+
+Malformed documents raise json.JSONDecodeError, as json.load() would.
+"""
+
+import json
+import re
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+# Characters read per refill; values larger than this are read in growing steps
+CHUNK_SIZE = 1 << 20
+
+# Benchmark members that hold per-request records
+REQUESTS_KEY = "requests"
+
+# Benchmark member receiving the per-request arrays (see read_benchmarks)
+REQUEST_ARRAYS_KEY = "request_arrays"
+
+# Per-request fields of GuideLLM's request records commonly needed for percentiles
+DEFAULT_REQUEST_FIELDS = (
+    "request_latency",
+    "time_to_first_token_ms",
+    "time_per_output_token_ms",
+    "inter_token_latency_ms",
+    "prompt_tokens",
+    "output_tokens",
+)
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_DELIMITER_RE = re.compile(r"[,\]} \t\n\r]")
+_DECODER = json.JSONDecoder()
+
+PathLike = Union[str, Path]
+
+
+class _JsonStream:
+    """Chunked JSON tokenizer for walking containers without decoding them whole."""
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self) -> bool:
+        """Append data to the buffer, dropping what was consumed. False at EOF."""
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        # Grow the read with the pending value so large values stay linear
+        chunk = self._f.read(max(self._chunk_size, len(self._buf)))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at EOF)."""
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._read_more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        if self.peek() not in '{["':
+            # A number cut at the buffer end ("1." of "1.5") would decode short
+            while not _DELIMITER_RE.search(self._buf, self._pos) and self._read_more():
+                pass
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise
+            self._pos = end
+            return obj
+
+    def members(self) -> Iterator[str]:
+        """Iterate the keys of the next object; consume each member's value in the loop."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def items(self) -> Iterator[None]:
+        """Iterate the elements of the next array; consume each element in the loop."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def skip(self) -> None:
+        """Consume the next value, decoding at most one container element at a time."""
+        char = self.peek()
+        if char in "{[":
+            # Containers already in the buffer (e.g. one request record) decode in C
+            try:
+                self._pos = _DECODER.raw_decode(self._buf, self._pos)[1]
+                return
+            except json.JSONDecodeError:
+                pass
+        if char == "{":
+            for _ in self.members():
+                self.skip()
+        elif char == "[":
+            for _ in self.items():
+                self.skip()
+        else:
+            self.value()
+
+    def end(self) -> None:
+        """Check that nothing but whitespace follows the document."""
+        if self.peek():
+            raise self._error("Extra data")
+
+
+def _request_arrays(stream: _JsonStream, fields: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Stream a benchmark's {status: [record, ...]} into {status: {field: ndarray}}."""
+    import numpy as np
+
+    paths = {field: field.split(".") for field in fields}
+    arrays = {}
+    for status in stream.members():
+        if stream.peek() != "[":
+            stream.skip()
+            continue
+        columns = {field: array("d") for field in paths}
+        for _ in stream.items():
+            record = stream.value()
+            for field, path in paths.items():
+                value = record
+                for part in path:
+                    value = value.get(part) if isinstance(value, dict) else None
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    columns[field].append(value)
+                else:
+                    columns[field].append(float("nan"))
+        arrays[status] = {
+            field: np.frombuffer(column, dtype=np.float64) for field, column in columns.items()
+        }
+    return arrays
+
+
+def _read_benchmark(stream: _JsonStream, request_fields: Optional[Iterable[str]]) -> Any:
+    if stream.peek() != "{":
+        return stream.value()
+    benchmark = {}
+    for key in stream.members():
+        if key != REQUESTS_KEY:
+            benchmark[key] = stream.value()
+        elif request_fields is not None and stream.peek() == "{":
+            benchmark[REQUEST_ARRAYS_KEY] = _request_arrays(stream, request_fields)
+        else:
+            stream.skip()
+    return benchmark
+
+
+def read_benchmarks(
+    path: PathLike,
+    request_fields: Optional[Iterable[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Read a GuideLLM benchmarks.json without materialising per-request records.
+
+    Args:
+        path: Path to benchmarks.json
+        request_fields: Per-request fields to collect as NumPy arrays under
+            each benchmark's REQUEST_ARRAYS_KEY (e.g. DEFAULT_REQUEST_FIELDS);
+            None skips the records entirely
+        chunk_size: Characters read at a time
+
+    Returns:
+        The document with every benchmark's "requests" member left out
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        if stream.peek() != "{":
+            document = stream.value()
+            stream.end()
+            return document
+        document = {}
+        for key in stream.members():
+            if key == "benchmarks" and stream.peek() == "[":
+                document[key] = [
+                    _read_benchmark(stream, request_fields) for _ in stream.items()
+                ]
+            else:
+                document[key] = stream.value()
+        stream.end()
+    return document
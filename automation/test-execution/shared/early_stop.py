@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Early stop of a benchmark point whose result is already known.
+
+A GuideLLM point runs until max_seconds / max_requests, even when its
+latency percentiles settled long before or the SLO is already blown many
+times over. EarlyStopController watches the latency distribution of the
+requests completed so far and ends the point once either:
+
+- converged: the confidence interval of the target quantile (p95 TTFT by
+  default) is narrower than `tolerance` times the estimate, so running on
+  would not move the reported number materially; or
+- SLO violated: the lower bound of that interval is above the SLO threshold
+  times `violation_factor`, so the point fails beyond doubt.
+
+Neither is considered before `min_requests` requests and `min_seconds`
+seconds into the point, so warm-up transients cannot end it.
+
+GuideLLM writes its per-request results only when a benchmark ends, so the
+stream watched during a run is the vLLM server's own latency histograms,
+scraped by the metrics collector into vllm-metrics.ndjson (one sample per
+line, appended while the benchmark runs). check_metrics_file() evaluates
+the window since the point started:
+
+    controller = EarlyStopController("ttft_ms", slo_ms=2000)
+    decision = check_metrics_file(metrics_path, controller, since=start_unix)
+    if decision["stop"]:
+        ...                     # end the run, keep the decision as early-stop.json
+
+The interval is the order-statistic interval of slo_search.quantile_ranks(),
+read from the server's buckets by linear interpolation. The controller
+judges client-side LatencyHistograms the same way (evaluate()).
+"""
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    from .latency_histogram import LatencyHistogram, quantile_label
+    from .slo_search import SLO_METRICS, parse_slo, quantile_interval, quantile_ranks
+    from .vllm_metrics import MetricsFrame, histogram_quantiles
+except ImportError:
+    # Imported as a top-level module with shared/ on sys.path
+    from latency_histogram import LatencyHistogram, quantile_label
+    from slo_search import SLO_METRICS, parse_slo, quantile_interval, quantile_ranks
+    from vllm_metrics import MetricsFrame, histogram_quantiles
+
+EARLY_STOP_FILENAME = "early-stop.json"
+
+# vLLM histograms (seconds) holding each target metric, in order of
+# preference across vLLM versions
+STREAM_HISTOGRAMS = {
+    "ttft_ms": ("vllm:time_to_first_token_seconds",),
+    "itl_ms": ("vllm:inter_token_latency_seconds", "vllm:time_per_output_token_seconds"),
+    "tpot_ms": ("vllm:request_time_per_output_token_seconds",),
+    "e2e_ms": ("vllm:e2e_request_latency_seconds",),
+    "latency_ms": ("vllm:e2e_request_latency_seconds",),
+}
+
+# Stop reasons
+CONVERGED = "confidence interval within tolerance"
+SLO_VIOLATED = "SLO violated beyond doubt"
+
+PathLike = Union[str, os.PathLike]
+
+
+def allowlist_error(metric: str, allowlist: Sequence[str]) -> Optional[str]:
+    """Why a metrics collector allowlist starves early stop of `metric`, or None.
+
+    Names match like the collector's allowlist: a family or sample name, or
+    a "prefix*" glob of either. An empty allowlist keeps every metric.
+    """
+    names = [name for name in allowlist if name]
+    if not names:
+        return None
+    exact = {name for name in names if not name.endswith("*")}
+    prefixes = tuple(name[:-1] for name in names if name.endswith("*"))
+    for family in STREAM_HISTOGRAMS[metric]:
+        bucket = f"{family}_bucket"
+        if family in exact or bucket in exact or bucket.startswith(prefixes):
+            return None
+    return (
+        f"vllm_metrics_allowlist keeps none of {', '.join(STREAM_HISTOGRAMS[metric])}; "
+        f"early stop on {metric} needs one of these histograms"
+    )
+
+
+def _finite(value: float) -> Optional[float]:
+    """JSON-safe value: None for NaN and open (infinite) bounds."""
+    return float(value) if value is not None and math.isfinite(value) else None
+
+
+def bucket_quantile_interval(
+    bounds: np.ndarray, counts: np.ndarray, q: float, confidence: float
+) -> Dict[str, float]:
+    """quantile_interval() of cumulative histogram buckets.
+
+    Ranks are interpolated within their bucket like histogram_quantiles().
+    A bound landing in the +Inf bucket has no finite estimate and is open,
+    as is a bound beyond the sample.
+    """
+    n = int(counts[-1]) if counts.size else 0
+    if n <= 0:
+        return {"value": math.nan, "low": -math.inf, "high": math.inf}
+    low_rank, high_rank = quantile_ranks(n, q, confidence)
+    value, low, high = histogram_quantiles(bounds, counts, [q, low_rank / n, high_rank / n])
+    finite_count = np.maximum.accumulate(counts)[-2] if counts.size > 1 else 0
+    if low_rank < 1:
+        low = -math.inf
+    if high_rank > finite_count:
+        high = math.inf
+    if q * n > finite_count:
+        value = math.nan
+    return {"value": float(value), "low": float(low), "high": float(high)}
+
+
+class EarlyStopController:
+    """Decides whether a running point has measured enough."""
+
+    def __init__(
+        self,
+        metric: str = "ttft_ms",
+        quantile: float = 0.95,
+        confidence: float = 0.95,
+        tolerance: float = 0.1,
+        slo_ms: Optional[float] = None,
+        violation_factor: float = 1.0,
+        min_requests: int = 200,
+        min_seconds: float = 60.0,
+    ):
+        """
+        Args:
+            metric: Target metric, one of STREAM_HISTOGRAMS
+            quantile: Target quantile of the metric
+            confidence: Confidence level of the interval
+            tolerance: Largest relative interval width, (high - low) / value,
+                at which the point counts as converged
+            slo_ms: SLO threshold of the target quantile (default: no SLO check)
+            violation_factor: Multiple of slo_ms the interval's lower bound must
+                exceed for the point to fail beyond doubt
+            min_requests: Requests to complete before any stop
+            min_seconds: Seconds into the point before any stop
+
+        Raises:
+            ValueError: If the metric is unknown or a parameter is out of range
+        """
+        if metric not in STREAM_HISTOGRAMS:
+            raise ValueError(
+                f"Unknown early stop metric '{metric}' "
+                f"(expected one of: {', '.join(STREAM_HISTOGRAMS)})"
+            )
+        if not 0 < quantile < 1 or not 0 < confidence < 1:
+            raise ValueError("quantile and confidence must be between 0 and 1")
+        if tolerance <= 0:
+            raise ValueError(f"tolerance must be positive, got {tolerance}")
+        if slo_ms is not None and slo_ms <= 0:
+            raise ValueError(f"SLO threshold must be positive, got {slo_ms}")
+        if violation_factor < 1:
+            raise ValueError(f"violation_factor must be at least 1, got {violation_factor}")
+        self.metric = metric
+        self.quantile = quantile
+        self.confidence = confidence
+        self.tolerance = tolerance
+        self.slo_ms = slo_ms
+        self.violation_factor = violation_factor
+        self.min_requests = int(min_requests)
+        self.min_seconds = float(min_seconds)
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            "metric": self.metric,
+            "quantile": quantile_label(self.quantile),
+            "confidence": self.confidence,
+            "tolerance": self.tolerance,
+            "slo_ms": self.slo_ms,
+            "violation_factor": self.violation_factor,
+            "min_requests": self.min_requests,
+            "min_seconds": self.min_seconds,
+        }
+
+    def decide(self, interval: Dict[str, float], requests: int, elapsed: float) -> Dict[str, Any]:
+        """Stop decision for a quantile interval of `requests` requests.
+
+        Returns:
+            Decision dict: stop, reason (None while running), the interval,
+            its relative width, requests, elapsed_seconds and the config
+        """
+        value, low, high = interval["value"], interval["low"], interval["high"]
+        width = (high - low) / value if value and math.isfinite(value) else math.inf
+        reason = None
+        if requests >= self.min_requests and elapsed >= self.min_seconds:
+            if self.slo_ms is not None and low > self.slo_ms * self.violation_factor:
+                reason = SLO_VIOLATED
+            elif width <= self.tolerance:
+                reason = CONVERGED
+        return {
+            "stop": reason is not None,
+            "reason": reason,
+            "requests": int(requests),
+            "elapsed_seconds": round(float(elapsed), 3),
+            "value": _finite(value),
+            "low": _finite(low),
+            "high": _finite(high),
+            "relative_width": _finite(width),
+            **self.config(),
+        }
+
+    def evaluate(self, histogram: LatencyHistogram, elapsed: float) -> Dict[str, Any]:
+        """Decision for a client-side histogram of the target metric (ms)."""
+        if not histogram.count:
+            return self.decide({"value": math.nan, "low": -math.inf, "high": math.inf}, 0, elapsed)
+        return self.decide(
+            quantile_interval(histogram, self.quantile, self.confidence), histogram.count, elapsed
+        )
+
+    def evaluate_buckets(
+        self, bounds: np.ndarray, counts: np.ndarray, elapsed: float
+    ) -> Dict[str, Any]:
+        """Decision for cumulative histogram buckets of the target metric (ms)."""
+        interval = bucket_quantile_interval(bounds, counts, self.quantile, self.confidence)
+        requests = int(counts[-1]) if counts.size else 0
+        return self.decide(interval, requests, elapsed)
+
+    def evaluate_frame(self, frame: MetricsFrame, since: float) -> Dict[str, Any]:
+        """Decision for the requests a vLLM metrics frame saw after `since`.
+
+        The last sample at or before `since` is the baseline, so requests
+        completed between the point's start and the first scrape after it
+        are counted.
+        """
+        times = frame.unix_times
+        before = np.flatnonzero(times <= since)
+        window = frame.between(times[before[-1]] if before.size else since)
+        elapsed = float(window.unix_times[-1] - since) if len(window) else 0.0
+        bounds, counts, source = np.empty(0), np.empty(0), None
+        if len(window) > 1:
+            for name in STREAM_HISTOGRAMS[self.metric]:
+                bounds, counts = window.histogram_delta(name)
+                if bounds.size:
+                    source = name
+                    break
+        decision = self.evaluate_buckets(bounds * 1000.0, counts, max(elapsed, 0.0))
+        decision["source"] = source
+        if len(window) > 1 and source is None:
+            decision["warning"] = (
+                f"No {' or '.join(STREAM_HISTOGRAMS[self.metric])} histogram in the metrics "
+                f"stream; early stop cannot trigger (is it in vllm_metrics_allowlist?)"
+            )
+        return decision
+
+
+def check_metrics_file(
+    metrics_file: PathLike, controller: EarlyStopController, since: float
+) -> Dict[str, Any]:
+    """Evaluate a (growing) vllm-metrics.ndjson since Unix time `since`."""
+    names = [f"{name}_bucket" for name in STREAM_HISTOGRAMS[controller.metric]]
+    if not Path(metrics_file).is_file():
+        decision = controller.evaluate_buckets(np.empty(0), np.empty(0), time.time() - since)
+        decision["source"] = None
+        return decision
+    return controller.evaluate_frame(MetricsFrame.from_file(metrics_file, names), since)
+
+
+def controller_from_options(options: Dict[str, Any]) -> EarlyStopController:
+    """EarlyStopController from flat options (CLI flags / Ansible variables).
+
+    An SLO given as a spec ('ttft_ms=2000,itl_ms=100') supplies the threshold
+    of the target metric, if it lists it.
+    """
+    slo_ms = options.get("slo_ms")
+    slo = options.get("slo")
+    metric = options.get("metric") or "ttft_ms"
+    if slo_ms in (None, "") and slo:
+        # e2e_ms and latency_ms name the same histogram
+        thresholds = {SLO_METRICS[m]: ms for m, ms in parse_slo(slo).items()}
+        slo_ms = thresholds.get(SLO_METRICS[metric])
+
+    def number(key, default, cast=float):
+        value = options.get(key)
+        return cast(value) if value not in (None, "") else default
+
+    return EarlyStopController(
+        metric=metric,
+        quantile=number("quantile", 0.95),
+        confidence=number("confidence", 0.95),
+        tolerance=number("tolerance", 0.1),
+        slo_ms=float(slo_ms) if slo_ms not in (None, "") else None,
+        violation_factor=number("violation_factor", 1.0),
+        min_requests=number("min_requests", 200, int),
+        min_seconds=number("min_seconds", 60.0),
+    )
+
+
+def write_decision(path: PathLike, decision: Dict[str, Any]) -> Path:
+    """Write a stop decision (early-stop.json) atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(decision, indent=2) + "\n")
+    os.replace(tmp, path)
+    return path
+
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Mergeable log-bucketed latency histograms.
+
+Percentiles cannot be combined: the p99 of three repetitions is not the
+mean of their p99s. A LatencyHistogram keeps the full distribution in
+logarithmic buckets instead, so histograms of repetitions, sweep points or
+concurrent load generator processes merge exactly by adding bucket counts,
+and quantiles of the pooled distribution are read from the merged buckets.
+
+Bucket i covers (gamma^(i-1), gamma^i] with gamma = (1 + a) / (1 - a), so
+every quantile is reported within relative accuracy a of a value that was
+actually recorded (a = 1% by default, as with HDR histograms of two
+significant digits). Values at or below MIN_VALUE (including 0) share a
+zero bucket. A millisecond latency range of 0.1 ms - 100 s needs about 700
+buckets; only the span between the smallest and largest bucket used is
+stored.
+
+    hist = LatencyHistogram()
+    hist.add(ttft_ms_array)
+    pooled = LatencyHistogram.merged([run1, run2, run3])
+    pooled.quantiles([0.5, 0.95, 0.99, 0.999])
+
+Histograms serialise to compact JSON (to_json / from_json) for CSV cells,
+Parquet columns and result files.
+"""
+
+import json
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Values at or below this go to the zero bucket
+MIN_VALUE = 1e-9
+
+# Quantiles reported for pooled latencies (p50/p95/p99/p99.9)
+REPORT_QUANTILES = (0.5, 0.95, 0.99, 0.999)
+
+
+def quantile_label(q: float) -> str:
+    """Column suffix of a quantile: 0.5 -> "p50", 0.999 -> "p999"."""
+    return "p" + f"{q * 100:g}".replace(".", "")
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram with bounded relative error.
+
+    Attributes:
+        relative_accuracy: Maximum relative error of reported quantiles
+        count: Number of recorded values
+        total: Sum of recorded values (for an exact mean)
+        min: Smallest recorded value (inf when empty)
+        max: Largest recorded value (-inf when empty)
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = 0
+        self._counts = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return (f"LatencyHistogram(count={self.count}, relative_accuracy={self.relative_accuracy}, "
+                f"buckets={len(self._counts)})")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LatencyHistogram) and self.to_dict() == other.to_dict()
+
+    def _grow(self, low: int, high: int) -> None:
+        """Extend the bucket array to cover bucket indices low..high."""
+        if not len(self._counts):
+            self._offset = low
+            self._counts = np.zeros(high - low + 1, dtype=np.int64)
+            return
+        new_low = min(low, self._offset)
+        new_high = max(high, self._offset + len(self._counts) - 1)
+        if new_low == self._offset and new_high == self._offset + len(self._counts) - 1:
+            return
+        counts = np.zeros(new_high - new_low + 1, dtype=np.int64)
+        start = self._offset - new_low
+        counts[start:start + len(self._counts)] = self._counts
+        self._offset = new_low
+        self._counts = counts
+
+    def add(self, values: Any) -> "LatencyHistogram":
+        """Record one value or an array of values; NaN values are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > MIN_VALUE]
+        self.zero_count += len(values) - len(positive)
+        if len(positive):
+            indices = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+            low, high = int(indices.min()), int(indices.max())
+            self._grow(low, high)
+            np.add.at(self._counts, indices - self._offset, 1)
+        return self
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's counts into this one (in place)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                "Cannot merge histograms with different relative accuracy "
+                f"({self.relative_accuracy} vs {other.relative_accuracy})"
+            )
+        if len(other._counts):
+            self._grow(other._offset, other._offset + len(other._counts) - 1)
+            start = other._offset - self._offset
+            self._counts[start:start + len(other._counts)] += other._counts
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable[Optional["LatencyHistogram"]]) -> "LatencyHistogram":
+        """Pool histograms (None entries are skipped) into a new histogram."""
+        histograms = [h for h in histograms if h is not None]
+        result = cls(histograms[0].relative_accuracy if histograms else DEFAULT_RELATIVE_ACCURACY)
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    @property
+    def mean(self) -> float:
+        """Exact mean of the recorded values (NaN when empty)."""
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (0..1), within relative_accuracy (NaN when empty).
+
+        Uses the nearest-rank definition: the smallest recorded value with at
+        least q * count values at or below it.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"quantile must be in [0, 1], got {q}")
+        if not self.count:
+            return math.nan
+        if q == 0:
+            return self.min
+        rank = math.ceil(q * self.count)
+        if rank <= self.zero_count:
+            return max(self.min, 0.0)
+        index = int(np.searchsorted(np.cumsum(self._counts), rank - self.zero_count))
+        # Midpoint (in relative terms) of bucket (gamma^(i-1), gamma^i]
+        value = 2 * self._gamma ** (self._offset + index) / (self._gamma + 1)
+        return min(max(value, self.min), self.max)
+
+    def quantiles(self, qs: Iterable[float] = REPORT_QUANTILES) -> List[float]:
+        """Values at several quantiles."""
+        return [self.quantile(q) for q in qs]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form; counts hold buckets offset..offset+len-1."""
+        nonzero = np.flatnonzero(self._counts)
+        counts = self._counts[nonzero[0]:nonzero[-1] + 1] if len(nonzero) else self._counts[:0]
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "offset": self._offset + (int(nonzero[0]) if len(nonzero) else 0),
+            "counts": counts.tolist(),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Inverse of to_dict()."""
+        histogram = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        histogram._offset = int(data.get("offset", 0))
+        histogram._counts = np.asarray(data.get("counts", []), dtype=np.int64)
+        histogram.zero_count = int(data.get("zero_count", 0))
+        histogram.count = int(data.get("count", histogram._counts.sum() + histogram.zero_count))
+        histogram.total = float(data.get("total", 0.0))
+        if histogram.count:
+            histogram.min = float(data["min"])
+            histogram.max = float(data["max"])
+        return histogram
+
+    def to_json(self) -> str:
+        """Compact JSON string of to_dict()."""
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: Optional[str]) -> Optional["LatencyHistogram"]:
+        """Histogram from to_json() output; None for empty or missing values."""
+        if not isinstance(text, str) or not text:
+            return None
+        return cls.from_dict(json.loads(text))
@@ -9,6 +9,12 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 
+try:
+    from ..latency_histogram import LatencyHistogram
+except ImportError:
+    # Imported as a top-level package with shared/ on sys.path
+    from latency_histogram import LatencyHistogram
+
 
 @dataclass
 class LoadGenConfig:
@@ -57,6 +63,7 @@ class LoadGenMetrics:
         latency_p50_ms: P50 latency
         latency_p95_ms: P95 latency
         latency_p99_ms: P99 latency
+        latency_p999_ms: P99.9 latency (when per-request latencies are available)
         ttft_mean_ms: Time to first token mean (LLM workloads)
         tpot_mean_ms: Time per output token mean (LLM workloads)
         duration_seconds: Total test duration
@@ -64,6 +71,9 @@ class LoadGenMetrics:
         decode_throughput_tps: Decode phase tokens/sec (offline batch)
         output_throughput_tps: Output tokens/sec (offline batch)
         kv_cache_usage_pct: Peak KV cache usage percent (offline batch)
+        histograms: Per-request distributions in milliseconds, keyed by
+            metric ("latency_ms", "ttft_ms", "itl_ms", "tpot_ms"); used by merge()
+            to report exact pooled percentiles
         raw_metrics: Raw metrics dict from load generator
     """
     requests_total: int = 0
@@ -75,6 +85,7 @@ class LoadGenMetrics:
     latency_p50_ms: float = 0.0
     latency_p95_ms: float = 0.0
     latency_p99_ms: float = 0.0
+    latency_p999_ms: Optional[float] = None
     ttft_mean_ms: Optional[float] = None
     tpot_mean_ms: Optional[float] = None
     duration_seconds: float = 0.0
@@ -83,6 +94,84 @@ class LoadGenMetrics:
     output_throughput_tps: Optional[float] = None
     kv_cache_usage_pct: Optional[float] = None
     raw_metrics: Dict[str, Any] = field(default_factory=dict)
+    histograms: Dict[str, LatencyHistogram] = field(default_factory=dict)
+
+    def apply_histograms(self) -> None:
+        """Set latency mean/percentiles and TTFT/TPOT means from the histograms."""
+        latency = self.histograms.get("latency_ms")
+        if latency is not None and latency.count:
+            self.latency_mean_ms = latency.mean
+            (self.latency_p50_ms, self.latency_p95_ms,
+             self.latency_p99_ms, self.latency_p999_ms) = latency.quantiles()
+        ttft = self.histograms.get("ttft_ms")
+        if ttft is not None and ttft.count:
+            self.ttft_mean_ms = ttft.mean
+        tpot = self.histograms.get("tpot_ms")
+        if tpot is not None and tpot.count:
+            self.tpot_mean_ms = tpot.mean
+
+    @classmethod
+    def merge(cls, metrics: List["LoadGenMetrics"], concurrent: bool = False) -> "LoadGenMetrics":
+        """Pool the metrics of several runs.
+
+        Request counts add up. Latency percentiles and means come from the
+        merged histograms, so they are exact for the pooled requests rather
+        than averages of per-run percentiles; a histogram is only pooled when
+        every run has it, otherwise percentiles stay unset and means are
+        weighted by successful requests.
+
+        Args:
+            metrics: Metrics of each run
+            concurrent: True when the runs loaded the same server at the same
+                time (throughput adds up, duration is the longest run);
+                False for repetitions (throughput is averaged, durations add up)
+
+        Returns:
+            Pooled metrics
+        """
+        if not metrics:
+            return cls()
+
+        def combine(values: List[Optional[float]]) -> Optional[float]:
+            values = [v for v in values if v is not None]
+            if not values:
+                return None
+            return sum(values) if concurrent else sum(values) / len(values)
+
+        def weighted_mean(values: List[Optional[float]]) -> Optional[float]:
+            pairs = [(v, m.requests_successful) for v, m in zip(values, metrics) if v is not None]
+            weight = sum(w for _, w in pairs)
+            if not pairs:
+                return None
+            if not weight:
+                return sum(v for v, _ in pairs) / len(pairs)
+            return sum(v * w for v, w in pairs) / weight
+
+        kv_cache = [m.kv_cache_usage_pct for m in metrics if m.kv_cache_usage_pct is not None]
+        durations = [m.duration_seconds for m in metrics]
+        pooled = cls(
+            requests_total=sum(m.requests_total for m in metrics),
+            requests_successful=sum(m.requests_successful for m in metrics),
+            requests_failed=sum(m.requests_failed for m in metrics),
+            throughput_rps=combine([m.throughput_rps for m in metrics]),
+            throughput_tps=combine([m.throughput_tps for m in metrics]),
+            latency_mean_ms=weighted_mean([m.latency_mean_ms for m in metrics]),
+            ttft_mean_ms=weighted_mean([m.ttft_mean_ms for m in metrics]),
+            tpot_mean_ms=weighted_mean([m.tpot_mean_ms for m in metrics]),
+            duration_seconds=max(durations) if concurrent else sum(durations),
+            prefill_throughput_tps=combine([m.prefill_throughput_tps for m in metrics]),
+            decode_throughput_tps=combine([m.decode_throughput_tps for m in metrics]),
+            output_throughput_tps=combine([m.output_throughput_tps for m in metrics]),
+            kv_cache_usage_pct=max(kv_cache) if kv_cache else None,
+            raw_metrics={"merged_runs": len(metrics), "concurrent": concurrent},
+        )
+        for key in metrics[0].histograms:
+            if all(key in m.histograms for m in metrics):
+                pooled.histograms[key] = LatencyHistogram.merged(
+                    m.histograms[key] for m in metrics
+                )
+        pooled.apply_histograms()
+        return pooled
 
 
 class LoadGenerator(ABC):
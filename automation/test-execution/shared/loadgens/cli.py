@@ -19,14 +19,54 @@ Usage:
 
     # Parse results
     python3 -m shared.loadgens parse-results guidellm /path/to/results.json
+
+    # Pool repetitions (exact pooled percentiles from merged histograms)
+    python3 -m shared.loadgens parse-results guidellm rep1.json rep2.json rep3.json
+
+    # Pool load generators that ran at the same time against one server
+    python3 -m shared.loadgens parse-results guidellm a.json b.json --concurrent
+
+    # Adaptive SLO search, one load point at a time (state kept in a file)
+    python3 -m shared.loadgens slo-search next --state search.json \\
+        --slo ttft_ms=2000,itl_ms=100 --max 128
+    python3 -m shared.loadgens slo-search record --state search.json \\
+        --load 16 --results /path/to/point/benchmarks.json
+    python3 -m shared.loadgens slo-search report --state search.json \\
+        --benchmarks-out /path/to/benchmarks.json
+
+    # Early stop: check the point that started at a Unix time against the
+    # streamed vLLM metrics (writes early-stop.json once it should stop)
+    python3 -m shared.loadgens early-stop --metrics /path/to/vllm-metrics.ndjson \
+        --since 1767261600 --metric ttft_ms --slo ttft_ms=2000 --out early-stop.json
+
+    # Check before the run that the options and the collector allowlist work
+    python3 -m shared.loadgens early-stop --check --metric ttft_ms --allowlist 'vllm:*'
+
+    # Merge the benchmarks of points run one at a time into one sweep
+    python3 -m shared.loadgens merge-benchmarks out.json point1.json point2.json
 """
 
 import argparse
 import json
 import sys
+from pathlib import Path
 from typing import Any, Dict
 
-from . import get_loadgen, list_loadgens, LoadGenConfig
+from . import get_loadgen, list_loadgens, LoadGenConfig, LoadGenMetrics
+
+try:
+    from ..early_stop import (
+        STREAM_HISTOGRAMS, allowlist_error, check_metrics_file, controller_from_options,
+        write_decision,
+    )
+    from ..slo_search import SEARCH_KINDS, merge_benchmarks, search_from_options
+except ImportError:
+    # Imported as a top-level package with shared/ on sys.path
+    from early_stop import (
+        STREAM_HISTOGRAMS, allowlist_error, check_metrics_file, controller_from_options,
+        write_decision,
+    )
+    from slo_search import SEARCH_KINDS, merge_benchmarks, search_from_options
 
 
 def cmd_list(_args: argparse.Namespace) -> None:
@@ -101,10 +141,14 @@ def cmd_get_config(args: argparse.Namespace) -> None:
 
 
 def cmd_parse_results(args: argparse.Namespace) -> None:
-    """Parse load generator results."""
+    """Parse load generator results, pooling several result files."""
     loadgen = get_loadgen(args.name)
 
-    metrics = loadgen.parse_results(args.results_path)
+    runs = [loadgen.parse_results(path) for path in args.results_paths]
+    if len(runs) == 1:
+        metrics = runs[0]
+    else:
+        metrics = LoadGenMetrics.merge(runs, concurrent=args.concurrent)
 
     # Convert dataclass to dict
     result = {
@@ -117,15 +161,111 @@ def cmd_parse_results(args: argparse.Namespace) -> None:
         "latency_p50_ms": metrics.latency_p50_ms,
         "latency_p95_ms": metrics.latency_p95_ms,
         "latency_p99_ms": metrics.latency_p99_ms,
+        "latency_p999_ms": metrics.latency_p999_ms,
         "ttft_mean_ms": metrics.ttft_mean_ms,
         "tpot_mean_ms": metrics.tpot_mean_ms,
         "duration_seconds": metrics.duration_seconds,
+        "histograms": {
+            name: histogram.to_dict() for name, histogram in metrics.histograms.items()
+        },
         "raw_metrics": metrics.raw_metrics,
     }
 
     print(json.dumps(result, indent=2))
 
 
+def cmd_slo_search(args: argparse.Namespace) -> None:
+    """Step an adaptive SLO search: next load point, record a point, report."""
+    try:
+        search = search_from_options({
+            "search_state": args.state,
+            "slo": args.slo,
+            "search_kind": args.kind,
+            "search_min": args.min,
+            "search_max": args.max,
+            "search_max_points": args.max_points,
+            "search_resolution": args.resolution,
+        })
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        sys.exit(1)
+
+    if args.action == 'next':
+        load = search.next_point()
+        result = {
+            "done": load is None,
+            "load": load,
+            "profile": search.kind,
+            "load_field": SEARCH_KINDS[search.kind],
+            "dir": search.point_dir(load) if load is not None else None,
+            "measurements": search.measurements,
+            "stop_reason": search.stop_reason,
+        }
+    elif args.action == 'record':
+        if args.load is None or not args.results:
+            print(json.dumps({"error": "record needs --load and --results"}), file=sys.stderr)
+            sys.exit(1)
+        metrics = get_loadgen('guidellm').parse_results(args.results)
+        point = search.record(
+            args.load,
+            metrics.histograms,
+            benchmarks=args.results,
+            failed_requests=metrics.requests_failed,
+        )
+        result = {key: value for key, value in point.items() if key != "histograms"}
+    else:
+        result = search.report()
+        if args.benchmarks_out:
+            paths = [path for point in search.points for path in point["benchmarks"]]
+            Path(args.benchmarks_out).write_text(json.dumps(merge_benchmarks(paths), indent=2))
+            result["benchmarks"] = args.benchmarks_out
+
+    search.save(args.state)
+    print(json.dumps(result, indent=2))
+
+
+def cmd_early_stop(args: argparse.Namespace) -> None:
+    """Decide whether the running point should stop early."""
+    try:
+        controller = controller_from_options({
+            "metric": args.metric,
+            "quantile": args.quantile,
+            "tolerance": args.tolerance,
+            "slo": args.slo,
+            "slo_ms": args.slo_ms,
+            "violation_factor": args.violation_factor,
+            "min_requests": args.min_requests,
+            "min_seconds": args.min_seconds,
+        })
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        sys.exit(1)
+
+    if args.allowlist is not None:
+        error = allowlist_error(controller.metric, args.allowlist.split(','))
+        if error:
+            print(json.dumps({"error": error}), file=sys.stderr)
+            sys.exit(1)
+    if args.check:
+        print(json.dumps(controller.config(), indent=2))
+        return
+    if args.metrics is None or args.since is None:
+        print(json.dumps({"error": "--metrics and --since are required"}), file=sys.stderr)
+        sys.exit(1)
+
+    decision = check_metrics_file(args.metrics, controller, args.since)
+    decision["since"] = args.since
+    if decision["stop"] and args.out:
+        write_decision(args.out, decision)
+    print(json.dumps(decision, indent=2))
+
+
+def cmd_merge_benchmarks(args: argparse.Namespace) -> None:
+    """Merge the benchmarks of points run one at a time into one file."""
+    Path(args.output).write_text(json.dumps(merge_benchmarks(args.results_paths), indent=2))
+    print(json.dumps({"benchmarks": args.output, "points": len(args.results_paths)}))
+
+
 def main() -> None:
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -156,7 +296,70 @@ def main() -> None:
     # parse-results command
     parser_parse = subparsers.add_parser('parse-results', help='Parse load generator results')
     parser_parse.add_argument('name', help='Load generator name')
-    parser_parse.add_argument('results_path', help='Path to results file')
+    parser_parse.add_argument('results_paths', nargs='+', metavar='results_path',
+                              help='Path to results file (several are pooled)')
+    parser_parse.add_argument('--concurrent', action='store_true',
+                              help='Results are from load generators that ran at the same '
+                                   'time (sum throughput) rather than repetitions')
+
+    # slo-search command
+    parser_search = subparsers.add_parser('slo-search', help='Step an adaptive SLO search')
+    parser_search.add_argument('action', choices=['next', 'record', 'report'],
+                               help='next: load point to measure; record: add a measured '
+                                    'point; report: knee and measured points')
+    parser_search.add_argument('--state', required=True, help='Search state file')
+    parser_search.add_argument('--slo', help='SLO, e.g. ttft_ms=2000,itl_ms=100,e2e_ms=30000 '
+                                             '(new search)')
+    parser_search.add_argument('--kind', default='concurrent', choices=sorted(SEARCH_KINDS),
+                               help='Search concurrent streams or a request rate (new search)')
+    parser_search.add_argument('--min', default='1', help='Smallest load (new search)')
+    parser_search.add_argument('--max', default='128', help='Largest load (new search)')
+    parser_search.add_argument('--max-points', type=int, default=12,
+                               help='Most measurements (new search)')
+    parser_search.add_argument('--resolution', type=float, default=0.1,
+                               help='Stop when failing/passing load is within 1 + this '
+                                    '(new search)')
+    parser_search.add_argument('--load', type=float, help='Measured load (record)')
+    parser_search.add_argument('--results', help='benchmarks.json of the measured load (record)')
+    parser_search.add_argument('--benchmarks-out',
+                               help='Write the benchmarks of all points to one file (report)')
+
+    # early-stop command
+    parser_stop = subparsers.add_parser('early-stop',
+                                        help='Check whether a running point can stop early')
+    parser_stop.add_argument('--metrics',
+                             help='vLLM metrics file streamed during the point (required '
+                                  'unless --check)')
+    parser_stop.add_argument('--since', type=float,
+                             help='Unix time the point started (required unless --check)')
+    parser_stop.add_argument('--metric', default='ttft_ms', choices=list(STREAM_HISTOGRAMS),
+                             help='Target metric')
+    parser_stop.add_argument('--quantile', type=float, default=0.95, help='Target quantile')
+    parser_stop.add_argument('--tolerance', type=float, default=0.1,
+                             help='Stop once the confidence interval is narrower than this '
+                                  'fraction of the estimate')
+    parser_stop.add_argument('--slo', help='SLO spec holding the target metric, '
+                                           'e.g. ttft_ms=2000,itl_ms=100')
+    parser_stop.add_argument('--slo-ms', type=float, help='SLO threshold of the target metric')
+    parser_stop.add_argument('--violation-factor', type=float, default=1.0,
+                             help='Stop once the interval lies above this multiple of the SLO')
+    parser_stop.add_argument('--min-requests', type=int, default=200,
+                             help='Requests to complete before any stop')
+    parser_stop.add_argument('--min-seconds', type=float, default=60.0,
+                             help='Seconds into the point before any stop')
+    parser_stop.add_argument('--out', help='Write the decision here once the point should stop')
+    parser_stop.add_argument('--allowlist',
+                             help='Metrics collector allowlist (comma-separated); fail if it '
+                                  'drops the histograms of the target metric')
+    parser_stop.add_argument('--check', action='store_true',
+                             help='Only validate the options and --allowlist')
+
+    # merge-benchmarks command
+    parser_merge = subparsers.add_parser('merge-benchmarks',
+                                         help='Merge benchmarks.json files into one sweep')
+    parser_merge.add_argument('output', help='Merged benchmarks.json')
+    parser_merge.add_argument('results_paths', nargs='+', metavar='results_path',
+                              help='benchmarks.json of each point, in order')
 
     args = parser.parse_args()
 
@@ -170,6 +373,9 @@ def main() -> None:
         'get-loadgen': cmd_get_loadgen,
         'get-config': cmd_get_config,
         'parse-results': cmd_parse_results,
+        'slo-search': cmd_slo_search,
+        'early-stop': cmd_early_stop,
+        'merge-benchmarks': cmd_merge_benchmarks,
     }
 
     commands[args.command](args)
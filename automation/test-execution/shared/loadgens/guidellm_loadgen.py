@@ -11,6 +11,16 @@ from typing import Dict, List
 
 from .base import LoadGenerator, LoadGenConfig, LoadGenMetrics
 
+try:
+    from ..benchmarks_reader import REQUEST_ARRAYS_KEY, read_benchmarks
+    from ..request_sidecar import REQUEST_FIELDS, request_columns, request_histograms
+    from ..slo_search import SEARCH_KINDS, search_from_options
+except ImportError:
+    # Imported as a top-level package with shared/ on sys.path
+    from benchmarks_reader import REQUEST_ARRAYS_KEY, read_benchmarks
+    from request_sidecar import REQUEST_FIELDS, request_columns, request_histograms
+    from slo_search import SEARCH_KINDS, search_from_options
+
 
 def _parse_version(ver: str) -> tuple:
     """Parse a version string like '0.7.2' into a comparable tuple."""
@@ -37,6 +47,15 @@ class GuideLLMLoadGen(LoadGenerator):
 
         v0.7+: returns CLI args for ``guidellm run``.
         v0.6.x: returns empty list (env vars only).
+
+        The ``adaptive`` profile measures the next load point of an SLO
+        search (see shared/slo_search.py): a single ``concurrent``,
+        ``constant`` or ``poisson`` benchmark written to the point's own
+        subdirectory of output_path. The search is resumed from the state
+        file in extra_args['search_state'] when it exists.
+
+        Raises:
+            ValueError: If an adaptive search has no SLO or is already over
         """
         if not self._is_v7_or_later:
             return []
@@ -77,6 +96,20 @@ class GuideLLMLoadGen(LoadGenerator):
         cmd.extend(["--tokenizer", tokenizer])
 
         profile = config.extra_args.get('profile', 'sweep')
+        rates = config.rate.split(',') if config.rate else []
+        output_path = config.output_path.rstrip('/')
+
+        if profile == 'adaptive':
+            search = search_from_options(config.extra_args)
+            load = search.next_point()
+            if load is None:
+                raise ValueError(
+                    f"SLO search is over ({search.stop_reason}); nothing to measure"
+                )
+            output_path = f"{output_path}/{search.point_dir(load)}"
+            profile = search.kind
+            rates = [f"{load:g}"]
+
         warmup = config.extra_args.get('warmup', '0.1')
         cooldown = config.extra_args.get('cooldown', '30')
         profile_parts = [
@@ -85,8 +118,6 @@ class GuideLLMLoadGen(LoadGenerator):
             f"cooldown={cooldown}",
         ]
 
-        rates = config.rate.split(',') if config.rate else []
-
         if profile == 'concurrent' and rates:
             profile_parts.append(f"streams={rates[0]}")
             cmd.extend(["--profile", ",".join(profile_parts)])
@@ -117,7 +148,6 @@ class GuideLLMLoadGen(LoadGenerator):
                 f"kind=max_requests,count={config.max_requests}",
             ])
 
-        output_path = config.output_path.rstrip('/')
         cmd.extend([
             "--output",
             f"kind=json,path={output_path}/benchmarks.json",
@@ -172,6 +202,10 @@ class GuideLLMLoadGen(LoadGenerator):
     def parse_results(self, results_path: str) -> LoadGenMetrics:
         """Parse GuideLLM results JSON into standardized metrics.
 
+        Per-request records of a benchmarks.json are streamed into latency
+        histograms (pooled over all sweep points), from which the latency
+        mean and percentiles, TTFT/TPOT means and request counts are set.
+
         Args:
             results_path: Path to benchmarks.json file
 
@@ -184,10 +218,17 @@ class GuideLLMLoadGen(LoadGenerator):
             return LoadGenMetrics()
 
         try:
-            with open(results_file, 'r') as f:
-                data = json.load(f)
+            data = read_benchmarks(results_file, request_fields=REQUEST_FIELDS)
         except (json.JSONDecodeError, IOError):
             return LoadGenMetrics()
+        if not isinstance(data, dict):
+            return LoadGenMetrics()
+
+        # Request arrays become histograms; keep raw_metrics JSON-serialisable
+        columns = request_columns(data)
+        for benchmark in data.get('benchmarks', []):
+            if isinstance(benchmark, dict):
+                benchmark.pop(REQUEST_ARRAYS_KEY, None)
 
         # GuideLLM benchmarks.json structure:
         # {
@@ -230,6 +271,19 @@ class GuideLLMLoadGen(LoadGenerator):
         # Extract duration
         metrics.duration_seconds = data.get('duration_seconds', 0.0)
 
+        histograms = request_histograms(columns)
+        if histograms:
+            metrics.histograms = {
+                'latency_ms' if name == 'request_latency_ms' else name: histogram
+                for name, histogram in histograms.items()
+            }
+            metrics.apply_histograms()
+            if not metrics.requests_total:
+                status = columns['status']
+                metrics.requests_total = len(status)
+                metrics.requests_successful = int((status == 'successful').sum())
+                metrics.requests_failed = int((status == 'errored').sum())
+
         return metrics
 
     def validate_config(self, config: LoadGenConfig) -> None:
@@ -275,7 +329,7 @@ class GuideLLMLoadGen(LoadGenerator):
                 'concurrent', 'throughput',
             ]
             if self._is_v7_or_later:
-                valid_profiles.extend(['constant', 'poisson'])
+                valid_profiles.extend(['constant', 'poisson', 'adaptive'])
             if profile not in valid_profiles:
                 opts = ', '.join(valid_profiles)
                 raise ValueError(
@@ -283,6 +337,17 @@ class GuideLLMLoadGen(LoadGenerator):
                     f" Must be one of: {opts}"
                 )
 
+        if profile == 'adaptive':
+            kind = config.extra_args.get('search_kind', 'concurrent')
+            if kind not in SEARCH_KINDS:
+                opts = ', '.join(SEARCH_KINDS)
+                raise ValueError(
+                    f"Invalid search_kind: {kind}."
+                    f" Must be one of: {opts}"
+                )
+            # Raises ValueError for a missing or malformed SLO / range
+            search_from_options(config.extra_args)
+
     def supports_workload(self, workload_type: str) -> bool:
         """GuideLLM supports generative and embedding workloads."""
         supported = [
@@ -14,6 +14,7 @@ import json
 import tempfile
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from shared.loadgens import (
@@ -22,9 +23,11 @@ from shared.loadgens import (
     LoadGenConfig,
     LoadGenMetrics,
 )
+from shared.latency_histogram import LatencyHistogram
 from shared.loadgens.guidellm_loadgen import GuideLLMLoadGen
 from shared.loadgens.vllm_bench_loadgen import VLLMBenchLoadGen
 from shared.loadgens.mteb_loadgen import MTEBLoadGen
+from shared.slo_search import search_from_options
 
 
 class TestLoadGenRegistry:
@@ -220,10 +223,72 @@ class TestGuideLLMLoadGen:
             config.extra_args = {"profile": profile}
             loadgen.validate_config(config)
 
+    def test_get_command_v7_profile_adaptive(self, loadgen, config, tmp_path):
+        """Test the adaptive profile measures the SLO search's next load point."""
+        state = tmp_path / "slo-search-state.json"
+        config.extra_args = {"profile": "adaptive", "slo": "ttft_ms=500", "search_state": str(state)}
+        loadgen.validate_config(config)
+        cmd = loadgen.get_command(config)
+        profile = cmd[cmd.index("--profile") + 1]
+        assert profile.startswith("kind=concurrent,") and profile.endswith(",streams=1")
+        assert "--override" not in cmd
+        assert cmd[-1] == "kind=json,path=/results/slo-search/01-concurrent-1/benchmarks.json"
+
+        # Resumed from the state file: the SLO held at 1 stream, so 2 is next
+        search = search_from_options(config.extra_args)
+        search.record(1, {"ttft_ms": LatencyHistogram().add(np.full(500, 100.0))})
+        search.save(state)
+        profile = loadgen.get_command(config)[cmd.index("--profile") + 1]
+        assert profile.endswith(",streams=2")
+
+        config.extra_args = {"profile": "adaptive", "slo": "ttft_ms=500", "search_kind": "poisson"}
+        profile = loadgen.get_command(config)[cmd.index("--profile") + 1]
+        assert profile.startswith("kind=poisson,") and profile.endswith(",rate=1")
+
+    def test_validate_config_adaptive_needs_slo(self, loadgen, config):
+        """Test the adaptive profile rejects a missing or unknown SLO."""
+        for extra_args in ({"profile": "adaptive"},
+                           {"profile": "adaptive", "slo": "p95=1"},
+                           {"profile": "adaptive", "slo": "ttft_ms=1", "search_kind": "sweep"}):
+            config.extra_args = extra_args
+            with pytest.raises(ValueError):
+                loadgen.validate_config(config)
+
     def test_get_output_format(self, loadgen):
         """Test output format."""
         assert loadgen.get_output_format() == "json"
 
+    def test_parse_results_histograms(self, loadgen, tmp_path):
+        """Test per-request records become latency histograms."""
+        requests = [
+            {"request_start_time": 10.0 * i, "first_token_time": 10.0 * i + 0.1,
+             "request_end_time": 10.0 * i + latency, "output_tokens": 101}
+            for i, latency in enumerate([1.0, 2.0, 3.0, 4.0])
+        ]
+        results_data = {
+            "benchmarks": [
+                {"config": {}, "requests": {"successful": requests[:2]}},
+                {"config": {}, "requests": {"successful": requests[2:],
+                                            "errored": [{"request_start_time": 0.0}]}},
+            ]
+        }
+        results_path = tmp_path / "benchmarks.json"
+        results_path.write_text(json.dumps(results_data))
+
+        metrics = loadgen.parse_results(str(results_path))
+        assert sorted(metrics.histograms) == ["itl_ms", "latency_ms", "tpot_ms", "ttft_ms"]
+        assert metrics.requests_total == 5
+        assert metrics.requests_successful == 4
+        assert metrics.requests_failed == 1
+        assert metrics.latency_mean_ms == pytest.approx(2500.0)
+        assert metrics.latency_p50_ms == pytest.approx(2000.0, rel=0.01)
+        assert metrics.latency_p999_ms == pytest.approx(4000.0, rel=0.01)
+        assert metrics.ttft_mean_ms == pytest.approx(100.0)
+        assert metrics.tpot_mean_ms == pytest.approx(2500.0 / 101)
+        assert metrics.histograms["itl_ms"].mean == pytest.approx(24.0)
+        # Request arrays are not left in the raw metrics
+        json.dumps(metrics.raw_metrics)
+
 
 class _GuideLLMV6(GuideLLMLoadGen):
     """GuideLLM subclass simulating v0.6.x for testing."""
@@ -615,3 +680,40 @@ class TestLoadGenMetrics:
         assert metrics.requests_failed == 2
         assert metrics.throughput_rps == 10.5
         assert metrics.latency_mean_ms == 45.2
+
+    def test_merge_pools_histograms(self):
+        """Test merged percentiles come from the pooled requests."""
+        runs = []
+        for values in ([10.0] * 98 + [500.0] * 2, [20.0] * 100):
+            metrics = LoadGenMetrics(
+                requests_total=len(values), requests_successful=len(values),
+                throughput_rps=5.0, duration_seconds=20.0,
+                histograms={"latency_ms": LatencyHistogram().add(values)},
+            )
+            metrics.apply_histograms()
+            runs.append(metrics)
+        assert runs[0].latency_p99_ms == pytest.approx(500.0, rel=0.01)
+
+        pooled = LoadGenMetrics.merge(runs)
+        assert pooled.requests_total == 200
+        assert pooled.throughput_rps == 5.0
+        assert pooled.duration_seconds == 40.0
+        assert pooled.histograms["latency_ms"].count == 200
+        # Mean of the per-run p99s would be 260 ms
+        assert pooled.latency_p99_ms == pytest.approx(20.0, rel=0.01)
+        assert pooled.latency_p999_ms == pytest.approx(500.0, rel=0.01)
+        assert pooled.latency_mean_ms == pytest.approx((980.0 + 1000.0 + 2000.0) / 200)
+
+        concurrent = LoadGenMetrics.merge(runs, concurrent=True)
+        assert concurrent.throughput_rps == 10.0
+        assert concurrent.duration_seconds == 20.0
+
+    def test_merge_without_histograms(self):
+        """Test means are weighted by requests when there are no histograms."""
+        pooled = LoadGenMetrics.merge([
+            LoadGenMetrics(requests_successful=1, latency_mean_ms=10.0, latency_p99_ms=10.0),
+            LoadGenMetrics(requests_successful=3, latency_mean_ms=30.0, latency_p99_ms=30.0),
+        ])
+        assert pooled.latency_mean_ms == 25.0
+        assert pooled.latency_p99_ms == 0.0
+        assert pooled.histograms == {}
@@ -11,6 +11,19 @@ from typing import Dict, List
 
 from .base import LoadGenerator, LoadGenConfig, LoadGenMetrics
 
+try:
+    from ..latency_histogram import LatencyHistogram
+except ImportError:
+    # Imported as a top-level package with shared/ on sys.path
+    from latency_histogram import LatencyHistogram
+
+# Per-request lists of `vllm bench serve --save-detailed` (seconds), by histogram
+_DETAILED_FIELDS = {
+    'latency_ms': 'e2els',
+    'ttft_ms': 'ttfts',
+    'itl_ms': 'itls',
+}
+
 
 class VLLMBenchLoadGen(LoadGenerator):
     """vLLM bench serve load generator."""
@@ -131,6 +144,10 @@ class VLLMBenchLoadGen(LoadGenerator):
     def parse_results(self, results_path: str) -> LoadGenMetrics:
         """Parse vLLM bench results JSON.
 
+        Results saved with --save-detailed also carry per-request lists,
+        which become latency histograms; these set the latency mean and
+        percentiles when present.
+
         Args:
             results_path: Path to vllm bench results JSON file
 
@@ -190,6 +207,21 @@ class VLLMBenchLoadGen(LoadGenerator):
             'duration', data.get('elapsed_time', 0.0)
         )
 
+        for name, key in _DETAILED_FIELDS.items():
+            values = data.get(key)
+            if not isinstance(values, list):
+                continue
+            # itls holds one list of inter-token latencies per request
+            if values and all(isinstance(v, list) for v in values):
+                values = [x for v in values for x in v]
+            try:
+                histogram = LatencyHistogram().add([v * 1000 for v in values])
+            except TypeError:
+                continue
+            if histogram.count:
+                metrics.histograms[name] = histogram
+        metrics.apply_histograms()
+
         return metrics
 
     def validate_config(self, config: LoadGenConfig) -> None:
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Per-request sidecar of a GuideLLM run: one Arrow IPC file of request columns.
+
+Distributions (TTFT, ITL, E2E, token counts) need GuideLLM's per-request
+records, which only exist inside benchmarks.json. The conversion pipeline
+extracts them once into requests.arrow next to benchmarks.json, with one row
+per request:
+
+    sweep_index    int32    index of the benchmark (sweep point) in benchmarks.json
+    status         string   successful / errored / incomplete (dictionary-encoded)
+    start          float64  request start, unix seconds
+    first_token    float64  first token received, unix seconds
+    end            float64  request end, unix seconds
+    prompt_tokens  float64
+    output_tokens  float64
+
+Missing values are NaN. The file is written uncompressed so readers can
+memory-map it: read_request_arrays() returns NumPy views of the mapped file
+without copying, so histograms and percentiles over millions of requests
+cost no parse and no extra memory:
+
+    arrays = read_request_arrays(sidecar_path(benchmarks_json), ["start", "first_token"])
+    ttft_ms = (arrays["first_token"] - arrays["start"]) * 1000
+
+request_histograms() turns the columns of one sweep point into mergeable
+latency histograms (see latency_histogram.py).
+
+pyarrow is optional and only imported when a sidecar is read or written;
+without it, available() returns False and no sidecar is produced.
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+try:
+    from .benchmarks_reader import REQUEST_ARRAYS_KEY, read_benchmarks
+    from .latency_histogram import LatencyHistogram
+except ImportError:
+    # Imported as a top-level module with shared/ on sys.path
+    from benchmarks_reader import REQUEST_ARRAYS_KEY, read_benchmarks
+    from latency_histogram import LatencyHistogram
+
+SIDECAR_FILENAME = "requests.arrow"
+
+# Bump when the columns change; sidecars of another version are rewritten
+SIDECAR_VERSION = "1"
+
+# Record fields holding each time column, in order of preference, across
+# GuideLLM versions
+TIME_FIELDS = {
+    "start": ("request_start_time", "info.timings.request_start", "start_time"),
+    "first_token": (
+        "first_token_time",
+        "info.timings.first_token_iteration",
+        "info.timings.first_iteration",
+    ),
+    "end": ("request_end_time", "info.timings.request_end", "end_time"),
+}
+
+# Durations used when a record has a start but no first-token or end time
+_DERIVED_FIELDS = ("time_to_first_token_ms", "request_latency")
+
+COLUMNS = ("sweep_index", "status", "start", "first_token", "end", "prompt_tokens", "output_tokens")
+
+# Everything read_benchmarks() must collect to build a sidecar
+REQUEST_FIELDS = tuple(
+    field for fields in TIME_FIELDS.values() for field in fields
+) + _DERIVED_FIELDS + ("prompt_tokens", "output_tokens")
+
+# Histograms built by request_histograms(), all in milliseconds, named after
+# GuideLLM's metrics: ITL is (end - first token) / (output tokens - 1) and
+# TPOT is request latency / output tokens, per request
+HISTOGRAMS = ("ttft_ms", "itl_ms", "tpot_ms", "request_latency_ms")
+
+PathLike = Union[str, Path]
+
+
+def available() -> bool:
+    """Whether pyarrow is installed, i.e. sidecars can be read and written."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def sidecar_path(benchmarks_json: PathLike) -> Path:
+    """Sidecar location of a benchmarks.json."""
+    return Path(benchmarks_json).parent / SIDECAR_FILENAME
+
+
+def _coalesce(fields: Dict[str, np.ndarray], candidates: Iterable[str], size: int) -> np.ndarray:
+    result = np.full(size, np.nan)
+    for field in candidates:
+        values = fields.get(field)
+        if values is not None:
+            result = np.where(np.isnan(result), values, result)
+    return result
+
+
+def request_columns(document: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Sidecar columns of a document read with read_benchmarks(request_fields=REQUEST_FIELDS).
+
+    Returns:
+        {column: array}; "status" is an array of status names
+    """
+    parts = {column: [] for column in COLUMNS}
+    for index, benchmark in enumerate(document.get("benchmarks", [])):
+        if not isinstance(benchmark, dict):
+            continue
+        for status, fields in benchmark.get(REQUEST_ARRAYS_KEY, {}).items():
+            size = len(next(iter(fields.values()), []))
+            start = _coalesce(fields, TIME_FIELDS["start"], size)
+            first_token = _coalesce(fields, TIME_FIELDS["first_token"], size)
+            end = _coalesce(fields, TIME_FIELDS["end"], size)
+            if "time_to_first_token_ms" in fields:
+                first_token = np.where(
+                    np.isnan(first_token), start + fields["time_to_first_token_ms"] / 1000, first_token
+                )
+            if "request_latency" in fields:
+                end = np.where(np.isnan(end), start + fields["request_latency"], end)
+            parts["sweep_index"].append(np.full(size, index, dtype=np.int32))
+            parts["status"].append(np.full(size, status, dtype=object))
+            parts["start"].append(start)
+            parts["first_token"].append(first_token)
+            parts["end"].append(end)
+            parts["prompt_tokens"].append(_coalesce(fields, ("prompt_tokens",), size))
+            parts["output_tokens"].append(_coalesce(fields, ("output_tokens",), size))
+
+    empty = {"sweep_index": np.int32, "status": object}
+    return {
+        column: np.concatenate(arrays) if arrays else np.array([], dtype=empty.get(column, np.float64))
+        for column, arrays in parts.items()
+    }
+
+
+def write_sidecar(
+    document: Dict[str, Any], path: PathLike, columns: Optional[Dict[str, np.ndarray]] = None
+) -> Path:
+    """Write the sidecar of a document read with request_fields=REQUEST_FIELDS.
+
+    The file is written next to its final location and renamed into place.
+    columns may pass request_columns(document) when the caller already has it.
+
+    Returns:
+        Path to the written sidecar
+    """
+    if not available():
+        raise ImportError("pyarrow is required for request sidecars: pip install pyarrow")
+    import pyarrow as pa
+
+    if columns is None:
+        columns = request_columns(document)
+    table = pa.table({
+        column: (
+            pa.array(values, type=pa.string()).dictionary_encode()
+            if column == "status" else pa.array(values)
+        )
+        for column, values in columns.items()
+    }).replace_schema_metadata({"sidecar_version": SIDECAR_VERSION})
+
+    path = Path(path)
+    staging = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    with pa.OSFile(str(staging), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    staging.replace(path)
+    return path
+
+
+def extract_sidecar(benchmarks_json: PathLike, path: Optional[PathLike] = None) -> Path:
+    """Stream a benchmarks.json's request records into its sidecar.
+
+    Args:
+        benchmarks_json: Path to benchmarks.json
+        path: Sidecar path (default: requests.arrow next to benchmarks.json)
+
+    Returns:
+        Path to the written sidecar
+    """
+    document = read_benchmarks(benchmarks_json, request_fields=REQUEST_FIELDS)
+    return write_sidecar(document, path or sidecar_path(benchmarks_json))
+
+
+def is_current(benchmarks_json: PathLike, path: Optional[PathLike] = None) -> bool:
+    """Whether the sidecar exists, has this version and is newer than benchmarks.json."""
+    path = Path(path or sidecar_path(benchmarks_json))
+    try:
+        if path.stat().st_mtime_ns < Path(benchmarks_json).stat().st_mtime_ns:
+            return False
+        metadata = read_sidecar(path).schema.metadata or {}
+    except (OSError, ValueError, ImportError):
+        return False
+    return metadata.get(b"sidecar_version") == SIDECAR_VERSION.encode()
+
+
+def read_sidecar(path: PathLike, columns: Optional[Iterable[str]] = None):
+    """Memory-map a sidecar as a pyarrow Table (no data is copied).
+
+    Args:
+        path: Path to requests.arrow
+        columns: Columns to select (default: all)
+    """
+    if not available():
+        raise ImportError("pyarrow is required for request sidecars: pip install pyarrow")
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table.select(list(columns)) if columns is not None else table
+
+
+def read_request_arrays(
+    path: PathLike, columns: Optional[Iterable[str]] = None
+) -> Dict[str, np.ndarray]:
+    """Sidecar columns as NumPy arrays.
+
+    Numeric columns are zero-copy views of the memory-mapped file; "status"
+    is decoded to an array of status names.
+    """
+    table = read_sidecar(path, columns)
+    arrays = {}
+    for name in table.column_names:
+        chunks = table.column(name).chunks
+        column = chunks[0] if len(chunks) == 1 else table.column(name).combine_chunks()
+        if name == "status":
+            arrays[name] = column.dictionary.to_numpy(zero_copy_only=False)[column.indices.to_numpy()]
+        else:
+            arrays[name] = column.to_numpy()
+    return arrays
+
+
+def request_histograms(
+    columns: Dict[str, np.ndarray], sweep_index: Optional[int] = None
+) -> Dict[str, LatencyHistogram]:
+    """Latency histograms (HISTOGRAMS) of the successful requests in columns.
+
+    Args:
+        columns: Sidecar columns (request_columns() or read_request_arrays())
+        sweep_index: Only use requests of this sweep point (default: all)
+
+    Returns:
+        {name: histogram}; histograms with no values are left out
+    """
+    mask = columns["status"] == "successful"
+    if sweep_index is not None:
+        mask &= columns["sweep_index"] == sweep_index
+    start = columns["start"][mask]
+    first_token = columns["first_token"][mask]
+    end = columns["end"][mask]
+    output_tokens = columns["output_tokens"][mask]
+
+    latency_ms = (end - start) * 1000
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = {
+            "ttft_ms": (first_token - start) * 1000,
+            "itl_ms": np.where(
+                output_tokens > 1, (end - first_token) * 1000 / (output_tokens - 1), np.nan
+            ),
+            "tpot_ms": np.where(output_tokens > 0, latency_ms / output_tokens, np.nan),
+            "request_latency_ms": latency_ms,
+        }
+    histograms = {name: LatencyHistogram().add(values[name]) for name in HISTOGRAMS}
+    return {name: histogram for name, histogram in histograms.items() if histogram.count}
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""SQLite catalog of benchmark result directories.
+
+Result trees hold thousands of runs; finding them with rglob() and stat()ing
+every hit makes `cpueval results --last` and dashboard startup slow. The
+catalog records, per results root:
+
+- every directory with its mtime, so a refresh only lists directories that
+  changed since the last one (stat()ing the rest);
+- the tracked result files (benchmarks.json, test-metadata.json, ...) with
+  size and mtime, so only changed files are re-read;
+- one row per run directory with model, suite, cores, workload, timestamp
+  and a few key metrics from benchmarks.json.
+
+The database lives in the results root as .results-catalog.sqlite (in memory
+if the root is read-only) and is refreshed incrementally on open:
+
+    catalog = ResultsCatalog(results_dir)
+    catalog.refresh()
+    catalog.latest("benchmarks.json", model_dir="meta-llama__Llama-3.2-1B")
+    catalog.find("vllm-metrics.ndjson")
+
+Run `python results_catalog.py RESULTS_DIR` after a run completes (or with
+--rebuild to start over).
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    from .benchmarks_reader import read_benchmarks
+except ImportError:
+    # Imported as a top-level module with shared/ on sys.path
+    from benchmarks_reader import read_benchmarks
+
+CATALOG_FILENAME = ".results-catalog.sqlite"
+
+# Bump when the schema or the extracted fields change; older catalogs are rebuilt
+SCHEMA_VERSION = 1
+
+# Directories modified this recently are listed again on the next refresh, in
+# case a later change in the same mtime tick (1-2 s on some filesystems) is hidden
+MTIME_SETTLE_NS = 2_000_000_000
+
+# Files recorded by the catalog; a directory holding either of RUN_MARKERS is a run
+TRACKED_FILES = (
+    "benchmarks.json",
+    "test-metadata.json",
+    "vllm-metrics.ndjson",
+    "vllm-metrics.json",
+    "run_summary.json",
+    "quality-results.json",
+)
+RUN_MARKERS = ("benchmarks.json", "test-metadata.json")
+
+PathLike = Union[str, Path]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_info (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    settled INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_by_name ON files (name, mtime_ns);
+CREATE INDEX IF NOT EXISTS files_by_dir ON files (dir);
+CREATE TABLE IF NOT EXISTS runs (
+    dir TEXT PRIMARY KEY,
+    model TEXT,
+    suite TEXT,
+    workload TEXT,
+    cores INTEGER,
+    platform TEXT,
+    test_run_id TEXT,
+    timestamp TEXT,
+    num_benchmarks INTEGER,
+    max_concurrency REAL,
+    peak_output_tok_per_sec REAL,
+    peak_req_per_sec REAL
+);
+CREATE INDEX IF NOT EXISTS runs_by_model ON runs (model);
+CREATE INDEX IF NOT EXISTS runs_by_suite ON runs (suite);
+CREATE INDEX IF NOT EXISTS runs_by_timestamp ON runs (timestamp);
+CREATE TABLE IF NOT EXISTS run_parts (part TEXT NOT NULL, dir TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS run_parts_by_part ON run_parts (part);
+CREATE INDEX IF NOT EXISTS run_parts_by_dir ON run_parts (dir);
+"""
+
+
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _load_benchmarks(path: Path) -> Optional[Dict[str, Any]]:
+    # Streamed: per-request records can make benchmarks.json several GB
+    try:
+        data = read_benchmarks(path)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _successful_mean(metrics: Dict[str, Any], key: str) -> Optional[float]:
+    value = metrics.get(key)
+    if isinstance(value, dict):
+        for status in ("successful", "total"):
+            stats = value.get(status)
+            if isinstance(stats, dict) and stats.get("mean") is not None:
+                return stats["mean"]
+    return None
+
+
+def summarize_benchmarks(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Key metrics of a GuideLLM benchmarks.json for the runs table."""
+    benchmarks = data.get("benchmarks") or []
+    concurrencies = []
+    output_rates = []
+    request_rates = []
+    for benchmark in benchmarks:
+        strategy = benchmark.get("config", {}).get("strategy", {})
+        concurrency = strategy.get("max_concurrency") or strategy.get("streams")
+        if isinstance(concurrency, (int, float)):
+            concurrencies.append(concurrency)
+        metrics = benchmark.get("metrics", {})
+        output_rate = _successful_mean(metrics, "output_tokens_per_second")
+        if output_rate is not None:
+            output_rates.append(output_rate)
+        request_rate = _successful_mean(metrics, "requests_per_second")
+        if request_rate is not None:
+            request_rates.append(request_rate)
+    return {
+        "num_benchmarks": len(benchmarks),
+        "max_concurrency": max(concurrencies) if concurrencies else None,
+        "peak_output_tok_per_sec": max(output_rates) if output_rates else None,
+        "peak_req_per_sec": max(request_rates) if request_rates else None,
+    }
+
+
+def summarize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Run attributes from a test-metadata.json for the runs table."""
+    configuration = metadata.get("configuration")
+    cores = (
+        metadata.get("core_count")
+        or metadata.get("cores")
+        or (configuration.get("cores") if isinstance(configuration, dict) else None)
+    )
+    try:
+        cores = int(cores) if cores is not None else None
+    except (TypeError, ValueError):
+        cores = None
+    return {
+        "model": metadata.get("model"),
+        "suite": metadata.get("suite") or metadata.get("test_type") or metadata.get("test_name"),
+        "workload": metadata.get("workload") or metadata.get("use_case"),
+        "cores": cores,
+        "platform": metadata.get("platform"),
+        "test_run_id": metadata.get("test_run_id"),
+        "timestamp": metadata.get("timestamp"),
+    }
+
+
+class ResultsCatalog:
+    """Incrementally maintained catalog of one results root.
+
+    Paths are stored relative to the root (POSIX separators); query methods
+    return absolute Paths.
+    """
+
+    def __init__(self, root: PathLike, db_path: Optional[PathLike] = None):
+        self.root = Path(root)
+        self.db_path = Path(db_path) if db_path else self.root / CATALOG_FILENAME
+        self.conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            self._init_schema(conn)
+        except sqlite3.Error:
+            # Read-only or missing root: keep a throwaway catalog in memory
+            conn = sqlite3.connect(":memory:")
+            self._init_schema(conn)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _init_schema(conn: sqlite3.Connection) -> None:
+        conn.executescript(_SCHEMA)
+        row = conn.execute(
+            "SELECT value FROM catalog_info WHERE key = 'schema_version'"
+        ).fetchone()
+        if row is None or row[0] != str(SCHEMA_VERSION):
+            with conn:
+                for table in ("dirs", "files", "runs", "run_parts"):
+                    conn.execute(f"DELETE FROM {table}")
+                conn.execute(
+                    "INSERT OR REPLACE INTO catalog_info VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),),
+                )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsCatalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _abs(self, rel: str) -> Path:
+        return self.root / rel if rel else self.root
+
+    def rebuild(self) -> int:
+        """Drop everything and index the root from scratch."""
+        with self.conn:
+            for table in ("dirs", "files", "runs", "run_parts"):
+                self.conn.execute(f"DELETE FROM {table}")
+        return self.refresh()
+
+    def refresh(self) -> int:
+        """Bring the catalog up to date with the filesystem.
+
+        Directories whose mtime is unchanged are not listed again (their
+        known subdirectories and tracked files are stat()ed instead), and
+        only runs with new, changed or removed files are re-read.
+
+        Returns:
+            Number of runs (re)indexed or removed
+        """
+        conn = self.conn
+        # Only settled directories may skip listing; see MTIME_SETTLE_NS
+        known_dirs = {
+            row["path"]: row["mtime_ns"] if row["settled"] else None
+            for row in conn.execute("SELECT path, mtime_ns, settled FROM dirs")
+        }
+        subdirs_of: Dict[str, List[str]] = defaultdict(list)
+        for path in known_dirs:
+            if path:
+                subdirs_of[path.rpartition("/")[0]].append(path)
+        known_files = {
+            row["path"]: (row["size"], row["mtime_ns"])
+            for row in conn.execute("SELECT path, size, mtime_ns FROM files")
+        }
+        files_of: Dict[str, List[str]] = defaultdict(list)
+        for path in known_files:
+            files_of[path.rpartition("/")[0]].append(path.rpartition("/")[2])
+
+        seen_dirs = set()
+        seen_files = set()
+        dir_updates = []
+        file_updates = []
+        changed_runs = set()
+
+        stack = [""] if self.root.is_dir() else []
+        while stack:
+            rel = stack.pop()
+            full = self._abs(rel)
+            try:
+                mtime_ns = os.stat(full).st_mtime_ns
+            except OSError:
+                continue
+            seen_dirs.add(rel)
+
+            if known_dirs.get(rel) == mtime_ns:
+                subdirs = subdirs_of.get(rel, [])
+                names = files_of.get(rel, [])
+            else:
+                subdirs, names = [], []
+                try:
+                    with os.scandir(full) as entries:
+                        for entry in entries:
+                            if entry.name.startswith("."):
+                                continue
+                            child = f"{rel}/{entry.name}" if rel else entry.name
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(child)
+                            elif entry.name in TRACKED_FILES:
+                                names.append(entry.name)
+                except OSError:
+                    continue
+                settled = time.time_ns() - mtime_ns > MTIME_SETTLE_NS
+                dir_updates.append((rel, mtime_ns, int(settled)))
+
+            for name in names:
+                path = f"{rel}/{name}" if rel else name
+                try:
+                    st = os.stat(self._abs(path))
+                except OSError:
+                    continue
+                seen_files.add(path)
+                stamp = (st.st_size, st.st_mtime_ns)
+                if known_files.get(path) != stamp:
+                    file_updates.append((path, rel, name) + stamp)
+                    changed_runs.add(rel)
+            stack.extend(subdirs)
+
+        removed_dirs = [path for path in known_dirs if path not in seen_dirs]
+        removed_files = [path for path in known_files if path not in seen_files]
+        changed_runs.update(path.rpartition("/")[0] for path in removed_files)
+
+        with conn:
+            conn.executemany("DELETE FROM dirs WHERE path = ?", [(p,) for p in removed_dirs])
+            conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed_files])
+            conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", dir_updates)
+            conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", file_updates)
+            for run_dir in changed_runs:
+                self._index_run(run_dir)
+        return len(changed_runs)
+
+    def _index_run(self, run_dir: str) -> None:
+        conn = self.conn
+        conn.execute("DELETE FROM runs WHERE dir = ?", (run_dir,))
+        conn.execute("DELETE FROM run_parts WHERE dir = ?", (run_dir,))
+        names = {
+            row[0] for row in conn.execute("SELECT name FROM files WHERE dir = ?", (run_dir,))
+        }
+        if not names.intersection(RUN_MARKERS):
+            return
+
+        row: Dict[str, Any] = {"dir": run_dir}
+        if "test-metadata.json" in names:
+            metadata = _load_json(self._abs(run_dir) / "test-metadata.json")
+            if metadata:
+                row.update(summarize_metadata(metadata))
+        if "benchmarks.json" in names:
+            benchmarks = _load_benchmarks(self._abs(run_dir) / "benchmarks.json")
+            if benchmarks:
+                row.update(summarize_benchmarks(benchmarks))
+
+        columns = ", ".join(row)
+        placeholders = ", ".join("?" for _ in row)
+        conn.execute(f"INSERT INTO runs ({columns}) VALUES ({placeholders})", list(row.values()))
+        conn.executemany(
+            "INSERT INTO run_parts VALUES (?, ?)",
+            [(part, run_dir) for part in set(run_dir.split("/")) if part],
+        )
+
+    def find(self, filename: str) -> List[Path]:
+        """All tracked files with this name under the root (rglob equivalent)."""
+        rows = self.conn.execute(
+            "SELECT path FROM files WHERE name = ? ORDER BY path", (filename,)
+        )
+        return [self._abs(row[0]) for row in rows]
+
+    def runs(
+        self,
+        marker: str = "benchmarks.json",
+        model_dir: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run directories holding `marker`, most recently modified first.
+
+        Args:
+            marker: File a run directory must contain
+            model_dir: Only runs with a path component equal to this
+                (sanitized model name, "/" replaced by "__")
+            limit: Maximum number of runs
+
+        Returns:
+            Run rows as dicts with an absolute "path" and the directory "mtime_ns"
+        """
+        query = (
+            "SELECT runs.*, dirs.mtime_ns FROM runs"
+            " JOIN files ON files.dir = runs.dir AND files.name = ?"
+            " JOIN dirs ON dirs.path = runs.dir"
+        )
+        params: List[Any] = [marker]
+        if model_dir:
+            query += " WHERE runs.dir IN (SELECT dir FROM run_parts WHERE part = ?)"
+            params.append(model_dir)
+        query += " ORDER BY dirs.mtime_ns DESC, runs.dir DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        result = []
+        for row in self.conn.execute(query, params):
+            record = dict(row)
+            record["path"] = self._abs(record["dir"])
+            result.append(record)
+        return result
+
+    def latest(self, marker: str = "benchmarks.json", model_dir: Optional[str] = None) -> Optional[Path]:
+        """Most recently modified run directory holding `marker`."""
+        runs = self.runs(marker, model_dir=model_dir, limit=1)
+        return runs[0]["path"] if runs else None
+
+    def count(self, marker: str = "test-metadata.json") -> int:
+        """Number of run directories holding `marker`."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM files WHERE name = ?", (marker,)
+        ).fetchone()[0]
+
+    def fingerprint(self) -> str:
+        """Token that changes whenever a directory or tracked file under the root does.
+
+        The root's own mtime is left out: the catalog database and its journal
+        live there and would change it on every write.
+        """
+        dirs = self.conn.execute(
+            "SELECT COUNT(*), MAX(mtime_ns) FROM dirs WHERE path != ''"
+        ).fetchone()
+        files = self.conn.execute(
+            "SELECT COUNT(*), SUM(size), MAX(mtime_ns) FROM files"
+        ).fetchone()
+        return ":".join(str(value or 0) for value in (*dirs, *files))
+
+
+def open_catalog(root: PathLike) -> ResultsCatalog:
+    """Open the catalog of a results root and refresh it."""
+    catalog = ResultsCatalog(root)
+    catalog.refresh()
+    return catalog
+
+
+def find_files(root: PathLike, filename: str) -> List[Path]:
+    """Tracked files named `filename` under root, via a refreshed catalog."""
+    with open_catalog(root) as catalog:
+        return catalog.find(filename)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Update the results catalog of a results directory")
+    parser.add_argument("root", help="Results directory (e.g. results/llm)")
+    parser.add_argument("--rebuild", action="store_true", help="Re-index everything from scratch")
+    args = parser.parse_args()
+
+    if not Path(args.root).is_dir():
+        print(f"Warning: results directory not found: {args.root}", file=sys.stderr)
+        return 0
+    with ResultsCatalog(args.root) as catalog:
+        changed = catalog.rebuild() if args.rebuild else catalog.refresh()
+        print(f"✓ Results catalog updated: {changed} run(s) indexed, "
+              f"{catalog.count('benchmarks.json')} benchmark result(s) in {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Columnar Parquet store for normalised benchmark result tables.
+
+The dashboards used to rebuild their DataFrames from raw JSON on every cache
+miss. The store keeps each normalised table (client, server, embedding, audio,
+offline_batch) as a Hive-partitioned Parquet dataset next to the results it
+was built from:
+
+    results/llm/.store/client/model=.../workload=chat/cores=16/month=2026-07/part-0.parquet
+    results/llm/.store/client/_manifest.json
+
+Partition keys are model, workload and cores (from the table columns named
+in PARTITION_SOURCES: the workload of the LLM tables, the scenario or use
+case of the others) and the run month, so readers filtering on them only
+open the matching files, and `columns=` reads only the requested columns.
+Months rather than days keep the file count low: reading a month of results
+opens one file per model/workload/cores combination instead of one per run.
+
+The manifest records the results catalog fingerprint at build time; a table
+is current while that fingerprint is unchanged (see results_catalog.py).
+
+pyarrow is optional and only imported when a table is read or written:
+without it, available() returns False and callers fall back to the JSON
+loaders.
+"""
+
+import importlib.util
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+STORE_DIRNAME = ".store"
+MANIFEST_FILENAME = "_manifest.json"
+
+# Bump when the on-disk layout or a table's columns change; tables with
+# another version are rebuilt
+STORE_VERSION = 3
+
+# Columns supplying the "workload" and "cores" partition keys of each table
+PARTITION_SOURCES = {
+    "client": ("workload", "cores"),
+    "server": ("workload", "cores"),
+    "embedding": ("scenario", "requested_cores"),
+    "audio": ("scenario", "cores"),
+    "offline_batch": ("use_case_slug", "cores"),
+}
+TABLES = tuple(PARTITION_SOURCES)
+
+PARTITION_COLUMNS = ("model", "workload", "cores", "month")
+
+# pyarrow caps partitions per write at 1024 by default, a few months of results
+MAX_PARTITIONS = 1_000_000
+
+_RUN_ID_DATE_RE = re.compile(r"(20\d{2})(\d{2})\d{2}-\d{6}")
+_ISO_DATE_RE = re.compile(r"^(\d{4}-\d{2})-\d{2}")
+
+PathLike = Union[str, Path]
+
+
+def available() -> bool:
+    """Whether pyarrow is installed, i.e. the store can be read and written."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _partition_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("model", pa.string()),
+        ("workload", pa.string()),
+        ("cores", pa.int64()),
+        ("month", pa.string()),
+    ])
+
+
+def table_path(results_dir: PathLike, table: str) -> Path:
+    """Directory holding one table of the store under a results directory."""
+    return Path(results_dir) / STORE_DIRNAME / table
+
+
+def run_month(timestamp: Any = None, test_run_id: Any = None) -> str:
+    """Month partition (YYYY-MM) from an ISO timestamp or a *-YYYYMMDD-HHMMSS run id."""
+    if isinstance(timestamp, pd.Timestamp) and not pd.isna(timestamp):
+        return timestamp.strftime("%Y-%m")
+    match = _ISO_DATE_RE.match(str(timestamp or ""))
+    if match:
+        return match.group(1)
+    match = _RUN_ID_DATE_RE.search(str(test_run_id or ""))
+    if match:
+        return "-".join(match.groups())
+    return "unknown"
+
+
+def _partition_keys(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """Copy of df with the partition columns filled in."""
+    out = df.copy()
+    out["model"] = out["model"].fillna("unknown").astype(str) if "model" in out else "unknown"
+    workload_column, cores_column = PARTITION_SOURCES[table]
+    if workload_column in out:
+        workload = out[workload_column].fillna("").astype(str)
+        out["workload"] = workload.where(workload != "", "unknown")
+    else:
+        out["workload"] = "unknown"
+    if cores_column in out:
+        cores = pd.to_numeric(out[cores_column], errors="coerce")
+        out["cores"] = cores.fillna(0).astype("int64")
+    else:
+        out["cores"] = 0
+    timestamps = out["timestamp"] if "timestamp" in out else [None] * len(out)
+    run_ids = out["test_run_id"] if "test_run_id" in out else [None] * len(out)
+    out["month"] = [run_month(ts, run_id) for ts, run_id in zip(timestamps, run_ids)]
+    return out
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Make object columns storable: nested values as JSON, mixed scalars as strings."""
+    out = df.copy()
+    for column in out.columns[out.dtypes == object]:
+        values = out[column].dropna()
+        if values.empty:
+            continue
+        if values.map(lambda v: isinstance(v, (dict, list))).any():
+            out[column] = out[column].map(
+                lambda v: json.dumps(v) if isinstance(v, (dict, list)) else v
+            )
+            values = out[column].dropna()
+        if values.map(type).nunique() > 1:
+            out[column] = out[column].map(lambda v: v if pd.isna(v) else str(v))
+    return out
+
+
+def read_manifest(results_dir: PathLike, table: str) -> Optional[Dict[str, Any]]:
+    """Manifest of a stored table, or None if it was never written."""
+    try:
+        with open(table_path(results_dir, table) / MANIFEST_FILENAME) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("store_version") != STORE_VERSION:
+        return None
+    return manifest
+
+
+def is_current(results_dir: PathLike, table: str, fingerprint: Optional[str]) -> bool:
+    """Whether the stored table was built from results with this fingerprint.
+
+    Tables hold absolute result paths, so a moved results directory is stale too.
+    """
+    manifest = read_manifest(results_dir, table)
+    return bool(available() and manifest and fingerprint
+                and manifest.get("source_fingerprint") == fingerprint
+                and manifest.get("source_dir") == str(Path(results_dir).resolve()))
+
+
+def write_table(
+    results_dir: PathLike,
+    table: str,
+    df: pd.DataFrame,
+    source_fingerprint: Optional[str] = None,
+) -> Path:
+    """Replace one table of the store with df.
+
+    The new table is written next to the old one and swapped in, so readers
+    never see a partial table.
+
+    Args:
+        results_dir: Results directory the table was built from
+        table: Table name (one of TABLES)
+        df: Normalised table as built by the dashboard loaders
+        source_fingerprint: Results catalog fingerprint of results_dir
+
+    Returns:
+        Path to the written table
+    """
+    if not available():
+        raise ImportError("pyarrow is required for the results store: pip install pyarrow")
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if table not in PARTITION_SOURCES:
+        raise ValueError(f"Unknown table '{table}', expected one of {', '.join(TABLES)}")
+
+    target = table_path(results_dir, table)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.parent / f".{table}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+
+    if not df.empty:
+        data = pa.Table.from_pandas(_arrow_safe(_partition_keys(df, table)), preserve_index=False)
+        ds.write_dataset(
+            data,
+            staging,
+            format="parquet",
+            partitioning=ds.partitioning(_partition_schema(), flavor="hive"),
+            basename_template="part-{i}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_partitions=MAX_PARTITIONS,
+        )
+
+    manifest = {
+        "store_version": STORE_VERSION,
+        "table": table,
+        "columns": [str(column) for column in df.columns],
+        "rows": len(df),
+        "built_at": time.time(),
+        "source_dir": str(Path(results_dir).resolve()),
+        "source_fingerprint": source_fingerprint,
+    }
+    with open(staging / MANIFEST_FILENAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    retired = target.parent / f".{table}.old-{os.getpid()}"
+    if target.exists():
+        target.rename(retired)
+    staging.rename(target)
+    shutil.rmtree(retired, ignore_errors=True)
+    return target
+
+
+def _filter_expression(filters: Dict[str, Any]):
+    import pyarrow.dataset as ds
+
+    expression = None
+    for column, value in filters.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            term = ds.field(column).isin(list(value))
+        else:
+            term = ds.field(column) == value
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def filter_frame(
+    df: pd.DataFrame,
+    table: str,
+    columns: Optional[Iterable[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """Apply read_table's columns and filters to a table held in memory.
+
+    Used when a table is built from JSON instead of read from the store, so
+    both paths return the same rows and columns.
+    """
+    if df.empty:
+        return df if columns is None else df.reindex(columns=list(columns))
+    keyed = _partition_keys(df, table)
+    mask = pd.Series(True, index=keyed.index)
+    for column, value in (filters or {}).items():
+        values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        mask &= keyed[column].isin(values) if column in keyed else False
+    wanted = list(columns) if columns is not None else list(df.columns)
+    return keyed.loc[mask].reindex(columns=wanted).reset_index(drop=True)
+
+
+def read_table(
+    results_dir: PathLike,
+    table: str,
+    columns: Optional[Iterable[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """Read a stored table.
+
+    Args:
+        results_dir: Results directory the table was built from
+        table: Table name (one of TABLES)
+        columns: Columns to read (default: all columns of the original table)
+        filters: {column: value or list of values}; filters on partition
+            columns (model, workload, cores, month) skip whole files
+
+    Returns:
+        The table as a DataFrame (empty if the table was never written)
+    """
+    manifest = read_manifest(results_dir, table)
+    if not available() or manifest is None:
+        return pd.DataFrame()
+    import pyarrow.dataset as ds
+
+    wanted: List[str] = list(columns) if columns is not None else manifest["columns"]
+    if manifest["rows"] == 0:
+        return pd.DataFrame(columns=wanted)
+
+    dataset = ds.dataset(
+        table_path(results_dir, table),
+        format="parquet",
+        partitioning=ds.partitioning(_partition_schema(), flavor="hive"),
+        exclude_invalid_files=True,
+        ignore_prefixes=[".", "_"],
+    )
+    present = [column for column in wanted if column in dataset.schema.names]
+    data = dataset.to_table(
+        columns=present,
+        filter=_filter_expression(filters) if filters else None,
+    )
+    df = data.to_pandas()
+    return df.reindex(columns=wanted)
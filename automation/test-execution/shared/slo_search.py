@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""Adaptive search for the highest load that meets a latency SLO.
+
+A fixed grid of streams or rates spends most of its points far below
+saturation or far past it. SLOSearch measures one load point at a time
+and picks the next from what it has seen:
+
+1. Bracket: start at the minimum load and double it while the SLO holds,
+   up to the maximum.
+2. Bisect: between the highest passing and the lowest failing point, on a
+   log scale (load ratios matter, not differences), until the two are
+   within the resolution.
+3. Refine: a point whose confidence interval straddles an SLO threshold is
+   measured again and its requests pooled, which tightens the interval.
+   If it still straddles after max_repeats measurements, the point sits on
+   the knee within measurement precision and the search stops there.
+
+A point passes when, for every SLO metric, the upper bound of the
+confidence interval of its quantile (p95 by default) is within the
+threshold, and fails when the lower bound of any of them is above it. The
+interval is the distribution-free order-statistic interval of the quantile,
+read from the point's pooled latency histogram.
+
+    search = SLOSearch(parse_slo("ttft_ms=2000,itl_ms=100"), high=128)
+    while (point := search.next_point()) is not None:
+        histograms = measure(point)          # {"ttft_ms": LatencyHistogram, ...}
+        search.record(point, histograms)
+    search.report()                          # knee, bracket and every point
+
+The search state serialises to JSON (save / load), so a driver that runs
+each point as a separate process (the Ansible adaptive profile) can resume
+it between points.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+try:
+    from .latency_histogram import LatencyHistogram, quantile_label
+except ImportError:
+    # Imported as a top-level module with shared/ on sys.path
+    from latency_histogram import LatencyHistogram, quantile_label
+
+STATE_VERSION = 1
+
+# SLO metric names and the histogram (LoadGenMetrics.histograms key) each reads
+SLO_METRICS = {
+    "ttft_ms": "ttft_ms",
+    "itl_ms": "itl_ms",
+    "tpot_ms": "tpot_ms",
+    "e2e_ms": "latency_ms",
+    "latency_ms": "latency_ms",
+}
+
+# Load kinds: GuideLLM profile and the profile field the load point sets
+SEARCH_KINDS = {
+    "concurrent": "streams",
+    "constant": "rate",
+    "poisson": "rate",
+}
+
+PASS = "pass"
+FAIL = "fail"
+INCONCLUSIVE = "inconclusive"
+
+# Stop reasons
+KNEE_FOUND = "knee within resolution"
+KNEE_WITHIN_CI = "knee within confidence interval"
+MAX_LOAD_MEETS_SLO = "maximum load meets the SLO"
+MIN_LOAD_FAILS_SLO = "minimum load violates the SLO"
+POINT_BUDGET = "point budget exhausted"
+
+Number = Union[int, float]
+
+
+def parse_slo(spec: Union[str, Mapping[str, Any]]) -> Dict[str, float]:
+    """SLO thresholds (milliseconds) from 'ttft_ms=2000,itl_ms=100' or a mapping.
+
+    Raises:
+        ValueError: If a metric is unknown or a threshold is not positive
+    """
+    if isinstance(spec, Mapping):
+        items = list(spec.items())
+    else:
+        items = []
+        for part in (spec or "").split(","):
+            if not part.strip():
+                continue
+            if "=" not in part:
+                raise ValueError(f"Invalid SLO '{part}' (expected METRIC=MS, e.g. ttft_ms=2000)")
+            items.append(tuple(part.split("=", 1)))
+    slo = {}
+    for metric, threshold in items:
+        metric = str(metric).strip()
+        if metric not in SLO_METRICS:
+            raise ValueError(
+                f"Unknown SLO metric '{metric}' (expected one of: {', '.join(SLO_METRICS)})"
+            )
+        try:
+            value = float(threshold)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid SLO threshold for {metric}: '{threshold}'")
+        if value <= 0:
+            raise ValueError(f"SLO threshold for {metric} must be positive, got {value}")
+        slo[metric] = value
+    if not slo:
+        raise ValueError("SLO is empty (expected e.g. ttft_ms=2000,itl_ms=100)")
+    return slo
+
+
+def quantile_ranks(n: int, q: float, confidence: float) -> Tuple[int, int]:
+    """Ranks (1-based) of the order statistics bounding the q-quantile of n values.
+
+    The k-th smallest of n values lies below the q-quantile with
+    probability Binomial(n, q).cdf(k - 1); the bounds are the ranks
+    n*q -/+ z * sqrt(n*q*(1-q)) (normal approximation). A rank below 1 or
+    above n means the bound lies beyond the sample.
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    spread = z * math.sqrt(n * q * (1 - q))
+    return math.floor(n * q - spread), math.ceil(n * q + spread)
+
+
+def quantile_interval(
+    histogram: LatencyHistogram, q: float, confidence: float
+) -> Dict[str, float]:
+    """Quantile of a histogram with its distribution-free confidence interval.
+
+    The bounds are the order statistics at quantile_ranks(). Bounds beyond
+    the sample are open (-inf / inf), so a point with few requests is never
+    judged on them.
+    """
+    n = histogram.count
+    value = histogram.quantile(q)
+    low_rank, high_rank = quantile_ranks(n, q, confidence)
+    # Nearest-rank quantiles: (rank - 0.5) / n selects exactly that rank
+    low = histogram.quantile((low_rank - 0.5) / n) if low_rank >= 1 else -math.inf
+    high = histogram.quantile((high_rank - 0.5) / n) if high_rank <= n else math.inf
+    return {"value": value, "low": low, "high": high}
+
+
+class SLOSearch:
+    """Search state: the measured points and the next point to measure."""
+
+    def __init__(
+        self,
+        slo: Mapping[str, float],
+        kind: str = "concurrent",
+        low: Number = 1,
+        high: Number = 128,
+        quantile: float = 0.95,
+        confidence: float = 0.95,
+        resolution: float = 0.1,
+        max_points: int = 12,
+        max_repeats: int = 2,
+    ):
+        """
+        Args:
+            slo: Threshold (ms) per SLO metric (parse_slo())
+            kind: Load kind (SEARCH_KINDS): concurrent streams or a request rate
+            low: Smallest load to measure
+            high: Largest load to measure
+            quantile: SLO quantile (0.95 for p95)
+            confidence: Confidence level of the quantile intervals
+            resolution: Stop when failing / passing load is within 1 + resolution
+            max_points: Most measurements, repeats included
+            max_repeats: Most measurements of one load point
+        """
+        if kind not in SEARCH_KINDS:
+            raise ValueError(f"Invalid search kind '{kind}' (expected one of: {', '.join(SEARCH_KINDS)})")
+        if not 0 < low <= high:
+            raise ValueError(f"Search range must satisfy 0 < low <= high, got {low}..{high}")
+        if kind == "concurrent" and (int(low) != low or int(high) != high):
+            raise ValueError("Concurrent search range must be whole streams")
+        if not 0 < quantile < 1 or not 0 < confidence < 1:
+            raise ValueError("quantile and confidence must be in (0, 1)")
+        if resolution <= 0 or max_points < 1 or max_repeats < 1:
+            raise ValueError("resolution, max_points and max_repeats must be positive")
+        self.slo = dict(parse_slo(slo))
+        self.kind = kind
+        self.low = int(low) if kind == "concurrent" else float(low)
+        self.high = int(high) if kind == "concurrent" else float(high)
+        self.quantile = quantile
+        self.confidence = confidence
+        self.resolution = resolution
+        self.max_points = max_points
+        self.max_repeats = max_repeats
+        self.points: List[Dict[str, Any]] = []
+        self.measurements = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "slo": self.slo,
+            "kind": self.kind,
+            "low": self.low,
+            "high": self.high,
+            "quantile": self.quantile,
+            "confidence": self.confidence,
+            "resolution": self.resolution,
+            "max_points": self.max_points,
+            "max_repeats": self.max_repeats,
+            "measurements": self.measurements,
+            "points": self.points,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SLOSearch":
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported SLO search state version: {data.get('version')}")
+        search = cls(
+            data["slo"],
+            kind=data["kind"],
+            low=data["low"],
+            high=data["high"],
+            quantile=data["quantile"],
+            confidence=data["confidence"],
+            resolution=data["resolution"],
+            max_points=data["max_points"],
+            max_repeats=data["max_repeats"],
+        )
+        search.points = [dict(point) for point in data.get("points", [])]
+        search.measurements = int(data.get("measurements", 0))
+        return search
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the state atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        staging.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+        staging.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SLOSearch":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def _load(self, value: Number) -> Number:
+        return int(round(value)) if self.kind == "concurrent" else round(float(value), 3)
+
+    def _point(self, load: Number) -> Optional[Dict[str, Any]]:
+        for point in self.points:
+            if point["load"] == load:
+                return point
+        return None
+
+    def point_dir(self, load: Number) -> str:
+        """Result subdirectory of a load point's next measurement."""
+        point = self._point(load)
+        repeat = point["measurements"] + 1 if point else 1
+        name = f"{self.measurements + 1:02d}-{self.kind}-{load:g}"
+        return f"slo-search/{name}" + (f"-r{repeat}" if repeat > 1 else "")
+
+    def record(
+        self,
+        load: Number,
+        histograms: Mapping[str, LatencyHistogram],
+        benchmarks: Optional[str] = None,
+        failed_requests: int = 0,
+    ) -> Dict[str, Any]:
+        """Add a measurement of a load point and judge the point against the SLO.
+
+        Repeated measurements of a load are pooled before judging.
+
+        Args:
+            load: Measured streams or rate
+            histograms: Latency histograms of the measurement (LoadGenMetrics.histograms)
+            benchmarks: Result file of the measurement (for the report)
+            failed_requests: Requests that errored (reported, not judged)
+
+        Returns:
+            The point: load, verdict, per-metric quantile and interval
+        """
+        load = self._load(load)
+        point = self._point(load)
+        if point is None:
+            point = {"load": load, "measurements": 0, "histograms": {}, "benchmarks": [],
+                     "failed_requests": 0}
+            self.points.append(point)
+        point["measurements"] += 1
+        point["failed_requests"] += failed_requests
+        if benchmarks:
+            point["benchmarks"].append(str(benchmarks))
+        for metric in self.slo:
+            name = SLO_METRICS[metric]
+            pooled = LatencyHistogram.from_json(point["histograms"].get(name)) or LatencyHistogram()
+            if histograms.get(name) is not None:
+                pooled.merge(histograms[name])
+            point["histograms"][name] = pooled.to_json()
+        self.measurements += 1
+        self._judge(point)
+        self.points.sort(key=lambda p: p["load"])
+        return point
+
+    def _judge(self, point: Dict[str, Any]) -> None:
+        metrics = {}
+        verdicts = []
+        for metric, threshold in self.slo.items():
+            histogram = LatencyHistogram.from_json(point["histograms"].get(SLO_METRICS[metric]))
+            if not histogram or not histogram.count:
+                # No successful requests: the SLO is not met
+                metrics[metric] = {"value": None, "low": None, "high": None, "slo": threshold,
+                                   "requests": 0}
+                verdicts.append(FAIL)
+                continue
+            interval = quantile_interval(histogram, self.quantile, self.confidence)
+            metrics[metric] = {**interval, "slo": threshold, "requests": histogram.count}
+            if interval["low"] > threshold:
+                verdicts.append(FAIL)
+            elif interval["high"] <= threshold:
+                verdicts.append(PASS)
+            else:
+                verdicts.append(INCONCLUSIVE)
+        point["metrics"] = {
+            metric: {key: (None if isinstance(v, float) and math.isinf(v) else v)
+                     for key, v in values.items()}
+            for metric, values in metrics.items()
+        }
+        if FAIL in verdicts:
+            point["verdict"] = FAIL
+        elif INCONCLUSIVE in verdicts:
+            point["verdict"] = INCONCLUSIVE
+        else:
+            point["verdict"] = PASS
+
+    def _settled(self, point: Dict[str, Any]) -> bool:
+        return point["verdict"] != INCONCLUSIVE or point["measurements"] >= self.max_repeats
+
+    def bracket(self) -> Dict[str, Optional[Number]]:
+        """Highest passing and lowest failing load (None when not found yet)."""
+        passing = [p["load"] for p in self.points if p["verdict"] == PASS]
+        failing = [p["load"] for p in self.points if p["verdict"] == FAIL]
+        highest_pass = max(passing) if passing else None
+        above = [load for load in failing if highest_pass is None or load > highest_pass]
+        return {"pass": highest_pass, "fail": min(above) if above else None}
+
+    @property
+    def knee(self) -> Optional[Number]:
+        """Highest load measured to meet the SLO."""
+        return self.bracket()["pass"]
+
+    def _decide(self) -> Dict[str, Any]:
+        """The next load to measure, or why the search is over."""
+        refine = [p for p in self.points if not self._settled(p)]
+        if self.measurements >= self.max_points:
+            return {"load": None, "reason": POINT_BUDGET}
+        if refine:
+            return {"load": refine[0]["load"], "reason": None}
+        if not self.points:
+            return {"load": self.low, "reason": None}
+
+        bracket = self.bracket()
+        lo, hi = bracket["pass"], bracket["fail"]
+        knee = [p["load"] for p in self.points
+                if p["verdict"] == INCONCLUSIVE and (lo is None or p["load"] > lo)
+                and (hi is None or p["load"] < hi)]
+        if knee:
+            return {"load": None, "reason": KNEE_WITHIN_CI}
+        if lo is None:
+            return {"load": None, "reason": MIN_LOAD_FAILS_SLO}
+        if hi is None:
+            if lo >= self.high:
+                return {"load": None, "reason": MAX_LOAD_MEETS_SLO}
+            return {"load": self._load(min(self.high, lo * 2)), "reason": None}
+        if hi <= lo * (1 + self.resolution):
+            return {"load": None, "reason": KNEE_FOUND}
+        mid = self._load(math.sqrt(lo * hi))
+        if mid <= lo or mid >= hi:
+            return {"load": None, "reason": KNEE_FOUND}
+        return {"load": mid, "reason": None}
+
+    def next_point(self) -> Optional[Number]:
+        """The next load to measure; None when the search is over."""
+        return self._decide()["load"]
+
+    @property
+    def done(self) -> bool:
+        return self.next_point() is None
+
+    @property
+    def stop_reason(self) -> Optional[str]:
+        return self._decide()["reason"]
+
+    def report(self) -> Dict[str, Any]:
+        """Knee, bracket, stop reason and every measured point."""
+        return {
+            "kind": self.kind,
+            "load_field": SEARCH_KINDS[self.kind],
+            "slo": self.slo,
+            "quantile": quantile_label(self.quantile),
+            "confidence": self.confidence,
+            "knee": self.knee,
+            "bracket": self.bracket(),
+            "done": self.done,
+            "stop_reason": self.stop_reason,
+            "measurements": self.measurements,
+            "points": [
+                {key: value for key, value in point.items() if key != "histograms"}
+                for point in self.points
+            ],
+        }
+
+
+def search_from_options(options: Mapping[str, Any]) -> SLOSearch:
+    """Search from load generator extra args, resumed from its state file if any.
+
+    Keys: slo (required for a new search), search_kind, search_min,
+    search_max, search_max_points, search_resolution and search_state (path
+    of the state file).
+    """
+    state = options.get("search_state")
+    if state and Path(state).is_file():
+        return SLOSearch.load(state)
+    if not options.get("slo"):
+        raise ValueError("The adaptive profile needs an SLO (e.g. slo=ttft_ms=2000,itl_ms=100)")
+    kind = options.get("search_kind", "concurrent")
+    cast = int if kind == "concurrent" else float
+    return SLOSearch(
+        parse_slo(options["slo"]),
+        kind=kind,
+        low=cast(options.get("search_min", 1)),
+        high=cast(options.get("search_max", 128)),
+        resolution=float(options.get("search_resolution", 0.1)),
+        max_points=int(options.get("search_max_points", 12)),
+    )
+
+
+def merge_benchmarks(paths: List[Union[str, Path]]) -> Dict[str, Any]:
+    """One benchmarks.json document holding the benchmarks of several files.
+
+    Load points measured as separate GuideLLM runs become the sweep points
+    of a single report, in the order given.
+    """
+    merged: Dict[str, Any] = {}
+    benchmarks: List[Any] = []
+    for path in paths:
+        with open(path) as f:
+            document = json.load(f)
+        if not merged:
+            merged = {key: value for key, value in document.items() if key != "benchmarks"}
+        benchmarks.extend(document.get("benchmarks", []))
+    merged["benchmarks"] = benchmarks
+    return merged
@@ -0,0 +1,103 @@
+"""Tests for the incremental benchmarks.json reader."""
+
+import json
+import math
+
+import pytest
+
+from shared.benchmarks_reader import REQUEST_ARRAYS_KEY, read_benchmarks
+
+
+def make_document():
+    benchmarks = []
+    for concurrency in (1, 4):
+        benchmarks.append({
+            "config": {"strategy": {"max_concurrency": concurrency}, "run_id": f"r{concurrency}"},
+            "metrics": {
+                "request_latency": {"successful": {"mean": 1.5e-1 * concurrency}},
+                "request_totals": {"total": 3, "successful": 2},
+            },
+            "scheduler_metrics": {"start_time": 1.7e9, "end_time": 1.7e9 + 60},
+            "requests": {
+                "successful": [
+                    {"request_latency": 0.5 * concurrency, "output_tokens": 128,
+                     "output": "a \"quoted\" \\ text, with [brackets] {braces}"},
+                    {"request_latency": -1.25e-3, "info": {"timings": {"request_start": 10.5}}},
+                ],
+                "errored": [{"request_latency": 3, "error": "timeout"}],
+                "incomplete": [],
+            },
+        })
+    return {
+        "metadata": {"guidellm_version": "0.7.0"},
+        "args": {"data": ["prompt_tokens=512,output_tokens=128"]},
+        "benchmarks": benchmarks,
+        "trailer": [True, False, None],
+    }
+
+
+def without_requests(document):
+    return {
+        **document,
+        "benchmarks": [
+            {k: v for k, v in b.items() if k != "requests"} for b in document["benchmarks"]
+        ],
+    }
+
+
+@pytest.fixture
+def benchmarks_file(tmp_path):
+    path = tmp_path / "benchmarks.json"
+    path.write_text(json.dumps(make_document(), indent=2))
+    return path
+
+
+class TestReadBenchmarks:
+    """Tests for read_benchmarks()."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+    def test_skips_requests(self, benchmarks_file, chunk_size):
+        result = read_benchmarks(benchmarks_file, chunk_size=chunk_size)
+        assert result == without_requests(make_document())
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+    def test_request_arrays(self, benchmarks_file, chunk_size):
+        result = read_benchmarks(
+            benchmarks_file,
+            request_fields=["request_latency", "output_tokens", "info.timings.request_start"],
+            chunk_size=chunk_size,
+        )
+        benchmark = result["benchmarks"][1]
+        assert "requests" not in benchmark
+        arrays = benchmark[REQUEST_ARRAYS_KEY]
+        assert sorted(arrays) == ["errored", "incomplete", "successful"]
+        assert list(arrays["successful"]["request_latency"]) == [2.0, -1.25e-3]
+        output_tokens = list(arrays["successful"]["output_tokens"])
+        assert output_tokens[0] == 128 and math.isnan(output_tokens[1])
+        request_start = list(arrays["successful"]["info.timings.request_start"])
+        assert math.isnan(request_start[0]) and request_start[1] == 10.5
+        assert list(arrays["errored"]["request_latency"]) == [3.0]
+        assert len(arrays["incomplete"]["request_latency"]) == 0
+        assert arrays["successful"]["request_latency"].dtype == "float64"
+
+    def test_non_object_document(self, tmp_path):
+        path = tmp_path / "benchmarks.json"
+        path.write_text("[1, 2]")
+        assert read_benchmarks(path) == [1, 2]
+
+    @pytest.mark.parametrize("text", [
+        '{"benchmarks": [',
+        '{"benchmarks": []} extra',
+        '{"benchmarks" []}',
+        '{"benchmarks": [{"requests": {"successful": [1, ]}}]}',
+        '{"benchmarks": [{"config": {} "metrics": {}}]}',
+    ])
+    def test_malformed(self, tmp_path, text):
+        path = tmp_path / "benchmarks.json"
+        path.write_text(text)
+        with pytest.raises(json.JSONDecodeError):
+            read_benchmarks(path, chunk_size=4)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            read_benchmarks(tmp_path / "missing.json")
@@ -0,0 +1,220 @@
+"""Tests for the early stop controller."""
+
+import json
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from shared.early_stop import (
+    CONVERGED,
+    SLO_VIOLATED,
+    EarlyStopController,
+    allowlist_error,
+    bucket_quantile_interval,
+    check_metrics_file,
+    controller_from_options,
+    write_decision,
+)
+from shared.latency_histogram import LatencyHistogram
+
+TEST_EXECUTION_DIR = Path(__file__).resolve().parents[2]
+TTFT = "vllm:time_to_first_token_seconds"
+# vLLM's TTFT bucket bounds (seconds), up to 10 s
+TTFT_BOUNDS = [0.001, 0.005, 0.01, 0.02, 0.04, 0.06, 0.08, 0.1, 0.25, 0.5,
+               0.75, 1.0, 2.5, 5.0, 7.5, 10.0, math.inf]
+
+
+def ttft_sample(unix_time, ttft_s):
+    """Collector sample with the TTFT histogram of all requests so far (seconds)."""
+    counts = np.searchsorted(np.sort(ttft_s), TTFT_BOUNDS, side="right")
+    return {
+        "unix_time": float(unix_time),
+        "elapsed_seconds": float(unix_time - 1000),
+        "metrics": {f"{TTFT}_bucket": [
+            {"labels": {"le": "+Inf" if math.isinf(le) else str(le)}, "value": float(count)}
+            for le, count in zip(TTFT_BOUNDS, counts)
+        ]},
+    }
+
+
+def stream(path, ttft_s, per_sample, start=1000, interval=10):
+    """Write a metrics stream completing `per_sample` requests every interval."""
+    lines = [json.dumps(ttft_sample(start + i * interval, ttft_s[:i * per_sample]))
+             for i in range(len(ttft_s) // per_sample + 1)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestBucketQuantileInterval:
+    """Tests for bucket_quantile_interval."""
+
+    def test_brackets_interpolated_quantile(self):
+        bounds = np.array([100.0, 500.0, 1000.0, math.inf])
+        counts = np.array([100.0, 600.0, 1000.0, 1000.0])
+        interval = bucket_quantile_interval(bounds, counts, 0.95, 0.95)
+        # rank 950 lies 350/400 into (500, 1000]
+        assert interval["value"] == pytest.approx(500 + 500 * 350 / 400)
+        assert interval["low"] < interval["value"] < interval["high"] <= 1000
+
+    def test_open_bounds(self):
+        bounds = np.array([100.0, math.inf])
+        assert bucket_quantile_interval(bounds, np.array([0.0, 0.0]), 0.95, 0.95)["high"] == math.inf
+        # p95 in the +Inf bucket has no finite estimate
+        interval = bucket_quantile_interval(bounds, np.array([50.0, 100.0]), 0.95, 0.95)
+        assert math.isnan(interval["value"]) and interval["high"] == math.inf
+
+
+class TestEarlyStopController:
+    """Tests for EarlyStopController."""
+
+    def test_converges_with_enough_requests(self):
+        rng = np.random.default_rng(7)
+        controller = EarlyStopController(tolerance=0.1, min_requests=100, min_seconds=0)
+        few = controller.evaluate(LatencyHistogram().add(rng.lognormal(5, 0.4, 150)), 30)
+        assert not few["stop"] and few["reason"] is None
+        many = controller.evaluate(LatencyHistogram().add(rng.lognormal(5, 0.4, 20000)), 30)
+        assert many["stop"] and many["reason"] == CONVERGED
+        assert many["relative_width"] <= 0.1
+        assert many["quantile"] == "p95" and many["requests"] == 20000
+
+    def test_slo_violated_beyond_doubt(self):
+        histogram = LatencyHistogram().add(np.linspace(9000, 11000, 300))
+        controller = EarlyStopController(slo_ms=1000, tolerance=0.001, min_seconds=0)
+        assert controller.evaluate(histogram, 5)["reason"] == SLO_VIOLATED
+        # Not violated by the required factor: keep running
+        strict = EarlyStopController(slo_ms=1000, violation_factor=20, tolerance=0.001, min_seconds=0)
+        assert not strict.evaluate(histogram, 5)["stop"]
+
+    def test_guards(self):
+        histogram = LatencyHistogram().add(np.full(1000, 100.0))
+        controller = EarlyStopController(min_requests=2000, min_seconds=0)
+        assert not controller.evaluate(histogram, 600)["stop"]
+        controller = EarlyStopController(min_requests=10, min_seconds=60)
+        assert not controller.evaluate(histogram, 59)["stop"]
+        assert controller.evaluate(histogram, 60)["stop"]
+
+    def test_decision_is_json_safe(self):
+        decision = EarlyStopController().evaluate(LatencyHistogram(), 0)
+        assert decision["value"] is None and decision["high"] is None
+        json.dumps(decision, allow_nan=False)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"metric": "p95"}, {"tolerance": 0}, {"slo_ms": -1}, {"quantile": 1.5},
+        {"violation_factor": 0.5},
+    ])
+    def test_invalid(self, kwargs):
+        with pytest.raises(ValueError):
+            EarlyStopController(**kwargs)
+
+    def test_from_options_reads_slo_spec(self):
+        controller = controller_from_options({"metric": "e2e_ms", "slo": "ttft_ms=500,latency_ms=9000"})
+        assert controller.slo_ms == 9000
+        assert controller_from_options({"slo": "itl_ms=50"}).slo_ms is None
+        assert controller_from_options({"slo_ms": "700", "min_requests": "50"}).min_requests == 50
+
+
+class TestCheckMetricsFile:
+    """Tests for evaluating the streamed vLLM metrics."""
+
+    def test_stops_once_stable(self, tmp_path):
+        rng = np.random.default_rng(1)
+        ttft_s = rng.lognormal(np.log(0.3), 0.3, 12000)
+        controller = EarlyStopController(tolerance=0.1, min_requests=200, min_seconds=60)
+
+        # Poll the stream as it grows, like the benchmark role does
+        for requests in range(1000, len(ttft_s) + 1, 1000):
+            path = stream(tmp_path / "vllm-metrics.ndjson", ttft_s[:requests], per_sample=100)
+            decision = check_metrics_file(path, controller, since=1000)
+            if decision["stop"]:
+                break
+        assert decision["reason"] == CONVERGED and decision["source"] == TTFT
+        assert decision["requests"] <= len(ttft_s) // 2
+        assert decision["elapsed_seconds"] == decision["requests"] // 10
+
+        # p95 TTFT when stopped close to that of all requests
+        assert decision["value"] == pytest.approx(np.quantile(ttft_s, 0.95) * 1000, rel=0.05)
+
+    def test_window_starts_at_the_point(self, tmp_path):
+        # Requests before the point started are not counted
+        ttft_s = np.concatenate([np.full(500, 9.0), np.full(500, 0.2)])
+        path = stream(tmp_path / "vllm-metrics.ndjson", ttft_s, per_sample=100)
+        controller = EarlyStopController(slo_ms=1000, min_requests=100, min_seconds=0)
+        decision = check_metrics_file(path, controller, since=1050)
+        assert decision["requests"] == 500
+        assert decision["high"] <= 250
+        assert decision["reason"] == CONVERGED
+
+    def test_missing_or_empty_stream_keeps_running(self, tmp_path):
+        controller = EarlyStopController(min_requests=0, min_seconds=0)
+        assert not check_metrics_file(tmp_path / "missing.ndjson", controller, since=0)["stop"]
+        path = stream(tmp_path / "vllm-metrics.ndjson", np.full(100, 0.2), per_sample=100)
+        decision = check_metrics_file(path, controller, since=5000)
+        assert not decision["stop"] and decision["requests"] == 0
+
+
+    def test_missing_histogram_warns(self, tmp_path):
+        # e.g. the collector allowlist dropped the e2e latency histogram
+        path = stream(tmp_path / "vllm-metrics.ndjson", np.full(1000, 0.2), per_sample=100)
+        decision = check_metrics_file(path, EarlyStopController("e2e_ms"), since=1000)
+        assert decision["source"] is None and not decision["stop"]
+        assert "vllm:e2e_request_latency_seconds" in decision["warning"]
+        decision = check_metrics_file(path, EarlyStopController("ttft_ms"), since=1000)
+        assert "warning" not in decision
+
+
+def test_allowlist_error():
+    assert allowlist_error("ttft_ms", []) is None
+    assert allowlist_error("ttft_ms", ["vllm:*"]) is None
+    assert allowlist_error("ttft_ms", [TTFT]) is None
+    assert allowlist_error("ttft_ms", [f"{TTFT}_bucket"]) is None
+    assert allowlist_error("itl_ms", ["vllm:time_per_output_token_seconds"]) is None
+    assert TTFT in allowlist_error("ttft_ms", ["vllm:num_requests_*", f"{TTFT}_sum"])
+
+
+def test_write_decision(tmp_path):
+    path = write_decision(tmp_path / "point" / "early-stop.json", {"stop": True})
+    assert json.loads(path.read_text()) == {"stop": True}
+
+
+def test_loadgens_cli(tmp_path):
+    path = stream(tmp_path / "vllm-metrics.ndjson", np.full(1000, 5.0), per_sample=100)
+    out = tmp_path / "early-stop.json"
+    result = subprocess.run(
+        [sys.executable, "-m", "shared.loadgens", "early-stop", "--metrics", str(path),
+         "--since", "1000", "--slo", "ttft_ms=1000", "--out", str(out)],
+        capture_output=True, text=True, cwd=TEST_EXECUTION_DIR,
+    )
+    assert result.returncode == 0, result.stderr
+    decision = json.loads(result.stdout)
+    assert decision["reason"] == SLO_VIOLATED and decision["since"] == 1000
+    assert json.loads(out.read_text()) == decision
+
+    points = []
+    for streams in (1, 2):
+        point = tmp_path / f"{streams}.json"
+        point.write_text(json.dumps({"benchmarks": [{"streams": streams}]}))
+        points.append(str(point))
+    merged = tmp_path / "benchmarks.json"
+    result = subprocess.run(
+        [sys.executable, "-m", "shared.loadgens", "merge-benchmarks", str(merged), *points],
+        capture_output=True, text=True, cwd=TEST_EXECUTION_DIR,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(merged.read_text())["benchmarks"] == [{"streams": 1}, {"streams": 2}]
+
+
+def test_loadgens_cli_check(tmp_path):
+    def check(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "shared.loadgens", "early-stop", "--check", *args],
+            capture_output=True, text=True, cwd=TEST_EXECUTION_DIR,
+        )
+
+    assert check("--allowlist", "vllm:*").returncode == 0
+    result = check("--allowlist", "process_cpu_seconds_total")
+    assert result.returncode == 1 and TTFT in json.loads(result.stderr)["error"]
+    assert check().returncode == 0
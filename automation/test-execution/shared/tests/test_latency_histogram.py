@@ -0,0 +1,79 @@
+"""Tests for mergeable latency histograms."""
+
+import math
+
+import numpy as np
+import pytest
+
+from shared.latency_histogram import (
+    REPORT_QUANTILES,
+    LatencyHistogram,
+    quantile_label,
+)
+
+
+def nearest_rank(values, q):
+    values = np.sort(values)
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(7)
+    # Three repetitions with different latency distributions (ms)
+    return [rng.lognormal(mean, 0.6, size) for mean, size in ((4, 5000), (4.5, 3000), (5, 200))]
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_quantiles_within_accuracy(self, samples):
+        values = samples[0]
+        histogram = LatencyHistogram().add(values)
+        assert histogram.count == len(values)
+        assert histogram.mean == pytest.approx(values.mean())
+        for q in REPORT_QUANTILES:
+            assert histogram.quantile(q) == pytest.approx(nearest_rank(values, q), rel=0.01)
+        assert histogram.quantile(0) == values.min()
+        assert histogram.quantile(1) == pytest.approx(values.max(), rel=0.01)
+
+    def test_merge_is_exact(self, samples):
+        merged = LatencyHistogram.merged(LatencyHistogram().add(v) for v in samples)
+        pooled = np.concatenate(samples)
+        direct = LatencyHistogram().add(pooled).to_dict()
+        merged_dict = merged.to_dict()
+        # Sums differ only in floating-point summation order
+        assert merged_dict.pop("total") == pytest.approx(direct.pop("total"))
+        assert merged_dict == direct
+
+        for q in REPORT_QUANTILES:
+            assert merged.quantile(q) == pytest.approx(nearest_rank(pooled, q), rel=0.01)
+
+    def test_zero_and_nan_values(self):
+        histogram = LatencyHistogram().add([0.0, 0.0, float("nan"), 5.0])
+        assert histogram.count == 3
+        assert histogram.zero_count == 2
+        assert histogram.quantile(0.5) == 0.0
+        assert histogram.quantile(0.99) == 5.0
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert math.isnan(histogram.quantile(0.5))
+        assert math.isnan(histogram.mean)
+        assert LatencyHistogram.merged([None]).count == 0
+
+    def test_json_round_trip(self, samples):
+        histogram = LatencyHistogram().add(samples[1])
+        restored = LatencyHistogram.from_json(histogram.to_json())
+        assert restored == histogram
+        assert restored.quantiles() == histogram.quantiles()
+        assert LatencyHistogram.from_json(None) is None
+        assert LatencyHistogram.from_json(float("nan")) is None
+
+    def test_merge_different_accuracy(self):
+        with pytest.raises(ValueError):
+            LatencyHistogram(0.01).merge(LatencyHistogram(0.02))
+
+    @pytest.mark.parametrize("q,label", [(0.5, "p50"), (0.95, "p95"), (0.99, "p99"), (0.999, "p999")])
+    def test_quantile_label(self, q, label):
+        assert quantile_label(q) == label
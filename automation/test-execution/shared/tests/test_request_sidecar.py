@@ -0,0 +1,125 @@
+"""Tests for the per-request Arrow sidecar."""
+
+import json
+import math
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from shared.benchmarks_reader import read_benchmarks  # noqa: E402
+from shared.request_sidecar import (  # noqa: E402
+    COLUMNS,
+    HISTOGRAMS,
+    REQUEST_FIELDS,
+    extract_sidecar,
+    is_current,
+    read_request_arrays,
+    read_sidecar,
+    request_columns,
+    request_histograms,
+    sidecar_path,
+)
+
+
+def make_document():
+    return {
+        "benchmarks": [
+            {
+                "config": {"strategy": {"max_concurrency": 1}},
+                "requests": {
+                    "successful": [
+                        # GuideLLM 0.5+: timings nested under info
+                        {"prompt_tokens": 512, "output_tokens": 128,
+                         "info": {"timings": {"request_start": 100.0,
+                                              "first_token_iteration": 100.25,
+                                              "request_end": 103.0}}},
+                        # Top-level timestamps
+                        {"prompt_tokens": 256, "output_tokens": 64,
+                         "request_start_time": 200.0, "first_token_time": 200.5,
+                         "request_end_time": 202.0},
+                    ],
+                    "errored": [{"prompt_tokens": 512, "request_start_time": 300.0}],
+                },
+            },
+            {
+                "config": {"strategy": {"max_concurrency": 4}},
+                "requests": {
+                    "successful": [
+                        # Durations only
+                        {"prompt_tokens": 512, "output_tokens": 128, "start_time": 400.0,
+                         "time_to_first_token_ms": 500.0, "request_latency": 4.0},
+                    ],
+                },
+            },
+        ]
+    }
+
+
+@pytest.fixture
+def benchmarks_file(tmp_path):
+    path = tmp_path / "benchmarks.json"
+    path.write_text(json.dumps(make_document()))
+    return path
+
+
+class TestRequestSidecar:
+    """Tests for writing and reading sidecars."""
+
+    def test_extract_and_read(self, benchmarks_file):
+        path = extract_sidecar(benchmarks_file)
+        assert path == sidecar_path(benchmarks_file)
+
+        arrays = read_request_arrays(path)
+        assert list(arrays) == list(COLUMNS)
+        assert list(arrays["sweep_index"]) == [0, 0, 0, 1]
+        assert list(arrays["status"]) == ["successful", "successful", "errored", "successful"]
+        assert list(arrays["start"]) == [100.0, 200.0, 300.0, 400.0]
+        assert list(arrays["first_token"][:2]) == [100.25, 200.5]
+        assert math.isnan(arrays["first_token"][2])
+        assert arrays["first_token"][3] == 400.5
+        assert list(arrays["end"][[0, 1, 3]]) == [103.0, 202.0, 404.0]
+        assert list(arrays["prompt_tokens"]) == [512, 256, 512, 512]
+        assert math.isnan(arrays["output_tokens"][2])
+
+    def test_zero_copy_columns(self, benchmarks_file):
+        arrays = read_request_arrays(extract_sidecar(benchmarks_file), ["start", "end"])
+        assert list(arrays) == ["start", "end"]
+        assert not arrays["start"].flags["OWNDATA"]
+
+    def test_no_requests(self, tmp_path):
+        path = tmp_path / "benchmarks.json"
+        path.write_text(json.dumps({"benchmarks": [{"config": {}}]}))
+        table = read_sidecar(extract_sidecar(path))
+        assert table.num_rows == 0
+        assert table.column_names == list(COLUMNS)
+
+    def test_is_current(self, benchmarks_file):
+        assert not is_current(benchmarks_file)
+        path = extract_sidecar(benchmarks_file)
+        assert is_current(benchmarks_file)
+
+        stat = os.stat(path)
+        os.utime(benchmarks_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert not is_current(benchmarks_file)
+
+        path.write_bytes(b"not arrow")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        assert not is_current(benchmarks_file)
+
+    def test_request_histograms(self, benchmarks_file):
+        document = read_benchmarks(benchmarks_file, request_fields=REQUEST_FIELDS)
+        columns = request_columns(document)
+
+        first = request_histograms(columns, 0)
+        assert sorted(first) == sorted(HISTOGRAMS)
+        assert first["ttft_ms"].count == 2  # errored requests are left out
+        assert first["ttft_ms"].min == 250.0 and first["ttft_ms"].max == 500.0
+        assert first["request_latency_ms"].max == 3000.0
+        assert first["tpot_ms"].min == pytest.approx(3000.0 / 128)
+        assert first["itl_ms"].max == pytest.approx(1500.0 / 63)
+
+        pooled = request_histograms(columns)
+        assert pooled["ttft_ms"] == first["ttft_ms"].merge(request_histograms(columns, 1)["ttft_ms"])
+        assert request_histograms(columns, 5) == {}
@@ -0,0 +1,150 @@
+"""Tests for the SQLite results catalog."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from shared.results_catalog import CATALOG_FILENAME, ResultsCatalog
+
+# Old enough for directories to count as settled
+OLD = 1_600_000_000
+
+
+def make_run(root, model, run, mtime, output_rates=(10.0, 20.0), metadata=None):
+    """Create a run directory with benchmarks.json and test-metadata.json."""
+    run_dir = root / model / run
+    run_dir.mkdir(parents=True)
+    (run_dir / "benchmarks.json").write_text(json.dumps({"benchmarks": [
+        {
+            "config": {"strategy": {"max_concurrency": 2 ** i}},
+            "metrics": {"output_tokens_per_second": {"successful": {"mean": rate}}},
+        }
+        for i, rate in enumerate(output_rates)
+    ]}))
+    (run_dir / "test-metadata.json").write_text(json.dumps(metadata or {
+        "model": model.replace("__", "/"), "workload": "chat", "core_count": 16,
+        "test_run_id": run, "timestamp": "2026-01-01T00:00:00",
+    }))
+    settle(root, mtime)
+    return run_dir
+
+
+def settle(root, mtime):
+    """Backdate every directory under root; run dirs keep their own order."""
+    for dirpath, _, _ in os.walk(root):
+        if dirpath != str(root) and os.path.basename(dirpath).startswith("run"):
+            continue
+        os.utime(dirpath, (OLD, OLD))
+    for dirpath, _, _ in os.walk(root):
+        if os.path.basename(dirpath).startswith("run") and os.stat(dirpath).st_mtime > OLD + 10_000:
+            os.utime(dirpath, (mtime, mtime))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    make_run(tmp_path, "org__model-a", "run-1", OLD + 100)
+    make_run(tmp_path, "org__model-a", "run-2", OLD + 300)
+    make_run(tmp_path, "org__model-b", "run-1", OLD + 200, output_rates=(5.0,))
+    return tmp_path
+
+
+class TestResultsCatalog:
+    """Tests for catalog indexing and queries."""
+
+    def test_find_matches_rglob(self, tree):
+        with ResultsCatalog(tree) as catalog:
+            catalog.refresh()
+            assert catalog.find("benchmarks.json") == sorted(tree.rglob("benchmarks.json"))
+            assert catalog.count("test-metadata.json") == 3
+        assert (tree / CATALOG_FILENAME).exists()
+
+    def test_run_fields(self, tree):
+        with ResultsCatalog(tree) as catalog:
+            catalog.refresh()
+            run = catalog.runs(model_dir="org__model-b")[0]
+        assert run["path"] == tree / "org__model-b" / "run-1"
+        assert run["model"] == "org/model-b"
+        assert run["cores"] == 16
+        assert run["num_benchmarks"] == 1
+        assert run["peak_output_tok_per_sec"] == 5.0
+
+    def test_request_records_not_loaded(self, tree, monkeypatch):
+        """Indexing streams benchmarks.json, skipping per-request records."""
+        run_dir = tree / "org__model-b" / "run-1"
+        (run_dir / "benchmarks.json").write_text(json.dumps({"benchmarks": [{
+            "config": {"strategy": {"max_concurrency": 1}},
+            "metrics": {"output_tokens_per_second": {"successful": {"mean": 7.0}}},
+            "requests": {"successful": [{"output_tokens": 1}] * 1000},
+        }]}))
+        json_load = json.load
+
+        def load(f, *args, **kwargs):
+            assert not f.name.endswith("benchmarks.json"), "benchmarks.json loaded in full"
+            return json_load(f, *args, **kwargs)
+
+        monkeypatch.setattr(json, "load", load)
+        with ResultsCatalog(tree) as catalog:
+            catalog.refresh()
+            run = catalog.runs(model_dir="org__model-b")[0]
+        assert run["peak_output_tok_per_sec"] == 7.0
+
+    def test_latest_by_directory_mtime(self, tree):
+        with ResultsCatalog(tree) as catalog:
+            catalog.refresh()
+            assert catalog.latest() == tree / "org__model-a" / "run-2"
+            assert catalog.latest(model_dir="org__model-b") == tree / "org__model-b" / "run-1"
+            assert catalog.latest(model_dir="org__model-c") is None
+            assert [r["dir"] for r in catalog.runs(limit=2)] == [
+                "org__model-a/run-2", "org__model-b/run-1",
+            ]
+
+    def test_refresh_is_incremental(self, tree):
+        with ResultsCatalog(tree) as catalog:
+            assert catalog.refresh() == 3
+            assert catalog.refresh() == 0
+
+            # Rewritten in place: the directory mtime does not change
+            bench = tree / "org__model-b" / "run-1" / "benchmarks.json"
+            bench.write_text(json.dumps({"benchmarks": []}))
+            os.utime(bench.parent, (OLD + 200, OLD + 200))
+            assert catalog.refresh() == 1
+            assert catalog.runs(model_dir="org__model-b")[0]["num_benchmarks"] == 0
+
+    def test_added_and_removed_runs(self, tree):
+        with ResultsCatalog(tree) as catalog:
+            catalog.refresh()
+            shutil.rmtree(tree / "org__model-a" / "run-2")
+            make_run(tree, "org__model-c", "run-1", OLD + 400)
+            assert catalog.refresh() == 2
+            assert catalog.latest() == tree / "org__model-c" / "run-1"
+            assert len(catalog.find("benchmarks.json")) == 3
+
+    def test_catalog_persists_between_opens(self, tree):
+        with ResultsCatalog(tree) as catalog:
+            catalog.refresh()
+        with ResultsCatalog(tree) as catalog:
+            assert catalog.refresh() == 0
+            assert catalog.latest() == tree / "org__model-a" / "run-2"
+
+    def test_unwritable_location_uses_memory(self, tree):
+        with ResultsCatalog(tree, db_path=tree / "missing" / "catalog.sqlite") as catalog:
+            catalog.refresh()
+            assert catalog.count("benchmarks.json") == 3
+
+    def test_missing_root(self, tmp_path):
+        with ResultsCatalog(tmp_path / "absent") as catalog:
+            assert catalog.refresh() == 0
+            assert catalog.latest() is None
+
+    def test_fingerprint_tracks_changes(self, tree):
+        with ResultsCatalog(tree) as catalog:
+            catalog.refresh()
+            before = catalog.fingerprint()
+            catalog.refresh()
+            assert catalog.fingerprint() == before
+
+            (tree / "org__model-a" / "run-1" / "benchmarks.json").write_text("{}")
+            catalog.refresh()
+            assert catalog.fingerprint() != before
@@ -0,0 +1,145 @@
+"""Tests for the Parquet results store."""
+
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from shared.results_store import (  # noqa: E402
+    MANIFEST_FILENAME,
+    filter_frame,
+    is_current,
+    read_manifest,
+    read_table,
+    run_month,
+    table_path,
+    write_table,
+)
+
+
+def client_rows():
+    rows = []
+    for model, workload, cores, run_id in [
+        ("org/model-a", "chat", 16, "20260701-100000"),
+        ("org/model-a", "chat", 32, "20260702-100000"),
+        ("org/model-a", "code", 16, "20260801-100000"),
+        ("org/model-b", "chat", 16, "20260703-100000"),
+    ]:
+        for concurrency in (1, 8):
+            rows.append({
+                "test_run_id": run_id,
+                "model": model,
+                "workload": workload,
+                "cores": cores,
+                "concurrency": concurrency,
+                "throughput_mean": cores * concurrency * 1.5,
+            })
+    return pd.DataFrame(rows)
+
+
+def sort_by(df, column):
+    return df.sort_values(column).reset_index(drop=True)
+
+
+def sort(df):
+    return df.sort_values(["test_run_id", "concurrency"]).reset_index(drop=True)
+
+
+class TestResultsStore:
+    """Tests for writing and reading store tables."""
+
+    def test_round_trip(self, tmp_path):
+        df = client_rows()
+        write_table(tmp_path, "client", df, "fp-1")
+        result = read_table(tmp_path, "client")
+        assert list(result.columns) == list(df.columns)
+        pd.testing.assert_frame_equal(sort(result), sort(df))
+
+    def test_partition_layout(self, tmp_path):
+        write_table(tmp_path, "client", client_rows())
+        files = sorted(
+            p.relative_to(table_path(tmp_path, "client")).parent.as_posix()
+            for p in table_path(tmp_path, "client").rglob("*.parquet")
+        )
+        assert files == [
+            "model=org%2Fmodel-a/workload=chat/cores=16/month=2026-07",
+            "model=org%2Fmodel-a/workload=chat/cores=32/month=2026-07",
+            "model=org%2Fmodel-a/workload=code/cores=16/month=2026-08",
+            "model=org%2Fmodel-b/workload=chat/cores=16/month=2026-07",
+        ]
+
+    def test_columns_and_filters(self, tmp_path):
+        write_table(tmp_path, "client", client_rows())
+        result = read_table(
+            tmp_path, "client",
+            columns=["model", "throughput_mean"],
+            filters={"model": "org/model-a", "cores": [16], "month": "2026-07"},
+        )
+        assert list(result.columns) == ["model", "throughput_mean"]
+        assert sorted(result["throughput_mean"]) == [24.0, 192.0]
+
+    def test_filter_frame_matches_store(self, tmp_path):
+        df = client_rows()
+        write_table(tmp_path, "client", df)
+        columns = ["model", "workload", "month", "throughput_mean"]
+        filters = {"workload": "chat", "cores": [16], "month": ["2026-07"]}
+        stored = read_table(tmp_path, "client", columns=columns, filters=filters)
+        in_memory = filter_frame(df, "client", columns=columns, filters=filters)
+        pd.testing.assert_frame_equal(
+            sort_by(in_memory, "throughput_mean"), sort_by(stored, "throughput_mean")
+        )
+        assert sorted(in_memory["model"]) == ["org/model-a"] * 2 + ["org/model-b"] * 2
+
+    def test_mixed_and_nested_values(self, tmp_path):
+        df = pd.DataFrame([
+            {"model": "m", "workload": "chat", "cores": "N/A", "bitrate": 128, "info": {"a": 1}},
+            {"model": "m", "workload": "chat", "cores": 8, "bitrate": "unknown", "info": {"a": 2}},
+        ])
+        write_table(tmp_path, "server", df)
+        result = read_table(tmp_path, "server").sort_values("cores").reset_index(drop=True)
+        assert list(result["cores"]) == [0, 8]
+        assert list(result["bitrate"]) == ["128", "unknown"]
+        assert [json.loads(v) for v in result["info"]] == [{"a": 1}, {"a": 2}]
+
+    def test_rewrite_replaces_table(self, tmp_path):
+        write_table(tmp_path, "client", client_rows())
+        write_table(tmp_path, "client", client_rows().iloc[:2])
+        assert len(read_table(tmp_path, "client")) == 2
+        assert [p.name for p in (tmp_path / ".store").iterdir()] == ["client"]
+
+    def test_empty_table(self, tmp_path):
+        write_table(tmp_path, "embedding", pd.DataFrame())
+        assert read_manifest(tmp_path, "embedding")["rows"] == 0
+        assert read_table(tmp_path, "embedding").empty
+
+    def test_missing_table(self, tmp_path):
+        assert read_manifest(tmp_path, "client") is None
+        assert read_table(tmp_path, "client").empty
+
+    def test_unknown_table(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown table"):
+            write_table(tmp_path, "bogus", client_rows())
+
+    def test_is_current(self, tmp_path):
+        write_table(tmp_path, "client", client_rows(), "fp-1")
+        assert is_current(tmp_path, "client", "fp-1")
+        assert not is_current(tmp_path, "client", "fp-2")
+        assert not is_current(tmp_path, "audio", "fp-1")
+
+        manifest_path = table_path(tmp_path, "client") / MANIFEST_FILENAME
+        manifest = json.loads(manifest_path.read_text())
+        manifest["source_dir"] = "/elsewhere"
+        manifest_path.write_text(json.dumps(manifest))
+        assert not is_current(tmp_path, "client", "fp-1")
+
+
+class TestRunMonth:
+    """Tests for the month partition key."""
+
+    def test_sources(self):
+        assert run_month("2026-07-29T16:53:11") == "2026-07"
+        assert run_month(pd.Timestamp("2026-07-29")) == "2026-07"
+        assert run_month(None, "chat-20260729-165311") == "2026-07"
+        assert run_month("", "no-date") == "unknown"
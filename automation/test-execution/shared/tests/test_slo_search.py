@@ -0,0 +1,236 @@
+"""Tests for the adaptive SLO search."""
+
+import json
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from shared.latency_histogram import LatencyHistogram
+from shared.slo_search import (
+    FAIL,
+    INCONCLUSIVE,
+    KNEE_FOUND,
+    KNEE_WITHIN_CI,
+    MAX_LOAD_MEETS_SLO,
+    MIN_LOAD_FAILS_SLO,
+    PASS,
+    POINT_BUDGET,
+    SLOSearch,
+    merge_benchmarks,
+    parse_slo,
+    quantile_interval,
+    search_from_options,
+)
+
+TEST_EXECUTION_DIR = Path(__file__).resolve().parents[2]
+
+
+def server(knee, rng=None, requests=400):
+    """Measures a server whose p95 TTFT (ms) climbs steeply past `knee` streams."""
+    rng = rng or np.random.default_rng(3)
+
+    def measure(load):
+        median = 200 * (1 + max(0, load - knee) ** 1.5 / 5)
+        return {"ttft_ms": LatencyHistogram().add(rng.lognormal(np.log(median), 0.3, requests))}
+
+    return measure
+
+
+def run(search, measure):
+    loads = []
+    while (load := search.next_point()) is not None:
+        loads.append(load)
+        search.record(load, measure(load))
+    return loads
+
+
+class TestParseSLO:
+    """Tests for parse_slo."""
+
+    def test_spec_and_mapping(self):
+        assert parse_slo("ttft_ms=2000, itl_ms=100,e2e_ms=3e4") == {
+            "ttft_ms": 2000.0, "itl_ms": 100.0, "e2e_ms": 30000.0,
+        }
+        assert parse_slo({"tpot_ms": "50"}) == {"tpot_ms": 50.0}
+
+    @pytest.mark.parametrize("spec", ["", "ttft_ms", "p95=10", "ttft_ms=fast", "itl_ms=0"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_slo(spec)
+
+
+class TestQuantileInterval:
+    """Tests for quantile_interval."""
+
+    def test_covers_true_quantile(self):
+        rng = np.random.default_rng(11)
+        true_p95 = math.exp(5 + 0.5 * 1.6448536)
+        covered = 0
+        for _ in range(200):
+            interval = quantile_interval(
+                LatencyHistogram().add(rng.lognormal(5, 0.5, 500)), 0.95, 0.95
+            )
+            assert interval["low"] <= interval["value"] <= interval["high"]
+            covered += interval["low"] <= true_p95 <= interval["high"]
+        assert covered >= 180  # ~95% nominal coverage
+
+    def test_few_requests_are_open(self):
+        interval = quantile_interval(LatencyHistogram().add([10.0, 20.0]), 0.95, 0.95)
+        assert interval["high"] == math.inf
+
+    def test_more_requests_tighten(self):
+        rng = np.random.default_rng(5)
+        widths = [
+            quantile_interval(LatencyHistogram().add(rng.lognormal(5, 0.5, n)), 0.95, 0.95)
+            for n in (200, 5000)
+        ]
+        assert widths[1]["high"] - widths[1]["low"] < widths[0]["high"] - widths[0]["low"]
+
+
+class TestSLOSearch:
+    """Tests for SLOSearch."""
+
+    def test_finds_knee_with_few_points(self):
+        search = SLOSearch(parse_slo("ttft_ms=600"), high=128)
+        loads = run(search, server(knee=24))
+
+        assert loads[:6] == [1, 2, 4, 8, 16, 32]  # bracket by doubling
+        assert len(loads) < 12
+        report = search.report()
+        assert report["stop_reason"] == KNEE_FOUND
+        bracket = report["bracket"]
+        assert 24 <= bracket["pass"] < bracket["fail"] <= 1.1 * bracket["pass"]
+        assert report["knee"] == bracket["pass"]
+        assert [p["load"] for p in report["points"]] == sorted(set(loads))
+        assert "histograms" not in report["points"][0]
+        assert report["quantile"] == "p95"
+
+    def test_rate_search(self):
+        search = SLOSearch(parse_slo("ttft_ms=600"), kind="poisson", low=0.5, high=64)
+        run(search, server(knee=10))
+        assert search.stop_reason == KNEE_FOUND
+        # p95 = 1.64 x median reaches 600 ms at 12.6 requests/s
+        assert 11.5 <= search.knee <= 12.6
+        assert isinstance(search.knee, float)
+
+    def test_stops_at_range_limits(self):
+        search = SLOSearch(parse_slo("ttft_ms=600"), high=20)
+        assert run(search, server(knee=1000)) == [1, 2, 4, 8, 16, 20]
+        assert search.stop_reason == MAX_LOAD_MEETS_SLO
+
+        search = SLOSearch(parse_slo("ttft_ms=100"), high=20)
+        assert run(search, server(knee=1000)) == [1]
+        assert search.stop_reason == MIN_LOAD_FAILS_SLO
+        assert search.knee is None
+
+    def test_point_budget(self):
+        search = SLOSearch(parse_slo("ttft_ms=600"), high=1024, max_points=3)
+        assert run(search, server(knee=500)) == [1, 2, 4]
+        assert search.stop_reason == POINT_BUDGET
+
+    def test_inconclusive_point_is_refined_then_taken_as_knee(self):
+        search = SLOSearch(parse_slo("ttft_ms=600"), high=64, max_repeats=2)
+        uniform = lambda p95: {"ttft_ms": LatencyHistogram().add(np.linspace(0, p95 / 0.95, 400))}
+        search.record(4, uniform(300))
+        search.record(16, uniform(2000))
+        # p95 of 600 ms at 8 streams: the interval straddles the SLO
+        point = search.record(8, uniform(600))
+        assert point["verdict"] == INCONCLUSIVE
+        assert search.next_point() == 8  # measured again, requests pooled
+
+        point = search.record(8, uniform(600))
+        assert point["measurements"] == 2
+        assert point["metrics"]["ttft_ms"]["requests"] == 800
+        assert point["verdict"] == INCONCLUSIVE
+        assert search.next_point() is None
+        assert search.stop_reason == KNEE_WITHIN_CI
+        assert search.bracket() == {"pass": 4, "fail": 16}
+
+    def test_missing_metric_fails(self):
+        search = SLOSearch(parse_slo("ttft_ms=600,itl_ms=50"))
+        point = search.record(1, server(knee=100)(1))
+        assert point["verdict"] == FAIL
+        assert point["metrics"]["itl_ms"]["requests"] == 0
+
+    def test_state_round_trip(self, tmp_path):
+        measure = server(knee=24)
+        search = SLOSearch(parse_slo("ttft_ms=600"), high=128)
+        for _ in range(3):
+            load = search.next_point()
+            search.record(load, measure(load), benchmarks=f"{load}.json")
+        path = tmp_path / "state.json"
+        search.save(path)
+
+        resumed = SLOSearch.load(path)
+        assert resumed.to_dict() == json.loads(json.dumps(search.to_dict()))
+        assert resumed.next_point() == search.next_point() == 8
+        assert resumed.point_dir(8) == "slo-search/04-concurrent-8"
+        assert resumed.points[0]["verdict"] == PASS
+        assert resumed.points[0]["benchmarks"] == ["1.json"]
+
+    def test_search_from_options(self, tmp_path):
+        with pytest.raises(ValueError, match="SLO"):
+            search_from_options({})
+        search = search_from_options({"slo": "itl_ms=80", "search_max": "32"})
+        assert (search.kind, search.low, search.high) == ("concurrent", 1, 32)
+        state = tmp_path / "state.json"
+        search.save(state)
+        # An existing state wins over the options
+        assert search_from_options({"slo": "ttft_ms=1", "search_state": str(state)}).slo == {"itl_ms": 80.0}
+
+    def test_invalid_range(self):
+        with pytest.raises(ValueError):
+            SLOSearch(parse_slo("ttft_ms=1"), low=8, high=4)
+        with pytest.raises(ValueError):
+            SLOSearch(parse_slo("ttft_ms=1"), low=0.5)
+        with pytest.raises(ValueError):
+            SLOSearch(parse_slo("ttft_ms=1"), kind="sweep")
+
+
+def test_merge_benchmarks(tmp_path):
+    paths = []
+    for load in (1, 2):
+        path = tmp_path / f"{load}.json"
+        path.write_text(json.dumps({"metadata": {"version": load}, "benchmarks": [{"streams": load}]}))
+        paths.append(path)
+    assert merge_benchmarks(paths) == {
+        "metadata": {"version": 1}, "benchmarks": [{"streams": 1}, {"streams": 2}],
+    }
+
+
+def test_loadgens_cli_steps_search(tmp_path):
+    state = tmp_path / "state.json"
+
+    def cli(*args):
+        result = subprocess.run(
+            [sys.executable, "-m", "shared.loadgens", "slo-search", *args, "--state", str(state)],
+            capture_output=True, text=True, cwd=TEST_EXECUTION_DIR,
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    step = cli("next", "--slo", "ttft_ms=500", "--max", "8")
+    assert step == {
+        "done": False, "load": 1, "profile": "concurrent", "load_field": "streams",
+        "dir": "slo-search/01-concurrent-1", "measurements": 0, "stop_reason": None,
+    }
+
+    requests = [
+        {"request_start_time": float(i), "first_token_time": i + 0.1,
+         "request_end_time": i + 1.0, "output_tokens": 11}
+        for i in range(300)
+    ]
+    results = tmp_path / "benchmarks.json"
+    results.write_text(json.dumps({"benchmarks": [{"config": {}, "requests": {"successful": requests}}]}))
+    point = cli("record", "--load", "1", "--results", str(results))
+    assert point["verdict"] == PASS
+    assert cli("next")["load"] == 2
+
+    merged = tmp_path / "merged.json"
+    report = cli("report", "--benchmarks-out", str(merged))
+    assert report["knee"] == 1 and not report["done"]
+    assert len(json.loads(merged.read_text())["benchmarks"]) == 1
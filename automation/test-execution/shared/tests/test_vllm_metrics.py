@@ -0,0 +1,410 @@
+"""Tests for vLLM metrics file readers."""
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+from shared.vllm_metrics import (
+    SERVER_PERCENTILE_COLUMNS,
+    MetricsFrame,
+    find_metrics_file,
+    histogram_quantiles,
+    iter_samples,
+    load_metrics_file,
+    read_collection_info,
+    read_last_sample,
+    server_latency_percentiles,
+)
+
+
+def make_sample(elapsed, running):
+    """Build a minimal collector sample."""
+    return {
+        "timestamp": f"2026-01-01T10:00:{elapsed:02d}",
+        "elapsed_seconds": float(elapsed),
+        "metrics": {
+            "vllm:num_requests_running": [{"labels": {}, "value": running}],
+        },
+    }
+
+
+@pytest.fixture
+def samples():
+    return [make_sample(i * 5, float(i)) for i in range(4)]
+
+
+@pytest.fixture
+def json_file(tmp_path, samples):
+    path = tmp_path / "vllm-metrics.json"
+    path.write_text(json.dumps({
+        "collection_info": {"test_run_id": "abc", "total_samples": len(samples)},
+        "samples": samples,
+    }))
+    return path
+
+
+def write_ndjson(path, samples, header=None, footer=None, tail=""):
+    lines = []
+    if header is not None:
+        lines.append(json.dumps({"collection_info": header}))
+    lines.extend(json.dumps(s) for s in samples)
+    if footer is not None:
+        lines.append(json.dumps({"collection_info": footer}))
+    path.write_text("\n".join(lines) + "\n" + tail)
+    return path
+
+
+class TestFindMetricsFile:
+    """Tests for locating the metrics file in a result directory."""
+
+    def test_missing(self, tmp_path):
+        assert find_metrics_file(tmp_path) is None
+
+    def test_legacy_json(self, json_file):
+        assert find_metrics_file(json_file.parent) == json_file
+
+    def test_prefers_ndjson(self, tmp_path, json_file, samples):
+        ndjson = write_ndjson(tmp_path / "vllm-metrics.ndjson", samples)
+        assert find_metrics_file(tmp_path) == ndjson
+
+
+class TestIterSamples:
+    """Both formats yield identical samples."""
+
+    def test_json(self, json_file, samples):
+        assert list(iter_samples(json_file)) == samples
+
+    def test_ndjson_skips_header_and_footer(self, tmp_path, samples):
+        path = write_ndjson(
+            tmp_path / "vllm-metrics.ndjson", samples,
+            header={"test_run_id": "abc"},
+            footer={"test_run_id": "abc", "total_samples": 4},
+        )
+        assert list(iter_samples(path)) == samples
+
+    def test_ndjson_truncated_last_line(self, tmp_path, samples):
+        """A collector killed mid-write leaves a partial line behind."""
+        path = write_ndjson(
+            tmp_path / "vllm-metrics.ndjson", samples,
+            header={"test_run_id": "abc"},
+            tail='{"timestamp": "2026-01-01T10:00:20", "metr',
+        )
+        assert list(iter_samples(path)) == samples
+
+    def test_read_last_sample(self, tmp_path, json_file, samples):
+        path = write_ndjson(
+            tmp_path / "vllm-metrics.ndjson", samples,
+            header={}, footer={"total_samples": 4},
+        )
+        assert read_last_sample(path) == samples[-1]
+        assert read_last_sample(json_file) == samples[-1]
+
+    def test_read_last_sample_empty(self, tmp_path):
+        path = write_ndjson(tmp_path / "vllm-metrics.ndjson", [], header={})
+        assert read_last_sample(path) is None
+
+
+class TestCollectionInfo:
+    """Tests for reading collection_info headers and footers."""
+
+    def test_footer_overrides_header(self, tmp_path, samples):
+        path = write_ndjson(
+            tmp_path / "vllm-metrics.ndjson", samples,
+            header={"test_run_id": "abc", "start_time": "t0"},
+            footer={"test_run_id": "abc", "start_time": "t0",
+                    "end_time": "t1", "total_samples": 4},
+        )
+        info = read_collection_info(path)
+        assert info["end_time"] == "t1"
+        assert info["total_samples"] == 4
+
+    def test_header_only_after_crash(self, tmp_path, samples):
+        path = write_ndjson(
+            tmp_path / "vllm-metrics.ndjson", samples,
+            header={"test_run_id": "abc"},
+        )
+        assert read_collection_info(path) == {"test_run_id": "abc"}
+
+    def test_legacy_json(self, json_file):
+        assert read_collection_info(json_file)["test_run_id"] == "abc"
+
+    def test_load_metrics_file_counts_samples(self, tmp_path, samples):
+        path = write_ndjson(
+            tmp_path / "vllm-metrics.ndjson", samples,
+            header={"test_run_id": "abc"},
+        )
+        data = load_metrics_file(path)
+        assert data["samples"] == samples
+        assert data["collection_info"]["total_samples"] == 4
+
+
+class TestMetricsFrame:
+    """Tests for the array-backed metrics engine."""
+
+    @pytest.fixture
+    def frame(self):
+        def sample(elapsed, running, prompt_tokens, kv):
+            return {
+                "timestamp": f"2026-01-01T10:00:{elapsed:02d}",
+                "elapsed_seconds": float(elapsed),
+                "metrics": {
+                    "vllm:num_requests_running": [
+                        {"labels": {"instance": "numa0"}, "value": running},
+                        {"labels": {"instance": "numa1"}, "value": running + 1},
+                    ],
+                    "vllm:prompt_tokens_total": [
+                        {"labels": {"instance": "numa0"}, "value": prompt_tokens},
+                        {"labels": {"instance": "numa1"}, "value": 2 * prompt_tokens},
+                    ],
+                    "vllm:kv_cache_usage_perc": [
+                        {"labels": {"instance": "numa0"}, "value": kv},
+                        {"labels": {"instance": "numa1"}, "value": kv / 2},
+                    ],
+                    "process_cpu_seconds_total": 10.0 + elapsed,
+                },
+            }
+        return MetricsFrame.from_samples([
+            sample(0, 0.0, 100.0, 0.2),
+            sample(5, 2.0, 150.0, 0.4),
+            sample(10, 4.0, 300.0, 0.8),
+        ])
+
+    def test_shape(self, frame):
+        assert len(frame) == 3
+        assert frame.duration == 10.0
+        assert frame.series("vllm:num_requests_running").shape == (2, 3)
+
+    def test_total_sums_instances(self, frame):
+        assert frame.total("vllm:num_requests_running").tolist() == [1.0, 5.0, 9.0]
+
+    def test_by_label(self, frame):
+        split = frame.by_label("vllm:num_requests_running")
+        assert split["numa0"].tolist() == [0.0, 2.0, 4.0]
+        assert split["numa1"].tolist() == [1.0, 3.0, 5.0]
+
+    def test_counter_delta(self, frame):
+        # numa0: 300 - 100, numa1: 600 - 200
+        assert frame.counter_delta("vllm:prompt_tokens_total") == 600.0
+        assert frame.counter_delta("process_cpu_seconds_total") == 10.0
+        assert frame.counter_delta("vllm:missing_total") is None
+
+    def test_single_sample_counter_is_value(self, frame):
+        assert frame.window(end=0).counter_delta("vllm:prompt_tokens_total") == 300.0
+
+    def test_rate(self, frame):
+        assert frame.rate("vllm:prompt_tokens_total").tolist() == [30.0, 90.0]
+
+    def test_gauge_stats(self, frame):
+        stats = frame.gauge_stats("vllm:num_requests_running")
+        assert stats["mean"] == 5.0
+        assert stats["max"] == 9.0
+        assert stats["last"] == 9.0
+        assert frame.gauge_stats("vllm:missing") == {}
+
+    def test_gauge_stats_per_series(self, frame):
+        stats = frame.gauge_stats("vllm:kv_cache_usage_perc", per_series=True)
+        assert stats["max"] == 0.8
+        assert stats["last"] == pytest.approx(0.6)
+
+    def test_window(self, frame):
+        window = frame.window(start=5, end=10)
+        assert window.elapsed.tolist() == [5.0, 10.0]
+        assert window.counter_delta("vllm:prompt_tokens_total") == 450.0
+
+    def test_between_unix_times(self):
+        frame = MetricsFrame.from_samples([
+            {"unix_time": 1000.0 + t, "elapsed_seconds": float(t),
+             "metrics": {"vllm:num_preemptions_total": float(t * t)}}
+            for t in range(10)
+        ])
+        window = frame.between(1002.5, 1006.0)
+        assert window.unix_times.tolist() == [1003.0, 1004.0, 1005.0, 1006.0]
+        assert window.counter_delta("vllm:num_preemptions_total") == 36.0 - 9.0
+
+    def test_unix_times_from_timestamps(self, frame):
+        # Files written before samples carried unix_time
+        assert np.diff(frame.unix_times).tolist() == [5.0, 5.0]
+        start = frame.unix_times[0]
+        assert len(frame.between(start + 1, start + 10)) == 2
+
+    def test_series_missing_from_some_samples(self):
+        frame = MetricsFrame.from_samples([
+            {"elapsed_seconds": 0.0, "metrics": {"vllm:num_requests_running": [{"value": 1.0}]}},
+            {"elapsed_seconds": 1.0, "metrics": {}},
+        ])
+        assert frame.total("vllm:num_requests_running")[0] == 1.0
+        assert np.isnan(frame.total("vllm:num_requests_running")[1])
+
+    def test_elapsed_from_timestamps(self):
+        frame = MetricsFrame.from_samples([
+            {"timestamp": "2024-01-01T10:00:00", "metrics": {}},
+            {"timestamp": "2024-01-01T10:02:00", "metrics": {}},
+        ])
+        assert frame.duration == 120.0
+
+    def test_ignores_non_numeric_metrics(self):
+        frame = MetricsFrame.from_samples([{"metrics": {"custom": "value"}}])
+        assert frame.metric_names == []
+
+    def test_metric_filter(self, frame, tmp_path, samples):
+        path = write_ndjson(tmp_path / "vllm-metrics.ndjson", samples, header={})
+        loaded = MetricsFrame.from_file(path, metric_names=["vllm:missing"])
+        assert len(loaded) == len(samples)
+        assert loaded.metric_names == []
+
+
+TTFT = "vllm:time_to_first_token_seconds"
+
+
+class TestCounterResets:
+    """Tests for Prometheus-style counter reset handling."""
+
+    @pytest.fixture
+    def frame(self):
+        # Two instances; numa1 restarts after the second sample and misses
+        # the third scrape
+        values = [
+            {"numa0": 100.0, "numa1": 50.0},
+            {"numa0": 130.0, "numa1": 80.0},
+            {"numa0": 160.0},
+            {"numa0": 190.0, "numa1": 25.0},
+        ]
+        return MetricsFrame.from_samples([
+            {
+                "elapsed_seconds": 10.0 * i,
+                "metrics": {"process_cpu_seconds_total": [
+                    {"labels": {"instance": name}, "value": value}
+                    for name, value in sample.items()
+                ]},
+            }
+            for i, sample in enumerate(values)
+        ])
+
+    def test_counter_delta_spans_restart(self, frame):
+        # numa0: 90, numa1: 30 before the restart plus 25 after it
+        assert frame.counter_delta("process_cpu_seconds_total") == 145.0
+        assert frame.counter_resets("process_cpu_seconds_total") == 1
+
+    def test_increase_and_rate(self, frame):
+        assert frame.increase("process_cpu_seconds_total").tolist() == [60.0, 30.0, 55.0]
+        assert frame.rate("process_cpu_seconds_total").tolist() == [6.0, 3.0, 5.5]
+
+    def test_cumulative_increase_keeps_rising(self, frame):
+        assert frame.cumulative_increase("process_cpu_seconds_total").tolist() == [
+            0.0, 60.0, 90.0, 145.0,
+        ]
+
+    def test_series_appearing_late_has_no_baseline(self):
+        frame = MetricsFrame.from_samples([
+            {"elapsed_seconds": 0.0, "metrics": {}},
+            {"elapsed_seconds": 1.0, "metrics": {"vllm:prompt_tokens_total": 40.0}},
+            {"elapsed_seconds": 2.0, "metrics": {"vllm:prompt_tokens_total": 70.0}},
+        ])
+        increase = frame.increase("vllm:prompt_tokens_total")
+        assert np.isnan(increase[0])
+        assert increase[1] == 30.0
+        assert frame.counter_delta("vllm:prompt_tokens_total") == 30.0
+
+
+def histogram_sample(elapsed, buckets, base_name=TTFT, instance=None):
+    """Build a sample holding one histogram as cumulative {le: count}."""
+    labels = {"instance": instance} if instance else {}
+    total = float(list(buckets.values())[-1])
+    return {"elapsed_seconds": float(elapsed), "metrics": {
+        f"{base_name}_bucket": [
+            {"labels": {**labels, "le": le}, "value": float(count)}
+            for le, count in buckets.items()
+        ],
+        f"{base_name}_sum": [{"labels": labels, "value": total * 0.25}],
+        f"{base_name}_count": [{"labels": labels, "value": total}],
+    }}
+
+
+class TestHistograms:
+    """Tests for bucket deltas and quantile interpolation."""
+
+    def test_buckets_summed_across_instances(self):
+        sample = histogram_sample(0, {"0.1": 1, "1.0": 3, "+Inf": 4}, instance="a")
+        other = histogram_sample(0, {"0.1": 2, "1.0": 2, "+Inf": 2}, instance="b")
+        for name, series in other["metrics"].items():
+            sample["metrics"][name] += series
+        bounds, counts = MetricsFrame.from_samples([sample]).histogram_buckets(TTFT)
+        assert bounds.tolist() == [0.1, 1.0, math.inf]
+        assert counts[:, 0].tolist() == [3.0, 5.0, 6.0]
+
+    def test_interpolation_matches_prometheus(self):
+        bounds = np.array([0.1, 0.5, 1.0, math.inf])
+        counts = np.array([10.0, 60.0, 100.0, 100.0])
+        p50, p95, p99 = histogram_quantiles(bounds, counts, [0.5, 0.95, 0.99])
+        # rank 50 lies 40/50 into (0.1, 0.5]
+        assert p50 == pytest.approx(0.1 + 0.4 * 40 / 50)
+        assert p95 == pytest.approx(0.5 + 0.5 * 35 / 40)
+        assert p99 == pytest.approx(0.5 + 0.5 * 39 / 40)
+
+    def test_first_bucket_interpolates_from_zero(self):
+        bounds = np.array([0.2, math.inf])
+        counts = np.array([4.0, 4.0])
+        assert histogram_quantiles(bounds, counts, [0.5])[0] == pytest.approx(0.1)
+
+    def test_inf_bucket_returns_largest_finite_bound(self):
+        bounds = np.array([0.1, 1.0, math.inf])
+        counts = np.array([0.0, 1.0, 10.0])
+        assert histogram_quantiles(bounds, counts, [0.99])[0] == 1.0
+
+    def test_empty_histogram_is_nan(self):
+        bounds = np.array([0.1, math.inf])
+        assert np.isnan(histogram_quantiles(bounds, np.zeros(2), [0.5])).all()
+        assert np.isnan(histogram_quantiles(np.empty(0), np.empty(0), [0.5])).all()
+
+    def test_delta_over_window(self):
+        frame = MetricsFrame.from_samples([
+            histogram_sample(0, {"0.1": 5, "1.0": 5, "+Inf": 5}),
+            histogram_sample(5, {"0.1": 5, "1.0": 9, "+Inf": 10}),
+        ])
+        _, counts = frame.histogram_delta(TTFT)
+        assert counts.tolist() == [0.0, 4.0, 5.0]
+        assert frame.histogram_mean(TTFT) == pytest.approx(0.25)
+
+    def test_delta_after_reset_uses_end_counts(self):
+        frame = MetricsFrame.from_samples([
+            histogram_sample(0, {"0.1": 50, "+Inf": 50}),
+            histogram_sample(5, {"0.1": 2, "+Inf": 3}),
+        ])
+        _, counts = frame.histogram_delta(TTFT)
+        assert counts.tolist() == [2.0, 3.0]
+
+    def test_delta_spans_reset(self):
+        frame = MetricsFrame.from_samples([
+            histogram_sample(0, {"0.1": 10, "+Inf": 10}),
+            histogram_sample(5, {"0.1": 30, "+Inf": 40}),
+            histogram_sample(10, {"0.1": 2, "+Inf": 3}),
+        ])
+        _, counts = frame.histogram_delta(TTFT)
+        assert counts.tolist() == [22.0, 33.0]
+
+    def test_interval_histogram_mean(self):
+        frame = MetricsFrame.from_samples([
+            histogram_sample(0, {"+Inf": 0}),
+            histogram_sample(5, {"+Inf": 4}),
+            histogram_sample(10, {"+Inf": 4}),
+        ])
+        means = frame.interval_histogram_mean(TTFT)
+        assert np.isnan(means[0]) and np.isnan(means[2])
+        assert means[1] == pytest.approx(0.25)
+
+    def test_server_latency_percentiles(self):
+        frame = MetricsFrame.from_samples([
+            histogram_sample(0, {"0.1": 0, "0.5": 0, "+Inf": 0}),
+            histogram_sample(5, {"0.1": 0, "0.5": 10, "+Inf": 10}),
+        ])
+        result = server_latency_percentiles(frame)
+        assert set(result) == {"server_ttft_p50_ms", "server_ttft_p95_ms", "server_ttft_p99_ms"}
+        assert result["server_ttft_p50_ms"] == pytest.approx(300.0)
+        assert set(result) <= set(SERVER_PERCENTILE_COLUMNS)
+
+    def test_no_requests_in_window(self):
+        sample = histogram_sample(0, {"0.1": 3, "+Inf": 3})
+        frame = MetricsFrame.from_samples([sample, {**sample, "elapsed_seconds": 5.0}])
+        assert server_latency_percentiles(frame) == {}
@@ -1,10 +1,658 @@
 #!/usr/bin/env python3
-"""vLLM Prometheus metrics parsing utilities.
+"""vLLM Prometheus metrics file utilities.
 
-This module provides helpers for parsing vLLM server metrics from Prometheus format.
-Currently a placeholder for future consolidation of metrics parsing logic.
+This module provides shared helpers for reading the vLLM server metrics
+written by the vllm_metrics_collector role. Two on-disk formats exist:
+
+- vllm-metrics.ndjson: streaming format, one JSON object per line. The first
+  line is a header and the last line a footer, both of the form
+  {"collection_info": {...}}; every other line is a sample. A collector that
+  was killed leaves no footer and possibly a truncated last line.
+- vllm-metrics.json: legacy single document {"collection_info": ..., "samples": [...]}.
+
+Readers should use iter_samples() so that streamed files are read lazily.
+
+Analysis goes through MetricsFrame, which loads a metrics file once into
+NumPy arrays indexed by (metric, label set) x sample and provides the
+counter-delta, rate, gauge and histogram operations shared by the
+converters, the MLflow logger, the vLLM backend and the dashboard:
+
+    frame = MetricsFrame.from_file(find_metrics_file(result_dir))
+    frame.counter_delta("vllm:prompt_tokens_total")
+    frame.gauge_stats("vllm:num_requests_running")["max"]
+    frame.histogram_mean("vllm:time_to_first_token_seconds")
+
+A collector scraping several vLLM instances tags every series with an
+"instance" label and lists the endpoints in collection_info["instances"];
+frame totals sum across instances and MetricsFrame.by_label() splits them.
+
+Samples carry a wall-clock "unix_time" so frames can be cut to windows
+reported by other tools, e.g. a GuideLLM benchmark's measurement period:
+
+    frame.between(start_time, end_time).gauge_stats("vllm:kv_cache_usage_perc")
+
+Histograms keep their cumulative _bucket series; histogram_quantiles()
+reconstructs p50/p95/p99 from bucket deltas over a window, the same way
+Prometheus' histogram_quantile() does.
 """
 
-# Placeholder for future consolidation of vLLM metrics parsing
-# Currently log_to_mlflow.py and convert_single.py have different implementations
-# that serve different purposes. Common helpers can be added here as patterns emerge.
+import json
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+METRICS_NDJSON_FILENAME = "vllm-metrics.ndjson"
+METRICS_JSON_FILENAME = "vllm-metrics.json"
+
+# Preferred file first: a result directory only ever has one of these
+METRICS_FILENAMES = (METRICS_NDJSON_FILENAME, METRICS_JSON_FILENAME)
+
+# Label the collector adds to every series to name its source endpoint
+INSTANCE_LABEL = "instance"
+
+# Latency histograms reported as server-side percentiles, by column stem
+LATENCY_HISTOGRAMS = {
+    "ttft": "vllm:time_to_first_token_seconds",
+    "queue_time": "vllm:request_queue_time_seconds",
+    "prefill_time": "vllm:request_prefill_time_seconds",
+    "decode_time": "vllm:request_decode_time_seconds",
+}
+LATENCY_QUANTILES = (0.50, 0.95, 0.99)
+
+# Output columns produced by server_latency_percentiles(), e.g. server_ttft_p95_ms
+SERVER_PERCENTILE_COLUMNS = [
+    f"server_{stem}_p{int(q * 100)}_ms"
+    for stem in LATENCY_HISTOGRAMS
+    for q in LATENCY_QUANTILES
+]
+
+PathLike = Union[str, Path]
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def is_ndjson(metrics_file: PathLike) -> bool:
+    """Return True if the metrics file uses the streaming NDJSON format."""
+    return Path(metrics_file).suffix == ".ndjson"
+
+
+def find_metrics_file(result_dir: PathLike) -> Optional[Path]:
+    """Locate the vLLM metrics file in a result directory.
+
+    Args:
+        result_dir: Directory containing benchmark results
+
+    Returns:
+        Path to vllm-metrics.ndjson or vllm-metrics.json, or None if absent
+    """
+    for filename in METRICS_FILENAMES:
+        candidate = Path(result_dir) / filename
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _iter_ndjson_records(metrics_file: PathLike) -> Iterator[Dict[str, Any]]:
+    """Yield decoded NDJSON records, skipping blank and truncated lines."""
+    with open(metrics_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Partial line left by a collector killed mid-write
+                continue
+
+
+def iter_samples(metrics_file: PathLike) -> Iterator[Dict[str, Any]]:
+    """Iterate over the samples in a metrics file.
+
+    NDJSON files are streamed line by line; legacy JSON files have to be
+    loaded in full.
+
+    Args:
+        metrics_file: Path to vllm-metrics.ndjson or vllm-metrics.json
+
+    Yields:
+        Sample dicts with 'timestamp', 'elapsed_seconds' and 'metrics' keys
+    """
+    if is_ndjson(metrics_file):
+        for record in _iter_ndjson_records(metrics_file):
+            if "collection_info" not in record:
+                yield record
+    else:
+        with open(metrics_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        yield from data.get("samples", [])
+
+
+def read_collection_info(metrics_file: PathLike) -> Dict[str, Any]:
+    """Read collection_info without loading the samples where possible.
+
+    For NDJSON files the header is read from the first line and the footer,
+    if present, from the last line; the footer wins where both define a key.
+
+    Args:
+        metrics_file: Path to vllm-metrics.ndjson or vllm-metrics.json
+
+    Returns:
+        collection_info dictionary (empty if none was recorded)
+    """
+    if not is_ndjson(metrics_file):
+        with open(metrics_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get("collection_info", {})
+
+    info: Dict[str, Any] = {}
+    with open(metrics_file, 'rb') as f:
+        header = f.readline()
+        footer = _read_last_line(f)
+
+    for raw in (header, footer):
+        try:
+            record = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if isinstance(record, dict) and "collection_info" in record:
+            info.update(record["collection_info"])
+    return info
+
+
+def _read_last_line(f, chunk_size: int = 8192) -> bytes:
+    """Return the last non-empty line of a binary file opened for reading."""
+    f.seek(0, 2)
+    position = f.tell()
+    buffer = b""
+    while position > 0:
+        step = min(chunk_size, position)
+        position -= step
+        f.seek(position)
+        buffer = f.read(step) + buffer
+        stripped = buffer.rstrip(b"\n")
+        if b"\n" in stripped:
+            return stripped.rsplit(b"\n", 1)[1]
+    return buffer.rstrip(b"\n")
+
+
+def read_last_sample(metrics_file: PathLike) -> Optional[Dict[str, Any]]:
+    """Return the final sample of a metrics file, or None if it has none."""
+    last = None
+    for sample in iter_samples(metrics_file):
+        last = sample
+    return last
+
+
+def load_metrics_file(metrics_file: PathLike) -> Dict[str, Any]:
+    """Load a metrics file of either format into the legacy document layout.
+
+    Prefer iter_samples() for large files; this materializes every sample.
+
+    Args:
+        metrics_file: Path to vllm-metrics.ndjson or vllm-metrics.json
+
+    Returns:
+        Dict with 'collection_info' and 'samples' keys
+    """
+    if not is_ndjson(metrics_file):
+        with open(metrics_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    info: Dict[str, Any] = {}
+    samples = []
+    for record in _iter_ndjson_records(metrics_file):
+        if "collection_info" in record:
+            info.update(record["collection_info"])
+        else:
+            samples.append(record)
+    info.setdefault("total_samples", len(samples))
+    return {"collection_info": info, "samples": samples}
+
+
+
+def _bucket_bound(le: Any) -> float:
+    """Parse a Prometheus 'le' label value (handles +Inf)."""
+    return float("inf") if le in ("+Inf", "Inf", "inf") else float(le)
+
+
+def _unix_from_timestamps(timestamps: List[Optional[str]]) -> np.ndarray:
+    """Unix seconds from ISO timestamps.
+
+    The collector writes naive local times, so files without "unix_time"
+    are only placed correctly when read in the collector host's timezone.
+    """
+    parsed = []
+    for ts in timestamps:
+        try:
+            parsed.append(datetime.fromisoformat(ts).timestamp())
+        except (TypeError, ValueError):
+            parsed.append(np.nan)
+    return np.asarray(parsed, dtype=float)
+
+
+def _elapsed_from_timestamps(timestamps: List[Optional[str]]) -> np.ndarray:
+    """Seconds since the first sample, from ISO timestamps."""
+    elapsed = _unix_from_timestamps(timestamps)
+    return elapsed - elapsed[0] if elapsed.size else elapsed
+
+
+class MetricsFrame:
+    """vLLM metrics loaded into NumPy arrays.
+
+    Every (metric, label set) pair is one row of ``values`` and every sample
+    one column, in collection order; series absent from a sample are NaN.
+    Totals sum all series of a metric (engines, instances) per sample.
+    """
+
+    def __init__(
+        self,
+        elapsed: np.ndarray,
+        timestamps: List[Optional[str]],
+        index: Dict[str, Tuple[List[LabelKey], np.ndarray]],
+        values: np.ndarray,
+        unix_times: Optional[np.ndarray] = None,
+    ):
+        self.elapsed = elapsed
+        self.timestamps = timestamps
+        self._index = index
+        self.values = values
+        self.unix_times = (
+            unix_times if unix_times is not None else _unix_from_timestamps(timestamps)
+        )
+
+    @classmethod
+    def from_samples(
+        cls,
+        samples: Iterable[Dict[str, Any]],
+        metric_names: Optional[Iterable[str]] = None,
+    ) -> "MetricsFrame":
+        """Build a frame from collector samples.
+
+        Args:
+            samples: Sample dicts as yielded by iter_samples()
+            metric_names: Only load these metrics (default: all)
+        """
+        wanted = set(metric_names) if metric_names is not None else None
+        rows: Dict[Tuple[str, LabelKey], int] = {}
+        # Scrapes of one server repeat the same series in the same order, so
+        # the row layout of each metric is resolved once and reused while its
+        # label sets stay unchanged
+        layouts: Dict[str, Tuple[List[Any], np.ndarray]] = {}
+        row_chunks: List[np.ndarray] = []
+        col_counts: List[int] = []
+        observed: List[float] = []
+        timestamps: List[Optional[str]] = []
+        elapsed: List[float] = []
+        unix_times: List[float] = []
+
+        for sample in samples:
+            timestamps.append(sample.get("timestamp"))
+            elapsed.append(sample.get("elapsed_seconds", np.nan))
+            unix_times.append(sample.get("unix_time", np.nan))
+            sample_rows = 0
+            for name, data in sample.get("metrics", {}).items():
+                if wanted is not None and name not in wanted:
+                    continue
+                if isinstance(data, (int, float)):
+                    data = [{"value": data}]
+                elif not isinstance(data, list):
+                    continue
+                try:
+                    labels = [item["labels"] for item in data]
+                    sample_values = [item["value"] for item in data]
+                except (KeyError, TypeError):
+                    items = [item for item in data if isinstance(item, dict)]
+                    labels = [item.get("labels") for item in items]
+                    sample_values = [item.get("value", 0) for item in items]
+                layout = layouts.get(name)
+                if layout is None or layout[0] != labels:
+                    layout_rows = []
+                    for item_labels in labels:
+                        key = (name, tuple(sorted(item_labels.items())) if item_labels else ())
+                        row = rows.get(key)
+                        if row is None:
+                            row = rows[key] = len(rows)
+                        layout_rows.append(row)
+                    layout = layouts[name] = (labels, np.asarray(layout_rows, dtype=np.intp))
+                row_chunks.append(layout[1])
+                observed.extend(sample_values)
+                sample_rows += len(sample_values)
+            col_counts.append(sample_rows)
+
+        values = np.full((len(rows), len(col_counts)), np.nan)
+        if observed:
+            row_ids = np.concatenate(row_chunks)
+            col_ids = np.repeat(np.arange(len(col_counts)), col_counts)
+            values[row_ids, col_ids] = observed
+
+        grouped: Dict[str, Tuple[List[LabelKey], List[int]]] = {}
+        for (name, labels), row in rows.items():
+            label_keys, row_list = grouped.setdefault(name, ([], []))
+            label_keys.append(labels)
+            row_list.append(row)
+        index = {
+            name: (label_keys, np.asarray(row_list, dtype=np.intp))
+            for name, (label_keys, row_list) in grouped.items()
+        }
+
+        elapsed_array = np.asarray(elapsed, dtype=float)
+        if np.isnan(elapsed_array).any():
+            elapsed_array = _elapsed_from_timestamps(timestamps)
+        unix_array = np.asarray(unix_times, dtype=float)
+        if np.isnan(unix_array).any():
+            unix_array = _unix_from_timestamps(timestamps)
+        return cls(elapsed_array, timestamps, index, values, unix_array)
+
+    @classmethod
+    def from_file(
+        cls, metrics_file: PathLike, metric_names: Optional[Iterable[str]] = None,
+    ) -> "MetricsFrame":
+        """Load a vllm-metrics.ndjson or vllm-metrics.json file."""
+        return cls.from_samples(iter_samples(metrics_file), metric_names)
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def metric_names(self) -> List[str]:
+        return sorted(self._index)
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the first and last sample."""
+        return float(self.elapsed[-1] - self.elapsed[0]) if len(self) > 1 else 0.0
+
+    def labels(self, name: str) -> List[Dict[str, str]]:
+        """Label sets of a metric's series, in row order of series()."""
+        return [dict(key) for key in self._index.get(name, ([], None))[0]]
+
+    def series(self, name: str) -> np.ndarray:
+        """All series of a metric, shape (n_series, n_samples)."""
+        if name not in self._index:
+            return np.empty((0, len(self)))
+        return self.values[self._index[name][1]]
+
+    def total(self, name: str) -> np.ndarray:
+        """Sum over a metric's series per sample; NaN where none was present."""
+        series = self.series(name)
+        present = ~np.isnan(series).all(axis=0)
+        return np.where(present, np.nansum(series, axis=0), np.nan)
+
+    def mean(self, name: str) -> np.ndarray:
+        """Mean over a metric's series per sample; NaN where none was present."""
+        series = self.series(name)
+        present = ~np.isnan(series)
+        counts = present.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, np.nansum(series, axis=0) / counts, np.nan)
+
+    def by_label(self, name: str, label: str = INSTANCE_LABEL) -> Dict[str, np.ndarray]:
+        """Per-sample totals of a metric grouped by one label's value.
+
+        Series without the label are grouped under the empty string.
+        """
+        groups: Dict[str, List[int]] = {}
+        for position, labels in enumerate(self.labels(name)):
+            groups.setdefault(labels.get(label, ""), []).append(position)
+        series = self.series(name)
+        result = {}
+        for value, positions in groups.items():
+            subset = series[positions]
+            present = ~np.isnan(subset).all(axis=0)
+            result[value] = np.where(present, np.nansum(subset, axis=0), np.nan)
+        return result
+
+    def _select(self, times: np.ndarray, start: Optional[float], end: Optional[float]) -> "MetricsFrame":
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= times >= start
+        if end is not None:
+            mask &= times <= end
+        timestamps = [ts for ts, keep in zip(self.timestamps, mask) if keep]
+        return MetricsFrame(
+            self.elapsed[mask], timestamps, self._index, self.values[:, mask],
+            self.unix_times[mask],
+        )
+
+    def window(self, start: Optional[float] = None, end: Optional[float] = None) -> "MetricsFrame":
+        """Frame restricted to samples with start <= elapsed_seconds <= end."""
+        return self._select(self.elapsed, start, end)
+
+    def between(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> "MetricsFrame":
+        """Frame restricted to samples taken between two Unix times (inclusive).
+
+        Counters and histograms of the result cover the first to the last
+        sample inside the window, so a window spanning fewer than two
+        samples has no increase to report.
+        """
+        return self._select(self.unix_times, start_time, end_time)
+
+    @staticmethod
+    def _interval_increases(series: np.ndarray) -> np.ndarray:
+        """Reset-aware increase of each counter series per sampling interval.
+
+        Shape (n_series, n_samples - 1). A value below its predecessor means
+        the process restarted and the counter began again from zero, so the
+        interval's increase is the new value (Prometheus' increase()
+        semantics). A series missing from some samples carries its previous
+        value forward; intervals before its first value are NaN.
+        """
+        if series.shape[1] < 2:
+            return np.empty((series.shape[0], 0))
+        present = ~np.isnan(series)
+        positions = np.where(present, np.arange(series.shape[1]), 0)
+        np.maximum.accumulate(positions, axis=1, out=positions)
+        filled = np.take_along_axis(series, positions, axis=1)
+        current = filled[:, 1:]
+        increases = current - filled[:, :-1]
+        resets = increases < 0
+        increases[resets] = current[resets]
+        return increases
+
+    def counter_delta(self, name: str) -> Optional[float]:
+        """Increase of a counter over the frame, summed across series.
+
+        Counter resets (server restarts) are detected per series, so the
+        result is the total counted across all process lifetimes. With a
+        single sample there is no baseline and the counter's value is
+        returned as-is.
+
+        Returns:
+            The increase, or None if the metric was never observed
+        """
+        series = self.series(name)
+        if not series.size or np.isnan(series).all():
+            return None
+        if len(self) == 1:
+            return float(np.nansum(series))
+        return float(np.nansum(self._interval_increases(series)))
+
+    def counter_resets(self, name: str) -> int:
+        """Number of counter resets seen across a metric's series."""
+        series = self.series(name)
+        if series.shape[1] < 2:
+            return 0
+        valid = [row[~np.isnan(row)] for row in series]
+        return int(sum((np.diff(row) < 0).sum() for row in valid))
+
+    def increase(self, name: str) -> np.ndarray:
+        """Reset-aware per-interval increase of a counter summed across
+        series, length n_samples - 1; NaN where no series had a baseline."""
+        increases = self._interval_increases(self.series(name))
+        present = ~np.isnan(increases).all(axis=0)
+        return np.where(present, np.nansum(increases, axis=0), np.nan)
+
+    def cumulative_increase(self, name: str) -> np.ndarray:
+        """Running total of a counter's increase since the first sample.
+
+        Unlike total(), the series keeps rising across server restarts.
+        """
+        if not len(self):
+            return np.empty(0)
+        return np.concatenate(([0.0], np.nancumsum(self.increase(name))))
+
+    def rate(self, name: str) -> np.ndarray:
+        """Per-interval rate (units/s) of a counter, reset-aware, length n_samples - 1."""
+        dt = np.diff(self.elapsed)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(dt > 0, self.increase(name) / dt, np.nan)
+
+    def gauge_stats(self, name: str, per_series: bool = False) -> Dict[str, float]:
+        """Summary statistics of a gauge over time.
+
+        Args:
+            name: Gauge metric name
+            per_series: Pool every series' values (e.g. utilisation per
+                instance) instead of summing the series per sample
+
+        Returns:
+            Dict with mean, min, max, p50, p95, p99 and last; empty if absent
+        """
+        if per_series:
+            series = self.series(name)
+            values = series[~np.isnan(series)]
+            last_column = series[:, -1] if series.size else np.empty(0)
+            last_values = last_column[~np.isnan(last_column)]
+            last = float(last_values.mean()) if last_values.size else np.nan
+        else:
+            total = self.total(name)
+            values = total[~np.isnan(total)]
+            last = float(values[-1]) if values.size else np.nan
+        if not values.size:
+            return {}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "last": last,
+        }
+
+    def histogram_mean(self, base_name: str) -> Optional[float]:
+        """Mean observation of a histogram over the frame (sum / count deltas)."""
+        total = self.counter_delta(f"{base_name}_sum")
+        count = self.counter_delta(f"{base_name}_count")
+        if total is None or not count or count <= 0:
+            return None
+        return total / count
+
+    def interval_histogram_mean(self, base_name: str) -> np.ndarray:
+        """Mean observation per sampling interval; NaN for the first sample
+        and for intervals without observations."""
+        sums = self.increase(f"{base_name}_sum")
+        counts = self.increase(f"{base_name}_count")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        return np.concatenate(([np.nan], means)) if len(self) else means
+
+    def _bucket_rows(self, base_name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Unique bucket bounds, each bucket series' bound group and the series."""
+        name = f"{base_name}_bucket"
+        label_keys = self._index.get(name, ([], None))[0]
+        bounds = []
+        positions = []
+        for position, key in enumerate(label_keys):
+            le = dict(key).get("le")
+            if le is not None:
+                bounds.append(_bucket_bound(le))
+                positions.append(position)
+        if not bounds:
+            return np.empty(0), np.empty(0, dtype=np.intp), np.empty((0, len(self)))
+        unique_bounds, group = np.unique(np.asarray(bounds), return_inverse=True)
+        return unique_bounds, group, self.series(name)[positions]
+
+    def histogram_buckets(self, base_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Cumulative bucket counts per upper bound, shape (n_bounds, n_samples).
+
+        Series sharing a bound (engines, instances) are summed.
+        """
+        bounds, group, series = self._bucket_rows(base_name)
+        counts = np.zeros((bounds.size, len(self)))
+        if bounds.size:
+            np.add.at(counts, group, np.nan_to_num(series))
+        return bounds, counts
+
+    def histogram_delta(self, base_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Cumulative bucket counts observed over the frame.
+
+        Bucket increases are reset-aware per series, like counter_delta(),
+        then summed per bound. A single-sample frame returns its cumulative
+        counts.
+        """
+        if len(self) == 1:
+            bounds, counts = self.histogram_buckets(base_name)
+            return bounds, counts[:, -1] if bounds.size else np.empty(0)
+        bounds, group, series = self._bucket_rows(base_name)
+        if not bounds.size:
+            return bounds, np.empty(0)
+        counts = np.zeros(bounds.size)
+        np.add.at(counts, group, np.nansum(self._interval_increases(series), axis=1))
+        return bounds, counts
+
+    def histogram_quantiles(self, base_name: str, quantiles: Sequence[float]) -> np.ndarray:
+        """Quantile estimates of a histogram over the frame (NaN if empty)."""
+        bounds, counts = self.histogram_delta(base_name)
+        return histogram_quantiles(bounds, counts, quantiles)
+
+
+def histogram_quantiles(
+    bounds: np.ndarray, counts: np.ndarray, quantiles: Sequence[float],
+) -> np.ndarray:
+    """Estimate quantiles from cumulative histogram buckets.
+
+    Linear interpolation within the bucket holding each rank, matching
+    Prometheus' histogram_quantile(): the first bucket's lower bound is 0 and
+    ranks landing in the +Inf bucket return the largest finite bound.
+
+    Args:
+        bounds: Sorted bucket upper bounds, last one +Inf
+        counts: Cumulative counts per bound
+        quantiles: Quantiles in [0, 1]
+
+    Returns:
+        Array of estimates, NaN where the histogram holds no observations
+    """
+    q = np.asarray(quantiles, dtype=float)
+    if not bounds.size or not np.isinf(bounds[-1]) or counts[-1] <= 0:
+        return np.full(q.shape, np.nan)
+
+    # Enforce monotonicity in case series were scraped mid-update
+    counts = np.maximum.accumulate(counts)
+    total = counts[-1]
+    ranks = q * total
+    idx = np.searchsorted(counts, ranks, side="left")
+    idx = np.minimum(idx, bounds.size - 1)
+
+    largest_finite = bounds[-2] if bounds.size > 1 else np.nan
+    upper = bounds[idx]
+    lower = np.where(idx > 0, bounds[np.maximum(idx - 1, 0)], 0.0)
+    lower = np.minimum(lower, upper)
+    count_below = np.where(idx > 0, counts[np.maximum(idx - 1, 0)], 0.0)
+    in_bucket = counts[idx] - count_below
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(in_bucket > 0, (ranks - count_below) / in_bucket, 1.0)
+    estimates = lower + (upper - lower) * fraction
+    return np.where(np.isinf(upper), largest_finite, estimates)
+
+
+def server_latency_percentiles(frame: MetricsFrame) -> Dict[str, float]:
+    """Server-side latency percentiles (ms) over a frame.
+
+    Returns:
+        Dict keyed by SERVER_PERCENTILE_COLUMNS; histograms that are absent
+        or saw no requests in the frame are omitted
+    """
+    result = {}
+    if not len(frame):
+        return result
+    for stem, base_name in LATENCY_HISTOGRAMS.items():
+        estimates = frame.histogram_quantiles(base_name, LATENCY_QUANTILES)
+        for q, value in zip(LATENCY_QUANTILES, estimates):
+            if not np.isnan(value):
+                result[f"server_{stem}_p{int(q * 100)}_ms"] = float(value) * 1000
+    return result